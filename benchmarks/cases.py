@@ -0,0 +1,269 @@
+"""The benchmarked hot paths, each registered with :func:`harness.case`.
+
+Inputs come from the simulator's codecs, so frames and register maps
+have the same shape as a real inverter's without a committed fixture.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from custom_components.dess_monitor_local import frame_capture, frame_log, metrics
+from custom_components.dess_monitor_local.api.adapters import replay
+from custom_components.dess_monitor_local.api.crc import (
+    build_pi30_frame,
+    crc16_modbus,
+    crc16_voltronic,
+    crc16_xmodem,
+    validate_voltronic_response,
+)
+from custom_components.dess_monitor_local.api.decoders.pi18 import build_request_frame, decode_pi18_response
+from custom_components.dess_monitor_local.api.decoders.voltronic import decode_direct_response
+from custom_components.dess_monitor_local.api.dispatcher import get_direct_data
+from custom_components.dess_monitor_local.api.protocols import eybond_dongle as ey
+from custom_components.dess_monitor_local.api.protocols.agent_http import split_raw_by_command
+from custom_components.dess_monitor_local.api.protocols.eybond_discovery import EybondRegistry
+from custom_components.dess_monitor_local.api.protocols.modbus_rtu import read_smg2_snapshot_via
+from custom_components.dess_monitor_local.coordinators.failure_tracker import FailureTracker
+from custom_components.dess_monitor_local.simulator import codecs
+from custom_components.dess_monitor_local.simulator.fleet import Fleet
+from custom_components.dess_monitor_local.simulator.state import FaultProfile, InverterState
+from custom_components.dess_monitor_local.soc_core import SocEstimator
+
+from .harness import AsyncOp, case
+
+CYCLE_COMMANDS = ("QPIGS", "QPIRI", "QMOD", "QPIGS2", "QPIWS", "QFWS")
+
+
+def _state(seed: int = 7) -> InverterState:
+    state = InverterState(seed=seed)
+    state.soc = 80.0
+    return state
+
+
+def _pi30(state: InverterState, command: str) -> bytes:
+    """A PI30 response frame as a transport hands it on (no trailing CR)."""
+    return codecs.pi30_request(state, build_pi30_frame(command))[1](False, False)[:-1]
+
+
+def _pi18(state: InverterState, command: str) -> bytes:
+    return codecs.pi18_request(state, build_request_frame(command))[1](False, False)
+
+
+QPIGS = _pi30(_state(), "QPIGS")
+
+
+@case("crc/voltronic")
+def _crc_voltronic():
+    return lambda: crc16_voltronic(QPIGS)
+
+
+@case("crc/xmodem")
+def _crc_xmodem():
+    return lambda: crc16_xmodem(QPIGS)
+
+
+@case("crc/modbus")
+def _crc_modbus():
+    return lambda: crc16_modbus(QPIGS)
+
+
+@case("validate_voltronic_response/qpigs")
+def _validate():
+    return lambda: validate_voltronic_response(QPIGS)
+
+
+@case("decode_direct_response/qpigs")
+def _decode_qpigs():
+    text = QPIGS.decode("ascii", errors="ignore")
+    return lambda: decode_direct_response("QPIGS", text)
+
+
+@case("decode_direct_response/qpiri")
+def _decode_qpiri():
+    text = _pi30(_state(), "QPIRI").decode("ascii", errors="ignore")
+    return lambda: decode_direct_response("QPIRI", text)
+
+
+@case("decode_pi18_response/qpigs")
+def _decode_pi18():
+    raw = _pi18(_state(), "QPIGS")
+    return lambda: decode_pi18_response("QPIGS", raw)
+
+
+@case("read_smg2_snapshot_via/in_memory")
+def _smg2():
+    state = _state()
+    regs = codecs.smg2_registers(state, state.sample())
+
+    async def read_block(start: int, count: int) -> list[int]:
+        return [regs.get(a, 0) for a in range(start, start + count)]
+
+    return AsyncOp(lambda: read_smg2_snapshot_via(read_block))
+
+
+@case("split_raw_by_command/qpiri")
+def _split():
+    raw = codecs.agent_snapshot(_state(), "bench", random.Random(0))["raw"]
+    return lambda: split_raw_by_command(raw, "QPIRI")
+
+
+@case("soc_estimator/update")
+def _soc():
+    estimator = SocEstimator()
+    estimator.set_capacity(200.0)
+    clock = iter(range(10**12))
+
+    def op():
+        return estimator.update(
+            signed_current_a=-12.5, voltage=25.6, now=float(next(clock)),
+            sync_voltage=28.2, floating_voltage=27.0,
+        )
+    return op
+
+
+@case("failure_tracker/fail_resolve_success")
+def _failures():
+    tracker = FailureTracker()
+    last_known = {"grid_voltage": "230.0"}
+
+    def op():
+        count = tracker.on_failure("inv1", "QPIGS")
+        tracker.resolve(count, last_known)
+        tracker.on_success("inv1", "QPIGS")
+    return op
+
+
+@case("frame_log/record")
+def _frame_log():
+    frame_log.clear()
+
+    def op():
+        with metrics.bind(device="inv1"):
+            frame_log.record("QPIGS", QPIGS, True)
+    return op
+
+
+@case("eybond/header_roundtrip")
+def _eybond_header():
+    payload = build_pi30_frame("QPIGS")
+
+    def op():
+        frame = ey._build_forward2device(1234, payload, 1)
+        return ey._decode_header(frame)
+    return op
+
+
+def _cycle(devices: int):
+    """One coordinator-shaped poll cycle over ``devices`` replayed inverters.
+
+    Every device reads the coordinator's command set in sequence and the
+    devices run concurrently; each read goes dispatcher → adapter → CRC
+    → decoder → frame_log with the device bound, like ``_timed_read``,
+    and feeds a FailureTracker (QFWS is never answered by PI30 devices,
+    so the failure path runs too). Frames come from a capture file
+    replayed at ``speed=0``, so the cycle measures our code, not sockets.
+    """
+    tmp = tempfile.mkdtemp(prefix="dess-bench-")
+    path = os.path.join(tmp, "cycle.cap")
+    cap = frame_capture.FrameCapture(path, 1 << 20)
+    ts = time.time()
+    for i in range(devices):
+        state = _state(seed=i)
+        for command in CYCLE_COMMANDS[:-1]:
+            cap.append(f"inv{i}", command, _pi30(state, command), True, ts=ts)
+    cap.close()
+    uris = {f"inv{i}": f"replay://{path}?device=inv{i}&speed=0&loop=1" for i in range(devices)}
+    tracker = FailureTracker()
+    previous: dict[str, dict] = {}
+
+    async def poll(key: str, uri: str) -> dict:
+        data = {}
+        for command in CYCLE_COMMANDS:
+            with metrics.bind(device=key, command=command, transport="replay"):
+                result = await get_direct_data(uri, command, 5.0)
+            if result:
+                tracker.on_success(key, command)
+            else:
+                last_known = previous.get(key, {}).get(command)
+                result, _ = tracker.resolve(tracker.on_failure(key, command), last_known)
+            data[command] = result
+        previous[key] = data
+        return data
+
+    async def cycle():
+        return await asyncio.gather(*(poll(key, uri) for key, uri in uris.items()))
+
+    async def cleanup():
+        replay.clear()
+        frame_log.clear()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return AsyncOp(cycle, cleanup)
+
+
+@case("coordinator_cycle/1")
+def _cycle_1():
+    return _cycle(1)
+
+
+@case("coordinator_cycle/10")
+def _cycle_10():
+    return _cycle(10)
+
+
+@case("coordinator_cycle/100")
+def _cycle_100():
+    return _cycle(100)
+
+
+def _swarm(dongles: int):
+    """One poll round of an EyBond hub with ``dongles`` dongles attached.
+
+    A real listener on an ephemeral loopback port, dialled by a simulator
+    fleet of dongles that answer without delay; every enabled dongle is
+    asked for QPIGS by PN concurrently. Measures the hub side at scale —
+    routing, FC=4 framing, TID matching and session bookkeeping — with
+    the swarm's heartbeats running underneath.
+    """
+    frame = build_pi30_frame("QPIGS")
+    hub: dict = {}
+
+    async def setup():
+        registry = EybondRegistry()
+        mgr = ey.EybondManager("127.0.0.1", 0, "127.0.0.1", "127.0.0.1", registry)
+        await mgr.ensure_started()
+        fleet = Fleet(FaultProfile(latency=0.0))
+        await fleet.start(dongles=dongles, eybond_port=mgr._server.sockets[0].getsockname()[1])
+        for dongle in fleet.dongles:
+            registry.set_enabled(dongle.pn, True)
+        while len(mgr.identified_pns) < dongles:
+            await asyncio.sleep(0.01)
+        hub.update(mgr=mgr, fleet=fleet, pns=[d.pn for d in fleet.dongles])
+
+    async def poll_round():
+        if not hub:
+            await setup()
+        mgr = hub["mgr"]
+        return await asyncio.gather(*(mgr.send_frame(1, frame, 5.0, pn=pn) for pn in hub["pns"]))
+
+    async def cleanup():
+        if hub:
+            await hub["fleet"].close()
+            await hub["mgr"].shutdown()
+
+    return AsyncOp(poll_round, cleanup)
+
+
+@case("eybond_hub/swarm_100")
+def _swarm_100():
+    return _swarm(100)
+
+
+@case("eybond_hub/swarm_500")
+def _swarm_500():
+    return _swarm(500)
@@ -0,0 +1,98 @@
+"""Timing / allocation measurement and baseline comparison."""
+from __future__ import annotations
+
+import asyncio
+import timeit
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+CASES: dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """Register a benchmark: a factory doing the setup and returning the op."""
+    def register(factory: Callable[[], Callable[[], Any]]):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+class AsyncOp:
+    """Run a coroutine function to completion per call, on one private loop."""
+
+    def __init__(self, op: Callable[[], Awaitable[Any]], cleanup: Callable[[], Awaitable[Any]] | None = None):
+        self.loop = asyncio.new_event_loop()
+        self.op = op
+        self.cleanup = cleanup
+
+    def __call__(self) -> Any:
+        return self.loop.run_until_complete(self.op())
+
+    def close(self) -> None:
+        if self.cleanup is not None:
+            self.loop.run_until_complete(self.cleanup())
+        self.loop.close()
+
+
+def measure(op: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> dict[str, float]:
+    """Best-of-``repeat`` throughput plus allocations of one call.
+
+    ``ops_per_s`` comes from the fastest of ``repeat`` runs of at least
+    ``min_time`` seconds each. ``peak_alloc_b`` is the tracemalloc peak
+    above the starting point during one warm call — the transient
+    garbage a call makes. ``retained_b_per_op`` is the traced-memory
+    growth averaged over a batch of calls; anything steadily above zero
+    is state the op keeps (a cache filling up, or a leak).
+    """
+    op()  # warm up caches, lazy imports, first-use allocations
+    timer = timeit.Timer(op)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    best = min([elapsed, *timer.repeat(repeat - 1, number)]) / number
+
+    batch = max(min(number, 1000), 10)
+    tracemalloc.start()
+    try:
+        op()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(batch):
+            op()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "ops_per_s": round(1.0 / best, 1),
+        "peak_alloc_b": max(peak - start, 0),
+        "retained_b_per_op": round((after - before) / batch, 1),
+    }
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float, alloc_slack: int = 256
+) -> list[str]:
+    """Names of results that regressed against ``baseline``.
+
+    A case regresses when its throughput drops more than ``tolerance``
+    (a fraction) below the baseline, or its per-call peak allocation
+    grows by more than ``tolerance`` plus ``alloc_slack`` bytes. Cases
+    missing from the baseline are new, not regressions.
+    """
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        slower = result["ops_per_s"] < base["ops_per_s"] * (1 - tolerance)
+        bigger = result["peak_alloc_b"] > base["peak_alloc_b"] * (1 + tolerance) + alloc_slack
+        if slower or bigger:
+            regressed.append(name)
+    return regressed
@@ -0,0 +1,100 @@
+"""Benchmarks for the integration's hot paths, without Home Assistant.
+
+The test suite checks that the read stack is right; this checks that
+it stays fast. Every case in ``cases.py`` — CRCs, frame validation, the
+PI30 / PI18 / SMG-II / agent decoders, SoC integration, failure
+tracking, ``frame_log.record``, EyBond framing, a coordinator-shaped
+poll cycle over 1, 10 and 100 replayed inverters and an EyBond hub
+polling a swarm of 100 / 500 simulated dongles — reports throughput
+and allocations, and is compared against the committed
+``baseline.json``::
+
+    python -m benchmarks.run                  # compare against the baseline
+    python -m benchmarks.run -k decode        # only cases containing "decode"
+    python -m benchmarks.run --save           # rewrite the baseline
+
+Run from the repository root. Columns are calls per second (best of
+five runs), the change against the baseline, the tracemalloc peak of
+one call and the memory one call leaves behind on average. A case
+regresses when it is more than ``--tolerance`` (default 25%) slower or
+its peak allocation grows by more than that; the exit status is then 1.
+
+Timings depend on the machine, so regenerate the baseline with
+``--save`` on the machine that compares against it, and commit it
+together with the change that legitimately moved a number.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import platform
+import runpy
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+
+
+def _bootstrap() -> None:
+    # Same HA-free import setup as the test suite: stub the package
+    # parents so the integration's pure modules import without HA.
+    sys.path.insert(0, str(ROOT))
+    runpy.run_path(str(ROOT / "tests" / "conftest.py"))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n")[0])
+    parser.add_argument("-k", dest="match", default="", help="only cases whose name contains this")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / growth (fraction)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _bootstrap()
+    from . import cases  # noqa: F401  (registers the cases)
+    from .harness import CASES, compare, measure
+
+    baseline = json.loads(args.baseline.read_text())["cases"] if args.baseline.exists() else {}
+    results = {}
+    for name, factory in CASES.items():
+        if args.match not in name:
+            continue
+        op = factory()
+        try:
+            results[name] = measure(op, repeat=args.repeat)
+        finally:
+            if hasattr(op, "close"):
+                op.close()
+        if not args.json:
+            r, base = results[name], baseline.get(name)
+            delta = f"{r['ops_per_s'] / base['ops_per_s'] - 1:+7.1%}" if base else "    new"
+            print(
+                f"{name:42} {r['ops_per_s']:>12,.0f}/s {delta} "
+                f"{r['peak_alloc_b']:>9,} B peak {r['retained_b_per_op']:>9,.1f} B/op kept",
+                flush=True,
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    if args.save:
+        merged = {**baseline, **results} if args.match else results
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "cases": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+        return 0
+    regressed = compare(results, baseline, args.tolerance)
+    for name in regressed:
+        print(f"REGRESSION {name}", file=sys.stderr)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,41 @@ from __future__ import annotations
 
 import asyncio
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-
-from custom_components.dess_monitor_local import frame_log
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from custom_components.dess_monitor_local import (
+    cpuprofile,
+    frame_capture,
+    frame_log,
+    memprofile,
+    metrics,
+    stalls,
+    tracing,
+)
+from custom_components.dess_monitor_local.api.adapters.factory import close_adapters
+from custom_components.dess_monitor_local.api.adapters.snapshot_cache import snapshots
 from custom_components.dess_monitor_local.api.commands.direct_command_queue import CommandQueue
 from custom_components.dess_monitor_local.api.protocols.eybond_dongle import (
     shutdown_all_eybond_managers,
 )
 from custom_components.dess_monitor_local.coordinators.direct_coordinator import DirectCoordinator
 
-from . import eybond_hub, hub
-from .const import CONF_ENTRY_KIND, ENTRY_KIND_DEVICE, ENTRY_KIND_EYBOND_HUB
+from . import eybond_hub, hub, services
+from .const import (
+    CONF_ENTRY_KIND,
+    CONF_FRAME_CAPTURE_MB,
+    CONF_FRAME_LOG_SIZE,
+    DEFAULT_FRAME_CAPTURE_MB,
+    DEFAULT_FRAME_LOG_SIZE,
+    DOMAIN,
+    ENTRY_KIND_DEVICE,
+    ENTRY_KIND_EYBOND_HUB,
+    FRAME_CAPTURE_FILE,
+)
 
 # List of platforms to support. There should be a matching .py file for each,
 # eg <cover.py> and <sensor.py>
@@ -23,6 +45,8 @@ PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.NUMBER, Platform.
 
 type HubConfigEntry = ConfigEntry[hub.Hub]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 
 def _entry_kind(entry: ConfigEntry) -> str:
     """Resolve the entry kind (device vs EyBond hub), defaulting to device."""
@@ -33,12 +57,30 @@ def _entry_kind(entry: ConfigEntry) -> str:
     )
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration-wide services (see services.py)."""
+    services.async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: HubConfigEntry) -> bool:
     # Store an instance of the "connecting" class that does the work of speaking
     # with your actual devices.
     queue = CommandQueue(min_delay=0.3)
     await queue.start()
     hass.data["dess_monitor_local_queue"] = queue
+    frame_log.configure(
+        int(entry.options.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE))
+    )
+    capture_mb = int(entry.options.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB))
+    if capture_mb > 0:
+        # Creating / mapping the file is blocking I/O; appends are not.
+        await hass.async_add_executor_job(
+            frame_capture.start,
+            entry.entry_id,
+            hass.config.path(FRAME_CAPTURE_FILE),
+            capture_mb * 1024 * 1024,
+        )
 
     if _entry_kind(entry) == ENTRY_KIND_EYBOND_HUB:
         # Hub entry: one listener, many PN-routed children built from the
@@ -76,9 +118,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     queue = hass.data.pop("dess_monitor_local_queue", None)
     if queue is not None:
         await queue.stop()
-    # Drop the diagnostic frame buffer too — keeps memory clean across
-    # reloads and avoids leaking stale frames from a previous device URI.
-    frame_log.clear()
+    # Adapters are per device URI and outlive a cycle. Close only this
+    # entry's (the next setup recreates them with the possibly changed
+    # options); other loaded entries keep polling through theirs.
+    uris = _entry_device_uris(entry)
+    await close_adapters(uris)
+    for uri in uris:
+        snapshots.invalidate(uri)
+    if not _other_loaded_entries(hass, entry):
+        # Adapters and diagnostic buffers are shared by every entry: drop
+        # what is left with the last one — keeps memory clean across
+        # reloads and avoids leaking stale frames from a previous device URI.
+        await close_adapters()
+        frame_log.clear()
+        metrics.clear()
+        memprofile.clear()
+        cpuprofile.clear()
+        stalls.clear()
+        snapshots.clear()
+    tracing.configure(entry.entry_id, 0)
+    await hass.async_add_executor_job(frame_capture.stop, entry.entry_id)
     # Free the EyBond TCP listener / UDP announcer so a reload can rebind
     # the port cleanly. Hub entries shut down only their own listener (and
     # persist the registry); legacy single-device entries drain all.
@@ -90,6 +149,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+def _entry_device_uris(entry: ConfigEntry) -> list[str]:
+    """Transport URIs the entry's coordinator polls (none if setup failed)."""
+    runtime = getattr(entry, "runtime_data", None)
+    coordinator = getattr(runtime, "direct_coordinator", None)
+    return [target.uri for target in getattr(coordinator, "devices", None) or ()]
+
+
+def _other_loaded_entries(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    return any(
+        other.entry_id != entry.entry_id and other.state is ConfigEntryState.LOADED
+        for other in hass.config_entries.async_entries(DOMAIN)
+    )
+
+
 async def _update_listener(hass: HomeAssistant, entry: ConfigEntry):
     # Reload the integration
     await hass.config_entries.async_reload(entry.entry_id)
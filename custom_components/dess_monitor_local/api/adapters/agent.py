@@ -16,6 +16,7 @@ from ..protocols.agent_http import (
     split_raw_by_command,
 )
 from .base import BaseAdapter
+from .snapshot_cache import PollCycle, snapshots
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,14 +48,36 @@ _CHARGER_PRIORITY_TO_AGENT: dict = {
 class AgentAdapter(BaseAdapter):
     """Adapter for solar-system-agent HTTP API."""
 
-    async def get_data(self, command: str) -> dict:
+    def __init__(self, uri: str, timeout: float = 30.0, strict_crc: bool = False):
+        super().__init__(uri, timeout, strict_crc)
+        # (host, port, providerDeviceId), parsed once; ``None`` if malformed.
+        self.endpoint: tuple[str, int, str] | None = None
         try:
-            host, port, provider_device_id = parse_agent_uri(self.uri)
+            self.endpoint = parse_agent_uri(uri)
         except ValueError as err:
-            _LOGGER.warning("invalid agent URI %s: %s", self.uri, err)
+            _LOGGER.warning("invalid agent URI %s: %s", uri, err)
+
+    async def close(self) -> None:
+        snapshots.invalidate(self.uri)
+
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        if self.endpoint is None:
             return {}
-
-        payload = await fetch_agent_snapshot(host, port, provider_device_id, self.timeout)
+        host, port, provider_device_id = self.endpoint
+        fetch_timeout = self.timeout if timeout is None else timeout
+
+        # One /latest fetch serves every command of the poll cycle.
+        payload = await snapshots.get(
+            self.uri,
+            lambda: fetch_agent_snapshot(host, port, provider_device_id, fetch_timeout),
+            cycle,
+        )
         if not payload:
             return {}
 
@@ -82,11 +105,16 @@ class AgentAdapter(BaseAdapter):
 
         return split_raw_by_command(raw, command)
 
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         return {"error": "raw set_data is not supported for Agent; use semantic setters or set_setting"}
 
-    async def set_setting(self, key: str, value: Any) -> dict:
-        return await post_agent_setting(self.uri, key, value, self.timeout)
+    async def set_setting(self, key: str, value: Any, timeout: float | None = None) -> dict:
+        try:
+            return await post_agent_setting(
+                self.uri, key, value, self.timeout if timeout is None else timeout
+            )
+        finally:
+            snapshots.invalidate(self.uri)
 
     async def set_output_source_priority(self, mode: OutputSourcePrioritySetting) -> dict:
         agent_value = _OUTPUT_PRIORITY_TO_AGENT.get(mode)
@@ -7,10 +7,19 @@ from ..decoders.enums import (
     ChargeSourcePrioritySetting,
     OutputSourcePrioritySetting,
 )
+from .snapshot_cache import PollCycle
 
 
 class BaseAdapter(ABC):
-    """Abstract base class for all communication adapters."""
+    """Abstract base class for all communication adapters.
+
+    The factory keeps one instance per device URI for the life of the
+    integration (see ``factory.get_adapter``): parse the URI and build
+    transport objects in ``__init__``, keep per-device state on the
+    instance, and release it in :meth:`close`. ``timeout`` and
+    ``strict_crc`` are only defaults: callers pass their own per call, so
+    every caller of a URI shares the one instance.
+    """
 
     def __init__(self, uri: str, timeout: float = 30.0, strict_crc: bool = False):
         self.uri = uri
@@ -18,15 +27,31 @@ class BaseAdapter(ABC):
         self.strict_crc = strict_crc
 
     @abstractmethod
-    async def get_data(self, command: str) -> dict:
-        """Read data from the device."""
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        """Read data from the device.
+
+        ``cycle`` is the coordinator's current poll cycle, for adapters
+        that share one physical snapshot across commands. ``timeout`` and
+        ``strict_crc`` override :attr:`timeout` / :attr:`strict_crc` for
+        this read.
+        """
         pass
 
     @abstractmethod
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         """Send a raw set command to the device."""
         pass
 
+    async def close(self) -> None:
+        """Release per-device state (integration unload)."""
+        return None
+
     # --- Semantic settings (default Voltronic implementation) ---
 
     async def set_battery_type(self, battery_type: BatteryTypeSetting) -> dict:
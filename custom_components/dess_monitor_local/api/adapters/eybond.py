@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import logging
 
+from ... import tracing
 from ...const import PROTOCOL_PI18
+from ...frame_log import record as _record_frame
+from ..crc import validate_pi18_response, validate_voltronic_response
 from ..decoders.pi18 import decode_pi18_response
 from ..decoders.voltronic import decode_direct_response
-from ..protocols.eybond_dongle import send_eybond_set_command, send_eybond_voltronic
+from ..protocols.eybond_dongle import (
+    eybond_endpoint,
+    send_eybond_set_command,
+    send_eybond_voltronic,
+)
 from .base import BaseAdapter
+from .snapshot_cache import PollCycle
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,27 +25,48 @@ class EyBondAdapter(BaseAdapter):
         super().__init__(uri, timeout, strict_crc)
         self.is_pi18 = uri.startswith("eybond-pi18://")
         self.protocol = PROTOCOL_PI18 if self.is_pi18 else None
+        self.endpoint = eybond_endpoint(uri)
 
-    async def get_data(self, command: str) -> dict:
-        response = await send_eybond_voltronic(
-            self.uri, command, self.timeout, protocol=self.protocol
-        )
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        # Forward through the dongle: session lookup + Modbus-wrapped
+        # request + the inverter's answer relayed back.
+        with tracing.span("forward", "transport"):
+            response = await send_eybond_voltronic(
+                self.endpoint,
+                command,
+                self.timeout if timeout is None else timeout,
+                protocol=self.protocol,
+            )
         if not response:
             return {}
 
+        # Same capture as the direct transports; the device label bound by
+        # the coordinator keeps hub children's frames apart.
+        body, _, _ = response.partition(b"\r")
+        if self.is_pi18:
+            _record_frame(f"PI18:{command}", body, validate_pi18_response(body)[0])
+        else:
+            _record_frame(command, body, validate_voltronic_response(body)[0])
+
         try:
-            if self.is_pi18:
-                return decode_pi18_response(command, response) or {}
+            with tracing.span("decode", "decode"):
+                if self.is_pi18:
+                    return decode_pi18_response(command, response) or {}
 
-            # For PI30, decode to ASCII first
-            body, _, _ = response.partition(b"\r")
-            ascii_resp = body.decode("ascii", errors="ignore")
-            return decode_direct_response(command, ascii_resp) or {}
+                # For PI30, decode to ASCII first
+                ascii_resp = body.decode("ascii", errors="ignore")
+                return decode_direct_response(command, ascii_resp) or {}
         except Exception as err:
             _LOGGER.debug("EyBondAdapter decode failed: %s", err)
             return {}
 
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         return await send_eybond_set_command(
-            self.uri, command, self.timeout, protocol=self.protocol
+            self.endpoint, command, self.timeout if timeout is None else timeout, protocol=self.protocol
         )
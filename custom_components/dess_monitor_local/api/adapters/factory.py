@@ -1,27 +1,64 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import Iterable
+
 from .agent import AgentAdapter
 from .base import BaseAdapter
 from .eybond import EyBondAdapter
 from .modbus import ModbusAdapter
 from .pi18 import PI18Adapter
+from .replay import ReplayAdapter
 from .voltronic import VoltronicAdapter
 
+_LOGGER = logging.getLogger(__name__)
+
+# device URI -> its adapter, for the life of the integration. Reads and
+# writes pass their timeout / strict_crc per call, so one instance (one
+# connection state, one set of learned capabilities) serves every caller
+# of a device, whatever options its entry polls with.
+_ADAPTERS: dict[str, BaseAdapter] = {}
+
+
+def get_adapter(device_uri: str) -> BaseAdapter:
+    """The adapter for ``device_uri``, created on first use."""
+    adapter = _ADAPTERS.get(device_uri)
+    if adapter is None:
+        adapter = _ADAPTERS[device_uri] = _create_adapter(device_uri)
+    return adapter
 
-def get_adapter(device_uri: str, timeout: float = 30.0, strict_crc: bool = False) -> BaseAdapter:
-    """Factory function to create the appropriate adapter for a device URI."""
+
+async def close_adapters(uris: Iterable[str] | None = None) -> None:
+    """Close and forget the adapters of ``uris`` (an unloading entry's
+    devices), or every adapter when ``None``."""
+    wanted = None if uris is None else set(uris)
+    keys = [uri for uri in _ADAPTERS if wanted is None or uri in wanted]
+    adapters = [_ADAPTERS.pop(key) for key in keys]
+    for adapter in adapters:
+        try:
+            await adapter.close()
+        except Exception:  # noqa: BLE001 — one adapter must not block the others
+            _LOGGER.exception("closing the adapter for %s failed", adapter.uri)
+
+
+def _create_adapter(device_uri: str) -> BaseAdapter:
+    """Create the appropriate adapter for a device URI."""
     if device_uri.startswith("agent://"):
-        return AgentAdapter(device_uri, timeout, strict_crc)
+        return AgentAdapter(device_uri)
 
     # SMG-II Modbus, either over TCP or forwarded through an EyBond dongle.
     if device_uri.startswith(("modbus://", "eybond-modbus://")):
-        return ModbusAdapter(device_uri, timeout, strict_crc)
+        return ModbusAdapter(device_uri)
 
     if device_uri.startswith(("pi18://", "pi18-serial://")):
-        return PI18Adapter(device_uri, timeout, strict_crc)
+        return PI18Adapter(device_uri)
 
     if device_uri.startswith(("eybond://", "eybond-pi18://")):
-        return EyBondAdapter(device_uri, timeout, strict_crc)
+        return EyBondAdapter(device_uri)
+
+    # Recorded frames (frame_log diagnostics export or frame_capture file).
+    if device_uri.startswith("replay://"):
+        return ReplayAdapter(device_uri)
 
     # Default to Voltronic PI30 for tcp:// and serial paths
-    return VoltronicAdapter(device_uri, timeout, strict_crc)
+    return VoltronicAdapter(device_uri)
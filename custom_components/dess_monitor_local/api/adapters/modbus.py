@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import logging
-import time
+from functools import partial
 
 from ..decoders.enums import (
     ChargeSourcePrioritySetting,
     OutputSourcePrioritySetting,
 )
-from ..protocols.eybond_dongle import parse_eybond_uri, send_eybond_bytes
+from ..protocols.eybond_dongle import eybond_endpoint, send_eybond_bytes
 from ..protocols.modbus_rtu import (
     UNIT_ID,
     build_read_holding_frame,
@@ -22,60 +22,28 @@ from ..protocols.modbus_rtu import (
     write_modbus_single_register,
 )
 from .base import BaseAdapter
+from .snapshot_cache import PollCycle, snapshots
 
 _LOGGER = logging.getLogger(__name__)
 
 _EYBOND_MODBUS_SCHEME = "eybond-modbus://"
 
-# The coordinator reads SMG-II via six Voltronic-shaped commands per cycle
-# (QPIGS/QPIRI/QMOD/QPIGS2/QPIWS/QFWS), and each historically re-read the full
-# 3-block register snapshot — 18 Modbus transactions per device per cycle.
-# Over an EyBond dongle (half-duplex RS485) that hammering both starves the
-# bus and multiplies the chance of a missed reply (which makes the dongle drop
-# the TCP session). Cache the snapshot briefly so all commands of one poll
-# cycle share a single read. TTL is short enough that data stays fresh at the
-# default poll interval; very short intervals are effectively rate-limited to
-# it (fine — inverter state changes slowly).
-_SNAPSHOT_TTL = 5.0
-# key (device uri) -> (monotonic_ts, snapshot tuple | None)
-_SNAPSHOT_CACHE: dict[str, tuple[float, tuple | None]] = {}
-
-
-def _clear_snapshot_cache() -> None:
-    """Drop all cached snapshots (used by tests)."""
-    _SNAPSHOT_CACHE.clear()
-
-
-async def _cached_snapshot(cache_key: str, read_block):
-    """Return the SMG-II snapshot for ``cache_key``, reading at most once per
-    TTL. A failed read is cached too (as ``None``) so a single dropped cycle
-    doesn't re-hammer the bus with six failing reads."""
-    now = time.monotonic()
-    entry = _SNAPSHOT_CACHE.get(cache_key)
-    if entry is not None and (now - entry[0]) < _SNAPSHOT_TTL:
-        return entry[1]
-    try:
-        snapshot = await read_smg2_snapshot_via(read_block)
-    except Exception as err:  # noqa: BLE001 — transport/parse failure
-        _LOGGER.debug("ModbusAdapter snapshot read failed: %s", err)
-        snapshot = None
-    _SNAPSHOT_CACHE[cache_key] = (now, snapshot)
-    return snapshot
-
-
 class _TcpModbusTransport:
     """Modbus RTU over a direct TCP socket (``modbus://host:port``)."""
 
-    def __init__(self, uri: str) -> None:
+    def __init__(self, uri: str, timeout: float = 30.0) -> None:
         self.host, self.port = parse_modbus_uri(uri)
         self.unit_id = UNIT_ID
+        self.timeout = timeout
 
-    async def read_block(self, start: int, count: int) -> list[int]:
-        return await read_modbus_block(self.host, self.port, start, count, self.unit_id)
+    async def read_block(self, start: int, count: int, timeout: float | None = None) -> list[int]:
+        return await read_modbus_block(
+            self.host, self.port, start, count, self.unit_id, self.timeout if timeout is None else timeout
+        )
 
-    async def write_register(self, address: int, value: int) -> dict:
+    async def write_register(self, address: int, value: int, timeout: float | None = None) -> dict:
         return await write_modbus_single_register(
-            self.host, self.port, address, value, self.unit_id
+            self.host, self.port, address, value, self.unit_id, self.timeout if timeout is None else timeout
         )
 
 
@@ -88,27 +56,33 @@ class _EybondModbusTransport:
     """
 
     def __init__(self, uri: str, timeout: float = 30.0) -> None:
-        self.uri = uri
+        self.endpoint = eybond_endpoint(uri)
         self.timeout = timeout
-        _, _, devaddr, _, _ = parse_eybond_uri(uri)
-        self.unit_id = devaddr
+        self.unit_id = self.endpoint.devaddr
 
-    async def read_block(self, start: int, count: int) -> list[int]:
+    async def read_block(self, start: int, count: int, timeout: float | None = None) -> list[int]:
         frame = build_read_holding_frame(start, count, self.unit_id)
         resp = await send_eybond_bytes(
-            self.uri, frame, self.timeout, context=f"modbus rd {start}+{count}"
+            self.endpoint,
+            frame,
+            self.timeout if timeout is None else timeout,
+            context=f"modbus rd {start}+{count}",
         )
         if not resp:
             raise ConnectionError("no eybond-modbus response")
         return parse_read_holding_response(resp, count, self.unit_id)
 
-    async def write_register(self, address: int, value: int) -> dict:
+    async def write_register(self, address: int, value: int, timeout: float | None = None) -> dict:
         # Try single-write (0x06), then multi-write (0x10) like the TCP path.
         last = {"error": "eybond-modbus write failed"}
         for func_code in (0x06, 0x10):
             frame = build_write_single_frame(address, value, self.unit_id, func_code)
             resp = await send_eybond_bytes(
-                self.uri, frame, self.timeout, context=f"modbus wr {address}"
+                self.endpoint,
+                frame,
+                self.timeout if timeout is None else timeout,
+                context=f"modbus wr {address}",
+                write=True,
             )
             if not resp:
                 last = {"error": "no eybond-modbus write response"}
@@ -125,13 +99,38 @@ class ModbusAdapter(BaseAdapter):
     (``eybond-modbus://``). The register map and projections are identical;
     only the transport differs."""
 
-    def _transport(self):
-        if self.uri.startswith(_EYBOND_MODBUS_SCHEME):
-            return _EybondModbusTransport(self.uri, self.timeout)
-        return _TcpModbusTransport(self.uri)
-
-    async def get_data(self, command: str) -> dict:
-        snapshot = await _cached_snapshot(self.uri, self._transport().read_block)
+    def __init__(self, uri: str, timeout: float = 30.0, strict_crc: bool = False):
+        super().__init__(uri, timeout, strict_crc)
+        if uri.startswith(_EYBOND_MODBUS_SCHEME):
+            self._transport = _EybondModbusTransport(uri, timeout)
+        else:
+            self._transport = _TcpModbusTransport(uri, timeout)
+
+    async def write_register(self, address: int, value: int, timeout: float | None = None) -> dict:
+        # Whatever the outcome, the next read must not project stale config.
+        try:
+            return await self._transport.write_register(
+                address, value, self.timeout if timeout is None else timeout
+            )
+        finally:
+            snapshots.invalidate(self.uri)
+
+    async def close(self) -> None:
+        snapshots.invalidate(self.uri)
+
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        # The six commands of a poll cycle share one 3-block snapshot read
+        # (18 Modbus transactions otherwise) — see snapshot_cache.py.
+        read_block = partial(self._transport.read_block, timeout=self.timeout if timeout is None else timeout)
+        snapshot = await snapshots.get(
+            self.uri, lambda: read_smg2_snapshot_via(read_block), cycle
+        )
         if snapshot is None:
             return {}
         sensors, config, faults = snapshot
@@ -143,7 +142,7 @@ class ModbusAdapter(BaseAdapter):
         # ... other command emulations from dispatcher.py ...
         return {"sensors": sensors, "config": config, "faults": faults}
 
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         return {"error": "raw set_data is not supported for Modbus; use semantic setters"}
 
     async def set_output_source_priority(self, mode: OutputSourcePrioritySetting) -> dict:
@@ -155,7 +154,7 @@ class ModbusAdapter(BaseAdapter):
         value = mapping.get(mode)
         if value is None:
             return {"error": f"mode {mode} is not mappable to SMG output_priority"}
-        return await self._transport().write_register(301, value)
+        return await self.write_register(301, value)
 
     async def set_charge_source_priority(self, mode: ChargeSourcePrioritySetting) -> dict:
         mapping = {
@@ -166,22 +165,22 @@ class ModbusAdapter(BaseAdapter):
         value = mapping.get(mode)
         if value is None:
             return {"error": f"mode {mode} is not mappable to SMG battery_charging_priority"}
-        return await self._transport().write_register(331, value)
+        return await self.write_register(331, value)
 
     async def set_battery_bulk_voltage(self, voltage: float) -> dict:
         reg_value = max(0, min(0xFFFF, int(round(voltage * 10.0))))
-        return await self._transport().write_register(324, reg_value)
+        return await self.write_register(324, reg_value)
 
     async def set_battery_float_voltage(self, voltage: float) -> dict:
         reg_value = max(0, min(0xFFFF, int(round(voltage * 10.0))))
-        return await self._transport().write_register(325, reg_value)
+        return await self.write_register(325, reg_value)
 
     async def set_max_combined_charge_current(self, amps: int) -> dict:
         reg_value = max(0, min(0xFFFF, int(round(amps * 10.0))))
-        return await self._transport().write_register(332, reg_value)
+        return await self.write_register(332, reg_value)
 
     async def set_battery_charge_current(self, amps: int) -> dict:
         return await self.set_max_combined_charge_current(amps)
 
     async def set_max_utility_charge_current(self, amps: int, float_format: bool = False) -> dict:
-        return await self._transport().write_register(333, int(amps * 10))
+        return await self.write_register(333, int(amps * 10))
@@ -4,16 +4,28 @@ import logging
 
 from ..protocols.pi18_tcp import query_pi18
 from .base import BaseAdapter
+from .snapshot_cache import PollCycle
 
 _LOGGER = logging.getLogger(__name__)
 
 class PI18Adapter(BaseAdapter):
     """Adapter for PI18 protocol over TCP or Serial."""
 
-    async def get_data(self, command: str) -> dict:
-        return await query_pi18(self.uri, command, self.timeout, self.strict_crc)
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        return await query_pi18(
+            self.uri,
+            command,
+            self.timeout if timeout is None else timeout,
+            self.strict_crc if strict_crc is None else strict_crc,
+        )
 
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         # For PI18, get_data (query_pi18) already handles set commands (ACK/NAK)
         # because the decoder handles ^1 and ^0.
-        return await self.get_data(command)
+        return await self.get_data(command, timeout=timeout)
@@ -0,0 +1,290 @@
+"""Replay adapter: recorded frames fed back through the read stack.
+
+``replay://<path>[?device=<id>&speed=<x>&loop=1]`` answers reads from
+frames recorded in the field instead of a transport, so the whole
+CRC validation → decoder → coordinator → entity pipeline can be run
+deterministically and without hardware — for regression runs on a
+customer's capture, or as a zero-latency source for the ``cli``
+benchmark.
+
+``<path>`` is either
+
+* a diagnostics download (entry or device level, with or without Home
+  Assistant's ``{"data": ...}`` envelope) or just its ``frames`` dict —
+  a few frames per command, from ``frame_log.snapshot``; or
+* a ``frame_capture`` file — hours of frames, from the
+  ``frame_capture_mb`` option.
+
+Each command has its own cursor: the n-th read of ``QPIGS`` returns the
+n-th recorded ``QPIGS`` frame. PI18 frames (recorded as ``PI18:<cmd>``)
+decode on the PI18 path, everything else as PI30; Modbus reads are not
+recorded, so SMG-II devices can't be replayed. ``device`` selects one
+recorded target and is required when the recording holds several.
+
+Pacing follows the recorded timestamps divided by ``speed``: 1 (the
+default) replays in real time, 10 ten times faster, 0 as fast as the
+caller reads. A read that would have to wait past its timeout returns
+``{}`` like a silent device, without consuming the frame. At the end of
+a command's frames the device goes silent, or with ``loop=1`` starts
+over.
+
+The factory keeps one adapter per URI, so the loaded recording and its
+cursors live on the adapter and go with it when it is closed;
+:func:`clear` rewinds every live one.
+
+:func:`decode_file` is the offline counterpart: it decodes a whole
+recording, sharded over a process pool, without pacing or cursors
+(``cli --decode``).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from itertools import repeat
+from typing import Any
+from urllib.parse import parse_qs
+
+from ... import metrics as _metrics
+from ... import tracing
+from ...frame_capture import MAGIC, CapturedFrame, CaptureReader
+from ...frame_log import record as _record_frame
+from ..crc import validate_pi18_response, validate_voltronic_response
+from ..decoders.pi18 import decode_pi18_response
+from ..decoders.voltronic import decode_direct_response
+from .base import BaseAdapter
+from .snapshot_cache import PollCycle
+
+_LOGGER = logging.getLogger(__name__)
+
+_PI18_PREFIX = "PI18:"
+
+
+def parse_replay_uri(uri: str) -> tuple[str, dict[str, str]]:
+    """Split ``replay://<path>?<query>`` into the path and its parameters."""
+    path, _, query = uri.removeprefix("replay://").partition("?")
+    return path, {key: values[-1] for key, values in parse_qs(query).items()}
+
+
+def load_frames(path: str) -> list[CapturedFrame]:
+    """Every frame of a capture file or diagnostics JSON, oldest first."""
+    with open(path, "rb") as f:
+        is_capture = f.read(len(MAGIC)) == MAGIC
+    if is_capture:
+        with CaptureReader(path) as reader:
+            return list(reader.frames())
+
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    if isinstance(doc.get("data"), dict) and "frames" in doc["data"]:
+        doc = doc["data"]  # Home Assistant's diagnostics envelope
+    frames: dict[str, list[dict]] = doc.get("frames", doc)
+    out = []
+    for key, entries in frames.items():
+        device, _, command = key.rpartition(" ")
+        for entry in entries:
+            out.append(CapturedFrame(
+                datetime.fromisoformat(entry["timestamp"]).timestamp(),
+                device,
+                command,
+                bool(entry.get("crc_valid", True)),
+                bytes.fromhex(entry["raw_hex"]),
+            ))
+    out.sort(key=lambda frame: frame.ts)
+    return out
+
+
+def decode_frame(command: str, raw: bytes, strict_crc: bool = False) -> dict | None:
+    """Validate and decode one recorded frame the way its transport would.
+
+    ``command`` is the recorded label. Returns ``None`` for a CRC
+    mismatch under ``strict_crc`` (the transport would drop the frame).
+    """
+    pi18 = command.startswith(_PI18_PREFIX)
+    ok, _ = validate_pi18_response(raw) if pi18 else validate_voltronic_response(raw)
+    if not ok:
+        _metrics.inc("crc_failures", transport="replay")
+        if strict_crc:
+            return None
+    with tracing.span("decode", "decode"):
+        if pi18:
+            return decode_pi18_response(command[len(_PI18_PREFIX):], raw + b"\r") or {}
+        return decode_direct_response(command, raw.strip().decode(errors="ignore")) or {}
+
+
+class _Player:
+    """One recording's frames for one device, with per-command cursors."""
+
+    def __init__(self, frames: list[CapturedFrame], speed: float, loop: bool):
+        self.speed = speed
+        self.loop = loop
+        self.by_command: dict[str, list[CapturedFrame]] = {}
+        for frame in frames:
+            self.by_command.setdefault(frame.command, []).append(frame)
+        self.cursor = dict.fromkeys(self.by_command, 0)
+        # (monotonic, recorded ts) pair pinning the replay clock.
+        self.anchor: tuple[float, float] | None = None
+
+    def _period(self, frames: list[CapturedFrame]) -> float:
+        # One lap plus one mean poll interval, so a looped frame doesn't
+        # land on the same instant as the last one.
+        if len(frames) < 2:
+            return 0.0
+        return (frames[-1].ts - frames[0].ts) * len(frames) / (len(frames) - 1)
+
+    def next(self, command: str) -> tuple[str, CapturedFrame, float] | None:
+        """The next frame for ``command``: label, frame, replay-clock ts."""
+        label = command if command in self.by_command else _PI18_PREFIX + command
+        frames = self.by_command.get(label)
+        if not frames:
+            return None
+        laps, i = divmod(self.cursor[label], len(frames))
+        if laps and not self.loop:
+            return None
+        frame = frames[i]
+        return label, frame, frame.ts + laps * self._period(frames)
+
+    def delay(self, ts: float) -> float:
+        """Seconds until a frame recorded at ``ts`` is due."""
+        if not self.speed:
+            return 0.0
+        now = time.monotonic()
+        if self.anchor is None:
+            self.anchor = (now, ts)
+        return self.anchor[0] + (ts - self.anchor[1]) / self.speed - now
+
+
+def _open_player(uri: str) -> _Player:
+    path, params = parse_replay_uri(uri)
+    frames = load_frames(path)
+    devices = {frame.device for frame in frames}
+    device = params.get("device")
+    if device is not None:
+        if device not in devices:
+            raise ValueError(f"{path}: no frames for device {device!r} (have {sorted(devices)})")
+        frames = [frame for frame in frames if frame.device == device]
+    elif len(devices) > 1:
+        raise ValueError(f"{path}: frames of several devices, pick one with ?device= {sorted(devices)}")
+    return _Player(frames, float(params.get("speed", 1.0)), params.get("loop") in ("1", "true"))
+
+
+def clear() -> None:
+    """Forget loaded recordings; the next read of each URI starts over."""
+    for adapter in _LIVE:
+        adapter._player = None
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter answering reads from a recorded capture (read-only)."""
+
+    def __init__(self, uri: str, timeout: float = 30.0, strict_crc: bool = False):
+        super().__init__(uri, timeout, strict_crc)
+        # Loaded on first read (file I/O off the event loop).
+        self._player: _Player | None = None
+        _LIVE.add(self)
+
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        player = self._player
+        if player is None:
+            try:
+                player = await asyncio.to_thread(_open_player, self.uri)
+            except (OSError, ValueError, KeyError) as err:
+                _LOGGER.warning("Cannot replay %s: %s", self.uri, err)
+                return {}
+            if self._player is None:  # a concurrent read may have won
+                self._player = player
+            player = self._player
+
+        nxt = player.next(command)
+        if nxt is None:
+            return {}
+        label, frame, ts = nxt
+        delay = player.delay(ts)
+        if timeout is None:
+            timeout = self.timeout
+        if delay > timeout:
+            await asyncio.sleep(max(timeout, 0))
+            return {}
+        with tracing.span("response", "transport"):
+            if delay > 0:
+                await asyncio.sleep(delay)
+        player.cursor[label] += 1
+
+        # Into frame_log like a live read, but never back into the
+        # capture file — that holds field recordings only.
+        _record_frame(label, frame.raw, frame.crc_valid, capture=False)
+        try:
+            return decode_frame(
+                label, frame.raw, self.strict_crc if strict_crc is None else strict_crc
+            ) or {}
+        except Exception:
+            return {}
+
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
+        return {"error": "replay:// devices are read-only"}
+
+    async def close(self) -> None:
+        self._player = None
+
+
+# Every ReplayAdapter alive, for :func:`clear`; closed ones drop out.
+_LIVE: weakref.WeakSet[ReplayAdapter] = weakref.WeakSet()
+
+
+# ---------------------------------------------------------------------------
+# Offline batch decoding
+# ---------------------------------------------------------------------------
+
+def _decode_shard(frames: list[CapturedFrame], strict_crc: bool) -> list[dict[str, Any]]:
+    rows = []
+    for frame in frames:
+        try:
+            data = decode_frame(frame.command, frame.raw, strict_crc)
+        except Exception as err:  # a decoder crash on field data is the finding
+            data = {"error": repr(err)}
+        rows.append({
+            "ts": datetime.fromtimestamp(frame.ts, UTC),
+            "device": frame.device,
+            "command": frame.command,
+            "crc_valid": frame.crc_valid,
+            "data": data,
+        })
+    return rows
+
+
+def decode_file(
+    path: str,
+    device: str | None = None,
+    strict_crc: bool = False,
+    workers: int | None = None,
+    shard_size: int = 5000,
+) -> Iterator[dict[str, Any]]:
+    """Decode every frame of a recording, in order, one row per frame.
+
+    Frames are cut into ``shard_size`` slices decoded on a process pool
+    of ``workers`` (default: one per CPU); ``workers=1`` or a single
+    shard decodes in-process. ``data`` is ``None`` for frames dropped by
+    ``strict_crc``.
+    """
+    frames = load_frames(path)
+    if device is not None:
+        frames = [frame for frame in frames if frame.device == device]
+    shards = [frames[i:i + shard_size] for i in range(0, len(frames), shard_size)]
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            yield from _decode_shard(shard, strict_crc)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        for rows in pool.map(_decode_shard, shards, repeat(strict_crc)):
+            yield from rows
@@ -0,0 +1,117 @@
+"""Per-poll-cycle sharing of a device's physical snapshot.
+
+The coordinator asks every device for six Voltronic-shaped commands per
+cycle (QPIGS / QPIRI / QMOD / QPIGS2 / QPIWS / QFWS). Some transports
+don't answer commands but hand back one whole-device snapshot: SMG-II
+over Modbus reads three register blocks, the solar-system-agent serves
+one ``/latest`` JSON document. Reading that snapshot once per *command*
+costs six times the bus time (18 Modbus transactions through a
+half-duplex dongle) or six HTTP round trips for identical data.
+
+Implementation choices:
+
+* The coordinator creates a :class:`PollCycle` per cycle and passes it
+  through ``get_direct_data`` into ``adapter.get_data``. Within a cycle
+  a device's snapshot is read exactly once — on first use — and every
+  later command of that cycle projects from it, however long the cycle
+  takes on a slow dongle. The next cycle starts empty, so short update
+  intervals never see a previous cycle's data.
+* A failed read is remembered for the cycle too (as ``None``): one
+  dropped snapshot must not re-hammer the bus with five more failing
+  reads. The next cycle tries again.
+* The QPIGS oversampler runs each sampling pass as its own cycle, so
+  every sample is a fresh read. Callers outside any cycle (the CLI)
+  share a bounded LRU (``SnapshotCache``) with a short TTL instead;
+  every read also lands there. Eviction is by count (``MAX_ENTRIES``),
+  so URIs of removed devices do not accumulate.
+* Writes invalidate explicitly (:meth:`SnapshotCache.invalidate`): the
+  LRU entry and the entry of every live cycle are dropped, so the read
+  after a setting change reflects it even mid-cycle. Live cycles are
+  tracked in a ``WeakSet`` — a finished cycle simply goes away.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Freshness of a snapshot for reads outside a poll cycle (CLI, scripts).
+SNAPSHOT_TTL = 5.0
+MAX_ENTRIES = 64
+
+
+class PollCycle:
+    """Snapshots read during one coordinator poll cycle, keyed by device URI."""
+
+    __slots__ = ("entries", "__weakref__")
+
+    def __init__(self) -> None:
+        self.entries: dict[str, Any] = {}
+
+
+class SnapshotCache:
+    """Cycle-scoped snapshot reads with a bounded, TTL'd LRU behind them."""
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL, max_entries: int = MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (monotonic ts, snapshot | None), least recently used first
+        self._lru: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._cycles: weakref.WeakSet[PollCycle] = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    async def get(
+        self,
+        key: str,
+        read: Callable[[], Awaitable[Any]],
+        cycle: PollCycle | None = None,
+    ) -> Any:
+        """The snapshot for ``key``: the cycle's if it has one, else the
+        LRU's while fresh (no cycle only), else ``await read()``.
+
+        An exception from ``read`` is logged and cached as ``None``.
+        """
+        if cycle is not None:
+            if key in cycle.entries:
+                return cycle.entries[key]
+            self._cycles.add(cycle)
+        else:
+            entry = self._lru.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._lru.move_to_end(key)
+                return entry[1]
+        try:
+            snapshot = await read()
+        except Exception as err:  # noqa: BLE001 — transport/parse failure
+            _LOGGER.debug("snapshot read for %s failed: %s", key, err)
+            snapshot = None
+        if cycle is not None:
+            cycle.entries[key] = snapshot
+        self._lru[key] = (time.monotonic(), snapshot)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, key: str) -> None:
+        """Forget ``key`` everywhere (after a write to the device)."""
+        self._lru.pop(key, None)
+        for cycle in self._cycles:
+            cycle.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget everything (integration unload, tests)."""
+        self._lru.clear()
+        for cycle in self._cycles:
+            cycle.entries.clear()
+
+
+# Shared by every adapter in this HA instance.
+snapshots = SnapshotCache()
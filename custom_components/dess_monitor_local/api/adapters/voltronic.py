@@ -5,17 +5,37 @@ import logging
 
 import serial_asyncio_fast as serial_asyncio
 
+from ... import stalls, tracing
 from ..decoders.voltronic import decode_direct_response
 from ..protocols.elfin_tcp import ElfinTCPProtocol, parse_tcp_uri
 from ..protocols.serial_uart import SERIAL_BAUDRATE, SerialCommandProtocol
 from .base import BaseAdapter
+from .snapshot_cache import PollCycle
 
 _LOGGER = logging.getLogger(__name__)
 
 class VoltronicAdapter(BaseAdapter):
     """Adapter for Voltronic PI30 protocol over TCP or Serial."""
 
-    async def get_data(self, command: str) -> dict:
+    def __init__(self, uri: str, timeout: float = 30.0, strict_crc: bool = False):
+        super().__init__(uri, timeout, strict_crc)
+        # (host, port) of an Elfin ``tcp://`` URI, parsed once.
+        self.endpoint: tuple[str, int] | None = None
+        if uri.startswith("tcp://"):
+            try:
+                self.endpoint = parse_tcp_uri(uri)
+            except ValueError as err:
+                _LOGGER.warning("invalid tcp URI %s: %s", uri, err)
+
+    async def get_data(
+        self,
+        command: str,
+        cycle: PollCycle | None = None,
+        timeout: float | None = None,
+        strict_crc: bool | None = None,
+    ) -> dict:
+        if strict_crc is None:
+            strict_crc = self.strict_crc
         loop = asyncio.get_running_loop()
         fut: asyncio.Future = loop.create_future()
         transport: asyncio.Transport | None = None
@@ -24,38 +44,54 @@ class VoltronicAdapter(BaseAdapter):
             if not fut.done():
                 fut.set_result(None if err else data)
 
+        # ``timeout`` bounds connect + response together: the
+        # coordinator hands us what is left of its cycle budget, and an
+        # unreachable Elfin would otherwise sit in the OS SYN retries.
+        if timeout is None:
+            timeout = self.timeout
+        deadline = loop.time() + timeout
         try:
             if self.uri.startswith("tcp://"):
-                host, port = parse_tcp_uri(self.uri)
-                transport, _ = await loop.create_connection(
-                    lambda: ElfinTCPProtocol(command, on_response, strict_crc=self.strict_crc),
+                if self.endpoint is None:
+                    raise ValueError(f"invalid tcp URI {self.uri}")
+                host, port = self.endpoint
+                connect = loop.create_connection(
+                    lambda: ElfinTCPProtocol(command, on_response, strict_crc=strict_crc),
                     host,
                     port,
                 )
             else:
                 # Direct serial (e.g. /dev/ttyUSB0)
-                transport, _ = await serial_asyncio.create_serial_connection(
+                connect = stalls.steps("serial_open", serial_asyncio.create_serial_connection(
                     loop,
-                    lambda: SerialCommandProtocol(command, on_response, strict_crc=self.strict_crc),
+                    lambda: SerialCommandProtocol(command, on_response, strict_crc=strict_crc),
                     self.uri,
                     baudrate=SERIAL_BAUDRATE,
                     bytesize=8,
                     parity="N",
                     stopbits=1,
-                )
+                ), self.uri)
+            with tracing.span("connect", "transport"):
+                transport, _ = await asyncio.wait_for(connect, timeout=timeout)
         except Exception as err:
             _LOGGER.debug("VoltronicAdapter connection failed: %s", err)
             return {}
 
         try:
             try:
-                result = await asyncio.wait_for(fut, timeout=self.timeout)
+                # The request is written from ``connection_made``; this
+                # span is write + the device's answer.
+                with tracing.span("response", "transport"):
+                    result = await asyncio.wait_for(
+                        fut, timeout=max(deadline - loop.time(), 0)
+                    )
             except TimeoutError:
                 result = None
 
             if result and isinstance(result, str):
                 try:
-                    return decode_direct_response(command, result) or {}
+                    with tracing.span("decode", "decode"):
+                        return decode_direct_response(command, result) or {}
                 except Exception:
                     return {}
             return {}
@@ -63,16 +99,20 @@ class VoltronicAdapter(BaseAdapter):
             if transport:
                 transport.close()
 
-    async def set_data(self, command: str) -> dict:
+    async def set_data(self, command: str, timeout: float | None = None) -> dict:
         # For Voltronic, set_data is often just get_data and checking for ACK/NAK.
         # But we have send_voltronic_set_command in elfin_tcp.py.
         if self.uri.startswith("tcp://"):
             from ..protocols.elfin_tcp import send_voltronic_set_command
-            host, port = parse_tcp_uri(self.uri)
-            return await send_voltronic_set_command(host, port, command, self.timeout)
+            if self.endpoint is None:
+                return {"error": f"invalid tcp URI {self.uri}"}
+            host, port = self.endpoint
+            return await send_voltronic_set_command(
+                host, port, command, self.timeout if timeout is None else timeout
+            )
 
         # Fallback to get_data for serial or others if not specialized
-        resp = await self.get_data(command)
+        resp = await self.get_data(command, timeout=timeout)
         # decode_direct_response already handles ACK/NAK for some commands but returns a dict.
         # This part might need refinement to match legacy set_direct_data.
         return resp
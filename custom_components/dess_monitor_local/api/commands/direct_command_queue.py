@@ -1,54 +1,124 @@
 import asyncio
-from collections.abc import Awaitable, Callable
+import contextvars
+import time
+from collections.abc import Awaitable, Callable, Hashable
 from typing import Any
 
+from ... import metrics, stalls, tracing
+
 
 class CommandQueue:
-    """Асинхронная очередь команд к инвертору (Elfin / RS232)."""
+    """Асинхронная очередь команд к инвертору (Elfin / RS232).
+
+    Команды разложены по «полосам» (``lane``): внутри полосы они идут по
+    одной с паузой ``min_delay``, разные полосы работают параллельно. По
+    умолчанию всё попадает в одну общую полосу — последовательная шина
+    (RS232, Elfin) не терпит двух запросов сразу. Устройства за EyBond
+    получают по своей полосе: порядок и обратное давление там даёт сам
+    донгл (окно ``?window=N`` и блокировка на devaddr), так что запросы к
+    разным devaddr/PN действительно уходят параллельно.
+    """
 
     def __init__(self, min_delay: float = 0.3):
-        self._queue = asyncio.Queue()
-        self._lock = asyncio.Lock()
-        self._worker_task = None
+        # lane -> queue; one worker per lane once started.
+        self._lanes: dict[Hashable, asyncio.Queue] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+        self._started = False
         self.min_delay = min_delay
 
     async def start(self):
-        if not self._worker_task:
-            self._worker_task = asyncio.create_task(self._worker())
+        self._started = True
+        for lane, queue in self._lanes.items():
+            self._spawn(lane, queue)
+
+    def _spawn(self, lane: Hashable, queue: asyncio.Queue) -> None:
+        if lane not in self._workers:
+            self._workers[lane] = asyncio.create_task(self._worker(queue))
 
     async def stop(self):
-        if self._worker_task:
-            self._worker_task.cancel()
+        self._started = False
+        workers, self._workers = list(self._workers.values()), {}
+        for task in workers:
+            task.cancel()
+        for task in workers:
             # Await the cancellation so HA's event loop sees the task
             # finish gracefully — otherwise we get "Task was destroyed
             # but it is pending!" warnings on integration reload / HA
             # shutdown when the worker is mid-``await fn()`` and the
             # future under it gets cancelled.
             try:
-                await self._worker_task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._worker_task = None
 
-    async def enqueue(self, fn: Callable[[], Awaitable[Any]], desc: str = "") -> Any:
-        """Добавить команду в очередь."""
+    async def enqueue(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        desc: str = "",
+        deadline: float | None = None,
+        labels: dict[str, str] | None = None,
+        lane: Hashable = None,
+    ) -> Any:
+        """Добавить команду в очередь.
+
+        ``deadline`` — момент ``time.monotonic()``, после которого команду
+        уже нет смысла выполнять (бюджет цикла опроса исчерпан, пока она
+        ждала в очереди). Такая команда не запускается, а завершается
+        ``TimeoutError`` — шина не тратится на ответ, который никто не ждёт.
+
+        ``labels`` (device / command / transport) — метки для метрики
+        ``queue_wait_seconds`` (время от постановки до запуска).
+
+        ``fn`` выполняется в контексте (``contextvars``) вызывающего кода, а
+        не воркера: метки метрик и трек трассировки, выставленные
+        координатором, доходят до транспорта и его колбэков.
+
+        ``lane`` — полоса команды (см. класс); ``None`` — общая.
+        """
         fut = asyncio.get_running_loop().create_future()
-        await self._queue.put((fn, fut, desc))
+        queue = self._lanes.get(lane)
+        if queue is None:
+            queue = self._lanes[lane] = asyncio.Queue()
+        if self._started:
+            self._spawn(lane, queue)
+        await queue.put(
+            (fn, fut, desc, deadline, labels, time.monotonic(), contextvars.copy_context())
+        )
         return await fut
 
-    async def _worker(self):
+    @staticmethod
+    async def _run(fn, queued_at: float, labels: dict[str, str] | None) -> Any:
+        started = time.monotonic()
+        metrics.observe("queue_wait_seconds", started - queued_at, **(labels or {}))
+        tracing.add("queue wait", queued_at, started, cat="queue")
+        return await fn()
+
+    async def _worker(self, queue: asyncio.Queue):
         while True:
-            fn, fut, desc = await self._queue.get()
+            fn, fut, desc, deadline, labels, queued_at, ctx = await queue.get()
+            if fut.done() or (deadline is not None and time.monotonic() >= deadline):
+                # Caller gave up (cancelled) or the budget ran out in the queue.
+                if not fut.done():
+                    metrics.inc("queue_deadline_expired", **(labels or {}))
+                    fut.set_exception(TimeoutError(f"queue deadline expired {desc}".rstrip()))
+                queue.task_done()
+                continue
             try:
-                async with self._lock:
-                    # if desc:
-                    #     print(f"[QUEUE] → {desc}")
-                    result = await fn()
-                    if not fut.done():
-                        fut.set_result(result)
+                # if desc:
+                #     print(f"[QUEUE] → {desc}")
+                result = await asyncio.create_task(
+                    stalls.steps(
+                        "queue_step",
+                        self._run(fn, queued_at, labels),
+                        lambda desc=desc: stalls.bound_name(desc or "command"),
+                    ),
+                    context=ctx,
+                )
+                if not fut.done():
+                    fut.set_result(result)
             except Exception as e:
                 if not fut.done():
                     fut.set_exception(e)
             finally:
                 await asyncio.sleep(self.min_delay)
-                self._queue.task_done()
+                queue.task_done()
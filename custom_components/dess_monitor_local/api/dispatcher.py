@@ -11,6 +11,7 @@ target. URI schemes::
     eybond-pi18://<host>:<port>/<devaddr>      PI18 via EyBond dongle
     tcp://<host>:<port>                        Voltronic Axpert via Elfin TCP
     /dev/ttyUSB0  or  COM3                     Voltronic Axpert via serial
+    replay://<path>?device=&speed=&loop=       recorded frames, no hardware
 
 All read paths return a flat dict shaped like the Voltronic QPIGS /
 QPIRI / QMOD response, so sensors don't need to know which adapter
@@ -19,8 +20,11 @@ sourced the data.
 from __future__ import annotations
 
 import logging
+import time
 
+from .. import tracing
 from .adapters.factory import get_adapter
+from .adapters.snapshot_cache import PollCycle
 from .decoders.enums import (
     BatteryTypeSetting,
     ChargeSourcePrioritySetting,
@@ -34,11 +38,28 @@ _LOGGER = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 async def get_direct_data(
-    device: str, command_str: str, timeout: float = 30.0, strict_crc: bool = False
+    device: str,
+    command_str: str,
+    timeout: float = 30.0,
+    strict_crc: bool = False,
+    deadline: float | None = None,
+    cycle: PollCycle | None = None,
 ) -> dict:
-    """Universal read dispatcher using the adapter pattern."""
-    adapter = get_adapter(device, timeout, strict_crc)
-    return await adapter.get_data(command_str.upper())
+    """Universal read dispatcher using the adapter pattern.
+
+    ``deadline`` is an optional ``time.monotonic()`` instant; the adapter
+    timeout is clipped to the budget left, and a spent budget returns
+    ``{}`` without touching the transport. ``cycle`` is the caller's poll
+    cycle: snapshot-based adapters read the device once per cycle.
+    """
+    if deadline is not None:
+        timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            return {}
+    adapter = get_adapter(device)
+    command = command_str.upper()
+    with tracing.span("read", "transport", command=command, timeout=timeout):
+        return await adapter.get_data(command, cycle, timeout, strict_crc)
 
 # ---------------------------------------------------------------------------
 # WRITE
@@ -48,16 +69,16 @@ async def set_direct_data(
     device: str, command_str: str, timeout: float = 30.0
 ) -> dict:
     """Send a raw set command to the device."""
-    adapter = get_adapter(device, timeout)
-    return await adapter.set_data(command_str.upper())
+    adapter = get_adapter(device)
+    return await adapter.set_data(command_str.upper(), timeout)
 
 async def set_direct_data_agent(
     device: str, setting_key: str, value, timeout: float = 30.0
 ) -> dict:
     """Agent-specific set command."""
-    adapter = get_adapter(device, timeout)
+    adapter = get_adapter(device)
     if hasattr(adapter, "set_setting"):
-        return await adapter.set_setting(setting_key, value)
+        return await adapter.set_setting(setting_key, value, timeout)
     return {"error": "Adapter does not support generic set_setting"}
 
 
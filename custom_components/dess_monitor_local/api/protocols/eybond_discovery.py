@@ -75,12 +75,93 @@ class EybondRegistry:
     """Registry of dongles discovered on one hub listener, keyed by ``PN``.
 
     ``now`` is injectable (returns an ISO-8601 timestamp string) so lifecycle
-    tracking is deterministic under test.
+    tracking is deterministic under test. Listeners added with
+    :meth:`add_listener` are called after every configuration change
+    (enable/disable, add, remove, load) — not on lifecycle updates.
+
+    The enabled and connected PNs are kept as indexes, updated by the
+    methods below, so the per-heartbeat / per-tick queries don't scan
+    every record of a hub with hundreds of dongles. Change ``enabled`` and
+    ``status`` through the registry, not on the records directly.
+
+    Change tracking: every change a user would notice (configuration,
+    connect / disconnect, a new or removed dongle) increments ``version``,
+    marks the record dirty and calls the observers added with
+    :meth:`add_observer`. A heartbeat that only moves ``last_seen`` does
+    neither — it marks the record *touched*, which :attr:`dirty` reports
+    so the next save picks it up. :meth:`to_dict` re-serializes only
+    dirty and touched records.
     """
 
     def __init__(self, now: Callable[[], str] | None = None) -> None:
         self._records: dict[str, DongleRecord] = {}
         self._now = now or _utcnow_iso
+        self._listeners: list[Callable[[], None]] = []
+        self._observers: list[Callable[[int], None]] = []
+        # Insertion-ordered sets (dict keys) of PNs.
+        self._enabled: dict[str, None] = {}
+        self._connected: dict[str, None] = {}
+        self._version = 0
+        self._dirty: set[str] = set()
+        self._touched: set[str] = set()
+        # Last serialization per PN, refreshed for dirty / touched records.
+        self._serialized: dict[str, dict] = {}
+
+    def _index(self, rec: DongleRecord) -> None:
+        if rec.enabled:
+            self._enabled[rec.pn] = None
+        else:
+            self._enabled.pop(rec.pn, None)
+        if rec.status is DongleStatus.CONNECTED:
+            self._connected[rec.pn] = None
+        else:
+            self._connected.pop(rec.pn, None)
+
+    def _reindex(self) -> None:
+        self._enabled = {pn: None for pn, r in self._records.items() if r.enabled}
+        self._connected = {
+            pn: None for pn, r in self._records.items() if r.status is DongleStatus.CONNECTED
+        }
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener()`` on configuration changes; returns a remover."""
+        self._listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    def add_observer(self, observer: Callable[[int], None]) -> Callable[[int], None]:
+        """Call ``observer(version)`` whenever ``version`` moves; returns a remover."""
+        self._observers.append(observer)
+
+        def _remove() -> None:
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+        return _remove
+
+    def _changed(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def _bump(self, *pns: str) -> None:
+        self._version += 1
+        self._dirty.update(pns)
+        for observer in list(self._observers):
+            observer(self._version)
+
+    @property
+    def version(self) -> int:
+        """Increments on every change except a bare ``last_seen`` refresh."""
+        return self._version
+
+    @property
+    def dirty(self) -> bool:
+        """Whether anything changed since the last :meth:`to_dict`."""
+        return bool(self._dirty or self._touched)
 
     # -- lifecycle (driven by the manager) --------------------------------
     def record_seen(
@@ -99,19 +180,35 @@ class EybondRegistry:
                 pn=pn, first_seen=now, last_seen=now, status=status, peer=peer
             )
             self._records[pn] = rec
+            self._index(rec)
+            self._bump(pn)
             return rec
         rec.last_seen = now
-        rec.status = status
-        if peer:
+        changed = False
+        if rec.status is not status:
+            rec.status = status
+            self._index(rec)
+            changed = True
+        if peer and rec.peer != peer:
             rec.peer = peer
+            changed = True
+        if changed:
+            self._bump(pn)
+        else:
+            self._touched.add(pn)
         return rec
 
     def mark_disconnected(self, pn: str) -> DongleRecord | None:
         """Mark a known dongle as disconnected, refreshing ``last_seen``."""
         rec = self._records.get(pn)
         if rec is not None:
-            rec.status = DongleStatus.DISCONNECTED
             rec.last_seen = self._now()
+            if rec.status is DongleStatus.DISCONNECTED:
+                self._touched.add(pn)
+            else:
+                rec.status = DongleStatus.DISCONNECTED
+                self._connected.pop(pn, None)
+                self._bump(pn)
         return rec
 
     def reset_connection_state(self) -> None:
@@ -122,9 +219,17 @@ class EybondRegistry:
         stale. Configuration (enabled/protocol/devaddr/name) and timestamps
         are preserved.
         """
-        for rec in self._records.values():
+        stale = [
+            rec.pn for rec in self._records.values()
+            if rec.status is not DongleStatus.DISCONNECTED or rec.peer
+        ]
+        for pn in stale:
+            rec = self._records[pn]
             rec.status = DongleStatus.DISCONNECTED
             rec.peer = ""
+        self._connected.clear()
+        if stale:
+            self._bump(*stale)
 
     # -- configuration (driven by the options UI, later phases) -----------
     def _ensure(self, pn: str) -> DongleRecord:
@@ -132,34 +237,50 @@ class EybondRegistry:
         if rec is None:
             rec = DongleRecord(pn=pn)
             self._records[pn] = rec
+            self._bump(pn)
         return rec
 
-    def set_enabled(self, pn: str, enabled: bool) -> DongleRecord:
+    def _set(self, pn: str, field: str, value: object) -> DongleRecord:
         rec = self._ensure(pn)
-        rec.enabled = enabled
+        if getattr(rec, field) != value:
+            setattr(rec, field, value)
+            self._bump(pn)
         return rec
 
-    def set_protocol(self, pn: str, protocol: str | None) -> DongleRecord:
+    def set_enabled(self, pn: str, enabled: bool) -> DongleRecord:
         rec = self._ensure(pn)
-        rec.protocol = protocol
+        if rec.enabled != enabled:
+            rec.enabled = enabled
+            self._index(rec)
+            self._bump(pn)
+            self._changed()
         return rec
 
+    def set_protocol(self, pn: str, protocol: str | None) -> DongleRecord:
+        return self._set(pn, "protocol", protocol)
+
     def set_devaddr(self, pn: str, devaddr: int) -> DongleRecord:
-        rec = self._ensure(pn)
-        rec.devaddr = devaddr
-        return rec
+        return self._set(pn, "devaddr", devaddr)
 
     def set_name(self, pn: str, name: str) -> DongleRecord:
-        rec = self._ensure(pn)
-        rec.name = name
-        return rec
+        return self._set(pn, "name", name)
 
     def remove(self, pn: str) -> DongleRecord | None:
-        return self._records.pop(pn, None)
+        rec = self._records.pop(pn, None)
+        if rec is not None:
+            self._enabled.pop(pn, None)
+            self._connected.pop(pn, None)
+            self._touched.discard(pn)
+            self._bump(pn)
+            self._changed()
+        return rec
 
     def put(self, record: DongleRecord) -> DongleRecord:
         """Insert/replace a fully-formed record (used by migration)."""
         self._records[record.pn] = record
+        self._index(record)
+        self._bump(record.pn)
+        self._changed()
         return record
 
     # -- queries ----------------------------------------------------------
@@ -169,15 +290,20 @@ class EybondRegistry:
     def all(self) -> list[DongleRecord]:
         return list(self._records.values())
 
+    def enabled(self) -> list[DongleRecord]:
+        return [self._records[pn] for pn in self._enabled]
+
     def enabled_pns(self) -> list[str]:
-        return [r.pn for r in self._records.values() if r.enabled]
+        return list(self._enabled)
 
     def connected_pns(self) -> list[str]:
-        return [
-            r.pn
-            for r in self._records.values()
-            if r.status is DongleStatus.CONNECTED
-        ]
+        return list(self._connected)
+
+    def enabled_count(self) -> int:
+        return len(self._enabled)
+
+    def connected_count(self) -> int:
+        return len(self._connected)
 
     def __len__(self) -> int:
         return len(self._records)
@@ -187,10 +313,29 @@ class EybondRegistry:
 
     # -- serialization (for the config-entry store, Phase 3) --------------
     def to_dict(self) -> dict[str, dict]:
-        return {pn: rec.to_dict() for pn, rec in self._records.items()}
+        """Serialized records; clears the dirty / touched marks.
+
+        Unchanged records reuse their previous serialization (never
+        mutated afterwards, so earlier results stay valid).
+        """
+        for pn in self._dirty | self._touched:
+            rec = self._records.get(pn)
+            if rec is None:
+                self._serialized.pop(pn, None)
+            else:
+                self._serialized[pn] = rec.to_dict()
+        self._dirty.clear()
+        self._touched.clear()
+        return {pn: self._serialized[pn] for pn in self._records}
 
     def load(self, data: dict[str, dict] | None) -> None:
         """Replace the registry contents from a serialized mapping."""
         self._records = {
             pn: DongleRecord.from_dict(rec) for pn, rec in (data or {}).items()
         }
+        self._reindex()
+        self._serialized.clear()
+        self._touched.clear()
+        self._dirty.clear()
+        self._bump(*self._records)
+        self._changed()
@@ -13,11 +13,17 @@ us. We:
      so announcing at an already-connected one flaps it offline.
   3. Accept multiple dongle connections on one listener. Each session is
      kept alive with FC=1 heartbeats and identified by the ``PN`` carried
-     in the dongle's own heartbeat.
+     in the dongle's own heartbeat. A reconnect from an address a known
+     dongle last used is routed under that PN at once, before its
+     heartbeat confirms it — for reads only; writes wait for the PN.
   4. On each read, wrap the Voltronic ASCII command (``QPIGS\\r``,
      ``QPIRI\\r``, ...) inside an EyBond FC=4 (Forward2Device) frame,
      await the response keyed by TID, unwrap, and return the inner
-     Voltronic ASCII payload.
+     Voltronic ASCII payload. Up to ``?window=<n>`` requests per dongle
+     may be outstanding at once (one per devaddr); see
+     :class:`_InflightWindow`. The coordinator's command queue gives each
+     EyBond device its own lane, so reads of several devaddrs (or PNs)
+     behind one listener actually reach the window concurrently.
 
 The wire format INSIDE FC=4 is byte-for-byte the same as ``tcp://`` and
 serial transports — the dispatcher feeds the unwrapped response straight
@@ -34,19 +40,22 @@ from __future__ import annotations
 import asyncio
 import ipaddress
 import logging
-import os
-import re
 import socket
 import struct
-import subprocess
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from urllib.parse import parse_qs, urlparse
 
+from ... import metrics as _metrics
+from ... import stalls as _stalls
 from ...const import PROTOCOL_PI18
 from ..crc import build_pi30_frame
 from ..decoders.pi18 import build_request_frame
+from . import netif as _netif
 from .eybond_discovery import EybondRegistry
+from .transport_log import hexdump, tally
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +66,10 @@ _LOGGER = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 HEADER_SIZE = 8
 WIRE_LEN_OFFSET = 6
+_HEADER = struct.Struct(">HHHBB")
+# Initial per-session receive buffer; heartbeats and PI30/PI18 replies
+# fit many times over. Grows (once) for a larger frame.
+RECV_BUFFER_SIZE = 2048
 FC_HEARTBEAT = 1
 FC_FORWARD2DEVICE = 4
 
@@ -70,10 +83,6 @@ DEFAULT_BROADCAST = "255.255.255.255"
 DEFAULT_BIND_PORT = 8899
 
 ANNOUNCE_INTERVAL = 5.0
-# How often the announcer re-evaluates whether to keep broadcasting. Kept
-# short (vs the 5s send cadence) so it catches the brief window where all
-# expected dongles are connected and pauses before knocking them offline.
-ANNOUNCE_CHECK_INTERVAL = 1.0
 # Duration of a user-triggered "scan for new dongles" — the announcer
 # broadcasts regardless of connection state for this window so brand-new
 # dongles receive ``set>server`` and attach. Briefly flaps connected dongles
@@ -88,6 +97,12 @@ REDISCOVERY_WINDOW = 60.0
 # with 3s heartbeats too, so the fast cadence bought nothing but 20x the
 # traffic. The heartbeat frame is byte-identical to the reference's.
 HEARTBEAT_INTERVAL = 60.0
+# Heartbeats for all sessions on a listener come from one timer wheel of
+# HEARTBEAT_SLOTS buckets, the hand moving one bucket per
+# HEARTBEAT_INTERVAL / HEARTBEAT_SLOTS seconds: one task and a 1 s timer per
+# listener instead of a task and a 60 s timer per dongle, and a hub of
+# hundreds of dongles spreads its heartbeats over the interval.
+HEARTBEAT_SLOTS = 60
 # Cap on how long an FC=4 forward waits for the inverter's reply, regardless of
 # the (larger) per-command timeout the coordinator passes. Matches the
 # reference's 5s request timeout: a connected dongle answers in well under a
@@ -101,6 +116,16 @@ DEFAULT_TIMEOUT = 5.0
 # coordinator simply retries next cycle, and a connected dongle answers
 # immediately. (Was 30s — that made one absent dongle freeze the whole hub.)
 SESSION_WAIT_TIMEOUT = 3.0
+# Outstanding FC=4 requests per dongle session. Replies are matched by TID,
+# so a dongle fronting several RS485 devaddrs (or a firmware that queues
+# internally) can take more than one at a time; the device URI opts in with
+# ``?window=<n>``. Requests to the same devaddr are always one at a time.
+DEFAULT_WINDOW = 1
+MAX_WINDOW = 16
+# The window halves when the dongle can't cope (a reply timeout, or an FC=4
+# reply to a TID nobody is waiting for) and grows back by one slot after
+# this many on-time replies in a row.
+WINDOW_GROW_AFTER = 20
 
 # After a bind failure, suppress further bind attempts for this many
 # seconds to keep the log from drowning in retries on every coordinator
@@ -131,16 +156,11 @@ class _EyHeader:
 def _encode_header(
     tid: int, devcode: int, total_len: int, devaddr: int, fcode: int
 ) -> bytes:
-    return struct.pack(
-        ">HHHBB", tid, devcode, total_len - WIRE_LEN_OFFSET, devaddr, fcode
-    )
+    return _HEADER.pack(tid, devcode, total_len - WIRE_LEN_OFFSET, devaddr, fcode)
 
 
 def _decode_header(data: bytes) -> _EyHeader:
-    tid, devcode, wire_len, devaddr, fcode = struct.unpack(
-        ">HHHBB", data[:HEADER_SIZE]
-    )
-    return _EyHeader(tid, devcode, wire_len, devaddr, fcode)
+    return _EyHeader(*_HEADER.unpack_from(data))
 
 
 def _build_heartbeat(tid: int, interval: int) -> bytes:
@@ -173,7 +193,7 @@ def parse_eybond_uri(device: str) -> tuple[str, int, int, str, str | None]:
 
     ``announce`` is the IP to embed in the ``set>server=<ip>:<port>;``
     UDP payload so the dongle knows where to TCP-connect. It defaults to
-    auto-detect via :func:`_detect_local_ip`; explicit override is needed
+    auto-detect via :func:`.netif.detect_local_ip`; explicit override is needed
     in Docker bridge networking where auto-detect returns the container's
     internal address.
     """
@@ -204,20 +224,44 @@ def _parse_pn_from_uri(device: str) -> str | None:
     return pn or None
 
 
-def _detect_local_ip() -> str:
-    """Best-effort local IP discovery for the announce payload."""
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+def _parse_window_from_uri(device: str) -> int | None:
+    """Extract ``?window=<n>`` (clamped to 1..MAX_WINDOW), if present."""
+    query = parse_qs(urlparse(device).query or "")
+    raw = (query.get("window") or [""])[0].strip()
     try:
-        s.connect(("8.8.8.8", 80))
-        return s.getsockname()[0]
-    except OSError:
-        return "127.0.0.1"
-    finally:
-        s.close()
+        return max(1, min(int(raw), MAX_WINDOW)) if raw else None
+    except ValueError:
+        return None
+
 
+@dataclass(frozen=True)
+class EybondEndpoint:
+    """A parsed ``eybond*://`` device URI, so long-lived adapters parse it once."""
 
-def _resolve_broadcast_for_announce_ip(announce_ip: str) -> str:
-    """Best-effort broadcast resolution by matching announce_ip to local subnets."""
+    uri: str
+    bind_host: str
+    bind_port: int
+    devaddr: int
+    broadcast: str
+    announce_ip: str | None
+    pn: str | None
+    window: int | None
+
+
+def eybond_endpoint(device: str) -> EybondEndpoint:
+    """Parse ``device`` with :func:`parse_eybond_uri` plus its ``pn`` / ``window``."""
+    return EybondEndpoint(
+        device,
+        *parse_eybond_uri(device),
+        pn=_parse_pn_from_uri(device),
+        window=_parse_window_from_uri(device),
+    )
+
+
+def _resolve_broadcast_for_announce_ip(
+    announce_ip: str, interfaces: tuple[ipaddress.IPv4Interface, ...] = ()
+) -> str:
+    """Broadcast of the local subnet (from :mod:`.netif`) holding announce_ip."""
     try:
         target = ipaddress.IPv4Address(announce_ip.strip())
     except ValueError:
@@ -226,42 +270,9 @@ def _resolve_broadcast_for_announce_ip(announce_ip: str) -> str:
     if target.is_loopback:
         return DEFAULT_BROADCAST
 
-    # Windows: parse ipconfig
-    if os.name == "nt":
-        try:
-            # shell=True handles Windows command lookup; cp866/utf-8 covers most locales
-            raw = subprocess.check_output("ipconfig", shell=True).decode("cp866", errors="ignore")
-            current_ip = None
-            for line in raw.splitlines():
-                if "IPv4" in line:
-                    m = re.search(r":\s*([\d\.]+)", line)
-                    if m:
-                        current_ip = m.group(1)
-                elif "Subnet Mask" in line or "Маска подсети" in line:
-                    m = re.search(r":\s*([\d\.]+)", line)
-                    if m and current_ip:
-                        try:
-                            net = ipaddress.IPv4Network(f"{current_ip}/{m.group(1)}", strict=False)
-                            if target in net:
-                                return str(net.broadcast_address)
-                        except ValueError:
-                            pass
-                    current_ip = None
-        except Exception:
-            pass
-    # Linux: parse ip addr
-    else:
-        try:
-            raw = subprocess.check_output(["ip", "-4", "addr", "show"]).decode("utf-8", errors="ignore")
-            for m in re.finditer(r"inet\s+([\d\.]+)/(\d+)", raw):
-                try:
-                    net = ipaddress.IPv4Network(f"{m.group(1)}/{m.group(2)}", strict=False)
-                    if target in net:
-                        return str(net.broadcast_address)
-                except ValueError:
-                    pass
-        except Exception:
-            pass
+    resolved = _netif.broadcast_for(announce_ip, interfaces)
+    if resolved:
+        return resolved
 
     # Heuristic fallback: if no matching subnet found (common in Docker without host networking),
     # assume a standard /24 network and use .255. This is much more likely to work
@@ -284,20 +295,235 @@ def _resolve_broadcast_for_announce_ip(announce_ip: str) -> str:
 # ---------------------------------------------------------------------------
 # Session — one connected dongle
 # ---------------------------------------------------------------------------
+def _detached(payload: bytes | memoryview) -> bytes:
+    """``payload`` as bytes that outlive the receive buffer (``bytes`` as is)."""
+    return payload.tobytes() if isinstance(payload, memoryview) else payload
+
+
+def _owner(sess: _Session) -> str:
+    """Frame-tally owner of session traffic; matches ``endpoint_key`` of a
+    ``?pn=`` URI so the entry polling the dongle reports it."""
+    return f"eybond:{sess.pn}" if sess.pn else ""
+
+
+class _ProtocolWriter:
+    """The ``StreamWriter`` subset sessions use, over a protocol's transport."""
+
+    __slots__ = ("_transport", "_protocol")
+
+    def __init__(self, transport: asyncio.Transport, protocol: _DongleProtocol) -> None:
+        self._transport = transport
+        self._protocol = protocol
+
+    def get_extra_info(self, name: str, default=None):
+        return self._transport.get_extra_info(name, default)
+
+    def write(self, data: bytes) -> None:
+        self._transport.write(data)
+
+    async def drain(self) -> None:
+        if self._transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        await self._protocol.drain()
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _DongleProtocol(asyncio.BufferedProtocol):
+    """One dongle's TCP connection, read into a single reusable buffer.
+
+    The event loop ``recv_into``s straight into the free tail of
+    ``_buf``; complete frames are parsed in place (``unpack_from``) and
+    handed to :meth:`EybondManager._on_frame` as ``memoryview`` slices —
+    nothing is copied unless a waiter keeps the payload. A partial frame
+    stays put and is moved to the front only when the tail runs out.
+    """
+
+    def __init__(self, manager: EybondManager) -> None:
+        self._manager = manager
+        self._buf = bytearray(RECV_BUFFER_SIZE)
+        self._view = memoryview(self._buf)
+        self._start = 0  # first unparsed byte
+        self._end = 0  # end of received data
+        self._transport: asyncio.Transport | None = None
+        self._sess: _Session | None = None
+        self._paused = False
+        self._drain_waiters: list[asyncio.Future] = []
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+        self._sess = self._manager._session_opened(None, _ProtocolWriter(transport, self))
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self._end == len(self._buf):
+            # Reclaim consumed bytes first; grow only when unparsed data fills it.
+            self._make_room(len(self._buf) + 1 if not self._start else 0)
+        return self._view[self._end:]
+
+    def _make_room(self, frame_len: int) -> None:
+        """Move the partial frame to the front; grow if it can't fit."""
+        pending = self._end - self._start
+        if frame_len > len(self._buf):
+            buf = bytearray(max(frame_len, 2 * len(self._buf)))
+            buf[:pending] = self._view[self._start:self._end]
+            self._view.release()
+            self._buf, self._view = buf, memoryview(buf)
+        elif self._start:
+            self._buf[:pending] = self._buf[self._start:self._end]
+        self._start, self._end = 0, pending
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._end += nbytes
+        view, start, end = self._view, self._start, self._end
+        while end - start >= HEADER_SIZE:
+            tid, _, wire_len, devaddr, fcode = _HEADER.unpack_from(view, start)
+            total = wire_len + WIRE_LEN_OFFSET
+            if total < HEADER_SIZE:
+                _LOGGER.debug(
+                    "EyBond: malformed header from %s (wire_len=%d), closing",
+                    self._sess.peer if self._sess else "?", wire_len,
+                )
+                self._start = self._end = 0
+                if self._transport is not None:
+                    self._transport.close()
+                return
+            if end - start < total:
+                if total > len(self._buf) - start:
+                    self._start = start
+                    self._make_room(total)
+                    return
+                break
+            self._manager._on_frame(self._sess, tid, devaddr, fcode, view[start + HEADER_SIZE:start + total])
+            start += total
+        if start == end:
+            start = end = 0
+        self._start, self._end = start, end
+
+    def eof_received(self) -> bool:
+        return False  # close the transport (dongle clean close)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionResetError("Connection lost"))
+        self._drain_waiters.clear()
+        if self._sess is not None:
+            if exc is None:
+                _LOGGER.debug("EyBond: dongle %s DISCONNECTED (clean close)", self._sess.peer)
+            else:
+                _LOGGER.debug("EyBond: session %s error: %s", self._sess.peer, exc)
+            self._manager._session_closed(self._sess)
+            self._sess = None
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+
+    async def drain(self) -> None:
+        if self._paused:
+            waiter = asyncio.get_running_loop().create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
+
+
+class _InflightWindow:
+    """Cap on a session's outstanding FC=4 requests, sized AIMD-style.
+
+    ``limit`` starts at the configured ``size``, halves on :meth:`shrink`
+    and grows back one slot per ``WINDOW_GROW_AFTER`` :meth:`ok` calls.
+    Slots are granted in FIFO order.
+    """
+
+    __slots__ = ("size", "limit", "inflight", "_streak", "_waiters")
+
+    def __init__(self, size: int = DEFAULT_WINDOW) -> None:
+        self.size = self.limit = size
+        self.inflight = 0
+        self._streak = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            return
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # granted just as the caller was cancelled
+            raise
+
+    def release(self) -> None:
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.inflight += 1
+                fut.set_result(None)
+
+    def resize(self, size: int) -> None:
+        self.size = self.limit = size
+        self._streak = 0
+        self._wake()
+
+    def ok(self) -> None:
+        self._streak += 1
+        if self._streak >= WINDOW_GROW_AFTER and self.limit < self.size:
+            self.limit += 1
+            self._streak = 0
+            self._wake()
+
+    def shrink(self) -> bool:
+        """Halve the limit (not below 1); ``True`` if it changed."""
+        self._streak = 0
+        if self.limit <= 1:
+            return False
+        self.limit //= 2
+        return True
+
+
 @dataclass(eq=False)  # identity hash/eq so sessions are usable as set elements
 class _Session:
-    reader: asyncio.StreamReader
-    writer: asyncio.StreamWriter
+    # ``reader`` is only set for StreamReader-driven sessions
+    # (:meth:`EybondManager._handle_session`); listener sessions are
+    # read by :class:`_DongleProtocol`.
+    reader: asyncio.StreamReader | None
+    writer: asyncio.StreamWriter | _ProtocolWriter
     peer: str = ""
+    ip: str = ""
     pn: str = ""
+    # Set once the dongle's own heartbeat has named ``pn``; until then
+    # ``pn`` is a guess from the peer address (see ``_session_opened``).
+    confirmed: asyncio.Event = field(default_factory=asyncio.Event)
     _tid: int = 0
     pending: dict[int, asyncio.Future] = field(default_factory=dict)
-    send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    hb_task: asyncio.Task | None = None
+    window: _InflightWindow = field(default_factory=_InflightWindow)
+    # One outstanding request per RS485 devaddr keeps each inverter's
+    # commands in order; the window only overlaps different devaddrs.
+    devaddr_locks: dict[int, asyncio.Lock] = field(default_factory=dict)
+    # TIDs given up on, so their late replies aren't counted twice.
+    expired: deque[int] = field(default_factory=lambda: deque(maxlen=2 * MAX_WINDOW))
+    # Heartbeat wheel bucket (-1 once dropped).
+    slot: int = -1
 
     def next_tid(self) -> int:
-        self._tid = (self._tid + 1) & 0xFFFF
-        return self._tid
+        tid = (self._tid + 1) & 0xFFFF
+        while tid in self.pending:  # 64k wrap with a request still out
+            tid = (tid + 1) & 0xFFFF
+        self._tid = tid
+        return tid
 
 
 # ---------------------------------------------------------------------------
@@ -315,8 +541,11 @@ class EybondManager:
         self.bind_host = bind_host
         self.bind_port = bind_port
         self.broadcast = broadcast
+        # Default broadcast: resolved from the host's subnets, and again
+        # whenever the host's addresses change.
+        self._auto_broadcast = broadcast == DEFAULT_BROADCAST
         # Explicit override for the IP advertised in the UDP payload.
-        # ``None`` falls back to :func:`_detect_local_ip`.
+        # ``None`` falls back to :func:`.netif.detect_local_ip`.
         self.announce_ip = announce_ip
         # Discovery registry: lifecycle + per-device config keyed by PN.
         # Owned by the hub; survives session churn (Phase 2).
@@ -334,6 +563,24 @@ class EybondManager:
         self._any_ready = asyncio.Event()
         # Monotonic deadline for a forced-rediscovery window (0 = inactive).
         self._force_announce_until: float = 0.0
+        # Announce gate, kept incrementally: enabled PNs and those of them
+        # without a live session. The announcer sleeps on ``_announce_wake``
+        # (set on identify / drop / registry change / forced scan) and only
+        # runs a timer while it is actually broadcasting.
+        self._expected: set[str] = set()
+        self._missing: set[str] = set()
+        self._announce_wake = asyncio.Event()
+        # Peer IP -> PN of the dongle last identified from it ("" once two
+        # PNs were seen from one address, e.g. behind NAT: never guessed).
+        self._pn_by_ip: dict[str, str] = {}
+        self._unlisten = self.registry.add_listener(self._on_registry_change)
+        self._on_registry_change()
+        # Version observers that follow the registry across adopt_registry:
+        # observer -> remover on the registry it is attached to.
+        self._registry_observers: dict[Callable[[int], None], Callable[[], None]] = {}
+        self._wheel: list[set[_Session]] = [set() for _ in range(HEARTBEAT_SLOTS)]
+        self._wheel_hand = 0
+        self._wheel_task: asyncio.Task | None = None
         self._start_lock = asyncio.Lock()
         # Sticky bind-failure state — keeps the log clean instead of
         # retrying every coordinator tick when port 8899 is held by
@@ -384,14 +631,77 @@ class EybondManager:
             )
         return None
 
-    def _drop_session(self, sess: _Session, reason: str) -> None:
-        """Idempotently remove a session from all maps and fail its pending."""
-        self._sessions.discard(sess)
+    def adopt_registry(self, registry: EybondRegistry) -> None:
+        """Switch to ``registry`` (the hub's persisted one), moving the
+        change listener and the registry observers over and recomputing
+        the announce gate from it. Observers are called once with the new
+        registry's version, since everything they show may have changed."""
+        if registry is self.registry:
+            return
+        self._unlisten()
+        self.registry = registry
+        self._unlisten = registry.add_listener(self._on_registry_change)
+        self._on_registry_change()
+        for observer, remove in list(self._registry_observers.items()):
+            remove()
+            self._registry_observers[observer] = registry.add_observer(observer)
+        for observer in list(self._registry_observers):
+            observer(registry.version)
+
+    def add_registry_observer(self, observer: Callable[[int], None]) -> Callable[[], None]:
+        """``registry.add_observer`` that survives :meth:`adopt_registry`;
+        returns a remover."""
+        self._registry_observers[observer] = self.registry.add_observer(observer)
+
+        def _remove() -> None:
+            remove = self._registry_observers.pop(observer, None)
+            if remove is not None:
+                remove()
+
+        return _remove
+
+    def _on_registry_change(self) -> None:
+        self._expected = set(self.registry.enabled_pns())
+        self._missing = self._expected.difference(self._sessions_by_pn)
+        self._announce_wake.set()
+
+    def _identified(self, pn: str, sess: _Session) -> None:
+        self._sessions_by_pn[pn] = sess
+        self._missing.discard(pn)
+        self._announce_wake.set()
+
+    def _unclaim(self, sess: _Session) -> None:
+        """Release ``sess.pn`` if this session holds it."""
         if sess.pn and self._sessions_by_pn.get(sess.pn) is sess:
             del self._sessions_by_pn[sess.pn]
             ev = self._ready_by_pn.get(sess.pn)
             if ev is not None:
                 ev.clear()
+            if sess.pn in self._expected:
+                self._missing.add(sess.pn)
+            self._announce_wake.set()
+
+    def _learn_affinity(self, ip: str, pn: str) -> None:
+        if not ip:
+            return
+        known = self._pn_by_ip.get(ip)
+        if known is None:
+            self._pn_by_ip[ip] = pn
+        elif known != pn:
+            self._pn_by_ip[ip] = ""
+
+    def _drop_session(self, sess: _Session, reason: str) -> None:
+        """Idempotently remove a session from all maps and fail its pending."""
+        self._sessions.discard(sess)
+        if sess.slot >= 0:
+            self._wheel[sess.slot].discard(sess)
+            sess.slot = -1
+        self._unclaim(sess)
+        if not sess.confirmed.is_set():
+            # Never confirmed: the PN was only a guess. Release replies
+            # waiting on the heartbeat (they are discarded).
+            sess.pn = ""
+            sess.confirmed.set()
         for fut in list(sess.pending.values()):
             if not fut.done():
                 fut.set_exception(ConnectionError(reason))
@@ -420,8 +730,8 @@ class EybondManager:
                     self.bind_host, self.bind_port,
                 )
                 try:
-                    self._server = await asyncio.start_server(
-                        self._handle_session,
+                    self._server = await loop.create_server(
+                        lambda: _DongleProtocol(self),
                         self.bind_host,
                         self.bind_port,
                         reuse_address=True,
@@ -458,13 +768,14 @@ class EybondManager:
             except asyncio.CancelledError:
                 pass
         self._announce_task = None
+        if self._wheel_task and not self._wheel_task.done():
+            self._wheel_task.cancel()
+            try:
+                await self._wheel_task
+            except asyncio.CancelledError:
+                pass
+        self._wheel_task = None
         for sess in list(self._sessions):
-            if sess.hb_task and not sess.hb_task.done():
-                sess.hb_task.cancel()
-                try:
-                    await sess.hb_task
-                except asyncio.CancelledError:
-                    pass
             n_pending = len(sess.pending)
             self._drop_session(sess, "manager shutting down")
             try:
@@ -476,8 +787,10 @@ class EybondManager:
                     "EyBond: cancelled %d in-flight request(s) on %s shutdown",
                     n_pending, sess.peer,
                 )
+        self._unlisten()
         self._sessions.clear()
         self._sessions_by_pn.clear()
+        self._missing = set(self._expected)
         self._ready_by_pn.clear()
         self._any_ready.clear()
         if self._server:
@@ -509,29 +822,33 @@ class EybondManager:
           dongle is connected.
 
         A forced-rediscovery window overrides the gate.
+
+        O(1): the missing set is maintained on identify / drop / registry
+        change rather than rebuilt here.
         """
         if self._force_announce_until:
             if asyncio.get_running_loop().time() < self._force_announce_until:
                 return True
             self._force_announce_until = 0.0  # window elapsed
 
-        connected = set(self._sessions_by_pn)
-        expected = set(self.registry.enabled_pns())
-        if expected:
-            return bool(expected - connected)
-        return not connected
+        if self._expected:
+            return bool(self._missing)
+        return not self._sessions_by_pn
 
     def force_rediscovery(self, duration: float = REDISCOVERY_WINDOW) -> None:
         """Broadcast ``set>server`` for ``duration`` seconds regardless of
         connection state, so brand-new dongles can be discovered on demand."""
         loop = asyncio.get_running_loop()
         self._force_announce_until = loop.time() + duration
+        self._announce_wake.set()
         _LOGGER.info(
             "EyBond: forced rediscovery for %.0fs on %s:%d",
             duration, self.bind_host, self.bind_port,
         )
 
-    async def _announce_loop(self) -> None:
+    def _announce_target(self, net: _netif.NetSnapshot) -> tuple[str, bytes]:
+        """(announce IP, ``set>server`` payload); resolves ``self.broadcast``
+        from ``net`` when it was left at the default."""
         if self.announce_ip:
             announce_ip = self.announce_ip
             _LOGGER.debug(
@@ -540,7 +857,7 @@ class EybondManager:
         else:
             announce_ip = self.bind_host
             if announce_ip in ("0.0.0.0", "", None):
-                announce_ip = _detect_local_ip()
+                announce_ip = net.local_ip
                 _LOGGER.debug(
                     "EyBond: auto-detected announce IP %s — set "
                     "eybond_announce_ip explicitly if this is wrong (e.g. "
@@ -548,16 +865,22 @@ class EybondManager:
                     announce_ip,
                 )
 
-        if self.broadcast == "255.255.255.255" or self.broadcast == DEFAULT_BROADCAST:
-            resolved = _resolve_broadcast_for_announce_ip(announce_ip)
-            if resolved and resolved != "255.255.255.255":
+        if self._auto_broadcast:
+            resolved = _resolve_broadcast_for_announce_ip(announce_ip, net.interfaces)
+            if resolved and resolved != self.broadcast:
                 _LOGGER.info(
                     "EyBond: broadcast resolved: announce=%s broadcast=%s",
                     announce_ip, resolved,
                 )
                 self.broadcast = resolved
+        return announce_ip, f"set>server={announce_ip}:{self.bind_port};".encode("ascii")
 
-        payload = f"set>server={announce_ip}:{self.bind_port};".encode("ascii")
+    async def _announce_loop(self) -> None:
+        # Addresses are read off-loop and shared by every manager; a
+        # host address change (DHCP, Wi-Fi reconnect) re-resolves the
+        # auto-detected announce IP and broadcast on the next send.
+        net = await _netif.discovery.snapshot()
+        _, payload = self._announce_target(net)
         _LOGGER.info(
             "EyBond: UDP announcer START -> %s:%d every %.1fs, payload=%r",
             self.broadcast, UDP_PORT, ANNOUNCE_INTERVAL, payload.decode(),
@@ -566,42 +889,66 @@ class EybondManager:
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         sock.setblocking(False)
         loop = asyncio.get_running_loop()
-        # Evaluate the pause condition frequently (so we catch the brief window
-        # where all dongles are simultaneously connected and stop knocking them
-        # offline) but rate-limit the actual broadcast to ANNOUNCE_INTERVAL.
-        last_send = 0.0
+        # Event-driven: the gate is re-evaluated whenever a dongle is
+        # identified or drops, the registry changes or a scan is forced
+        # (``_announce_wake``) — a drop triggers the next broadcast at
+        # once, and all dongles connecting stops it before the next one.
+        # A timer only runs while broadcasting, to pace sends at
+        # ANNOUNCE_INTERVAL; a paused announcer has no wake-ups at all.
+        last_send = -ANNOUNCE_INTERVAL
         was_paused = False
         try:
             while True:
-                if self._should_announce():
-                    if was_paused:
+                self._announce_wake.clear()
+                if not self._should_announce():
+                    if not was_paused:
+                        # Don't keep knocking connected dongles offline.
+                        was_paused = True
                         _LOGGER.debug(
-                            "EyBond: announce RESUMED — expected dongle missing"
+                            "EyBond: announce PAUSED — expected dongle(s) connected "
+                            "(%s); will resume if one drops",
+                            self.identified_pns,
                         )
-                    was_paused = False
-                    now = loop.time()
-                    if now - last_send >= ANNOUNCE_INTERVAL:
-                        last_send = now
-                        try:
-                            sock.sendto(payload, (self.broadcast, UDP_PORT))
-                            _LOGGER.debug(
-                                "EyBond: UDP -> %s:%d %r",
-                                self.broadcast, UDP_PORT, payload.decode(),
-                            )
-                        except OSError as err:
-                            _LOGGER.warning(
-                                "EyBond: UDP send failed (target %s:%d): %s",
-                                self.broadcast, UDP_PORT, err,
-                            )
-                elif not was_paused:
-                    # Don't keep knocking connected dongles offline.
-                    was_paused = True
+                    await self._announce_wake.wait()
+                    continue
+                if was_paused:
                     _LOGGER.debug(
-                        "EyBond: announce PAUSED — expected dongle(s) connected "
-                        "(%s); will resume if one drops",
-                        self.identified_pns,
+                        "EyBond: announce RESUMED — expected dongle missing"
                     )
-                await asyncio.sleep(ANNOUNCE_CHECK_INTERVAL)
+                was_paused = False
+                now = loop.time()
+                if now - last_send >= ANNOUNCE_INTERVAL:
+                    last_send = now
+                    latest = await _netif.discovery.snapshot()
+                    if latest != net:
+                        net = latest
+                        _, changed = self._announce_target(net)
+                        if changed != payload:
+                            _LOGGER.info(
+                                "EyBond: host address changed, payload now %r",
+                                changed.decode(),
+                            )
+                            payload = changed
+                    try:
+                        sock.sendto(payload, (self.broadcast, UDP_PORT))
+                        _LOGGER.debug(
+                            "EyBond: UDP -> %s:%d %r",
+                            self.broadcast, UDP_PORT, payload.decode(),
+                        )
+                    except OSError as err:
+                        _LOGGER.warning(
+                            "EyBond: UDP send failed (target %s:%d): %s",
+                            self.broadcast, UDP_PORT, err,
+                        )
+                    now = loop.time()
+                delay = last_send + ANNOUNCE_INTERVAL - now
+                if self._force_announce_until:
+                    delay = min(delay, self._force_announce_until - now)
+                try:
+                    async with asyncio.timeout(max(delay, 0)):
+                        await self._announce_wake.wait()
+                except TimeoutError:
+                    pass
         except asyncio.CancelledError:
             _LOGGER.info("EyBond: UDP announcer STOP")
             raise
@@ -618,146 +965,207 @@ class EybondManager:
             except asyncio.CancelledError:
                 pass
 
-    async def _handle_session(
-        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
-    ) -> None:
+    def _session_opened(
+        self, reader: asyncio.StreamReader | None, writer: asyncio.StreamWriter | _ProtocolWriter
+    ) -> _Session:
         peer = writer.get_extra_info("peername")
         peer_str = f"{peer[0]}:{peer[1]}" if peer else "unknown"
         _LOGGER.debug("EyBond: dongle CONNECTED from %s", peer_str)
 
         # Multi-session: a new connection NEVER evicts an existing one.
         # It joins as unidentified until its heartbeat reveals a PN.
-        sess = _Session(reader=reader, writer=writer, peer=peer_str)
+        sess = _Session(reader=reader, writer=writer, peer=peer_str, ip=peer[0] if peer else "")
         self._sessions.add(sess)
         self._any_ready.set()
 
-        sess.hb_task = asyncio.create_task(self._heartbeat_loop(sess))
-
+        # These dongles clean-close every few seconds and come straight
+        # back from the same address. Route to the new connection under
+        # its last PN now instead of leaving polls waiting for the
+        # heartbeat; replies are only handed out once it confirms the PN.
+        pn = self._pn_by_ip.get(sess.ip)
+        if pn and pn not in self._sessions_by_pn:
+            sess.pn = pn
+            self._identified(pn, sess)
+            self._ready_event_for(pn).set()
+            _LOGGER.debug("EyBond: %s routed as PN=%s pending its heartbeat", peer_str, pn)
+
+        # Our first heartbeat goes out right away; the dongle answers with
+        # its own, which carries the PN. The next one comes from the wheel,
+        # a full interval later.
+        frame = _build_heartbeat(sess.next_tid(), int(HEARTBEAT_INTERVAL))
+        writer.write(frame)
+        tally("eybond", "tx heartbeat", len(frame), _owner(sess))
+        sess.slot = self._wheel_hand
+        self._wheel[sess.slot].add(sess)
+        if self._wheel_task is None or self._wheel_task.done():
+            self._wheel_task = asyncio.create_task(self._heartbeat_wheel())
+        return sess
+
+    def _session_closed(self, sess: _Session) -> None:
+        # Disconnecting one dongle must not affect the others. Drop only
+        # this session; the announcer keeps running for re-attach.
+        self._drop_session(sess, "dongle disconnected")
+        # Mark the dongle disconnected in discovery — unless its PN was
+        # already claimed by a same-PN reconnect (still mapped → live).
+        if sess.pn and sess.pn not in self._sessions_by_pn:
+            self.registry.mark_disconnected(sess.pn)
         try:
-            while True:
-                head = await reader.readexactly(HEADER_SIZE)
-                h = _decode_header(head)
-                payload = b""
-                if h.payload_len > 0:
-                    payload = await reader.readexactly(h.payload_len)
+            sess.writer.close()
+        except Exception:
+            pass
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "EyBond: session %s removed (%d session(s) remain: %s)",
+                sess.peer, len(self._sessions), self.identified_pns,
+            )
 
+    @_stalls.timed("data_received", lambda self, sess, *_: f"EyBond {sess.pn or sess.peer}")
+    def _on_frame(
+        self, sess: _Session, tid: int, devaddr: int, fcode: int, payload: bytes | memoryview
+    ) -> None:
+        """Dispatch one complete frame. A ``memoryview`` payload is only
+        valid during the call (it views the receive buffer): whatever
+        outlives it goes through :func:`_detached`."""
+        # Per-frame lines are replaced by the coordinator's per-cycle
+        # summary (transport_log); only anomalies are logged below.
+        if fcode == FC_HEARTBEAT:
+            tally("eybond", "rx heartbeat", HEADER_SIZE + len(payload), _owner(sess))
+            if sess.confirmed.is_set():
+                # Refresh last_seen so discovery liveness stays current.
+                self.registry.record_seen(sess.pn, sess.peer)
+                return
+            pn = bytes(payload[:14]).decode("ascii", errors="replace").strip("\x00")
+            if not pn:
+                return
+            if sess.pn and sess.pn != pn:
+                # Address affinity guessed wrong (the address moved to
+                # another dongle); release the PN it was routed under.
+                _LOGGER.debug(
+                    "EyBond: %s is PN=%s, not PN=%s as routed", sess.peer, pn, sess.pn
+                )
+                self._unclaim(sess)
+            sess.pn = pn
+            # Same physical dongle reconnecting? Evict the stale
+            # session bound to this PN before claiming it.
+            old = self._sessions_by_pn.get(pn)
+            if old is not None and old is not sess:
                 _LOGGER.debug(
-                    "EyBond RX [%s] tid=%d fc=%d devaddr=%d len=%d payload=%s",
-                    peer_str, h.tid, h.fcode, h.devaddr, h.payload_len, payload.hex(),
+                    "EyBond: PN=%s reconnected from %s, replacing "
+                    "stale session %s",
+                    pn, sess.peer, old.peer,
+                )
+                try:
+                    old.writer.close()
+                except Exception:
+                    pass
+                self._drop_session(old, "replaced by reconnect with same PN")
+            self._identified(pn, sess)
+            sess.confirmed.set()
+            self._ready_event_for(pn).set()
+            self.registry.record_seen(pn, sess.peer)
+            self._learn_affinity(sess.ip, pn)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "EyBond: dongle identified, PN=%s peer=%s "
+                    "(now %d session(s): %s)",
+                    pn, sess.peer, len(self._sessions), self.identified_pns,
+                )
+        elif fcode == FC_FORWARD2DEVICE:
+            tally("eybond", "rx forward", HEADER_SIZE + len(payload), _owner(sess))
+            fut = sess.pending.pop(tid, None)
+            if fut and not fut.done():
+                fut.set_result(_detached(payload))
+                return
+            # A late reply was already counted by its timeout; any other
+            # reply nobody waits for means the dongle mixed up or dropped
+            # requests — back off.
+            if tid not in sess.expired and sess.window.shrink():
+                _LOGGER.debug(
+                    "EyBond: %s window shrunk to %d (unexpected reply tid=%d)",
+                    sess.pn or sess.peer, sess.window.limit, tid,
+                )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "EyBond: unsolicited FC=4 tid=%d devaddr=%d (%d bytes) "
+                    "payload=%s",
+                    tid, devaddr, len(payload), hexdump(_detached(payload)),
+                )
+        else:
+            tally("eybond", "rx other", HEADER_SIZE + len(payload), _owner(sess))
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "EyBond: unhandled FC=%d tid=%d payload=%s",
+                    fcode, tid, hexdump(_detached(payload)),
                 )
 
-                if h.fcode == FC_HEARTBEAT:
-                    pn = payload[:14].decode("ascii", errors="replace").strip("\x00")
-                    if pn and not sess.pn:
-                        sess.pn = pn
-                        # Same physical dongle reconnecting? Evict the stale
-                        # session bound to this PN before claiming it.
-                        old = self._sessions_by_pn.get(pn)
-                        if old is not None and old is not sess:
-                            _LOGGER.debug(
-                                "EyBond: PN=%s reconnected from %s, replacing "
-                                "stale session %s",
-                                pn, peer_str, old.peer,
-                            )
-                            try:
-                                old.writer.close()
-                            except Exception:
-                                pass
-                            self._drop_session(
-                                old, "replaced by reconnect with same PN"
-                            )
-                        self._sessions_by_pn[pn] = sess
-                        self._ready_event_for(pn).set()
-                        self.registry.record_seen(pn, peer_str)
-                        _LOGGER.debug(
-                            "EyBond: dongle identified, PN=%s peer=%s "
-                            "(now %d session(s): %s)",
-                            pn, peer_str, len(self._sessions), self.identified_pns,
-                        )
-                    else:
-                        if sess.pn:
-                            # Refresh last_seen so discovery liveness stays current.
-                            self.registry.record_seen(sess.pn, peer_str)
-                        _LOGGER.debug(
-                            "EyBond: heartbeat ack from %s (PN=%s)", peer_str, sess.pn
-                        )
-                elif h.fcode == FC_FORWARD2DEVICE:
-                    fut = sess.pending.pop(h.tid, None)
-                    if fut and not fut.done():
-                        fut.set_result(payload)
-                    else:
-                        _LOGGER.debug(
-                            "EyBond: unsolicited FC=4 tid=%d devaddr=%d (%d bytes) "
-                            "payload=%s",
-                            h.tid, h.devaddr, len(payload), payload.hex(),
-                        )
-                else:
-                    _LOGGER.debug(
-                        "EyBond: unhandled FC=%d tid=%d payload=%s",
-                        h.fcode, h.tid, payload.hex(),
-                    )
+    async def _handle_session(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Run a session from a ``StreamReader`` / ``StreamWriter`` pair.
 
+        The listener uses :class:`_DongleProtocol`; this drives the same
+        session logic from streams (e.g. an ``asyncio.start_server``
+        callback, or in-memory streams under test).
+        """
+        sess = self._session_opened(reader, writer)
+        try:
+            while True:
+                h = _decode_header(await reader.readexactly(HEADER_SIZE))
+                payload = b""
+                if h.payload_len > 0:
+                    payload = await reader.readexactly(h.payload_len)
+                self._on_frame(sess, h.tid, h.devaddr, h.fcode, payload)
         except asyncio.IncompleteReadError:
-            _LOGGER.debug("EyBond: dongle %s DISCONNECTED (clean close)", peer_str)
+            _LOGGER.debug("EyBond: dongle %s DISCONNECTED (clean close)", sess.peer)
         except asyncio.CancelledError:
-            _LOGGER.info("EyBond: session %s cancelled", peer_str)
+            _LOGGER.info("EyBond: session %s cancelled", sess.peer)
             raise
         except Exception as err:  # noqa: BLE001
-            _LOGGER.exception("EyBond: session %s error: %s", peer_str, err)
+            _LOGGER.exception("EyBond: session %s error: %s", sess.peer, err)
         finally:
-            if sess.hb_task and not sess.hb_task.done():
-                sess.hb_task.cancel()
-                try:
-                    await sess.hb_task
-                except asyncio.CancelledError:
-                    pass
-            sess.hb_task = None
-            # Disconnecting one dongle must not affect the others. Drop only
-            # this session; the announcer keeps running for re-attach.
-            self._drop_session(sess, "dongle disconnected")
-            # Mark the dongle disconnected in discovery — unless its PN was
-            # already claimed by a same-PN reconnect (still mapped → live).
-            if sess.pn and sess.pn not in self._sessions_by_pn:
-                self.registry.mark_disconnected(sess.pn)
+            self._session_closed(sess)
+
+    async def _heartbeat_wheel(self) -> None:
+        """Send each session its heartbeat as the hand reaches its bucket;
+        ends when the listener has no sessions left."""
+        loop = asyncio.get_running_loop()
+        step = HEARTBEAT_INTERVAL / HEARTBEAT_SLOTS
+        deadline = loop.time()
+        while self._sessions:
+            deadline += step
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            self._wheel_hand = (self._wheel_hand + 1) % HEARTBEAT_SLOTS
+            due = self._wheel[self._wheel_hand]
+            if not due:
+                continue
             try:
-                writer.close()
-            except Exception:
+                # A peer that stopped reading mustn't hold up the wheel;
+                # its heartbeat is retried a turn later.
+                async with asyncio.timeout(step):
+                    await asyncio.gather(*(self._beat(sess) for sess in list(due)))
+            except TimeoutError:
                 pass
-            _LOGGER.debug(
-                "EyBond: session %s removed (%d session(s) remain: %s)",
-                peer_str, len(self._sessions), self.identified_pns,
-            )
 
-    async def _heartbeat_loop(self, sess: _Session) -> None:
+    async def _beat(self, sess: _Session) -> None:
+        frame = _build_heartbeat(sess.next_tid(), int(HEARTBEAT_INTERVAL))
         try:
-            while True:
-                tid = sess.next_tid()
-                frame = _build_heartbeat(tid, int(HEARTBEAT_INTERVAL))
-                try:
-                    sess.writer.write(frame)
-                    await sess.writer.drain()
-                    _LOGGER.debug(
-                        "EyBond TX [%s] HB tid=%d interval=%ds frame=%s",
-                        sess.peer, tid, int(HEARTBEAT_INTERVAL), frame.hex(),
-                    )
-                except (ConnectionError, OSError) as err:
-                    # A failed heartbeat write means the TCP connection is dead.
-                    # Close the writer so the session's read loop unblocks and
-                    # drops the session NOW — otherwise a half-open connection
-                    # lingers and its polls waste the full 30s response timeout
-                    # before failing (S3).
-                    _LOGGER.warning(
-                        "EyBond: heartbeat write to %s failed: %s — "
-                        "closing dead session", sess.peer, err,
-                    )
-                    try:
-                        sess.writer.close()
-                    except Exception:
-                        pass
-                    return
-                await asyncio.sleep(HEARTBEAT_INTERVAL)
-        except asyncio.CancelledError:
-            pass
+            sess.writer.write(frame)
+            await sess.writer.drain()
+            tally("eybond", "tx heartbeat", len(frame), _owner(sess))
+        except (ConnectionError, OSError) as err:
+            # A failed heartbeat write means the TCP connection is dead.
+            # Close the writer so the session's read loop unblocks and
+            # drops the session NOW — otherwise a half-open connection
+            # lingers and its polls waste the full 30s response timeout
+            # before failing (S3).
+            _LOGGER.warning(
+                "EyBond: heartbeat write to %s failed: %s — "
+                "closing dead session", sess.peer, err,
+            )
+            try:
+                sess.writer.close()
+            except Exception:
+                pass
 
     async def _wait_for_session(
         self, pn: str | None, timeout: float, context: str, devaddr: int
@@ -806,66 +1214,117 @@ class EybondManager:
         timeout: float,
         context: str = "",
         pn: str | None = None,
+        window: int | None = None,
+        write: bool = False,
     ) -> bytes | None:
         """Send a raw frame via FC=4, return the response as bytes.
 
         ``pn`` selects which connected dongle to target; ``None`` keeps the
         legacy single-dongle behaviour (route to the only/first session).
+        ``window`` sets how many requests that dongle may have outstanding
+        (``None`` leaves the session's current setting). A ``write`` frame
+        changes inverter state, so on a session routed by address affinity
+        it is held until the heartbeat confirms the PN — discarding the
+        reply afterwards would be too late.
         """
         await self.ensure_started()
 
         sess = await self._wait_for_session(pn, timeout, context, devaddr)
         if sess is None:
             return None
-
-        async with sess.send_lock:
-            tid = sess.next_tid()
-            frame = _build_forward2device(tid, v_frame, devaddr=devaddr)
-            loop = asyncio.get_running_loop()
-            fut: asyncio.Future[bytes] = loop.create_future()
-            sess.pending[tid] = fut
+        if write and pn and not await self._confirm_identity(sess, pn, timeout):
+            _LOGGER.debug(
+                "EyBond: not sending %s to %s: not PN=%s",
+                context or "frame", sess.peer, pn,
+            )
+            return None
+        if window is not None and window != sess.window.size:
+            sess.window.resize(window)
+
+        lock = sess.devaddr_locks.get(devaddr)
+        if lock is None:
+            lock = sess.devaddr_locks[devaddr] = asyncio.Lock()
+        async with lock:
+            await sess.window.acquire()
             try:
-                sess.writer.write(frame)
-                await sess.writer.drain()
-                _LOGGER.debug(
-                    "EyBond TX [%s] %s tid=%d devaddr=%d v_frame=%s wrapped=%s",
-                    sess.peer, context or "frame", tid, devaddr,
-                    v_frame.hex(), frame.hex(),
-                )
-            except (ConnectionError, OSError) as err:
-                sess.pending.pop(tid, None)
-                # Dongle closed mid-send (normal during clean-close cycling).
-                _LOGGER.debug(
-                    "EyBond: write %s devaddr=%d to %s failed: %s",
-                    context or "frame", devaddr, sess.peer, err,
-                )
-                return None
-            # Cap the reply wait — a connected dongle answers in well under a
-            # second, so a longer wait only stalls the cycle on a half-attentive
-            # dongle (matches the reference's 5s request timeout).
-            resp_timeout = min(timeout, FORWARD_RESPONSE_TIMEOUT)
+                raw = await self._exchange(sess, devaddr, v_frame, timeout, context)
+            finally:
+                sess.window.release()
+        if raw is None:
+            return None
+        if pn and not await self._confirm_identity(sess, pn, timeout):
+            _LOGGER.debug(
+                "EyBond: discarding %s reply from %s: not PN=%s",
+                context or "frame", sess.peer, pn,
+            )
+            return None
+
+        _metrics.observe(
+            "response_bytes", len(raw), _metrics.BYTE_BUCKETS, transport="eybond"
+        )
+        return raw
+
+    async def _confirm_identity(self, sess: _Session, pn: str, timeout: float) -> bool:
+        """Whether ``sess`` is dongle ``pn``, waiting for its heartbeat if
+        the session was routed by address affinity."""
+        if not sess.confirmed.is_set():
             try:
-                raw = await asyncio.wait_for(fut, timeout=resp_timeout)
+                await asyncio.wait_for(sess.confirmed.wait(), min(timeout, SESSION_WAIT_TIMEOUT))
             except TimeoutError:
-                sess.pending.pop(tid, None)
-                # No reply within the cap — usual when the dongle clean-closed
-                # mid-poll; it reconnects and the next cycle succeeds.
-                _LOGGER.debug(
-                    "EyBond: %s devaddr=%d tid=%d TIMEOUT after %.1fs",
-                    context or "frame", devaddr, tid, resp_timeout,
-                )
-                return None
-            except ConnectionError as err:
+                return False
+        return sess.pn == pn
+
+    async def _exchange(
+        self, sess: _Session, devaddr: int, v_frame: bytes, timeout: float, context: str
+    ) -> bytes | None:
+        """One FC=4 request/reply on ``sess``, holding a window slot."""
+        tid = sess.next_tid()
+        frame = _build_forward2device(tid, v_frame, devaddr=devaddr)
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[bytes] = loop.create_future()
+        sess.pending[tid] = fut
+        try:
+            sess.writer.write(frame)
+            await sess.writer.drain()
+            tally("eybond", "tx forward", len(frame))
+        except (ConnectionError, OSError) as err:
+            sess.pending.pop(tid, None)
+            # Dongle closed mid-send (normal during clean-close cycling).
+            _LOGGER.debug(
+                "EyBond: write %s devaddr=%d to %s failed: %s",
+                context or "frame", devaddr, sess.peer, err,
+            )
+            return None
+        # Cap the reply wait — a connected dongle answers in well under a
+        # second, so a longer wait only stalls the cycle on a half-attentive
+        # dongle (matches the reference's 5s request timeout). The clock
+        # starts once the frame is written, not while waiting for a slot.
+        resp_timeout = min(timeout, FORWARD_RESPONSE_TIMEOUT)
+        try:
+            raw = await asyncio.wait_for(fut, timeout=resp_timeout)
+        except TimeoutError:
+            sess.pending.pop(tid, None)
+            sess.expired.append(tid)
+            # No reply within the cap — usual when the dongle clean-closed
+            # mid-poll; it reconnects and the next cycle succeeds.
+            _LOGGER.debug(
+                "EyBond: %s devaddr=%d tid=%d TIMEOUT after %.1fs",
+                context or "frame", devaddr, tid, resp_timeout,
+            )
+            _metrics.inc("forward_timeouts", transport="eybond")
+            if sess.window.shrink():
                 _LOGGER.debug(
-                    "EyBond: %s devaddr=%d aborted (session lost): %s",
-                    context or "frame", devaddr, err,
+                    "EyBond: %s window shrunk to %d after timeout",
+                    sess.pn or sess.peer, sess.window.limit,
                 )
-                return None
-
-        _LOGGER.debug(
-            "EyBond RX-payload %s devaddr=%d (%d bytes raw)",
-            context or "frame", devaddr, len(raw),
-        )
+            return None
+        except ConnectionError as err:
+            _LOGGER.debug(
+                "EyBond: %s devaddr=%d aborted (session lost): %s",
+                context or "frame", devaddr, err,
+            )
+            return None
+        sess.window.ok()
         return raw
 
 
@@ -899,6 +1358,7 @@ async def _get_manager(
                     mgr.broadcast, broadcast,
                 )
                 mgr.broadcast = broadcast
+                mgr._auto_broadcast = False
 
             if mgr.announce_ip != announce_ip:
                 _LOGGER.info(
@@ -909,6 +1369,7 @@ async def _get_manager(
                 # If broadcast was also default, reset it to force re-resolution for the new IP
                 if broadcast == DEFAULT_BROADCAST:
                     mgr.broadcast = DEFAULT_BROADCAST
+                    mgr._auto_broadcast = True
 
                 # Restart announcer so the new IP takes effect immediately.
                 # The announcer runs continuously in the multi-session model.
@@ -935,7 +1396,7 @@ async def get_eybond_manager(
     """
     mgr = await _get_manager(bind_host, bind_port, broadcast, announce_ip)
     if registry is not None and mgr.registry is not registry and len(mgr.registry) == 0:
-        mgr.registry = registry
+        mgr.adopt_registry(registry)
     return mgr
 
 
@@ -951,30 +1412,28 @@ async def shutdown_eybond_manager(bind_host: str, bind_port: int) -> None:
 
 
 async def send_eybond_bytes(
-    device: str,
+    device: str | EybondEndpoint,
     v_frame: bytes,
     timeout: float = DEFAULT_TIMEOUT,
     context: str = "",
     pn: str | None = None,
+    write: bool = False,
 ) -> bytes | None:
-    """Parse the URI, get/create the manager, send the raw frame.
+    """Parse the URI (unless already parsed), get/create the manager, send
+    the raw frame.
 
     ``pn`` optionally targets a specific dongle on a shared listener; when
-    ``None`` the legacy single-dongle routing is used.
+    ``None`` the legacy single-dongle routing is used. ``write`` marks a
+    frame that changes device state (see :meth:`EybondManager.send_frame`).
     """
-    bind_host, bind_port, devaddr, broadcast, announce_ip = parse_eybond_uri(device)
+    ep = device if isinstance(device, EybondEndpoint) else eybond_endpoint(device)
+    bind_host, bind_port = ep.bind_host, ep.bind_port
     if pn is None:
         # Hub children carry their target dongle's PN in the URI query.
-        pn = _parse_pn_from_uri(device)
+        pn = ep.pn
 
-    _LOGGER.debug(
-        "EyBond: dispatch frame %s for device=%s "
-        "(bind=%s:%d devaddr=%d broadcast=%s announce=%s)",
-        context or v_frame.hex(), device, bind_host, bind_port, devaddr, broadcast,
-        announce_ip or "<auto>",
-    )
     try:
-        mgr = await _get_manager(bind_host, bind_port, broadcast, announce_ip)
+        mgr = await _get_manager(bind_host, bind_port, ep.broadcast, ep.announce_ip)
     except OSError as err:
         msg = str(err)
         if "backoff active" in msg:
@@ -985,26 +1444,30 @@ async def send_eybond_bytes(
                 bind_host, bind_port, err, int(BIND_FAILURE_BACKOFF),
             )
         return None
-    return await mgr.send_frame(devaddr, v_frame, timeout, context=context, pn=pn)
+    return await mgr.send_frame(
+        ep.devaddr, v_frame, timeout, context=context, pn=pn, window=ep.window, write=write
+    )
 
 
 async def send_eybond_voltronic(
-    device: str,
+    device: str | EybondEndpoint,
     command: str,
     timeout: float = DEFAULT_TIMEOUT,
     protocol: str | None = None,
     pn: str | None = None,
+    write: bool = False,
 ) -> bytes | None:
     """Backward-compatible wrapper for Voltronic/PI18 commands."""
-    if protocol == PROTOCOL_PI18 or device.startswith("eybond-pi18://"):
+    uri = device.uri if isinstance(device, EybondEndpoint) else device
+    if protocol == PROTOCOL_PI18 or uri.startswith("eybond-pi18://"):
         v_frame = build_request_frame(command)
     else:
         v_frame = build_pi30_frame(command)
-    return await send_eybond_bytes(device, v_frame, timeout, context=command, pn=pn)
+    return await send_eybond_bytes(device, v_frame, timeout, context=command, pn=pn, write=write)
 
 
 async def send_eybond_set_command(
-    device: str,
+    device: str | EybondEndpoint,
     command: str,
     timeout: float = 30.0,
     protocol: str | None = None,
@@ -1012,7 +1475,7 @@ async def send_eybond_set_command(
 ) -> dict:
     """Send a set command and classify the ACK/NAK response."""
     response = await send_eybond_voltronic(
-        device, command, timeout, protocol=protocol, pn=pn
+        device, command, timeout, protocol=protocol, pn=pn, write=True
     )
     if response is None:
         return {"error": "no response"}
@@ -1030,6 +1493,7 @@ async def shutdown_all_eybond_managers() -> None:
     async with _registry_lock:
         managers = list(_managers.values())
         _managers.clear()
+    _netif.discovery.close()
     if not managers:
         _LOGGER.debug("EyBond: shutdown — no managers to stop")
         return
@@ -0,0 +1,292 @@
+"""Local IPv4 interface discovery for the EyBond announcer.
+
+The announcer needs two facts about the host: which IP to advertise in
+``set>server=<ip>:<port>`` and which subnet broadcast reaches the
+dongles. Both used to be looked up on the event loop — an ``ip -4 addr
+show`` (``ipconfig`` on Windows) child process and a routing-table
+socket connect — every time a hub listener started.
+
+Implementation choices:
+
+* Addresses come from an rtnetlink ``RTM_GETADDR`` dump where
+  ``AF_NETLINK`` exists (Linux, including HA OS and containers): one
+  request/response on a socket, no child process, every address with
+  its prefix length (aliases included). Elsewhere the old ``ip`` /
+  ``ipconfig`` parsing stays as the fallback. Either way the read runs
+  in the default executor.
+* One :class:`InterfaceDiscovery` (``discovery``) is shared by every
+  ``EybondManager``: hubs on several ports start together on HA boot
+  and all await the same in-flight read instead of each forking ``ip``.
+* Results are cached for ``ttl`` seconds (5 min). On Linux a netlink
+  socket subscribed to ``RTMGRP_IPV4_IFADDR`` is registered with the
+  loop's reader, so an added / removed address (DHCP renewal, Wi-Fi
+  reconnect) invalidates the cache at once; the TTL is the safety net
+  where that subscription is unavailable.
+* :class:`NetSnapshot` is a frozen dataclass — callers compare it with
+  ``==`` to see whether anything they derived from it is stale.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import os
+import re
+import socket
+import struct
+import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300.0
+
+# rtnetlink (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h)
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTMGRP_IPV4_IFADDR = 0x10
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_IFADDRMSG = struct.Struct("=BBBBI")
+_RTATTR = struct.Struct("=HH")
+
+
+@dataclass(frozen=True)
+class NetSnapshot:
+    """Host IPv4 addresses (with prefix) and the default-route source IP."""
+
+    interfaces: tuple[ipaddress.IPv4Interface, ...]
+    local_ip: str
+
+
+def _align(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def parse_netlink_addresses(data: bytes) -> tuple[list[ipaddress.IPv4Interface], bool]:
+    """``RTM_NEWADDR`` entries of one netlink datagram; ``True`` once ``NLMSG_DONE``."""
+    out: list[ipaddress.IPv4Interface] = []
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+        body = offset + _NLMSGHDR.size
+        if msg_type == NLMSG_DONE:
+            return out, True
+        if msg_type == NLMSG_ERROR:
+            (errno,) = struct.unpack_from("=i", data, body)
+            raise OSError(-errno, "netlink RTM_GETADDR failed")
+        if msg_type == RTM_NEWADDR:
+            family, prefixlen, _, _, _ = _IFADDRMSG.unpack_from(data, body)
+            attrs: dict[int, bytes] = {}
+            pos = body + _IFADDRMSG.size
+            while pos + _RTATTR.size <= offset + length:
+                rta_len, rta_type = _RTATTR.unpack_from(data, pos)
+                if rta_len < _RTATTR.size:
+                    break
+                attrs[rta_type] = data[pos + _RTATTR.size:pos + rta_len]
+                pos += _align(rta_len)
+            # IFA_ADDRESS is the peer on point-to-point links; IFA_LOCAL is ours.
+            raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+            if family == socket.AF_INET and raw and len(raw) == 4:
+                out.append(ipaddress.IPv4Interface((raw, prefixlen)))
+        offset += _align(length)
+    return out, False
+
+
+def _netlink_addresses() -> list[ipaddress.IPv4Interface]:
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE) as sock:
+        sock.settimeout(2.0)
+        sock.bind((0, 0))
+        header = _NLMSGHDR.pack(
+            _NLMSGHDR.size + _IFADDRMSG.size, RTM_GETADDR, NLM_F_REQUEST | NLM_F_DUMP, 1, 0
+        )
+        sock.send(header + _IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0))
+        out: list[ipaddress.IPv4Interface] = []
+        while True:
+            found, done = parse_netlink_addresses(sock.recv(65536))
+            out.extend(found)
+            if done:
+                return out
+
+
+def parse_ip_addr(raw: str) -> list[ipaddress.IPv4Interface]:
+    """Addresses from ``ip -4 addr show`` output."""
+    out = []
+    for m in re.finditer(r"inet\s+([\d\.]+)/(\d+)", raw):
+        try:
+            out.append(ipaddress.IPv4Interface(f"{m.group(1)}/{m.group(2)}"))
+        except ValueError:
+            pass
+    return out
+
+
+def parse_ipconfig(raw: str) -> list[ipaddress.IPv4Interface]:
+    """Addresses from Windows ``ipconfig`` output (English / Russian)."""
+    out = []
+    current_ip = None
+    for line in raw.splitlines():
+        if "IPv4" in line:
+            m = re.search(r":\s*([\d\.]+)", line)
+            if m:
+                current_ip = m.group(1)
+        elif "Subnet Mask" in line or "Маска подсети" in line:
+            m = re.search(r":\s*([\d\.]+)", line)
+            if m and current_ip:
+                try:
+                    out.append(ipaddress.IPv4Interface(f"{current_ip}/{m.group(1)}"))
+                except ValueError:
+                    pass
+            current_ip = None
+    return out
+
+
+def read_interfaces() -> tuple[ipaddress.IPv4Interface, ...]:
+    """Host IPv4 addresses. Blocking — run it in the executor."""
+    if hasattr(socket, "AF_NETLINK"):
+        try:
+            return tuple(_netlink_addresses())
+        except OSError as err:
+            _LOGGER.debug("netlink address dump failed (%s), falling back to ip(8)", err)
+    try:
+        if os.name == "nt":
+            # shell=True handles Windows command lookup; cp866/utf-8 covers most locales
+            raw = subprocess.check_output("ipconfig", shell=True).decode("cp866", errors="ignore")
+            return tuple(parse_ipconfig(raw))
+        raw = subprocess.check_output(["ip", "-4", "addr", "show"]).decode("utf-8", errors="ignore")
+        return tuple(parse_ip_addr(raw))
+    except (OSError, subprocess.SubprocessError) as err:
+        _LOGGER.debug("interface discovery failed: %s", err)
+        return ()
+
+
+def detect_local_ip() -> str:
+    """Source IP of the default route (no packet is sent). Blocking."""
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+    finally:
+        s.close()
+
+
+def _read_snapshot() -> NetSnapshot:
+    return NetSnapshot(read_interfaces(), detect_local_ip())
+
+
+class InterfaceDiscovery:
+    """TTL-cached :class:`NetSnapshot`, read off-loop and shared by callers."""
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, reader: Callable[[], NetSnapshot] = _read_snapshot
+    ) -> None:
+        self.ttl = ttl
+        self._reader = reader
+        self._cached: NetSnapshot | None = None
+        self._expires = 0.0
+        self._inflight: asyncio.Future[NetSnapshot] | None = None
+        self._watch: socket.socket | None = None
+        self._watch_loop: asyncio.AbstractEventLoop | None = None
+
+    async def snapshot(self) -> NetSnapshot:
+        if self._cached is not None and time.monotonic() < self._expires:
+            return self._cached
+        loop = asyncio.get_running_loop()
+        self._ensure_watch(loop)
+        if self._inflight is None or self._inflight.get_loop() is not loop:
+            self._inflight = loop.run_in_executor(None, self._reader)
+            self._inflight.add_done_callback(self._store)
+        # Shielded: one caller being cancelled must not cancel the read
+        # every other hub is waiting on.
+        return await asyncio.shield(self._inflight)
+
+    def _store(self, fut: asyncio.Future[NetSnapshot]) -> None:
+        if fut is not self._inflight:
+            return  # invalidated while reading: don't cache a stale result
+        self._inflight = None
+        if not fut.cancelled() and fut.exception() is None:
+            self._cached = fut.result()
+            self._expires = time.monotonic() + self.ttl
+
+    def invalidate(self) -> None:
+        """Force the next :meth:`snapshot` to re-read."""
+        self._cached = None
+        self._inflight = None
+
+    def _ensure_watch(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._watch is not None and self._watch_loop is loop:
+            return
+        self.close()
+        if not hasattr(socket, "AF_NETLINK"):
+            return
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.setblocking(False)
+            sock.bind((0, RTMGRP_IPV4_IFADDR))
+            loop.add_reader(sock.fileno(), self._on_address_change)
+        except (OSError, NotImplementedError) as err:
+            _LOGGER.debug("address-change subscription unavailable: %s", err)
+            return
+        self._watch, self._watch_loop = sock, loop
+
+    def _on_address_change(self) -> None:
+        changed = False
+        while self._watch is not None:
+            try:
+                data = self._watch.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # ENOBUFS: notifications were dropped — treat as a change.
+                changed = True
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, msg_type, *_ = _NLMSGHDR.unpack_from(data, offset)
+                changed = changed or msg_type in (RTM_NEWADDR, RTM_DELADDR)
+                if length < _NLMSGHDR.size:
+                    break
+                offset += _align(length)
+        if changed:
+            _LOGGER.debug("IPv4 address change, dropping cached interfaces")
+            self.invalidate()
+
+    def close(self) -> None:
+        """Stop watching for address changes (integration unload)."""
+        sock, loop = self._watch, self._watch_loop
+        self._watch = self._watch_loop = None
+        if sock is None:
+            return
+        if loop is not None and not loop.is_closed():
+            loop.remove_reader(sock.fileno())
+        sock.close()
+
+
+# Shared by every EybondManager in this HA instance.
+discovery = InterfaceDiscovery()
+
+
+def broadcast_for(announce_ip: str, interfaces: tuple[ipaddress.IPv4Interface, ...]) -> str | None:
+    """Broadcast address of the local subnet holding ``announce_ip``, if any."""
+    try:
+        target = ipaddress.IPv4Address(announce_ip.strip())
+    except ValueError:
+        return None
+    for iface in interfaces:
+        if target in iface.network:
+            return str(iface.network.broadcast_address)
+    return None
@@ -15,9 +15,13 @@ import logging
 
 import serial_asyncio_fast as serial_asyncio
 
+from ... import metrics as _metrics
+from ... import stalls as _stalls
+from ... import tracing as _tracing
 from ...frame_log import record as _record_frame
 from ..crc import validate_pi18_response
 from ..decoders.pi18 import build_request_frame, decode_pi18_response
+from .transport_log import hexdump, tally
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,22 +54,29 @@ class _Pi18FrameCollector(asyncio.Protocol):
     def connection_made(self, transport):
         self.transport = transport
         self.transport.write(self.frame)
+        tally("pi18", "tx", len(self.frame))
 
+    @_stalls.timed("data_received", lambda self, _data: _stalls.bound_name(f"PI18:{self.command or '?'}"))
     def data_received(self, data: bytes):
         self.buffer.extend(data)
         if b"\r" in self.buffer:
             body = bytes(self.buffer.split(b"\r", 1)[0])
             ok, _ = validate_pi18_response(body)
             _record_frame(f"PI18:{self.command or '?'}", body, ok)
+            tally("pi18", "rx", len(body))
+            _metrics.observe(
+                "response_bytes", len(body), _metrics.BYTE_BUCKETS, transport="pi18"
+            )
             if not ok:
+                _metrics.inc("crc_failures", transport="pi18")
                 # See elfin_tcp.py: single CRC mismatches are absorbed by the
                 # coordinator's retry/freeze; only the consecutive-failure
                 # warning at the coordinator level is escalated.
                 _LOGGER.debug(
-                    "CRC mismatch for PI18 %s response (%d bytes): %r",
+                    "CRC mismatch for PI18 %s response (%d bytes): %s",
                     self.command or "?",
                     len(body),
-                    body[:120],
+                    hexdump(body, 120),
                 )
                 if self.strict_crc:
                     self.on_response(None, ValueError("CRC mismatch"))
@@ -100,17 +111,19 @@ async def query_pi18(
 
     frame = build_request_frame(command)
 
+    # ``timeout`` bounds connect + response together (see VoltronicAdapter).
+    deadline = loop.time() + timeout
     try:
         if device.startswith("pi18://"):
             host, port = parse_pi18_tcp_uri(device)
-            transport, _ = await loop.create_connection(
+            connect = loop.create_connection(
                 lambda: _Pi18FrameCollector(frame, on_response, strict_crc, command),
                 host,
                 port,
             )
         elif device.startswith("pi18-serial://"):
             path = parse_pi18_serial_uri(device)
-            transport, _ = await serial_asyncio.create_serial_connection(
+            connect = _stalls.steps("serial_open", serial_asyncio.create_serial_connection(
                 loop,
                 lambda: _Pi18FrameCollector(frame, on_response, strict_crc, command),
                 path,
@@ -118,21 +131,25 @@ async def query_pi18(
                 bytesize=8,
                 parity="N",
                 stopbits=1,
-            )
+            ), path)
         else:
             return {}
+        with _tracing.span("connect", "transport"):
+            transport, _ = await asyncio.wait_for(connect, timeout=timeout)
     except Exception:
         return {}
 
     try:
         try:
-            raw = await asyncio.wait_for(fut, timeout=timeout)
+            with _tracing.span("response", "transport"):
+                raw = await asyncio.wait_for(fut, timeout=max(deadline - loop.time(), 0))
         except TimeoutError:
             raw = None
         if not raw:
             return {}
         try:
-            return decode_pi18_response(command, raw) or {}
+            with _tracing.span("decode", "decode"):
+                return decode_pi18_response(command, raw) or {}
         except Exception:
             return {}
     finally:
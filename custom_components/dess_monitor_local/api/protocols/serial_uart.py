@@ -8,8 +8,11 @@ from __future__ import annotations
 import asyncio
 import logging
 
+from ... import metrics as _metrics
+from ... import stalls as _stalls
 from ...frame_log import record as _record_frame
 from ..crc import crc16_voltronic, validate_voltronic_response
+from .transport_log import hexdump, tally
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,22 +35,29 @@ class SerialCommandProtocol(asyncio.Protocol):
         self.transport = transport
         packet = self.command_bytes + crc16_voltronic(self.command_bytes) + b"\r"
         self.transport.write(packet)
+        tally("serial", "tx", len(packet))
 
+    @_stalls.timed("data_received", lambda self, _data: _stalls.bound_name(self.command))
     def data_received(self, data: bytes):
         self.buffer.extend(data)
         if b"\r" in self.buffer:
             raw_bytes = bytes(self.buffer.split(b"\r", 1)[0])
             ok, _ = validate_voltronic_response(raw_bytes)
             _record_frame(self.command, raw_bytes, ok)
+            tally("serial", "rx", len(raw_bytes))
+            _metrics.observe(
+                "response_bytes", len(raw_bytes), _metrics.BYTE_BUCKETS, transport="serial"
+            )
             if not ok:
+                _metrics.inc("crc_failures", transport="serial")
                 # See elfin_tcp.py: single CRC mismatches are absorbed by the
                 # coordinator's retry/freeze; only the consecutive-failure
                 # warning at the coordinator level is escalated.
                 _LOGGER.debug(
-                    "CRC mismatch for %s response (%d bytes): %r",
+                    "CRC mismatch for %s response (%d bytes): %s",
                     self.command,
                     len(raw_bytes),
-                    raw_bytes[:120],
+                    hexdump(raw_bytes, 120),
                 )
                 if self.strict_crc:
                     self.on_response(None, ValueError("CRC mismatch"))
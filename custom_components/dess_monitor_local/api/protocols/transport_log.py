@@ -0,0 +1,97 @@
+"""Logging helpers for the transport hot paths.
+
+``logging`` defers *formatting* until a record is emitted, but not the
+evaluation of its arguments: ``_LOGGER.debug("... %s", payload.hex())``
+hex-encodes every frame even with DEBUG off. On an EyBond hub that is
+every heartbeat and every forwarded reply of every dongle.
+
+Two tools keep the disabled path free:
+
+* :class:`hexdump` — wraps the bytes and hex-encodes them in
+  ``__str__``, i.e. only when a handler actually formats the record.
+  Construction is one small object, no copy.
+* :func:`tally` / :func:`take_summary` — instead of one DEBUG line per
+  frame, transports bump a per-(transport, kind) frame / byte counter
+  and the coordinator logs one summary record per poll cycle. The raw
+  bytes of interesting frames are in ``frame_log`` (diagnostics), and
+  rare anomalies (unsolicited / unknown frames, CRC mismatches) are
+  still logged individually with a lazy :class:`hexdump`.
+
+Like ``frame_log`` the counters are module-level, so protocol classes
+record without threading ``hass`` through. They are keyed by owner so
+that several config entries each summarize only their own traffic: the
+``device`` label bound by :func:`metrics.bind` for frames of a request,
+or an explicit endpoint (``eybond:<PN>``) for session traffic outside
+any request, such as heartbeats and replies read by the session loop.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from ... import metrics as _metrics
+
+_Key = tuple[str, str]
+# owner -> (transport, kind) -> [frames, bytes]
+_TALLY: dict[str, dict[_Key, list[int]]] = {}
+
+
+class hexdump:  # lower-case: reads like a format function at call sites
+    """Lazy ``bytes.hex()`` for log arguments; ``limit`` truncates."""
+
+    __slots__ = ("data", "limit")
+
+    def __init__(self, data: bytes, limit: int | None = None):
+        self.data = data
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if self.limit is None or len(self.data) <= self.limit:
+            return self.data.hex()
+        return f"{self.data[:self.limit].hex()}… ({len(self.data)} bytes)"
+
+    __repr__ = __str__
+
+
+def tally(transport: str, kind: str, nbytes: int = 0, owner: str = "") -> None:
+    """Count one frame of ``kind`` (``rx`` / ``tx`` / ``tx heartbeat``…).
+
+    ``owner`` defaults to the bound ``device`` label.
+    """
+    counts = _TALLY.setdefault(owner or _metrics.bound_label("device"), {})
+    entry = counts.get((transport, kind))
+    if entry is None:
+        counts[(transport, kind)] = [1, nbytes]
+    else:
+        entry[0] += 1
+        entry[1] += nbytes
+
+
+class CycleSummary:
+    """Frame counts since the previous summary; formatted only when logged."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self, counts: dict[_Key, list[int]]):
+        self.counts = counts
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{transport} {kind} {frames}×/{nbytes} B"
+            for (transport, kind), (frames, nbytes) in sorted(self.counts.items())
+        )
+
+
+def take_summary(owners: Iterable[str] | None = None) -> CycleSummary:
+    """Hand over the counters of ``owners`` (all if ``None``) and start a
+    new window for them; other owners' counters are left in place."""
+    keys = list(_TALLY) if owners is None else owners
+    counts: dict[_Key, list[int]] = {}
+    for owner in keys:
+        for key, (frames, nbytes) in _TALLY.pop(owner, {}).items():
+            entry = counts.setdefault(key, [0, 0])
+            entry[0] += frames
+            entry[1] += nbytes
+    return CycleSummary(counts)
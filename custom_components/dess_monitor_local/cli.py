@@ -0,0 +1,212 @@
+"""Headless poller / transport benchmark for the integration's read stack.
+
+Runs the same ``dispatcher.get_direct_data`` path the coordinator uses —
+adapters, transports, CRC validation, decoders — without a running Home
+Assistant, and prints JSON lines::
+
+    python -m custom_components.dess_monitor_local.cli tcp://192.168.1.50:8899
+    python -m custom_components.dess_monitor_local.cli --interval 2 \\
+        -c QPIGS -c QMOD tcp://10.0.0.5:8899 pi18://10.0.0.6:502
+    python -m custom_components.dess_monitor_local.cli --bench --count 200 \\
+        eybond://0.0.0.0:8899?pn=Q0033...
+
+``python -m`` imports the integration package, so run it where that
+works — a Home Assistant dev venv, or inside the HA container from the
+config directory. Stop HA (or pick another port) first when benchmarking
+an ``eybond://`` listener HA also binds.
+
+Poll mode emits one ``{"type": "sample", ...}`` line per read. Bench
+mode reads back to back (``--interval`` defaults to 0) and emits one
+``{"type": "summary", ...}`` line with per-device/command request
+count, error rate, exact RTT p50/p95/p99/max and throughput, plus the
+transport counters of ``metrics`` (CRC failures, timeouts, bytes) —
+also on Ctrl-C. Devices are polled concurrently, the commands of one
+device sequentially, like a coordinator cycle.
+
+``replay://`` URIs poll recorded frames instead of hardware (add
+``?speed=0`` to bench the decode path alone). ``--decode FILE`` skips
+polling and decodes a whole frame_log export or frame_capture file on a
+process pool, one ``{"type": "frame", ...}`` line per frame::
+
+    python -m custom_components.dess_monitor_local.cli --decode capture.bin --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any, TextIO
+
+from . import metrics
+from .api.adapters.replay import decode_file
+from .api.dispatcher import get_direct_data
+from .api.protocols.eybond_dongle import shutdown_all_eybond_managers
+
+DEFAULT_COMMANDS = ("QPIGS", "QPIRI", "QMOD")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _emit(out: TextIO, record: dict) -> None:
+    out.write(json.dumps(record, default=_json_default, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class BenchStats:
+    """Exact per-(device, command) RTTs and error counts for one run."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.rtts: dict[tuple[str, str], list[float]] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+
+    def add(self, device: str, command: str, rtt: float, ok: bool) -> None:
+        self.rtts.setdefault((device, command), []).append(rtt)
+        if not ok:
+            self.errors[(device, command)] = self.errors.get((device, command), 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        rows = []
+        for (device, command), rtts in sorted(self.rtts.items()):
+            ordered = sorted(rtts)
+            errors = self.errors.get((device, command), 0)
+            rows.append({
+                "device": device,
+                "command": command,
+                "requests": len(rtts),
+                "errors": errors,
+                "error_rate": round(errors / len(rtts), 4),
+                **{
+                    f"rtt_{name}": round(percentile(ordered, q), 4)
+                    for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+                },
+                "per_second": round(len(rtts) / elapsed, 3) if elapsed else None,
+            })
+        total = sum(row["requests"] for row in rows)
+        return {
+            "type": "summary",
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "per_second": round(total / elapsed, 3) if elapsed else None,
+            "commands": rows,
+            "transport_counters": metrics.snapshot()["counters"],
+        }
+
+
+async def _read(
+    device: str, command: str, args: argparse.Namespace, stats: BenchStats, out: TextIO
+) -> None:
+    started = time.monotonic()
+    with metrics.bind(device=device, command=command, transport=metrics.transport_of(device)):
+        try:
+            data = await get_direct_data(device, command, args.timeout, args.strict_crc)
+        except Exception as err:  # a broken transport is a data point here
+            data = {"error": repr(err)}
+    rtt = time.monotonic() - started
+    ok = bool(data) and "error" not in data
+    stats.add(device, command, rtt, ok)
+    if not args.bench:
+        _emit(out, {
+            "type": "sample",
+            "ts": datetime.now(UTC),
+            "device": device,
+            "command": command,
+            "rtt": round(rtt, 4),
+            "ok": ok,
+            "data": data,
+        })
+
+
+async def _poll_device(
+    device: str, args: argparse.Namespace, stats: BenchStats, out: TextIO
+) -> None:
+    rounds = 0
+    while args.count is None or rounds < args.count:
+        round_started = time.monotonic()
+        for command in args.commands:
+            await _read(device, command, args, stats, out)
+        rounds += 1
+        if args.interval:
+            await asyncio.sleep(max(args.interval - (time.monotonic() - round_started), 0))
+
+
+async def run(args: argparse.Namespace, stats: BenchStats, out: TextIO = sys.stdout) -> None:
+    try:
+        await asyncio.gather(*(_poll_device(d, args, stats, out) for d in args.devices))
+    finally:
+        await shutdown_all_eybond_managers()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.dess_monitor_local.cli",
+        description="Poll inverter device URIs outside Home Assistant and print JSON lines.",
+    )
+    parser.add_argument("devices", nargs="*", metavar="URI", help="device URI(s), as in the config entry")
+    parser.add_argument(
+        "-c", "--command", dest="commands", action="append", type=str.upper,
+        help=f"command to read (repeatable; default {' '.join(DEFAULT_COMMANDS)})",
+    )
+    parser.add_argument("-i", "--interval", type=float, help="seconds between rounds (default 10, bench 0)")
+    parser.add_argument("-n", "--count", type=int, help="rounds per device (default: until Ctrl-C)")
+    parser.add_argument("-t", "--timeout", type=float, default=10.0, help="per-read timeout in seconds")
+    parser.add_argument("--strict-crc", action="store_true", help="drop frames with a bad CRC")
+    parser.add_argument("--bench", action="store_true", help="print only a latency / error summary")
+    parser.add_argument("--decode", metavar="FILE", help="decode a recording offline instead of polling")
+    parser.add_argument("--device", help="with --decode: only this recorded device")
+    parser.add_argument("--workers", type=int, help="with --decode: decoder processes (default: CPUs)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging to stderr")
+    args = parser.parse_args(argv)
+    if not args.devices and not args.decode:
+        parser.error("give device URI(s) or --decode FILE")
+    args.commands = args.commands or list(DEFAULT_COMMANDS)
+    if args.interval is None:
+        args.interval = 0.0 if args.bench else 10.0
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    if args.decode:
+        for row in decode_file(args.decode, args.device, args.strict_crc, args.workers):
+            _emit(sys.stdout, {"type": "frame", **row})
+        return 0
+    stats = BenchStats()
+    try:
+        asyncio.run(run(args, stats))
+    except KeyboardInterrupt:
+        pass
+    if args.bench:
+        _emit(sys.stdout, stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,13 +28,18 @@ from .const import (
     CONF_EYBOND_BIND_PORT,
     CONF_EYBOND_BROADCAST,
     CONF_EYBOND_DEVADDR,
+    CONF_FRAME_CAPTURE_MB,
+    CONF_FRAME_LOG_SIZE,
     CONF_HOST,
     CONF_HUB_REVISION,
     CONF_NAME,
+    CONF_OVERSAMPLE_INTERVAL,
     CONF_PORT,
     CONF_PROTOCOL,
+    CONF_SAMPLE_LOG_DAYS,
     CONF_SERIAL_DEVICE,
     CONF_STRICT_CRC,
+    CONF_TRACE_CYCLES,
     CONF_TRANSPORT,
     CONF_UPDATE_INTERVAL,
     DEFAULT_AGENT_PORT,
@@ -43,14 +48,29 @@ from .const import (
     DEFAULT_EYBOND_BIND_PORT,
     DEFAULT_EYBOND_BROADCAST,
     DEFAULT_EYBOND_DEVADDR,
+    DEFAULT_FRAME_CAPTURE_MB,
+    DEFAULT_FRAME_LOG_SIZE,
+    DEFAULT_OVERSAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_LOG_DAYS,
     DEFAULT_STRICT_CRC,
     DEFAULT_TCP_PORT,
+    DEFAULT_TRACE_CYCLES,
     DEFAULT_TRANSPORT_BY_PROTOCOL,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     ENTRY_KIND_EYBOND_HUB,
     LEGACY_PROTOCOL_TRANSPORT,
+    MAX_FRAME_CAPTURE_MB,
+    MAX_FRAME_LOG_SIZE,
+    MAX_OVERSAMPLE_INTERVAL,
+    MAX_SAMPLE_LOG_DAYS,
+    MAX_TRACE_CYCLES,
     MAX_UPDATE_INTERVAL,
+    MIN_FRAME_CAPTURE_MB,
+    MIN_FRAME_LOG_SIZE,
+    MIN_OVERSAMPLE_INTERVAL,
+    MIN_SAMPLE_LOG_DAYS,
+    MIN_TRACE_CYCLES,
     MIN_UPDATE_INTERVAL,
     PROTOCOL_AGENT,
     PROTOCOL_MODBUS,
@@ -294,6 +314,64 @@ def _update_interval_field() -> Any:
     )
 
 
+def _oversample_interval_field() -> Any:
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=MIN_OVERSAMPLE_INTERVAL,
+            max=MAX_OVERSAMPLE_INTERVAL,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        )
+    )
+
+
+def _trace_cycles_field() -> Any:
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=MIN_TRACE_CYCLES,
+            max=MAX_TRACE_CYCLES,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+        )
+    )
+
+
+def _frame_log_size_field() -> Any:
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=MIN_FRAME_LOG_SIZE,
+            max=MAX_FRAME_LOG_SIZE,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+        )
+    )
+
+
+def _frame_capture_mb_field() -> Any:
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=MIN_FRAME_CAPTURE_MB,
+            max=MAX_FRAME_CAPTURE_MB,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="MiB",
+        )
+    )
+
+
+def _sample_log_days_field() -> Any:
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=MIN_SAMPLE_LOG_DAYS,
+            max=MAX_SAMPLE_LOG_DAYS,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="d",
+        )
+    )
+
+
 async def _build_connection_schema(
     protocol: str, transport: str, defaults: dict[str, Any]
 ) -> vol.Schema:
@@ -385,6 +463,41 @@ async def _build_connection_schema(
         )
     ] = _update_interval_field()
 
+    schema[
+        vol.Optional(
+            CONF_OVERSAMPLE_INTERVAL,
+            default=defaults.get(CONF_OVERSAMPLE_INTERVAL, DEFAULT_OVERSAMPLE_INTERVAL),
+        )
+    ] = _oversample_interval_field()
+
+    schema[
+        vol.Optional(
+            CONF_TRACE_CYCLES,
+            default=defaults.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES),
+        )
+    ] = _trace_cycles_field()
+
+    schema[
+        vol.Optional(
+            CONF_FRAME_LOG_SIZE,
+            default=defaults.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE),
+        )
+    ] = _frame_log_size_field()
+
+    schema[
+        vol.Optional(
+            CONF_FRAME_CAPTURE_MB,
+            default=defaults.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB),
+        )
+    ] = _frame_capture_mb_field()
+
+    schema[
+        vol.Optional(
+            CONF_SAMPLE_LOG_DAYS,
+            default=defaults.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS),
+        )
+    ] = _sample_log_days_field()
+
     if protocol in _CRC_CAPABLE_PROTOCOLS:
         schema[
             vol.Optional(
@@ -623,6 +736,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 strict_crc = bool(
                     user_input.get(CONF_STRICT_CRC, DEFAULT_STRICT_CRC)
                 )
+                oversample_interval = int(
+                    user_input.get(CONF_OVERSAMPLE_INTERVAL, DEFAULT_OVERSAMPLE_INTERVAL)
+                )
+                trace_cycles = int(
+                    user_input.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES)
+                )
+                frame_log_size = int(
+                    user_input.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE)
+                )
+                frame_capture_mb = int(
+                    user_input.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB)
+                )
+                sample_log_days = int(
+                    user_input.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS)
+                )
 
                 device_value = _build_device_uri(
                     protocol, transport, host, port, serial_device, agent_device_id,
@@ -645,6 +773,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_EYBOND_ANNOUNCE_IP: eybond_announce_ip,
                         CONF_UPDATE_INTERVAL: update_interval,
                         CONF_STRICT_CRC: strict_crc,
+                        CONF_OVERSAMPLE_INTERVAL: oversample_interval,
+                        CONF_TRACE_CYCLES: trace_cycles,
+                        CONF_FRAME_LOG_SIZE: frame_log_size,
+                        CONF_FRAME_CAPTURE_MB: frame_capture_mb,
+                        CONF_SAMPLE_LOG_DAYS: sample_log_days,
                     },
                 )
 
@@ -710,6 +843,13 @@ class OptionsFlow(config_entries.OptionsFlow):
                 CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
             ),
             CONF_STRICT_CRC: opts.get(CONF_STRICT_CRC, DEFAULT_STRICT_CRC),
+            CONF_OVERSAMPLE_INTERVAL: opts.get(
+                CONF_OVERSAMPLE_INTERVAL, DEFAULT_OVERSAMPLE_INTERVAL
+            ),
+            CONF_TRACE_CYCLES: opts.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES),
+            CONF_FRAME_LOG_SIZE: opts.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE),
+            CONF_FRAME_CAPTURE_MB: opts.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB),
+            CONF_SAMPLE_LOG_DAYS: opts.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS),
         }
         self._protocol, self._transport = _normalize_protocol_transport(
             opts.get(CONF_PROTOCOL, parsed[CONF_PROTOCOL]),
@@ -804,6 +944,21 @@ class OptionsFlow(config_entries.OptionsFlow):
                 strict_crc = bool(
                     user_input.get(CONF_STRICT_CRC, DEFAULT_STRICT_CRC)
                 )
+                oversample_interval = int(
+                    user_input.get(CONF_OVERSAMPLE_INTERVAL, DEFAULT_OVERSAMPLE_INTERVAL)
+                )
+                trace_cycles = int(
+                    user_input.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES)
+                )
+                frame_log_size = int(
+                    user_input.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE)
+                )
+                frame_capture_mb = int(
+                    user_input.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB)
+                )
+                sample_log_days = int(
+                    user_input.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS)
+                )
 
                 device_value = _build_device_uri(
                     protocol, transport, host, port, serial_device, agent_device_id,
@@ -825,6 +980,11 @@ class OptionsFlow(config_entries.OptionsFlow):
                         CONF_EYBOND_ANNOUNCE_IP: eybond_announce_ip,
                         CONF_UPDATE_INTERVAL: update_interval,
                         CONF_STRICT_CRC: strict_crc,
+                        CONF_OVERSAMPLE_INTERVAL: oversample_interval,
+                        CONF_TRACE_CYCLES: trace_cycles,
+                        CONF_FRAME_LOG_SIZE: frame_log_size,
+                        CONF_FRAME_CAPTURE_MB: frame_capture_mb,
+                        CONF_SAMPLE_LOG_DAYS: sample_log_days,
                     },
                 )
 
@@ -864,6 +1024,22 @@ def _hub_listener_options_schema(defaults: dict[str, Any]) -> vol.Schema:
                 CONF_UPDATE_INTERVAL,
                 default=defaults.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
             ): _update_interval_field(),
+            vol.Optional(
+                CONF_TRACE_CYCLES,
+                default=defaults.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES),
+            ): _trace_cycles_field(),
+            vol.Optional(
+                CONF_FRAME_LOG_SIZE,
+                default=defaults.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE),
+            ): _frame_log_size_field(),
+            vol.Optional(
+                CONF_FRAME_CAPTURE_MB,
+                default=defaults.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB),
+            ): _frame_capture_mb_field(),
+            vol.Optional(
+                CONF_SAMPLE_LOG_DAYS,
+                default=defaults.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS),
+            ): _sample_log_days_field(),
         }
     )
 
@@ -1024,6 +1200,18 @@ class EybondHubOptionsFlow(config_entries.OptionsFlow):
                 CONF_UPDATE_INTERVAL: int(
                     user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
                 ),
+                CONF_TRACE_CYCLES: int(
+                    user_input.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES)
+                ),
+                CONF_FRAME_LOG_SIZE: int(
+                    user_input.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE)
+                ),
+                CONF_FRAME_CAPTURE_MB: int(
+                    user_input.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB)
+                ),
+                CONF_SAMPLE_LOG_DAYS: int(
+                    user_input.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS)
+                ),
             }
             return self.async_create_entry(title="", data=self._bumped_options(extra))
 
@@ -1039,6 +1227,10 @@ class EybondHubOptionsFlow(config_entries.OptionsFlow):
             CONF_UPDATE_INTERVAL: opts.get(
                 CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
             ),
+            CONF_TRACE_CYCLES: opts.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES),
+            CONF_FRAME_LOG_SIZE: opts.get(CONF_FRAME_LOG_SIZE, DEFAULT_FRAME_LOG_SIZE),
+            CONF_FRAME_CAPTURE_MB: opts.get(CONF_FRAME_CAPTURE_MB, DEFAULT_FRAME_CAPTURE_MB),
+            CONF_SAMPLE_LOG_DAYS: opts.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS),
         }
         return self.async_show_form(
             step_id="listener",
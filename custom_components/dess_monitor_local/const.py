@@ -16,6 +16,11 @@ CONF_EYBOND_BROADCAST = "eybond_broadcast"
 CONF_EYBOND_ANNOUNCE_IP = "eybond_announce_ip"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_STRICT_CRC = "strict_crc"
+CONF_OVERSAMPLE_INTERVAL = "oversample_interval"
+CONF_TRACE_CYCLES = "trace_cycles"
+CONF_FRAME_LOG_SIZE = "frame_log_size"
+CONF_FRAME_CAPTURE_MB = "frame_capture_mb"
+CONF_SAMPLE_LOG_DAYS = "sample_log_days"
 
 # Entry kind — distinguishes a single-inverter entry (legacy/default) from an
 # EyBond hub entry (one TCP listener, many auto-discovered dongles routed by
@@ -99,7 +104,7 @@ DEFAULT_EYBOND_BIND_HOST = "0.0.0.0"
 DEFAULT_EYBOND_BIND_PORT = 8899
 DEFAULT_EYBOND_DEVADDR = 1
 DEFAULT_EYBOND_BROADCAST = "255.255.255.255"
-# Empty = auto-detect via _detect_local_ip(). Override needed in Docker
+# Empty = auto-detect via netif.detect_local_ip(). Override needed in Docker
 # bridge networking, where auto-detect returns the container's internal
 # IP (172.x) instead of the host's LAN IP.
 DEFAULT_EYBOND_ANNOUNCE_IP = ""
@@ -107,3 +112,35 @@ DEFAULT_UPDATE_INTERVAL = 10
 MIN_UPDATE_INTERVAL = 1
 MAX_UPDATE_INTERVAL = 300
 DEFAULT_STRICT_CRC = False
+# QPIGS oversampling (see coordinators/oversampling.py). 0 = off: one
+# QPIGS read per publish. When set below the update interval, QPIGS is read
+# every N seconds to feed the energy / vSoC integrators, while HA state is
+# still published at the update interval.
+DEFAULT_OVERSAMPLE_INTERVAL = 0
+MIN_OVERSAMPLE_INTERVAL = 0
+MAX_OVERSAMPLE_INTERVAL = 10
+# Poll-cycle tracing (see tracing.py). 0 = off; otherwise the number of most
+# recent cycles whose spans are kept for the diagnostics download.
+DEFAULT_TRACE_CYCLES = 0
+MIN_TRACE_CYCLES = 0
+MAX_TRACE_CYCLES = 20
+# Raw frames kept per (device, command) for the diagnostics download
+# (see frame_log.py). 0 disables recording.
+DEFAULT_FRAME_LOG_SIZE = 20
+MIN_FRAME_LOG_SIZE = 0
+MAX_FRAME_LOG_SIZE = 500
+# Persistent raw-frame capture file size in MiB (see frame_capture.py).
+# 0 = off. The file lives in the HA config dir as FRAME_CAPTURE_FILE.
+DEFAULT_FRAME_CAPTURE_MB = 0
+MIN_FRAME_CAPTURE_MB = 0
+MAX_FRAME_CAPTURE_MB = 1024
+FRAME_CAPTURE_FILE = "dess_monitor_local_frames.cap"
+# Columnar on-disk log of decoded readings (see sample_log.py): days kept,
+# 0 = off. Stored in the HA config dir under SAMPLE_LOG_DIR.
+DEFAULT_SAMPLE_LOG_DAYS = 0
+MIN_SAMPLE_LOG_DAYS = 0
+MAX_SAMPLE_LOG_DAYS = 3650
+SAMPLE_LOG_DIR = "dess_monitor_local_samples"
+# Collapsed-stack output of the ``profile`` service (see cpuprofile.py),
+# in the HA config dir.
+CPU_PROFILE_FILE = "dess_monitor_local_profile.collapsed"
@@ -0,0 +1,137 @@
+"""Pure, Home-Assistant-free circuit breaker for unreachable devices.
+
+``FailureTracker`` decides what to *show* for a device that stopped
+answering (freeze, then unavailable) but not whether to keep *asking*:
+every cycle the coordinator still sent the full command set with
+retries to a dead inverter, and on an EyBond hub that bus time came out
+of the healthy siblings' budget.
+
+The breaker sits on top of the same consecutive-failure counts:
+
+  * **closed** — normal polling;
+  * **open** — the device (or its transport endpoint) hit the failure
+    threshold; it is not polled at all until the backoff expires;
+  * **half-open** — the backoff expired; the next cycle sends a single
+    cheap probe command. Success closes the breaker and the full poll
+    resumes in the same cycle; failure re-opens it with the backoff
+    doubled (``base_backoff`` → … → ``max_backoff``).
+
+One ``CircuitBreaker`` instance holds any number of independent keys;
+the coordinator keeps one keyed by device id and one keyed by transport
+endpoint (see :func:`endpoint_key`), so several devices behind one dead
+gateway stop being polled together. An endpoint counts consecutive
+failed polls across all of its devices; any device answering resets it.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_BASE_BACKOFF = 30.0
+DEFAULT_MAX_BACKOFF = 900.0
+
+
+class BreakerState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "backoff", "trips")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.backoff = 0.0
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """Per-key closed / open / half-open state with exponential probing."""
+
+    def __init__(
+        self,
+        threshold: int,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        now: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._now = now
+        self._circuits: dict[str, _Circuit] = {}
+
+    def state(self, key: str) -> BreakerState:
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return BreakerState.CLOSED
+        if self._now() - circuit.opened_at >= circuit.backoff:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    def on_success(self, key: str) -> None:
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.backoff = 0.0
+
+    def on_failure(self, key: str) -> BreakerState:
+        """Count a failed poll (or probe); trip or re-open as needed."""
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        if circuit.opened_at is not None:
+            # Failed half-open probe: back off further.
+            circuit.backoff = min(circuit.backoff * 2, self.max_backoff)
+            circuit.opened_at = self._now()
+        elif circuit.failures >= self.threshold:
+            circuit.backoff = self.base_backoff
+            circuit.opened_at = self._now()
+            circuit.trips += 1
+        return self.state(key)
+
+    def retry_in(self, key: str) -> float | None:
+        """Seconds until the next probe is due; ``None`` while closed."""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return None
+        return max(circuit.opened_at + circuit.backoff - self._now(), 0.0)
+
+    def describe(self, key: str) -> dict:
+        """Diagnostics / sensor attributes for one key."""
+        circuit = self._circuits.get(key) or _Circuit()
+        retry_in = self.retry_in(key)
+        return {
+            "state": self.state(key).value,
+            "consecutive_failures": circuit.failures,
+            "backoff_seconds": circuit.backoff or None,
+            "retry_in_seconds": None if retry_in is None else round(retry_in, 1),
+            "trips": circuit.trips,
+        }
+
+    def snapshot(self) -> dict[str, dict]:
+        return {key: self.describe(key) for key in self._circuits}
+
+
+def endpoint_key(uri: str) -> str:
+    """Transport endpoint a device URI talks through.
+
+    Devices sharing an endpoint share its fate: ``agent://h:p/<id>``
+    children all live behind ``h:p``; ``eybond*://`` children are routed
+    by dongle PN, so the PN (when present) is the endpoint rather than
+    the shared local listener. Serial paths are their own endpoint.
+    """
+    if "://" not in uri:
+        return uri
+    parts = urlsplit(uri)
+    if parts.scheme.startswith("eybond"):
+        pn = parse_qs(parts.query).get("pn")
+        if pn:
+            return f"eybond:{pn[0]}"
+    if parts.netloc:
+        return parts.netloc
+    return f"{parts.scheme}:{parts.path}"
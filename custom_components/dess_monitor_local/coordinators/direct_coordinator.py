@@ -1,33 +1,68 @@
 import asyncio
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
 import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
+from custom_components.dess_monitor_local import cpuprofile, memprofile, metrics, stalls, tracing
+from custom_components.dess_monitor_local.api.adapters.snapshot_cache import PollCycle
 from custom_components.dess_monitor_local.api.dispatcher import get_direct_data
+from custom_components.dess_monitor_local.api.protocols import transport_log
 from custom_components.dess_monitor_local.const import (
     CONF_DEVICE,
     CONF_NAME,
+    CONF_OVERSAMPLE_INTERVAL,
     CONF_PROTOCOL,
+    CONF_SAMPLE_LOG_DAYS,
     CONF_STRICT_CRC,
+    CONF_TRACE_CYCLES,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_OVERSAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_LOG_DAYS,
     DEFAULT_STRICT_CRC,
+    DEFAULT_TRACE_CYCLES,
     DEFAULT_UPDATE_INTERVAL,
     PROTOCOL_VOLTRONIC,
+    SAMPLE_LOG_DIR,
+)
+from custom_components.dess_monitor_local.coordinators.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    endpoint_key,
 )
 from custom_components.dess_monitor_local.coordinators.device_target import DeviceTarget
 from custom_components.dess_monitor_local.coordinators.failure_tracker import (
     FailureOutcome,
     FailureTracker,
 )
+from custom_components.dess_monitor_local.coordinators.oversampling import (
+    SampleWindow,
+    oversampling_enabled,
+)
+from custom_components.dess_monitor_local.coordinators.timeout_budget import RtoEstimator
+from custom_components.dess_monitor_local.sample_log import SampleLogWriter
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _listener_name(listener: Callable) -> str:
+    """Entity id of a bound entity callback, else the callable's name."""
+    owner = getattr(listener, "__self__", None)
+    return getattr(owner, "entity_id", None) or getattr(listener, "__qualname__", repr(listener))
+
+
+def _queue_lane(uri: str) -> str | None:
+    """Command-queue lane of a device: its own for EyBond (the dongle's
+    in-flight window orders its requests), else the shared serial lane."""
+    return uri if uri.startswith("eybond") else None
+
+
 class DirectCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
     devices = []
@@ -47,6 +82,21 @@ class DirectCoordinator(DataUpdateCoordinator):
     # Single-device entries stay uncapped — a legacy cloud-proxied transport can
     # legitimately take minutes and has no sibling to starve.
     _PER_DEVICE_POLL_TIMEOUT = 45.0
+    # Whole-cycle budget. It becomes a monotonic deadline that flows through
+    # the command queue down to the adapter: each read gets
+    # min(adaptive RTO, remaining budget) — see coordinators/timeout_budget.py.
+    _CYCLE_BUDGET_S = 120.0
+    # Slack for the hard asyncio guards behind the deadlines, so the soft
+    # deadline (freeze on last-known) fires before a hard cancel does.
+    _DEADLINE_GRACE_S = 2.0
+    # A read that returned empty-handed after this fraction of its timeout
+    # is treated as having timed out (transports swallow TimeoutError).
+    _TIMEOUT_FRACTION = 0.9
+    # Budget (queue wait + transport) for a single oversampled QPIGS read.
+    # Short on purpose: a slow sample is worth less than the next one on time.
+    _SAMPLE_TIMEOUT_S = 5.0
+    # Decoded sections appended to the on-disk sample log (sample_log.py).
+    _SAMPLE_LOG_SECTIONS = ("qpigs", "qpigs2", "qpiri", "qmod", "qpiws", "qfws")
 
     def __init__(self, hass: HomeAssistant, config_entry, targets=None):
         """Initialize my coordinator.
@@ -75,6 +125,41 @@ class DirectCoordinator(DataUpdateCoordinator):
         self._targets = targets
         # Per-(target id, command) consecutive-failure counter + freeze policy.
         self._failures = FailureTracker(self._MAX_CONSECUTIVE_FAILURES)
+        # Per-(target id, command) smoothed RTT → adaptive request timeout.
+        self._rto = RtoEstimator()
+        # Stop polling devices / endpoints that stopped answering; probe
+        # them with one QPIGS on exponential backoff instead. Tripped by the
+        # same consecutive-failure count that flips entities unavailable.
+        self._breaker = CircuitBreaker(self._MAX_CONSECUTIVE_FAILURES)
+        self._endpoint_breaker = CircuitBreaker(self._MAX_CONSECUTIVE_FAILURES)
+        # QPIGS oversampling (see coordinators/oversampling.py): a background
+        # task reads QPIGS every ``_sample_interval`` seconds and fans each
+        # sample out to in-memory listeners (energy / vSoC integrators);
+        # the regular refresh publishes the freshest sample plus window stats.
+        self._sample_interval = float(
+            config_entry.options.get(CONF_OVERSAMPLE_INTERVAL, DEFAULT_OVERSAMPLE_INTERVAL)
+        )
+        self.oversampling = oversampling_enabled(self._sample_interval, interval_seconds)
+        self._sample_listeners: dict[str, list[Callable[[dict], None]]] = {}
+        self._windows: dict[str, SampleWindow] = {}
+        # target id -> QPIGS sampled since the last publish (consumed by it)
+        self._fresh_qpigs: dict[str, dict] = {}
+        self._sampler_task: asyncio.Task | None = None
+        # Opt-in span recording of the last N cycles (see tracing.py);
+        # released again in async_unload_entry.
+        tracing.configure(
+            config_entry.entry_id,
+            int(config_entry.options.get(CONF_TRACE_CYCLES, DEFAULT_TRACE_CYCLES)),
+        )
+        # Opt-in columnar log of every cycle's readings (see sample_log.py);
+        # files are opened lazily from the executor.
+        sample_log_days = int(
+            config_entry.options.get(CONF_SAMPLE_LOG_DAYS, DEFAULT_SAMPLE_LOG_DAYS)
+        )
+        self._sample_log = (
+            SampleLogWriter(hass.config.path(SAMPLE_LOG_DIR), sample_log_days)
+            if sample_log_days > 0 else None
+        )
         # self.my_api = my_api
         # self._device: MyDevice | None = None
 
@@ -88,6 +173,113 @@ class DirectCoordinator(DataUpdateCoordinator):
         coordinator.async_config_entry_first_refresh.
         """
         self.devices = await self.get_active_devices()
+        if self.oversampling and self._sampler_task is None:
+            # Entry-scoped background task: cancelled automatically on unload.
+            self._sampler_task = self.config_entry.async_create_background_task(
+                self.hass, self._oversample_loop(), "dess_monitor_local oversampler"
+            )
+        if self._sample_log is not None:
+            self.config_entry.async_on_unload(self._async_close_sample_log)
+
+    async def _async_close_sample_log(self) -> None:
+        await self.hass.async_add_executor_job(self._sample_log.close)
+
+    async def _log_samples(self, data_map: dict, prev_data: dict) -> None:
+        """Append this cycle's decoded sections to the sample log.
+
+        Sections frozen on last-known data (the very object published
+        last cycle) are left out — the log only holds real reads.
+        """
+        rows = {}
+        for key, device_data in data_map.items():
+            prev = prev_data.get(key) or {}
+            rows[key] = {
+                section: value
+                for section in self._SAMPLE_LOG_SECTIONS
+                if (value := device_data.get(section)) is not prev.get(section)
+            }
+        try:
+            with tracing.span("sample log", "storage"):
+                await self.hass.async_add_executor_job(
+                    self._sample_log.append_cycle, time.time(), rows
+                )
+        except OSError as err:
+            _LOGGER.warning("Writing the sample log failed: %s", err)
+
+    def async_add_sample_listener(
+        self, key: str, listener: Callable[[dict], None]
+    ) -> CALLBACK_TYPE:
+        """Subscribe to every oversampled QPIGS read for target ``key``.
+
+        The listener receives a device-data dict shaped like
+        ``coordinator.data[key]`` (last published sections with ``qpigs``
+        replaced by the new sample). It must only update in-memory state —
+        the state write happens on the regular coordinator update.
+        """
+        listeners = self._sample_listeners.setdefault(key, [])
+        timed = stalls.timed("sample_listener", lambda _data: _listener_name(listener))(listener)
+        listeners.append(timed)
+
+        def _remove() -> None:
+            if timed in listeners:
+                listeners.remove(timed)
+
+        return _remove
+
+    def _on_sample(self, key: str, qpigs: dict) -> None:
+        self._windows.setdefault(key, SampleWindow()).add(qpigs)
+        self._fresh_qpigs[key] = qpigs
+        listeners = self._sample_listeners.get(key)
+        if not listeners:
+            return
+        device_data = {**((self.data or {}).get(key) or {}), "qpigs": qpigs}
+        for listener in list(listeners):
+            try:
+                listener(device_data)
+            except Exception:  # noqa: BLE001 — one bad entity must not stop the sampler
+                _LOGGER.exception("%s: oversample listener failed", key)
+
+    def _take_window(self, key: str) -> dict:
+        window = self._windows.get(key)
+        if window is None or not window:
+            return {}
+        summary = window.summary()
+        window.reset()
+        return summary
+
+    async def _oversample_loop(self) -> None:
+        strict_crc = bool(
+            self.config_entry.options.get(CONF_STRICT_CRC, DEFAULT_STRICT_CRC)
+        )
+        queue = self.hass.data["dess_monitor_local_queue"]
+        while True:
+            started = time.monotonic()
+            # A pass is its own cycle: snapshot-based adapters (Modbus,
+            # agent) read fresh data for every sample instead of serving
+            # the out-of-cycle cache for its whole TTL.
+            cycle = PollCycle()
+            for target in list(self.devices):
+                if self._link_state(target.id, endpoint_key(target.uri)) is not BreakerState.CLOSED:
+                    continue  # the publish cycle owns probing of a dead link
+                deadline = time.monotonic() + self._SAMPLE_TIMEOUT_S
+                try:
+                    with tracing.span("sample QPIGS", "sample", track=target.id):
+                        qpigs = await queue.enqueue(
+                            lambda t=target, dl=deadline, c=cycle: self._timed_read(
+                                t.id, t.uri, "QPIGS", dl, strict_crc, c
+                            ),
+                            deadline=deadline,
+                            lane=_queue_lane(target.uri),
+                        )
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.debug("%s: oversample QPIGS raised %r", target.id, err)
+                    continue
+                # A miss is simply not integrated; the publish cycle still
+                # runs its own retry + freeze policy on QPIGS.
+                if qpigs and "error" not in qpigs:
+                    self._on_sample(target.id, qpigs)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(self._sample_interval - elapsed, 0.0))
 
     def set_targets(self, targets) -> None:
         """Swap the explicit poll-target list at runtime.
@@ -121,28 +313,199 @@ class DirectCoordinator(DataUpdateCoordinator):
         name = self.config_entry.data.get(CONF_NAME) or "Inverter"
         return [DeviceTarget(id=device, uri=device, protocol=protocol, name=name)]
 
+    def _link_state(self, key: str, endpoint: str) -> BreakerState:
+        """Combined breaker state: the worse of device and endpoint."""
+        states = (self._breaker.state(key), self._endpoint_breaker.state(endpoint))
+        if BreakerState.OPEN in states:
+            return BreakerState.OPEN
+        if BreakerState.HALF_OPEN in states:
+            return BreakerState.HALF_OPEN
+        return BreakerState.CLOSED
+
+    def _link_info(self, key: str, endpoint: str) -> dict:
+        info = self._breaker.describe(key)
+        info["state"] = self._link_state(key, endpoint).value
+        info["endpoint_state"] = self._endpoint_breaker.state(endpoint).value
+        return info
+
+    @staticmethod
+    def _request_counts(key: str) -> tuple[float, float]:
+        return metrics.counter("requests", device=key), metrics.counter("failures", device=key)
+
+    def _device_metrics(
+        self, key: str, poll_started: float, counts_before: tuple[float, float]
+    ) -> dict:
+        """Per-device numbers for the optional diagnostic sensors."""
+        duration = time.monotonic() - poll_started
+        metrics.observe("device_poll_seconds", duration, device=key)
+        requests, failures = self._request_counts(key)
+        requests -= counts_before[0]
+        failures -= counts_before[1]
+        p95 = metrics.percentile("rtt_seconds", 0.95, device=key)
+        return {
+            "poll_seconds": round(duration, 3),
+            # Share of this cycle's transport reads that returned data.
+            "success_ratio": round(1 - failures / requests, 3) if requests else None,
+            "rtt_p95_seconds": None if p95 is None else round(p95, 3),
+        }
+
+    def _offline_device_data(self, key: str, endpoint: str) -> dict:
+        """Device data for a cycle in which the device was not polled.
+
+        Entities read every section with ``.get(section, {})``, so they go
+        unavailable / unknown exactly as after a failed poll; only the link
+        diagnostics stay live.
+        """
+        return {"timestamp": datetime.now(), "link": self._link_info(key, endpoint)}
+
+    async def _probe(
+        self,
+        key: str,
+        uri: str,
+        endpoint: str,
+        deadline: float | None,
+        strict_crc: bool,
+        cycle: PollCycle | None = None,
+    ) -> dict | None:
+        """Single QPIGS probe of a half-open device; no retry.
+
+        Returns the QPIGS section on success (closing both breakers so the
+        full poll resumes this cycle), ``None`` after re-opening them with a
+        longer backoff.
+        """
+        queue = self.hass.data["dess_monitor_local_queue"]
+        try:
+            with tracing.span("probe QPIGS", "attempt"):
+                result = await queue.enqueue(
+                    lambda: self._timed_read(key, uri, "QPIGS", deadline, strict_crc, cycle),
+                    deadline=deadline,
+                    lane=_queue_lane(uri),
+                )
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("%s: probe raised %r", key, err)
+            result = None
+        if result and "error" not in result:
+            _LOGGER.info("%s: probe answered; resuming polling", key)
+            self._failures.on_success(key, "QPIGS")
+            self._breaker.on_success(key)
+            self._endpoint_breaker.on_success(endpoint)
+            return result
+        self._breaker.on_failure(key)
+        self._endpoint_breaker.on_failure(endpoint)
+        _LOGGER.debug(
+            "%s: probe failed; next probe in %.0fs", key, self._breaker.retry_in(key) or 0
+        )
+        return None
+
+    async def _timed_read(
+        self,
+        key: str,
+        uri: str,
+        cmd: str,
+        deadline: float | None,
+        strict_crc: bool,
+        cycle: PollCycle | None = None,
+    ) -> dict:
+        """One transport read with an adaptive timeout; feeds the RTT estimator.
+
+        Runs inside the command queue, so the remaining budget is computed
+        *after* the queue wait. Any answer — even a NAK — is a valid RTT
+        sample; running into the timeout backs the estimate off instead.
+        A fast empty result (refused connection, dropped frame) says
+        nothing about the device's response time and is not a sample.
+        """
+        timeout = self._rto.timeout_for(key, cmd, deadline)
+        if timeout <= 0:
+            return {}
+        with metrics.bind(device=key, command=cmd, transport=metrics.transport_of(uri)):
+            metrics.inc("requests")
+            started = time.monotonic()
+            result = await get_direct_data(
+                uri, cmd, timeout, strict_crc=strict_crc, deadline=deadline, cycle=cycle
+            )
+            elapsed = time.monotonic() - started
+            if elapsed < timeout * self._TIMEOUT_FRACTION:
+                if result:
+                    self._rto.on_sample(key, cmd, elapsed)
+                    metrics.observe("rtt_seconds", elapsed)
+            elif not result:
+                self._rto.on_timeout(key, cmd)
+                metrics.inc("timeouts")
+            if not result:
+                metrics.inc("failures")
+            elif "NAK" in str(result.get("error", "")):
+                metrics.inc("naks")
+        return result
+
     async def _async_update_data(self):
+        tracing.begin_cycle()
+        memprofile.begin_cycle()
+        try:
+            with tracing.span("cycle", "cycle", devices=len(self.devices)):
+                return await self._poll_cycle()
+        finally:
+            memprofile.end_cycle()
+            cpuprofile.end_cycle()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context=None
+    ) -> Callable[[], None]:
+        # Entities subscribe their ``_handle_coordinator_update`` here; the
+        # wrapper names the entity when one of them stalls the loop.
+        return super().async_add_listener(
+            stalls.timed("entity_update", lambda: _listener_name(update_callback))(update_callback),
+            context,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # Entity fan-out: every listener writes its state here.
+        with tracing.span("publish", "publish", listeners=len(self._listeners)):
+            super().async_update_listeners()
+
+    async def _poll_cycle(self):
         strict_crc = bool(
             self.config_entry.options.get(CONF_STRICT_CRC, DEFAULT_STRICT_CRC)
         )
         prev_data = self.data or {}
         queue = self.hass.data["dess_monitor_local_queue"]
 
-        async def fetch_with_retry(key: str, uri: str, cmd: str, section: str) -> dict:
+        cycle_started = time.monotonic()
+        cycle_deadline = cycle_started + self._CYCLE_BUDGET_S
+        # Snapshot-based adapters (Modbus, agent) read each device once per
+        # cycle and answer all six commands from it; dropped with the cycle.
+        cycle = PollCycle()
+
+        async def fetch_with_retry(
+            key: str, uri: str, cmd: str, section: str, deadline: float | None = None
+        ) -> dict:
             """Read a command with one fast retry, then apply the pure
             freeze/unavailable policy (see FailureTracker).
 
             ``key`` is the target's stable id (failure tracking + last-known
             lookup); ``uri`` is the transport address the command is sent to.
+            ``deadline`` (monotonic) bounds queue wait plus transport time of
+            both attempts; defaults to the cycle deadline.
             """
+            if deadline is None:
+                deadline = cycle_deadline
             for attempt in range(2):
                 try:
-                    result = await queue.enqueue(
-                        lambda d=uri, c=cmd: get_direct_data(
-                            d, c, 30, strict_crc=strict_crc
+                    if attempt:
+                        metrics.inc("retries", device=key, command=cmd)
+                    with tracing.span(
+                        "{command} attempt {attempt}", "attempt", command=cmd, attempt=attempt + 1
+                    ):
+                        result = await queue.enqueue(
+                            lambda d=uri, c=cmd: self._timed_read(
+                                key, d, c, deadline, strict_crc, cycle
+                            ),
+                            deadline=deadline,
+                            labels={"device": key, "command": cmd},
+                            lane=_queue_lane(uri),
                         )
-                    )
-                except Exception as err:  # transport raised unexpectedly
+                except Exception as err:  # transport raised / budget expired in queue
                     _LOGGER.debug(
                         "%s/%s attempt %d raised %r", key, cmd, attempt + 1, err
                     )
@@ -151,7 +514,10 @@ class DirectCoordinator(DataUpdateCoordinator):
                     self._failures.on_success(key, cmd)
                     return result
                 if attempt == 0:
-                    await asyncio.sleep(self._RETRY_DELAY_S)
+                    if deadline - time.monotonic() <= self._RETRY_DELAY_S:
+                        break  # no budget left for a second attempt
+                    with tracing.span("retry sleep", "retry"):
+                        await asyncio.sleep(self._RETRY_DELAY_S)
 
             count = self._failures.on_failure(key, cmd)
             last_known = (prev_data.get(key) or {}).get(section) or {}
@@ -169,28 +535,84 @@ class DirectCoordinator(DataUpdateCoordinator):
             return data
 
         try:
-            async with async_timeout.timeout(120):
-                async def fetch_device_data(target):
+            # The deadline above already clips every request; this outer
+            # guard only catches a transport that ignores its timeout.
+            async with async_timeout.timeout(self._CYCLE_BUDGET_S + self._DEADLINE_GRACE_S):
+                async def fetch_device_data(target, deadline=None):
                     key = target.id
                     uri = target.uri
-                    qpigs = await fetch_with_retry(key, uri, 'QPIGS', 'qpigs')
-                    qpiri = await fetch_with_retry(key, uri, 'QPIRI', 'qpiri')
+                    endpoint = endpoint_key(uri)
+                    poll_started = time.monotonic()
+                    counts_before = self._request_counts(key)
+                    window = {}
+                    probe = None
+                    if self._link_state(key, endpoint) is BreakerState.OPEN:
+                        return key, self._offline_device_data(key, endpoint)
+                    if self._link_state(key, endpoint) is BreakerState.HALF_OPEN:
+                        probe = await self._probe(
+                            key, uri, endpoint, deadline, strict_crc, cycle
+                        )
+                        if probe is None:
+                            return key, self._offline_device_data(key, endpoint)
+                    if probe is not None:
+                        qpigs = probe
+                        if self.oversampling:
+                            self._on_sample(key, qpigs)
+                            window = self._take_window(key)
+                    elif self.oversampling:
+                        # Publish the freshest oversampled QPIGS (already fed
+                        # to the integrators) instead of reading it again.
+                        qpigs = self._fresh_qpigs.pop(key, None)
+                        if qpigs is None:
+                            qpigs = await fetch_with_retry(key, uri, 'QPIGS', 'qpigs', deadline)
+                            # Only a fresh read feeds the integrators: after a
+                            # failure this is the frozen last-known sample,
+                            # which they already counted.
+                            if (
+                                qpigs
+                                and "error" not in qpigs
+                                and not self._failures.count(key, 'QPIGS')
+                            ):
+                                self._on_sample(key, qpigs)
+                        else:
+                            self._failures.on_success(key, 'QPIGS')
+                        window = self._take_window(key)
+                    else:
+                        qpigs = await fetch_with_retry(key, uri, 'QPIGS', 'qpigs', deadline)
+                    if self._failures.count(key, 'QPIGS'):
+                        # Same count as the freeze/unavailable policy: the
+                        # breaker trips exactly when entities go unavailable,
+                        # and then the rest of the command set is skipped.
+                        self._breaker.on_failure(key)
+                        self._endpoint_breaker.on_failure(endpoint)
+                        if self._link_state(key, endpoint) is not BreakerState.CLOSED:
+                            _LOGGER.warning(
+                                "%s: %d consecutive failed polls; pausing polling, "
+                                "probing again in %.0fs",
+                                key, self._failures.count(key, 'QPIGS'),
+                                self._breaker.retry_in(key) or 0,
+                            )
+                            return key, self._offline_device_data(key, endpoint)
+                    else:
+                        self._breaker.on_success(key)
+                        self._endpoint_breaker.on_success(endpoint)
+                    qpiri = await fetch_with_retry(key, uri, 'QPIRI', 'qpiri', deadline)
                     # QMOD = current operating mode (PowerOn / Standby /
                     # Line / Battery / Fault). Cheap one-byte answer; gives
                     # us a real status sensor for automations instead of
                     # parsing the QPIGS status bits string.
-                    qmod = await fetch_with_retry(key, uri, 'QMOD', 'qmod')
+                    qmod = await fetch_with_retry(key, uri, 'QMOD', 'qmod', deadline)
                     # QPIGS2 = second PV input on dual-MPPT models. Many
                     # inverters NAK it, in which case fetch_with_retry
                     # returns {} and the PV2 sensors stay unavailable —
                     # zero cost for the rest of users.
-                    qpigs2 = await fetch_with_retry(key, uri, 'QPIGS2', 'qpigs2')
+                    qpigs2 = await fetch_with_retry(key, uri, 'QPIGS2', 'qpigs2', deadline)
                     # QPIWS = warning/fault bitstring. PI18 inverters NAK
                     # this and respond to QFWS instead; fetch both — the
                     # one that doesn't apply just returns ``{}`` and
                     # downstream sensors stay unavailable.
-                    qpiws = await fetch_with_retry(key, uri, 'QPIWS', 'qpiws')
-                    qfws = await fetch_with_retry(key, uri, 'QFWS', 'qfws')
+                    qpiws = await fetch_with_retry(key, uri, 'QPIWS', 'qpiws', deadline)
+                    qfws = await fetch_with_retry(key, uri, 'QFWS', 'qfws', deadline)
                     return key, {
                         "timestamp": datetime.now(),
                         'qpigs': qpigs,
@@ -199,6 +621,11 @@ class DirectCoordinator(DataUpdateCoordinator):
                         'qpigs2': qpigs2,
                         'qpiws': qpiws,
                         'qfws': qfws,
+                        # Per-field min/max/mean of the QPIGS samples since
+                        # the previous publish; empty when not oversampling.
+                        'qpigs_window': window,
+                        'link': self._link_info(key, endpoint),
+                        'metrics': self._device_metrics(key, poll_started, counts_before),
                     }
                     # return device, {
                     #     "timestamp": datetime.now(),
@@ -265,13 +692,23 @@ class DirectCoordinator(DataUpdateCoordinator):
                     self._PER_DEVICE_POLL_TIMEOUT if len(self.devices) > 1 else None
                 )
 
+                async def fetch_device_traced(target, deadline):
+                    # One trace row per device: its reads, queue waits and
+                    # transport spans all nest under this span.
+                    with tracing.span("fetch device", "device", track=target.id):
+                        return await fetch_device_data(target, deadline)
+
                 async def fetch_device_guarded(target):
                     if per_device_timeout is None:
-                        return await fetch_device_data(target)
+                        return await fetch_device_traced(target, cycle_deadline)
                     key = target.id
+                    # The device's share of the cycle budget; its requests
+                    # are clipped to it, wait_for is only the backstop.
+                    deadline = min(cycle_deadline, time.monotonic() + per_device_timeout)
                     try:
                         return await asyncio.wait_for(
-                            fetch_device_data(target), per_device_timeout
+                            fetch_device_traced(target, deadline),
+                            per_device_timeout + self._DEADLINE_GRACE_S,
                         )
                     except TimeoutError:
                         _LOGGER.warning(
@@ -284,6 +721,19 @@ class DirectCoordinator(DataUpdateCoordinator):
                 data_map = dict(
                     await asyncio.gather(*map(fetch_device_guarded, self.devices))
                 )
+                elapsed = time.monotonic() - cycle_started
+                metrics.observe("cycle_seconds", elapsed)
+                # One record per cycle instead of one per frame; the summary
+                # object formats itself only if DEBUG is on. Only this entry's
+                # devices and dongles: other entries drain their own tallies.
+                owners = {t.id for t in self.devices}
+                owners.update(endpoint_key(t.uri) for t in self.devices)
+                _LOGGER.debug(
+                    "Poll cycle: %d device(s) in %.2fs; frames since last cycle: %s",
+                    len(data_map), elapsed, transport_log.take_summary(owners) or "none",
+                )
+                if self._sample_log is not None:
+                    await self._log_samples(data_map, prev_data)
                 return data_map
         except TimeoutError as err:
             # Raising ConfigEntryAuthFailed will cancel future updates
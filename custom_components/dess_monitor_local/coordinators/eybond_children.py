@@ -59,9 +59,7 @@ def build_child_targets(
 ) -> list[DeviceTarget]:
     """Targets for every enabled record with a supported protocol assigned."""
     targets: list[DeviceTarget] = []
-    for rec in registry.all():
-        if not rec.enabled:
-            continue
+    for rec in registry.enabled():
         if rec.protocol not in SUPPORTED_CHILD_PROTOCOLS:
             continue
         targets.append(
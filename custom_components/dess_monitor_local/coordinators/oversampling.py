@@ -0,0 +1,116 @@
+"""Pure, Home-Assistant-free helpers for the QPIGS oversampling mode.
+
+The energy integrators (trapezoid over ``pv_charging_power`` etc.) and
+the vSoC Coulomb counter are only as accurate as their sample rate: at
+the default 10 s poll a 3 kW kettle switching on and off between two
+polls is either fully counted or fully missed. Publishing HA state that
+often, on the other hand, floods the recorder with rows nobody reads.
+
+Oversampling splits the two rates:
+
+  * the coordinator reads QPIGS every ``sample_interval`` seconds
+    (1–2 s is typical) and hands each sample to the integrators in
+    memory — no state write, no recorder row;
+  * HA state is published on the regular ``update_interval``, with the
+    window's per-field min / max / mean attached so short spikes stay
+    visible on the dashboard.
+
+This module owns the window statistics and the "is oversampling on"
+decision; the sampling task and the listener fan-out live in
+``DirectCoordinator``.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from functools import cache
+from typing import Any
+
+# Parts of field names that mark a digit string as a code rather than a
+# measurement: QPIGS ``device_status_bits_b7_b0="00010000"`` parses as a
+# float but its min / max / mean mean nothing (same for PI18
+# ``mppt1_status``, ``eeprom_version``, ``flag_*``).
+_NON_MEASUREMENT_MARKERS = ("bits", "status", "flag", "version")
+
+
+def oversampling_enabled(sample_interval: float, publish_interval: float) -> bool:
+    """Oversampling only makes sense when it samples faster than it publishes.
+
+    A sample interval at or above the publish interval would just add a
+    second poller hitting the same bus for no extra resolution.
+    """
+    return 0 < sample_interval < publish_interval
+
+
+@cache
+def _is_measurement(field: str) -> bool:
+    return not any(marker in field for marker in _NON_MEASUREMENT_MARKERS)
+
+
+def _as_number(raw: Any) -> float | None:
+    # Bools are ints in Python, but a flag is not a measurement.
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, int | float):
+        value = float(raw)
+    elif isinstance(raw, str):
+        try:
+            value = float(raw)
+        except ValueError:
+            return None
+    else:
+        return None
+    return None if math.isnan(value) else value
+
+
+class SampleWindow:
+    """Running min / max / mean per numeric field between two publishes.
+
+    Fields that don't parse as numbers (enum members, error strings from
+    a NAK) and status / flag fields that do are skipped silently. Means are accumulated
+    as a running sum so memory stays O(fields) however many samples land
+    in the window.
+    """
+
+    def __init__(self) -> None:
+        self.samples = 0
+        # field -> [min, max, sum, count]
+        self._acc: dict[str, list[float]] = {}
+
+    def add(self, section: Mapping[str, Any]) -> None:
+        self.samples += 1
+        for field, raw in section.items():
+            if not _is_measurement(field):
+                continue
+            value = _as_number(raw)
+            if value is None:
+                continue
+            acc = self._acc.get(field)
+            if acc is None:
+                self._acc[field] = [value, value, value, 1]
+                continue
+            if value < acc[0]:
+                acc[0] = value
+            if value > acc[1]:
+                acc[1] = value
+            acc[2] += value
+            acc[3] += 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-field ``{"min", "max", "mean", "samples"}`` for the window."""
+        return {
+            field: {
+                "min": acc[0],
+                "max": acc[1],
+                "mean": round(acc[2] / acc[3], 3),
+                "samples": int(acc[3]),
+            }
+            for field, acc in self._acc.items()
+        }
+
+    def reset(self) -> None:
+        self.samples = 0
+        self._acc.clear()
+
+    def __len__(self) -> int:
+        return self.samples
@@ -0,0 +1,146 @@
+"""Pure, Home-Assistant-free adaptive timeouts for the coordinator.
+
+Every read used to carry the same static 30 s transport timeout, so a
+dead serial link cost 30 s × 2 attempts × 6 commands before the cycle
+gave up — and on an EyBond hub that time is stolen from the healthy
+siblings sharing the command queue.
+
+This module replaces the constant with a TCP-style retransmission
+timeout (RFC 6298) learned per ``(device, command)`` from observed
+response times:
+
+    SRTT   ← (1 − α)·SRTT + α·R           α = 1/8
+    RTTVAR ← (1 − β)·RTTVAR + β·|SRTT − R|  β = 1/4
+    RTO    = SRTT + max(G, K·RTTVAR)       K = 4
+
+clamped to ``[min_rto, max_rto]``. A timed-out read doubles a backoff
+multiplier (Karn's algorithm) — capped, so a device that just died fails
+in a few seconds instead of drifting back to the 30 s ceiling — and the
+next real sample resets it. A command with no samples yet borrows the
+slowest learned estimate of the same device, and falls back to
+``initial_rto`` for a device never heard from. That prior is a realistic
+3 s (RFC 6298 allows 1–3 s), not the 30 s ceiling: a key that has never
+answered backs off from it on every timeout (3 → 6 → 12 → 24 s) just like
+a learned one, so a slow first contact still gets through within a few
+attempts while a dead link stops costing 30 s per read.
+
+The cycle deadline is a ``time.monotonic()`` instant; :func:`remaining`
+turns it into the budget left, and :meth:`RtoEstimator.timeout_for`
+returns ``min(RTO, remaining budget)`` — the value handed down through
+the queue to the adapter.
+"""
+from __future__ import annotations
+
+import time
+
+DEFAULT_INITIAL_RTO = 3.0
+DEFAULT_MIN_RTO = 1.0
+DEFAULT_MAX_RTO = 30.0
+# Timeout backoff multiplier cap: 2 → 4 → 8× the learned RTO, no further.
+MAX_BACKOFF = 8
+
+_ALPHA = 1 / 8
+_BETA = 1 / 4
+_K = 4
+# Clock granularity term; our "clock" is asyncio scheduling + queue jitter.
+_GRANULARITY = 0.1
+
+
+def remaining(deadline: float | None, now: float | None = None) -> float | None:
+    """Seconds left until ``deadline`` (monotonic), or ``None`` if unbounded."""
+    if deadline is None:
+        return None
+    if now is None:
+        now = time.monotonic()
+    return deadline - now
+
+
+class _RttState:
+    __slots__ = ("srtt", "rttvar", "backoff")
+
+    def __init__(self, sample: float):
+        self.srtt = sample
+        self.rttvar = sample / 2
+        self.backoff = 1
+
+    def update(self, sample: float) -> None:
+        self.rttvar = (1 - _BETA) * self.rttvar + _BETA * abs(self.srtt - sample)
+        self.srtt = (1 - _ALPHA) * self.srtt + _ALPHA * sample
+        self.backoff = 1
+
+    def base_rto(self) -> float:
+        return self.srtt + max(_GRANULARITY, _K * self.rttvar)
+
+
+class RtoEstimator:
+    """Per-(device, command) smoothed RTT / variance → timeout."""
+
+    def __init__(
+        self,
+        initial_rto: float = DEFAULT_INITIAL_RTO,
+        min_rto: float = DEFAULT_MIN_RTO,
+        max_rto: float = DEFAULT_MAX_RTO,
+    ):
+        self.initial_rto = initial_rto
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self._state: dict[str, dict[str, _RttState]] = {}
+        # Backoff of keys that timed out before their first answer.
+        self._unanswered: dict[str, dict[str, int]] = {}
+
+    def on_sample(self, device: str, command: str, rtt: float) -> None:
+        """Record the response time of a read that got an answer."""
+        per_device = self._state.setdefault(device, {})
+        state = per_device.get(command)
+        if state is None:
+            per_device[command] = _RttState(rtt)
+            self._unanswered.get(device, {}).pop(command, None)
+        else:
+            state.update(rtt)
+
+    def on_timeout(self, device: str, command: str) -> None:
+        """Back off after a read that hit its timeout without an answer."""
+        state = self._state.get(device, {}).get(command)
+        if state is not None:
+            state.backoff = min(state.backoff * 2, MAX_BACKOFF)
+            return
+        pending = self._unanswered.setdefault(device, {})
+        pending[command] = min(pending.get(command, 1) * 2, MAX_BACKOFF)
+
+    def rto(self, device: str, command: str) -> float:
+        per_device = self._state.get(device)
+        state = per_device.get(command) if per_device else None
+        if state is not None:
+            base = state.base_rto() * state.backoff
+        else:
+            if per_device:
+                # Unseen command on a known device: the slowest known command
+                # is a safe prior (QPIRI / QPIWS answers are longer than QMOD).
+                prior = max(s.base_rto() * s.backoff for s in per_device.values())
+            else:
+                prior = self.initial_rto
+            base = prior * self._unanswered.get(device, {}).get(command, 1)
+        return min(max(base, self.min_rto), self.max_rto)
+
+    def timeout_for(
+        self, device: str, command: str, deadline: float | None = None,
+        now: float | None = None,
+    ) -> float:
+        """``min(RTO, remaining budget)``; ``<= 0`` means the budget is spent."""
+        rto = self.rto(device, command)
+        left = remaining(deadline, now)
+        return rto if left is None else min(rto, left)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Diagnostics view: ``{device: {command: {srtt, rttvar, rto}}}``."""
+        return {
+            device: {
+                command: {
+                    "srtt": round(state.srtt, 3),
+                    "rttvar": round(state.rttvar, 3),
+                    "rto": round(self.rto(device, command), 3),
+                }
+                for command, state in per_device.items()
+            }
+            for device, per_device in self._state.items()
+        }
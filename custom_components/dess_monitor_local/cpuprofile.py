@@ -0,0 +1,230 @@
+"""On-demand sampling CPU profile of the integration's code on the event loop.
+
+On a Raspberry Pi a busy hub can keep the event loop at 30 % CPU, and
+"which decoder or entity callback is it" has so far meant restarting
+Home Assistant under a profiler. The ``profile`` service instead
+samples the event-loop thread for N seconds or N poll cycles and
+writes the result to ``CPU_PROFILE_FILE`` in the config dir, in the
+collapsed-stack format (``outer;inner;leaf count`` per line) that
+speedscope (https://www.speedscope.app), ``flamegraph.pl`` and
+``inferno`` open directly. The diagnostics download summarises it under
+``"cpu_profile"``.
+
+Implementation choices:
+
+* A pure-Python stack sampler rather than ``cProfile``: a daemon thread
+  reads the loop thread's current frame from ``sys._current_frames()``
+  every ``interval`` (5 ms by default). Cost is bounded by the sample
+  rate instead of by every call Home Assistant makes, and nothing has
+  to be installed. The sampler only runs when the loop thread lets go
+  of the GIL — on blocking I/O or every 5 ms switch interval — which
+  is frequent enough on a busy loop; a C call that holds the GIL is
+  charged to its Python caller.
+* Only this integration's work is kept: a stack counts when one of its
+  frames lies inside this package, and is cut to start at the
+  outermost such frame — the coroutine, callback or entity method that
+  the loop dispatched. Library frames above the leaf (``struct``,
+  ``json``, HA's state machine) stay, since their CPU was spent on our
+  behalf. Idle samples and other integrations only count towards the
+  total, so the summary's percentages are of the whole loop thread.
+* Aggregation is a ``Counter`` of stack tuples keyed by code object, so
+  a sample costs one frame walk and one dict update; labels, the file
+  and the top-N summary are built once, in the sampler thread, when it
+  stops — no file I/O on the event loop.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from types import CodeType, FrameType
+from typing import Any
+
+DEFAULT_SECONDS = 60
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP = 20
+# Upper bound for a cycle-boxed profile whose cycles never come.
+MAX_SECONDS = 3600
+
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _label(code: CodeType) -> str:
+    path = code.co_filename
+    if path.startswith(_PKG_DIR):
+        where = os.path.relpath(path, _PKG_DIR).replace(os.sep, "/")
+    else:
+        where = os.path.basename(path)
+    return f"{code.co_qualname} ({where}:{code.co_firstlineno})"
+
+
+def own_stack(frame: FrameType | None) -> tuple[CodeType, ...] | None:
+    """Code objects from the outermost own frame down to the leaf, or ``None``."""
+    stack: list[CodeType] = []
+    outermost = -1
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_PKG_DIR):
+            outermost = len(stack)
+        stack.append(code)
+        frame = frame.f_back
+    if outermost < 0:
+        return None
+    return tuple(reversed(stack[:outermost + 1]))
+
+
+class Sampler(threading.Thread):
+    """Samples ``thread_id``'s stack for ``seconds`` (or until :meth:`stop`),
+    then writes ``path``."""
+
+    def __init__(
+        self,
+        thread_id: int,
+        path: str,
+        seconds: float | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        top: int = DEFAULT_TOP,
+    ):
+        super().__init__(name="dess_monitor_local profiler", daemon=True)
+        self.thread_id = thread_id
+        self.deadline = time.monotonic() + seconds if seconds else None
+        self.path = path
+        self.interval = interval
+        self.top = top
+        self.samples = 0
+        self.stacks: Counter[tuple[CodeType, ...]] = Counter()
+        self.started = datetime.now(UTC)
+        self.report: dict[str, Any] | None = None
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                break
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break  # the loop thread is gone
+            self.samples += 1
+            stack = own_stack(frame)
+            del frame
+            if stack is not None:
+                self.stacks[stack] += 1
+        self.report = self._finish()
+
+    def _finish(self) -> dict[str, Any]:
+        labels: dict[CodeType, str] = {}
+
+        def label(code: CodeType) -> str:
+            if code not in labels:
+                labels[code] = _label(code)
+            return labels[code]
+
+        lines = [
+            f"{';'.join(label(code) for code in stack)} {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+        error = None
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + ("\n" if lines else ""))
+        except OSError as err:
+            error = str(err)
+
+        own_samples = sum(self.stacks.values())
+        self_counts: Counter[str] = Counter()
+        total_counts: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[label(stack[-1])] += count
+            for name in {label(code) for code in stack}:
+                total_counts[name] += count
+
+        def rows(counts: Counter[str]) -> list[dict[str, Any]]:
+            return [
+                {"function": name, "samples": n, "percent": round(100 * n / max(self.samples, 1), 2)}
+                for name, n in counts.most_common(self.top)
+            ]
+
+        return {
+            "state": "done",
+            "started": self.started.isoformat(),
+            "finished": datetime.now(UTC).isoformat(),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "integration_samples": own_samples,
+            "integration_percent": round(100 * own_samples / max(self.samples, 1), 2),
+            "file": self.path,
+            **({"file_error": error} if error else {}),
+            "top_self": rows(self_counts),
+            "top_total": rows(total_counts),
+        }
+
+
+_sampler: Sampler | None = None
+_cycles_left = 0
+
+
+def start(
+    path: str,
+    seconds: float | None = DEFAULT_SECONDS,
+    cycles: int | None = None,
+    interval: float = DEFAULT_INTERVAL,
+    top: int = DEFAULT_TOP,
+) -> None:
+    """Sample the calling thread (the event loop) for ``cycles`` poll cycles
+    or ``seconds``, whichever is given (cycles win, up to MAX_SECONDS);
+    replaces a running profile."""
+    global _sampler, _cycles_left
+    stop()
+    _cycles_left = cycles or 0
+    _sampler = Sampler(
+        threading.get_ident(), path, MAX_SECONDS if cycles else seconds or DEFAULT_SECONDS, interval, top
+    )
+    _sampler.start()
+
+
+def stop() -> None:
+    """End the running profile early; it still writes its file."""
+    global _cycles_left
+    _cycles_left = 0
+    if _sampler is not None:
+        _sampler.stop()
+
+
+def running() -> bool:
+    return _sampler is not None and _sampler.is_alive()
+
+
+def end_cycle() -> None:
+    """Count a finished poll cycle; the N-th one stops a cycle-boxed profile."""
+    global _cycles_left
+    if _cycles_left:
+        _cycles_left -= 1
+        if not _cycles_left:
+            stop()
+
+
+def report() -> dict[str, Any] | None:
+    """Summary for diagnostics: ``None`` if never run, else its state."""
+    if _sampler is None:
+        return None
+    if _sampler.report is not None:
+        return _sampler.report
+    state: dict[str, Any] = {"state": "running", "samples": _sampler.samples}
+    if _cycles_left:
+        state["cycles_left"] = _cycles_left
+    if _sampler.deadline is not None:
+        state["seconds_left"] = round(max(_sampler.deadline - time.monotonic(), 0), 1)
+    return state
+
+
+def clear() -> None:
+    """Stop any profile and forget its summary (integration unload)."""
+    global _sampler
+    stop()
+    _sampler = None
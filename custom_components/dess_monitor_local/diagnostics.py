@@ -15,6 +15,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
+from . import cpuprofile, frame_capture, memprofile, metrics, stalls, tracing
 from .frame_log import snapshot as _frame_snapshot
 
 _REDACT_KEYS = {"host", "device", "serial_device", "agent_device_id"}
@@ -46,6 +47,20 @@ def _coordinator_section(entry: ConfigEntry) -> dict[str, Any]:
         "consecutive_failures": dict(
             getattr(getattr(coordinator, "_failures", None), "_counts", {}) or {}
         ),
+        # Learned per-(device, command) RTT → adaptive request timeout.
+        "timeouts": (
+            coordinator._rto.snapshot() if getattr(coordinator, "_rto", None) else {}
+        ),
+        "circuit_breakers": {
+            "devices": (
+                coordinator._breaker.snapshot()
+                if getattr(coordinator, "_breaker", None) else {}
+            ),
+            "endpoints": (
+                coordinator._endpoint_breaker.snapshot()
+                if getattr(coordinator, "_endpoint_breaker", None) else {}
+            ),
+        },
         "data": coordinator.data,
     }
 
@@ -63,6 +78,25 @@ async def async_get_config_entry_diagnostics(
         },
         "coordinator": _coordinator_section(entry),
         "frames": _frame_snapshot(),
+        "metrics": metrics.snapshot(),
+        # Rolling max / p99 of the integration's callbacks on the event
+        # loop, and the latest ones over the stall threshold.
+        "stalls": stalls.snapshot(),
+        # Chrome trace / Perfetto JSON of the last N poll cycles; only
+        # present with the ``trace_cycles`` option set.
+        **({"trace": tracing.export()} if tracing.enabled() else {}),
+        # Fill level of the persistent capture file (``frame_capture_mb``);
+        # the frames themselves are read with frame_capture.CaptureReader.
+        **({"frame_capture": capture} if (capture := frame_capture.stats()) else {}),
+        # tracemalloc diff of the poll cycles profiled by the
+        # ``profile_memory`` service; grouping the heap is CPU-heavy.
+        **(
+            {"memory_profile": profile}
+            if (profile := await hass.async_add_executor_job(memprofile.report)) else {}
+        ),
+        # Summary of the ``profile`` service's sampling run; the full
+        # collapsed stacks are in the file it names.
+        **({"cpu_profile": cpu} if (cpu := cpuprofile.report()) else {}),
     }
 
 
@@ -84,5 +118,11 @@ async def async_get_device_diagnostics(
             "id": device_id,
             "direct_data": device_data,
         },
-        "frames": _frame_snapshot(),
+        "frames": _frame_snapshot(device_id) if device_id is not None else {},
+        # Only this device's series; transport-wide ones (no device label,
+        # e.g. EyBond forward timeouts) are in the entry diagnostics.
+        "metrics": {
+            kind: [m for m in series if m["labels"].get("device") == device_id]
+            for kind, series in metrics.snapshot().items()
+        },
     }
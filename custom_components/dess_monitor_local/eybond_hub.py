@@ -8,13 +8,15 @@ the existing entity platforms work unchanged.
 
 The discovered-device registry lives in a Store (not entry options) so
 volatile lifecycle metadata (``last_seen`` / ``status``) doesn't bloat the
-entry or trigger reload churn. A background task persists it periodically and
-on unload.
+entry or trigger reload churn. It is saved ``SAVE_DELAY`` after a change to
+the registry (see ``EybondRegistry.version``), every ``LAST_SEEN_SAVE_INTERVAL``
+when only heartbeat ``last_seen`` times moved, and on unload.
 """
 from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -27,6 +29,7 @@ from .api.protocols.eybond_discovery import (
     EybondRegistry,
 )
 from .api.protocols.eybond_dongle import (
+    EybondManager,
     get_eybond_manager,
     parse_eybond_uri,
     shutdown_eybond_manager,
@@ -57,7 +60,10 @@ from .hub import Hub
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
-SAVE_INTERVAL = 30.0
+# A burst of changes (dongles reconnecting after an HA restart) is one save.
+SAVE_DELAY = 10.0
+# ``last_seen`` alone changes with every heartbeat; it is informational.
+LAST_SEEN_SAVE_INTERVAL = 900.0
 
 
 def _store(hass: HomeAssistant, entry_id: str) -> Store:
@@ -82,39 +88,64 @@ class EybondHubRuntime:
         hass: HomeAssistant,
         entry: ConfigEntry,
         store: Store,
-        registry: EybondRegistry,
+        manager: EybondManager,
         bind_host: str,
         bind_port: int,
     ) -> None:
         self.hass = hass
         self.entry = entry
         self.store = store
-        self.registry = registry
+        self.manager = manager
         self.bind_host = bind_host
         self.bind_port = bind_port
         self._task: asyncio.Task | None = None
-        self._last_saved = registry.to_dict()
+        self._save_handle: asyncio.TimerHandle | None = None
+        self._unsub_observer = None
+        # Serializing marks the registry clean: what was loaded is on disk.
+        manager.registry.to_dict()
+
+    @property
+    def registry(self) -> EybondRegistry:
+        """The registry the listener feeds — follows ``adopt_registry``."""
+        return self.manager.registry
+
+    def add_observer(self, observer: Callable[[int], None]) -> Callable[[], None]:
+        """Observe the hub's registry, whichever object it currently is."""
+        return self.manager.add_registry_observer(observer)
 
     def start_persistence(self) -> None:
+        self._unsub_observer = self.add_observer(self._on_registry_change)
         self._task = self.hass.async_create_background_task(
             self._persist_loop(), name=f"eybond_hub_persist_{self.entry.entry_id}"
         )
 
+    def _on_registry_change(self, version: int) -> None:
+        if self._save_handle is None:
+            self._save_handle = self.hass.loop.call_later(SAVE_DELAY, self._save_due)
+
+    def _save_due(self) -> None:
+        self._save_handle = None
+        self.hass.async_create_task(self.async_save())
+
     async def _persist_loop(self) -> None:
         try:
             while True:
-                await asyncio.sleep(SAVE_INTERVAL)
+                await asyncio.sleep(LAST_SEEN_SAVE_INTERVAL)
                 await self.async_save()
         except asyncio.CancelledError:
             pass
 
     async def async_save(self, force: bool = False) -> None:
-        snap = self.registry.to_dict()
-        if force or snap != self._last_saved:
-            await self.store.async_save(snap)
-            self._last_saved = snap
+        if force or self.registry.dirty:
+            await self.store.async_save(self.registry.to_dict())
 
     async def stop(self) -> None:
+        if self._unsub_observer is not None:
+            self._unsub_observer()
+            self._unsub_observer = None
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
         if self._task and not self._task.done():
             self._task.cancel()
             try:
@@ -146,7 +177,8 @@ async def async_setup_eybond_hub(hass: HomeAssistant, entry: ConfigEntry) -> Hub
     manager = await get_eybond_manager(
         bind_host, bind_port, broadcast, announce_ip, registry=registry
     )
-    # Adopt whatever registry the manager actually uses (in case it pre-existed).
+    # Use whatever registry the manager actually uses (in case it
+    # pre-existed); the runtime reads it through the manager from here on.
     registry = manager.registry
 
     targets = build_child_targets(
@@ -164,7 +196,7 @@ async def async_setup_eybond_hub(hass: HomeAssistant, entry: ConfigEntry) -> Hub
     entry.runtime_data = hub_obj
 
     runtime = EybondHubRuntime(
-        hass, entry, store, registry, bind_host, bind_port
+        hass, entry, store, manager, bind_host, bind_port
     )
     runtime.start_persistence()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
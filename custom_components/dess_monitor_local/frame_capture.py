@@ -0,0 +1,320 @@
+"""Persistent raw-frame capture in a fixed-size memory-mapped ring file.
+
+``frame_log`` keeps a few frames per command in memory for the
+diagnostics download and forgets them on restart. Chasing an
+intermittent field shift needs hours of frames that survive a reboot,
+so with the ``frame_capture_mb`` option set every frame handed to
+``frame_log.record`` — CRC-valid or not — is also appended here.
+
+File layout (little-endian)::
+
+    header   64 B     magic, version, sizes, head/tail/last, count, next seq
+    index    N × 24 B (seq, ts, offset) of every INDEX_EVERY-th record
+    data     ring of records, each
+             [rec_len u32][seq u64][ts f64][flags u8][dev_len u8]
+             [cmd_len u8][pad][payload_len u16] device command payload
+
+Records never straddle the end of the data region: a record that does
+not fit is written at offset 0, leaving a ``rec_len = 0`` wrap marker.
+The writer keeps an exact ``tail`` (oldest live record) by evicting
+whole records ahead of the write position, so a reader walks
+``count`` consecutive records from ``tail`` without resynchronising.
+
+Appending costs one ``struct.pack_into`` plus slice copies into the
+mapping — no file I/O on the event loop; the kernel writes dirty pages
+back. Timestamps are wall-clock (``time.time()``) because the file
+outlives the process. The sparse index is written in ring order (slot
+``seq // INDEX_EVERY`` modulo the slot count), so :meth:`frames` bisects
+it by timestamp to start a time-range read from the nearest indexed
+record instead of the tail.
+
+:class:`CaptureReader` opens a capture read-only (e.g. from a shell
+while HA runs); reads racing the writer are best effort and stop at the
+first record whose sequence number doesn't follow.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+MAGIC = b"DESSCAP1"
+VERSION = 1
+# One index entry per this many records.
+INDEX_EVERY = 32
+
+_HEADER = struct.Struct("<8sHxxIIIIIIQ")
+_HEADER_SIZE = 64
+_INDEX = struct.Struct("<QdI4x")
+_RECORD = struct.Struct("<IQdBBBxH")
+_WRAP = struct.Struct("<I")
+
+_FLAG_CRC_OK = 0x01
+
+
+class CapturedFrame(NamedTuple):
+    ts: float
+    device: str
+    command: str
+    crc_valid: bool
+    raw: bytes
+
+
+class _Ring:
+    """Shared layout / reading logic over an open mapping."""
+
+    _mm: mmap.mmap
+
+    def _load_header(self) -> None:
+        (
+            magic, version, self.data_size, self.index_slots,
+            self.head, self.tail, self.count, self.last, self.next_seq,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a frame capture file")
+        self._data_start = _HEADER_SIZE + self.index_slots * _INDEX.size
+
+    def _wraps_at(self, pos: int) -> bool:
+        return (
+            self.data_size - pos < _RECORD.size
+            or _WRAP.unpack_from(self._mm, self._data_start + pos)[0] == 0
+        )
+
+    def _record_at(self, pos: int) -> tuple[int, int, float, int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._data_start + pos)
+
+    def _index_entry(self, k: int) -> tuple[int, float, int] | None:
+        """``(seq, ts, offset)`` of the ``k``-th indexed record, if still live."""
+        seq, ts, offset = _INDEX.unpack_from(
+            self._mm, _HEADER_SIZE + (k % self.index_slots) * _INDEX.size
+        )
+        if (
+            seq != k * INDEX_EVERY
+            or offset > self.data_size - _RECORD.size
+            or self._record_at(offset)[1] != seq
+        ):
+            return None
+        return seq, ts, offset
+
+    def _seek(self, since: float | None) -> tuple[int, int]:
+        """``(offset, seq)`` of the first record worth scanning for ``since``."""
+        start = (self.tail, self.next_seq - self.count)
+        if since is None or not self.count:
+            return start
+        # Bisect the live index entries (k-th entry = record k·INDEX_EVERY)
+        # for the last one at or before ``since``. An entry that doesn't
+        # check out counts as "too late": starting earlier is always safe.
+        lo = -(-start[1] // INDEX_EVERY)
+        hi = (self.next_seq - 1) // INDEX_EVERY
+        best = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            entry = self._index_entry(mid)
+            if entry is None or entry[1] > since:
+                hi = mid - 1
+            else:
+                best, lo = entry, mid + 1
+        if best is None:
+            return start
+        return best[2], best[0]
+
+    def frames(
+        self, since: float | None = None, until: float | None = None
+    ) -> Iterator[CapturedFrame]:
+        """Captured frames oldest to newest, optionally within ``[since, until]``."""
+        pos, seq = self._seek(since)
+        base = self._data_start
+        for _ in range(self.next_seq - seq):
+            if self._wraps_at(pos):
+                pos = 0
+            rec_len, rec_seq, ts, flags, dev_len, cmd_len, payload_len = self._record_at(pos)
+            if rec_seq != seq or rec_len < _RECORD.size:
+                return  # overwritten under us
+            seq += 1
+            if until is not None and ts > until:
+                return
+            if since is None or ts >= since:
+                p = base + pos + _RECORD.size
+                device = self._mm[p:p + dev_len].decode(errors="replace")
+                p += dev_len
+                command = self._mm[p:p + cmd_len].decode(errors="replace")
+                p += cmd_len
+                yield CapturedFrame(
+                    ts, device, command, bool(flags & _FLAG_CRC_OK),
+                    bytes(self._mm[p:p + payload_len]),
+                )
+            pos += rec_len
+
+    def stats(self) -> dict:
+        return {
+            "data_bytes": self.data_size,
+            "records": self.count,
+            "next_seq": self.next_seq,
+            "oldest": self._record_at(self.tail)[2] if self.count else None,
+            "newest": self._record_at(self.last)[2] if self.count else None,
+        }
+
+
+class FrameCapture(_Ring):
+    """Writer: creates or reopens the ring file and appends frames."""
+
+    def __init__(self, path: str, data_size: int):
+        # Enough slots to index a ring full of minimum-size records
+        # (~3 % of the data size), so every live record stays reachable.
+        index_slots = data_size // (INDEX_EVERY * _RECORD.size) + 1
+        total = _HEADER_SIZE + index_slots * _INDEX.size + data_size
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fresh = os.fstat(fd).st_size != total
+            if fresh:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, total)
+            self._mm = mmap.mmap(fd, total)
+        finally:
+            os.close(fd)
+        if not fresh:
+            try:
+                self._load_header()
+                fresh = self.data_size != data_size or self.index_slots != index_slots
+            except ValueError:
+                fresh = True
+        if fresh:
+            self.data_size, self.index_slots = data_size, index_slots
+            self.head = self.tail = self.count = self.last = self.next_seq = 0
+            self._data_start = _HEADER_SIZE + index_slots * _INDEX.size
+            self._store_header()
+        self._names: dict[str, bytes] = {}
+
+    def _store_header(self) -> None:
+        _HEADER.pack_into(
+            self._mm, 0, MAGIC, VERSION, self.data_size, self.index_slots,
+            self.head, self.tail, self.count, self.last, self.next_seq,
+        )
+
+    def _drop_oldest(self) -> None:
+        self.tail += self._record_at(self.tail)[0]
+        self.count -= 1
+        if not self.count:
+            self.tail = self.head
+        elif self._wraps_at(self.tail):
+            self.tail = 0
+
+    def _name(self, text: str) -> bytes:
+        encoded = self._names.get(text)
+        if encoded is None:
+            encoded = self._names[text] = text.encode()[:255]
+        return encoded
+
+    def append(
+        self, device: str, command: str, raw: bytes, crc_valid: bool,
+        ts: float | None = None,
+    ) -> None:
+        dev, cmd = self._name(device), self._name(command)
+        payload = raw[:0xFFFF]
+        rec_len = _RECORD.size + len(dev) + len(cmd) + len(payload)
+        if rec_len > self.data_size:
+            return
+        if self.head + rec_len > self.data_size:
+            # Free the unusable end of the region, leave a wrap marker.
+            while self.count and self.tail >= self.head:
+                self._drop_oldest()
+            if self.data_size - self.head >= _WRAP.size:
+                _WRAP.pack_into(self._mm, self._data_start + self.head, 0)
+            self.head = 0
+            if not self.count:
+                self.tail = 0
+        end = self.head + rec_len
+        while self.count and self.head <= self.tail < end:
+            self._drop_oldest()
+        if ts is None:
+            ts = time.time()
+        seq = self.next_seq
+        p = self._data_start + self.head
+        _RECORD.pack_into(
+            self._mm, p, rec_len, seq, ts, _FLAG_CRC_OK if crc_valid else 0,
+            len(dev), len(cmd), len(payload),
+        )
+        p += _RECORD.size
+        self._mm[p:p + len(dev)] = dev
+        p += len(dev)
+        self._mm[p:p + len(cmd)] = cmd
+        p += len(cmd)
+        self._mm[p:p + len(payload)] = payload
+        if seq % INDEX_EVERY == 0:
+            slot = (seq // INDEX_EVERY) % self.index_slots
+            _INDEX.pack_into(self._mm, _HEADER_SIZE + slot * _INDEX.size, seq, ts, self.head)
+        if not self.count:
+            self.tail = self.head
+        self.last = self.head
+        self.head = end
+        self.count += 1
+        self.next_seq = seq + 1
+        self._store_header()
+
+    def flush(self) -> None:
+        self._mm.flush()
+
+    def close(self) -> None:
+        self._mm.flush()
+        self._mm.close()
+
+
+class CaptureReader(_Ring):
+    """Read-only view of a capture file (a snapshot of its header)."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._load_header()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide capture, fed by frame_log.record
+# ---------------------------------------------------------------------------
+_active: FrameCapture | None = None
+# Entries that enabled capture; the file stays open while any remains.
+_owners: set[str] = set()
+
+
+def start(owner: str, path: str, data_size: int) -> None:
+    """Open the capture file (blocking — run in the executor).
+
+    The first entry to enable capture opens the file (its path and size
+    win); later ones share it.
+    """
+    global _active
+    if _active is None:
+        _active = FrameCapture(path, data_size)
+    _owners.add(owner)
+
+
+def stop(owner: str) -> None:
+    """Release ``owner``'s use; flush and close after the last (blocking)."""
+    global _active
+    _owners.discard(owner)
+    if _active is not None and not _owners:
+        capture, _active = _active, None
+        capture.close()
+
+
+def append(device: str, command: str, raw: bytes, crc_valid: bool) -> None:
+    if _active is not None:
+        _active.append(device, command, raw, crc_valid)
+
+
+def stats() -> dict | None:
+    return None if _active is None else {"path": _active.path, **_active.stats()}
@@ -10,51 +10,187 @@ Implementation choices:
 * Module-level dict (rather than ``hass.data``) so transports can call
   ``record()`` without threading ``hass`` through every protocol class.
   Single-tenant integration, so no isolation concerns.
-* Buffer per command (QPIGS / QPIRI / GS / …) keeps related frames
-  together; ``maxlen=20`` covers ~3 minutes at the default 10-second
-  poll interval — enough to catch a transient anomaly while staying
-  well under any reasonable memory budget.
-* Both hex and printable-ASCII representations are recorded — hex for
-  byte-exact reproduction, ASCII for at-a-glance human reading.
+* Buffer per (device, command) — QPIGS of one hub child never pushes out
+  another child's. The device comes from the labels the coordinator
+  binds around each read (``metrics.bind``), so protocol classes still
+  only pass the command.
+* ``record()`` runs for every frame but the buffer is only read when
+  someone downloads diagnostics, so the hot path stores just
+  ``(monotonic ts, raw bytes, crc flag)`` into preallocated slots; the
+  ISO timestamp, hex and printable-ASCII renderings are built in
+  :func:`snapshot`. Hex is for byte-exact reproduction, ASCII for
+  at-a-glance human reading.
+* Capacity per buffer defaults to 20 frames (~3 minutes at the default
+  10-second poll) and is set from the ``frame_log_size`` option. A
+  global byte budget caps the sum over all buffers — a hub with dozens
+  of children evicts its globally oldest frames first.
+* Every recorded frame is also handed to ``frame_capture``, which keeps
+  a persistent on-disk ring when the ``frame_capture_mb`` option is set
+  (a single ``None`` check otherwise).
 """
 from __future__ import annotations
 
-from collections import deque
+import time
+from collections.abc import Iterator
 from datetime import UTC, datetime
 
+from . import frame_capture, metrics
+
 _MAX_FRAMES_PER_COMMAND = 20
-_FRAMES: dict[str, deque[dict]] = {}
+# Sum of raw frame lengths kept across all buffers.
+_MAX_TOTAL_BYTES = 256 * 1024
+
+# Printable ASCII as-is, everything else as a ``\xNN`` escape.
+_ASCII = tuple(chr(c) if 0x20 <= c < 0x7F else f"\\x{c:02x}" for c in range(256))
+
+
+class _Ring:
+    """Fixed-capacity FIFO of ``(ts, raw, crc_ok)`` in parallel slots."""
+
+    __slots__ = ("ts", "raw", "ok", "head", "size")
+
+    def __init__(self, capacity: int):
+        self.ts = [0.0] * capacity
+        self.raw: list[bytes | None] = [None] * capacity
+        self.ok = bytearray(capacity)
+        self.head = 0  # next slot to write
+        self.size = 0
+
+    def push(self, ts: float, raw: bytes, ok: bool) -> int:
+        """Store a frame; returns the byte count of the frame it overwrote."""
+        slot = self.head
+        overwritten = self.raw[slot]
+        self.ts[slot] = ts
+        self.raw[slot] = raw
+        self.ok[slot] = ok
+        self.head = (slot + 1) % len(self.raw)
+        if overwritten is None:
+            self.size += 1
+            return 0
+        return len(overwritten)
+
+    def _oldest(self) -> int:
+        return (self.head - self.size) % len(self.raw)
+
+    def oldest_ts(self) -> float:
+        return self.ts[self._oldest()]
+
+    def pop_oldest(self) -> int:
+        slot = self._oldest()
+        freed = len(self.raw[slot])
+        self.raw[slot] = None
+        self.size -= 1
+        return freed
+
+    def frames(self) -> Iterator[tuple[float, bytes, bool]]:
+        """Oldest to newest."""
+        cap = len(self.raw)
+        start = self._oldest()
+        for i in range(self.size):
+            slot = (start + i) % cap
+            yield self.ts[slot], self.raw[slot], bool(self.ok[slot])
+
+
+_capacity = _MAX_FRAMES_PER_COMMAND
+_budget = _MAX_TOTAL_BYTES
+_total_bytes = 0
+_FRAMES: dict[tuple[str, str], _Ring] = {}
 
 
 def _safe_ascii(b: bytes) -> str:
     """Render ``b`` as printable ASCII with non-printable bytes shown as
     ``\\xNN`` escapes. Keeps the diagnostic readable even when the frame
     contains CRC bytes / control chars / random corruption."""
-    return "".join(
-        chr(c) if 0x20 <= c < 0x7F else f"\\x{c:02x}" for c in b
-    )
+    return "".join(map(_ASCII.__getitem__, b))
+
+
+def record(
+    command: str,
+    raw_bytes: bytes,
+    crc_valid: bool,
+    device: str | None = None,
+    capture: bool = True,
+) -> None:
+    """Append one frame to the (device, command) ring buffer.
+
+    ``device`` defaults to the one bound by the coordinator for the
+    current read (``""`` outside a poll). ``capture=False`` keeps the
+    frame out of the persistent capture file (replayed frames).
+    """
+    global _total_bytes
+    if device is None:
+        device = metrics.bound_label("device")
+    if capture:
+        frame_capture.append(device, command, raw_bytes, crc_valid)
+    if not _capacity:
+        return
+    ring = _FRAMES.get((device, command))
+    if ring is None:
+        ring = _FRAMES[(device, command)] = _Ring(_capacity)
+    raw = bytes(raw_bytes)  # no copy for ``bytes``; detaches a bytearray
+    _total_bytes += len(raw) - ring.push(time.monotonic(), raw, crc_valid)
+    if _total_bytes > _budget:
+        _evict()
+
+
+def _evict() -> None:
+    """Drop globally-oldest frames until the byte budget holds again."""
+    global _total_bytes
+    while _total_bytes > _budget:
+        live = [ring for ring in _FRAMES.values() if ring.size]
+        if not live:
+            break
+        _total_bytes -= min(live, key=_Ring.oldest_ts).pop_oldest()
+
 
+def configure(frames_per_command: int | None = None, budget_bytes: int | None = None) -> None:
+    """Resize every buffer (newest frames kept); ``0`` frames disables recording."""
+    global _budget, _capacity, _total_bytes
+    if budget_bytes is not None:
+        _budget = budget_bytes
+    if frames_per_command is not None and frames_per_command != _capacity:
+        _capacity = frames_per_command
+        for key, ring in list(_FRAMES.items()):
+            frames = list(ring.frames())[-_capacity:] if _capacity else []
+            if not frames:
+                del _FRAMES[key]
+                continue
+            resized = _FRAMES[key] = _Ring(_capacity)
+            for ts, raw, ok in frames:
+                resized.push(ts, raw, ok)
+        _total_bytes = sum(
+            len(raw) for ring in _FRAMES.values() for _, raw, _ in ring.frames()
+        )
+    _evict()
 
-def record(command: str, raw_bytes: bytes, crc_valid: bool) -> None:
-    """Append one frame snapshot to the per-command ring buffer."""
-    buf = _FRAMES.get(command)
-    if buf is None:
-        buf = deque(maxlen=_MAX_FRAMES_PER_COMMAND)
-        _FRAMES[command] = buf
-    buf.append({
-        "timestamp": datetime.now(UTC).isoformat(),
-        "byte_count": len(raw_bytes),
-        "crc_valid": crc_valid,
-        "raw_hex": raw_bytes.hex(" "),
-        "raw_ascii": _safe_ascii(raw_bytes),
-    })
 
+def snapshot(device: str | None = None) -> dict[str, list[dict]]:
+    """Return a JSON-serialisable snapshot of all buffers for diagnostics.
 
-def snapshot() -> dict[str, list[dict]]:
-    """Return a JSON-serialisable snapshot of all buffers for diagnostics."""
-    return {cmd: list(buf) for cmd, buf in _FRAMES.items()}
+    Keys are the command, prefixed with the device id for frames read on
+    behalf of a coordinator target; ``device`` restricts to one target.
+    """
+    # Monotonic -> wall clock, evaluated once for the whole snapshot.
+    to_wall = time.time() - time.monotonic()
+    out: dict[str, list[dict]] = {}
+    for (dev, command), ring in _FRAMES.items():
+        if not ring.size or (device is not None and dev != device):
+            continue
+        out[f"{dev} {command}" if dev else command] = [
+            {
+                "timestamp": datetime.fromtimestamp(ts + to_wall, UTC).isoformat(),
+                "byte_count": len(raw),
+                "crc_valid": ok,
+                "raw_hex": raw.hex(" "),
+                "raw_ascii": _safe_ascii(raw),
+            }
+            for ts, raw, ok in ring.frames()
+        ]
+    return out
 
 
 def clear() -> None:
     """Drop all buffers — called on integration unload to free memory."""
+    global _total_bytes
     _FRAMES.clear()
+    _total_bytes = 0
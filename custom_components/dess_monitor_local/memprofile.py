@@ -0,0 +1,246 @@
+"""Opt-in allocation profile of a few poll cycles, for memory creep.
+
+A hub that grows by a few MB a day can't be attributed from the
+outside: Home Assistant's process RSS says *that* it grows, not which
+session map, cache or future list holds on to the memory. The
+``profile_memory`` service starts ``tracemalloc``, snapshots the heap at
+the start of the next coordinator cycle and again after N cycles, and
+the diff — restricted to allocations made *by this integration's code*
+— appears in the diagnostics download under ``"memory_profile"``.
+
+Implementation choices:
+
+* Process-wide, like ``tracing``: every coordinator calls
+  :func:`begin_cycle` / :func:`end_cycle`, so with several config
+  entries each entry's cycle counts towards N.
+* Allocations are attributed to the innermost traceback frame inside
+  this package, not to the frame that called ``malloc``: a future made
+  by ``loop.create_future()`` for an EyBond request is charged to the
+  line in ``eybond_dongle.py`` that asked for it. That needs deeper
+  tracebacks (``frames``, default 10) than tracemalloc's default of 1.
+* Lines are rolled up into components (transports, decoders, entities,
+  ``frame_log``, EyBond sessions, ...) so the report first says *where*
+  and then *which line*. Sizes of the integration's long-lived
+  structures (EyBond sessions and their pending futures, the Modbus
+  snapshot cache, ``frame_log`` buffers, asyncio tasks) are sampled at
+  both snapshots next to the heap diff.
+* Tracing costs CPU and roughly doubles the memory of every traced
+  allocation, so ``tracemalloc`` is stopped again as soon as the second
+  snapshot is taken (unless something else had started it). The diff
+  is only computed in :func:`report`, from the executor, when
+  diagnostics are downloaded.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tracemalloc
+from datetime import UTC, datetime
+from typing import Any
+
+DEFAULT_CYCLES = 10
+DEFAULT_FRAMES = 10
+DEFAULT_TOP = 20
+
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (path prefix relative to the package, component); first match wins.
+_COMPONENTS = (
+    ("api/protocols/eybond", "eybond"),
+    ("api/protocols/", "transports"),
+    ("api/adapters/", "transports"),
+    ("api/decoders/", "decoders"),
+    ("api/commands/", "command_queue"),
+    ("coordinators/", "coordinator"),
+    ("sensors/", "entities"),
+    ("sensor.py", "entities"),
+    ("binary_sensor.py", "entities"),
+    ("number.py", "entities"),
+    ("select.py", "entities"),
+    ("switch.py", "entities"),
+    ("button.py", "entities"),
+    ("frame_log.py", "frame_log"),
+    ("frame_capture.py", "frame_capture"),
+)
+
+_Line = tuple[str, int]
+
+_cycles_left = 0
+_frames = DEFAULT_FRAMES
+_top = DEFAULT_TOP
+_owns_tracemalloc = False
+# (wall time, heap snapshot, live-object sizes) at the window's edges
+_before: tuple[datetime, tracemalloc.Snapshot, dict[str, int]] | None = None
+_after: tuple[datetime, tracemalloc.Snapshot, dict[str, int]] | None = None
+_report: dict[str, Any] | None = None
+
+
+def start(cycles: int = DEFAULT_CYCLES, frames: int = DEFAULT_FRAMES, top: int = DEFAULT_TOP) -> None:
+    """Arm a profile of the next ``cycles`` poll cycles (replaces any previous one)."""
+    global _cycles_left, _frames, _top, _owns_tracemalloc, _before, _after, _report
+    cancel()
+    _cycles_left, _frames, _top = max(cycles, 1), max(frames, 1), max(top, 1)
+    _before = _after = _report = None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(_frames)
+        _owns_tracemalloc = True
+
+
+def cancel() -> None:
+    """Stop a running profile; a finished report is kept."""
+    global _cycles_left, _owns_tracemalloc, _before
+    if _cycles_left and _after is None:
+        _before = None
+    _cycles_left = 0
+    if _owns_tracemalloc:
+        tracemalloc.stop()
+        _owns_tracemalloc = False
+
+
+def running() -> bool:
+    return _cycles_left > 0
+
+
+def _take() -> tuple[datetime, tracemalloc.Snapshot, dict[str, int]]:
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, os.path.join(_PKG_DIR, "*"), all_frames=True)]
+    )
+    return datetime.now(UTC), snapshot, _live_objects()
+
+
+def begin_cycle() -> None:
+    """Take the baseline snapshot at the first cycle after :func:`start`."""
+    global _before
+    if _cycles_left and _before is None:
+        _before = _take()
+
+
+def end_cycle() -> None:
+    """Count a finished cycle; the last one takes the second snapshot."""
+    global _cycles_left, _after
+    if not _cycles_left or _before is None:
+        return
+    _cycles_left -= 1
+    if not _cycles_left:
+        _after = _take()
+        cancel()
+
+
+def _live_objects() -> dict[str, int]:
+    """Sizes of the integration's long-lived structures, where loaded."""
+    out: dict[str, int] = {}
+    frame_log = sys.modules.get(f"{__package__}.frame_log")
+    if frame_log is not None:
+        out["frame_log_buffers"] = len(frame_log._FRAMES)
+        out["frame_log_bytes"] = frame_log._total_bytes
+    eybond = sys.modules.get(f"{__package__}.api.protocols.eybond_dongle")
+    if eybond is not None:
+        managers = list(eybond._managers.values())
+        sessions = [s for mgr in managers for s in mgr._sessions]
+        out["eybond_managers"] = len(managers)
+        out["eybond_sessions"] = len(sessions)
+        out["eybond_identified_sessions"] = sum(len(mgr._sessions_by_pn) for mgr in managers)
+        out["eybond_ready_events"] = sum(len(mgr._ready_by_pn) for mgr in managers)
+        out["eybond_pending_futures"] = sum(len(s.pending) for s in sessions)
+    snapshot_cache = sys.modules.get(f"{__package__}.api.adapters.snapshot_cache")
+    if snapshot_cache is not None:
+        out["snapshot_cache"] = len(snapshot_cache.snapshots)
+    try:
+        out["asyncio_tasks"] = len(asyncio.all_tasks())
+    except RuntimeError:  # not on the event loop
+        pass
+    return out
+
+
+def _component(filename: str) -> str:
+    rel = os.path.relpath(filename, _PKG_DIR).replace(os.sep, "/")
+    for prefix, component in _COMPONENTS:
+        if rel.startswith(prefix):
+            return component
+    return "other"
+
+
+def _by_line(snapshot: tracemalloc.Snapshot) -> dict[_Line, list[int]]:
+    """``{(file, line): [bytes, blocks]}`` charged to the innermost own frame."""
+    out: dict[_Line, list[int]] = {}
+    for stat in snapshot.statistics("traceback"):
+        # Tracebacks run oldest -> most recent frame.
+        for frame in reversed(stat.traceback):
+            if frame.filename.startswith(_PKG_DIR):
+                slot = out.setdefault((frame.filename, frame.lineno), [0, 0])
+                slot[0] += stat.size
+                slot[1] += stat.count
+                break
+    return out
+
+
+def _where(line: _Line) -> str:
+    return f"{os.path.relpath(line[0], _PKG_DIR).replace(os.sep, '/')}:{line[1]}"
+
+
+def report() -> dict[str, Any] | None:
+    """The profile for diagnostics: ``None`` if never run, else its state.
+
+    CPU-heavy on the first call after the window closes (it groups every
+    traced allocation), so call it from the executor. The result is
+    cached and the snapshots are released.
+    """
+    global _before, _after, _report
+    if _report is not None:
+        return _report
+    if _after is None:
+        if not _cycles_left:
+            return None
+        return {"state": "running", "cycles_left": _cycles_left, "started": _before is not None}
+
+    (t0, snap0, live0), (t1, snap1, live1) = _before, _after
+    before, after = _by_line(snap0), _by_line(snap1)
+    rows = []
+    components: dict[str, dict[str, int]] = {}
+    for line in before.keys() | after.keys():
+        size0, count0 = before.get(line, (0, 0))
+        size1, count1 = after.get(line, (0, 0))
+        component = _component(line[0])
+        rows.append((line, component, size1, count1, size1 - size0, count1 - count0))
+        totals = components.setdefault(
+            component, {"size_b": 0, "count": 0, "growth_b": 0, "count_growth": 0}
+        )
+        totals["size_b"] += size1
+        totals["count"] += count1
+        totals["growth_b"] += size1 - size0
+        totals["count_growth"] += count1 - count0
+
+    _report = {
+        "state": "done",
+        "started": t0.isoformat(),
+        "finished": t1.isoformat(),
+        "traceback_frames": _frames,
+        "total": {
+            key: sum(c[key] for c in components.values())
+            for key in ("size_b", "count", "growth_b", "count_growth")
+        },
+        "components": dict(sorted(components.items(), key=lambda kv: -kv[1]["growth_b"])),
+        "top_allocators": [
+            {"where": _where(line), "component": comp, "size_b": size, "count": count}
+            for line, comp, size, count, _, _ in sorted(rows, key=lambda r: -r[2])[:_top]
+        ],
+        "top_growth": [
+            {"where": _where(line), "component": comp, "growth_b": growth, "count_growth": count_growth}
+            for line, comp, _, _, growth, count_growth in sorted(rows, key=lambda r: -r[4])[:_top]
+            if growth > 0
+        ],
+        "live_objects": {
+            name: {"before": live0.get(name, 0), "after": value}
+            for name, value in live1.items()
+        },
+    }
+    _before = _after = None
+    return _report
+
+
+def clear() -> None:
+    """Stop any profile and drop its report (integration unload)."""
+    global _before, _after, _report
+    cancel()
+    _before = _after = _report = None
@@ -0,0 +1,206 @@
+"""In-memory latency / reliability metrics for the transport layer.
+
+Answers the questions the logs can't: how long QPIGS takes on a given
+device, how often a gateway corrupts CRC, how long commands sit in the
+``CommandQueue`` — the numbers needed to size update intervals and spot
+a failing gateway. Surfaced through the diagnostics download and a few
+optional diagnostic sensors.
+
+Implementation choices:
+
+* Module-level registry (like ``frame_log``) so transports and the queue
+  can record without threading ``hass`` through every protocol class.
+* Two primitive kinds only: monotonically increasing **counters** and
+  **fixed-bucket histograms** (Prometheus-style cumulative ``le``
+  buckets). Fixed buckets keep memory O(series) however long HA runs;
+  percentiles are estimated by linear interpolation inside the bucket.
+* Labels are ``device`` / ``command`` / ``transport``. The coordinator
+  binds them for the duration of a request with :func:`bind`; they live
+  in a ``ContextVar``, so protocol callbacks running inside that request
+  (``data_received`` of a connection opened by it) pick them up without
+  being passed anything. Explicit keyword labels win over bound ones.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LABEL_NAMES = ("device", "command", "transport")
+
+# Seconds: sub-100 ms serial answers up to multi-second dongle round trips.
+TIME_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Response sizes: QMOD (~8 B) … QPIRI / PI18 GS (~110 B) … Modbus blocks.
+BYTE_BUCKETS = (16, 32, 64, 128, 256, 512, 1024)
+
+_Labels = tuple[str, str, str]
+
+_bound: ContextVar[dict[str, str] | None] = ContextVar(
+    "dess_monitor_local_metric_labels", default=None
+)
+
+
+class Histogram:
+    """Fixed upper-bound buckets plus running count / sum."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bound plus the implicit +Inf bucket.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> float | None:
+        """Estimate the ``q``-quantile (0–1) by interpolating in its bucket.
+
+        Values in the +Inf bucket are reported as the last finite bound —
+        a floor, which is the honest answer for an open-ended bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                if i == len(self.bounds):
+                    return float(self.bounds[-1])
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            if i < len(self.bounds):
+                lower = self.bounds[i]
+        return float(self.bounds[-1])
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, n in zip((*self.bounds, math.inf), self.counts, strict=True):
+            cumulative += n
+            buckets["+Inf" if bound == math.inf else str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": buckets,
+            "p50": _round(self.percentile(0.50)),
+            "p95": _round(self.percentile(0.95)),
+        }
+
+
+_COUNTERS: dict[str, dict[_Labels, float]] = {}
+_HISTOGRAMS: dict[str, dict[_Labels, Histogram]] = {}
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 4)
+
+
+def _labels(explicit: dict[str, str]) -> _Labels:
+    bound = _bound.get() or {}
+    return tuple(explicit.get(n) or bound.get(n) or "" for n in LABEL_NAMES)
+
+
+@contextmanager
+def bind(**labels: str) -> Iterator[None]:
+    """Attach ``device`` / ``command`` / ``transport`` to everything recorded
+    inside the block (including protocol callbacks it spawns)."""
+    merged = {**(_bound.get() or {}), **{k: v for k, v in labels.items() if v}}
+    token = _bound.set(merged)
+    try:
+        yield
+    finally:
+        _bound.reset(token)
+
+
+def bound_label(name: str) -> str:
+    """Label ``name`` bound by the enclosing :func:`bind`, or ``""``."""
+    return (_bound.get() or {}).get(name, "")
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    series = _COUNTERS.setdefault(name, {})
+    key = _labels(labels)
+    series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = TIME_BUCKETS,
+            **labels: str) -> None:
+    series = _HISTOGRAMS.setdefault(name, {})
+    key = _labels(labels)
+    hist = series.get(key)
+    if hist is None:
+        hist = series[key] = Histogram(buckets)
+    hist.observe(value)
+
+
+def counter(name: str, **labels: str) -> float:
+    """Sum of ``name`` over every series matching the given labels."""
+    return sum(
+        v for key, v in _COUNTERS.get(name, {}).items() if _matches(key, labels)
+    )
+
+
+def percentile(name: str, q: float, **labels: str) -> float | None:
+    """``q``-quantile over every series of ``name`` matching ``labels``."""
+    merged: Histogram | None = None
+    for key, hist in _HISTOGRAMS.get(name, {}).items():
+        if not _matches(key, labels):
+            continue
+        if merged is None:
+            merged = Histogram(hist.bounds)
+        if merged.bounds != hist.bounds:
+            continue
+        merged.counts = [a + b for a, b in zip(merged.counts, hist.counts, strict=True)]
+        merged.count += hist.count
+        merged.sum += hist.sum
+    return None if merged is None else merged.percentile(q)
+
+
+def _matches(key: _Labels, wanted: dict[str, str]) -> bool:
+    return all(key[LABEL_NAMES.index(n)] == v for n, v in wanted.items())
+
+
+def transport_of(uri: str) -> str:
+    """Transport label for a device URI (``modbus``, ``eybond``, ``serial``…)."""
+    if "://" not in uri:
+        return "serial"
+    scheme = uri.split("://", 1)[0]
+    return "elfin" if scheme == "tcp" else scheme
+
+
+def snapshot() -> dict[str, list[dict]]:
+    """JSON-serialisable dump of every series for diagnostics."""
+    def _series_labels(key: _Labels) -> dict[str, str]:
+        return {n: v for n, v in zip(LABEL_NAMES, key, strict=True) if v}
+
+    return {
+        "counters": [
+            {"name": name, "labels": _series_labels(key), "value": value}
+            for name, series in sorted(_COUNTERS.items())
+            for key, value in sorted(series.items())
+        ],
+        "histograms": [
+            {"name": name, "labels": _series_labels(key), **hist.to_dict()}
+            for name, series in sorted(_HISTOGRAMS.items())
+            for key, hist in sorted(series.items())
+        ],
+    }
+
+
+def clear() -> None:
+    """Drop all series — called on integration unload."""
+    _COUNTERS.clear()
+    _HISTOGRAMS.clear()
@@ -0,0 +1,482 @@
+"""Columnar, append-only on-disk log of decoded readings.
+
+The HA recorder keeps one state string per entity and update, and most
+installs purge it after ten days. With the ``sample_log_days`` option
+set, the coordinator appends every cycle's decoded sections (QPIGS,
+QPIGS2, QPIRI, QMOD, warning bits) here instead, as typed fixed-width
+columns that stay cheap to keep for months.
+
+Layout under the root directory::
+
+    <device>/<YYYY-MM-DD>/      one segment per device and UTC day
+        ts.f8                   float64 epoch seconds, one per row
+        qpigs.grid_voltage.f4   float32 per numeric field, NaN = missing
+        qmod.operating_mode.u2  uint16 code per text field, 0xFFFF = missing
+        schema.json             column kinds and the text dictionaries
+
+Every column of a segment has exactly one value per row, so a column is
+a plain little-endian array that ``numpy.memmap`` maps without copying
+or parsing. A field's kind is fixed by the first value seen in the
+segment: numbers (also numeric strings such as ``"239.7"``) go to
+float32 — inverter readings carry at most five significant digits —
+and anything else (enum members, priority names) is dictionary-encoded.
+A field first seen mid-day gets its column backfilled with "missing".
+
+Rows are buffered in memory and written once per ``flush_interval``
+(and on close / day rollover): each column file is opened, appended to
+and closed again, so a hub with hundreds of devices holds no file
+handles between flushes and pays a few syscalls per column per flush,
+not per row. A crash loses at most the unflushed interval. ``ts.f8`` is
+written last, so after a crash mid-flush the extra values are trimmed
+on reopen. Whole day directories past the retention are removed on day
+rollover.
+
+:class:`SampleLogWriter` does blocking file I/O — the coordinator calls
+it in the executor. :class:`SampleLog` reads and aggregates; numpy is
+used when installed (zero-copy memmaps) and otherwise the columns are
+loaded into ``array.array``.
+"""
+from __future__ import annotations
+
+import array
+import bisect
+import json
+import math
+import os
+import re
+import shutil
+import struct
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional: reads fall back to array.array
+    np = None
+
+KIND_NUMBER = "f4"
+KIND_TEXT = "u2"
+_WIDTH = {"f8": 8, KIND_NUMBER: 4, KIND_TEXT: 2}
+_ARRAY_CODE = {"f8": "d", KIND_NUMBER: "f", KIND_TEXT: "H"}
+_TS_FILE = "ts.f8"
+_SCHEMA_FILE = "schema.json"
+_MISSING_CODE = 0xFFFF
+
+_F8 = struct.Struct("<d")
+_F4 = struct.Struct("<f")
+_U2 = struct.Struct("<H")
+_NAN = _F4.pack(math.nan)
+_NO_CODE = _U2.pack(_MISSING_CODE)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, UTC).strftime("%Y-%m-%d")
+
+
+def _typed(value: Any) -> float | str | None:
+    """A decoded field as a column value: float, text, or ``None`` (skip)."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return None
+
+
+def flatten(sections: Mapping[str, Any]) -> dict[str, float | str]:
+    """``{"qpigs": {"grid_voltage": "239.7"}}`` -> ``{"qpigs.grid_voltage": 239.7}``.
+
+    Sections that are empty or carry an ``error`` (NAK, failed read) are
+    left out, so their columns read "missing" for the row.
+    """
+    row: dict[str, float | str] = {}
+    for section, fields in sections.items():
+        if not isinstance(fields, Mapping) or not fields or "error" in fields:
+            continue
+        for field, value in fields.items():
+            typed = _typed(value)
+            if typed is not None:
+                row[f"{section}.{field}"] = typed
+    return row
+
+
+def _load_schema(path: str) -> dict[str, dict]:
+    try:
+        with open(os.path.join(path, _SCHEMA_FILE), encoding="utf-8") as f:
+            return json.load(f)["columns"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _file_rows(path: str, kind: str) -> int:
+    try:
+        return os.path.getsize(path) // _WIDTH[kind]
+    except OSError:
+        return 0
+
+
+class _Column:
+    __slots__ = ("kind", "file", "pending", "dictionary", "codes")
+
+    def __init__(self, kind: str, file: str, dictionary: list[str] | None = None):
+        self.kind = kind
+        self.file = file
+        self.pending = bytearray()  # packed values not yet on disk
+        self.dictionary = dictionary if dictionary is not None else []
+        self.codes = {text: code for code, text in enumerate(self.dictionary)}
+
+    def encode(self, value: float | str | None) -> tuple[bytes, bool]:
+        """Packed value and whether the dictionary grew."""
+        if self.kind == KIND_NUMBER:
+            return (_F4.pack(value) if isinstance(value, float) else _NAN), False
+        if value is None:
+            return _NO_CODE, False
+        text = value if isinstance(value, str) else f"{value:g}"
+        code = self.codes.get(text)
+        if code is not None:
+            return _U2.pack(code), False
+        if len(self.dictionary) >= _MISSING_CODE:
+            return _NO_CODE, False
+        code = self.codes[text] = len(self.dictionary)
+        self.dictionary.append(text)
+        return _U2.pack(code), True
+
+
+class _Segment:
+    """One device-day directory being appended to, rows buffered in memory."""
+
+    def __init__(self, path: str, day: str):
+        self.path = path
+        self.day = day
+        os.makedirs(path, exist_ok=True)
+        self.columns = {
+            name: _Column(spec["kind"], spec["file"], spec.get("dictionary"))
+            for name, spec in _load_schema(path).items()
+        }
+        self.rows = _file_rows(os.path.join(path, _TS_FILE), "f8")  # on disk
+        self.buffered = 0
+        self._ts = bytearray()
+        self._schema_changed = False
+        # Trim (after a crash mid-flush) or pad (column file lost) to ``rows``.
+        for column in self.columns.values():
+            file = os.path.join(path, column.file)
+            have = _file_rows(file, column.kind)
+            if have == self.rows:
+                continue
+            with open(file, "ab") as f:
+                if have > self.rows:
+                    f.truncate(self.rows * _WIDTH[column.kind])
+                else:
+                    f.write(column.encode(None)[0] * (self.rows - have))
+
+    def _add_column(self, name: str, value: float | str) -> _Column:
+        kind = KIND_NUMBER if isinstance(value, float) else KIND_TEXT
+        file = f"{_slug(name)}.{kind}"
+        while any(c.file == file for c in self.columns.values()):
+            file = f"_{file}"
+        column = self.columns[name] = _Column(kind, file)
+        # "wb": a file not in the schema is a leftover of a crash.
+        with open(os.path.join(self.path, file), "wb") as f:
+            f.write(column.encode(None)[0] * self.rows)
+        column.pending += column.encode(None)[0] * self.buffered
+        return column
+
+    def _save_schema(self) -> None:
+        columns = {}
+        for name, column in self.columns.items():
+            columns[name] = {"kind": column.kind, "file": column.file}
+            if column.kind == KIND_TEXT:
+                columns[name]["dictionary"] = column.dictionary
+        tmp = os.path.join(self.path, _SCHEMA_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "columns": columns}, f, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self.path, _SCHEMA_FILE))
+
+    def append(self, ts: float, row: Mapping[str, float | str]) -> None:
+        for name, value in row.items():
+            if name not in self.columns:
+                self._add_column(name, value)
+                self._schema_changed = True
+        for name, column in self.columns.items():
+            packed, grew = column.encode(row.get(name))
+            column.pending += packed
+            self._schema_changed |= grew
+        self._ts += _F8.pack(ts)
+        self.buffered += 1
+
+    def flush(self) -> None:
+        """Write the buffered rows: one open/append/close per column."""
+        if not self.buffered:
+            return
+        if self._schema_changed:
+            self._save_schema()
+            self._schema_changed = False
+        for column in self.columns.values():
+            with open(os.path.join(self.path, column.file), "ab") as f:
+                f.write(column.pending)
+            column.pending.clear()
+        with open(os.path.join(self.path, _TS_FILE), "ab") as f:
+            f.write(self._ts)
+        self._ts.clear()
+        self.rows += self.buffered
+        self.buffered = 0
+
+
+class SampleLogWriter:
+    """Appends rows to the per-device day segments under ``root`` (blocking).
+
+    Rows reach disk every ``flush_interval`` seconds of row time, on
+    :meth:`flush` and on :meth:`close`.
+    """
+
+    def __init__(self, root: str, retention_days: int = 0, flush_interval: float = 60.0):
+        self.root = root
+        # Full days kept before today's; 0 keeps everything.
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self._segments: dict[str, _Segment] = {}
+        self._flushed_at: float | None = None
+
+    def append(self, device: str, ts: float, sections: Mapping[str, Any]) -> None:
+        row = flatten(sections)
+        if row:
+            self._append(device, ts, row)
+        self._maybe_flush(ts)
+
+    def _append(self, device: str, ts: float, row: Mapping[str, float | str]) -> None:
+        day = _day(ts)
+        segment = self._segments.get(device)
+        if segment is None or segment.day != day:
+            if segment is not None:
+                segment.flush()
+            device_dir = os.path.join(self.root, _slug(device))
+            segment = self._segments[device] = _Segment(os.path.join(device_dir, day), day)
+            self._prune(device_dir, ts)
+        segment.append(ts, row)
+
+    def append_cycle(self, ts: float, devices: Mapping[str, Mapping[str, Any]]) -> None:
+        """One row per device for a poll cycle."""
+        for device, sections in devices.items():
+            row = flatten(sections)
+            if row:
+                self._append(device, ts, row)
+        self._maybe_flush(ts)
+
+    def _maybe_flush(self, ts: float) -> None:
+        if self._flushed_at is None:
+            self._flushed_at = ts
+        elif ts - self._flushed_at >= self.flush_interval:
+            self.flush()
+            self._flushed_at = ts
+
+    def flush(self) -> None:
+        """Write every buffered row."""
+        for segment in self._segments.values():
+            segment.flush()
+
+    def _prune(self, device_dir: str, ts: float) -> None:
+        if self.retention_days <= 0:
+            return
+        cutoff = _day(ts - timedelta(days=self.retention_days).total_seconds())
+        for day in os.listdir(device_dir):
+            if day < cutoff:
+                shutil.rmtree(os.path.join(device_dir, day), ignore_errors=True)
+
+    def close(self) -> None:
+        self.flush()
+        self._segments.clear()
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+def _load(path: str, kind: str, rows: int) -> Sequence:
+    if np is not None:
+        if not rows:
+            return np.empty(0, dtype=f"<{kind}")
+        return np.memmap(path, dtype=f"<{kind}", mode="r", shape=(rows,))
+    values = array.array(_ARRAY_CODE[kind])
+    if rows:
+        with open(path, "rb") as f:
+            values.frombytes(f.read(rows * _WIDTH[kind]))
+    return values
+
+
+def _load_missing(rows: int) -> Sequence[float]:
+    if np is not None:
+        return np.full(rows, np.nan, dtype="<f4")
+    return array.array("f", [math.nan]) * rows
+
+
+def _index(ts: Sequence[float], value: float, right: bool = False) -> int:
+    if np is not None:
+        return int(np.searchsorted(ts, value, side="right" if right else "left"))
+    return (bisect.bisect_right if right else bisect.bisect_left)(ts, value)
+
+
+def _concat(parts: list[Sequence], kind: str) -> Sequence:
+    if len(parts) == 1:
+        return parts[0]
+    if np is not None:
+        return np.concatenate(parts) if parts else np.empty(0, dtype=f"<{kind}")
+    out = array.array(_ARRAY_CODE[kind])
+    for part in parts:
+        out.extend(part)
+    return out
+
+
+def _number_stats(values: Sequence[float]) -> dict[str, float] | None:
+    if np is not None:
+        v = np.asarray(values, dtype=np.float64)
+        v = v[~np.isnan(v)]
+        if not v.size:
+            return None
+        return {"count": int(v.size), "min": float(v.min()), "max": float(v.max()), "mean": float(v.mean())}
+    v = [x for x in values if not math.isnan(x)]
+    if not v:
+        return None
+    return {"count": len(v), "min": min(v), "max": max(v), "mean": math.fsum(v) / len(v)}
+
+
+def _text_stats(values: Iterable[str | None]) -> dict[str, int] | None:
+    counts: dict[str, int] = {}
+    for value in values:
+        if value is not None:
+            counts[value] = counts.get(value, 0) + 1
+    return counts or None
+
+
+class SampleLog:
+    """Read side: time-range reads and aggregates over the day segments."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def devices(self) -> list[str]:
+        try:
+            return sorted(
+                d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d))
+            )
+        except OSError:
+            return []
+
+    def days(self, device: str) -> list[str]:
+        try:
+            return sorted(os.listdir(os.path.join(self.root, _slug(device))))
+        except OSError:
+            return []
+
+    def columns(self, device: str) -> dict[str, str]:
+        """Column name -> kind over all of ``device``'s days."""
+        out: dict[str, str] = {}
+        for day in self.days(device):
+            for name, spec in _load_schema(os.path.join(self.root, _slug(device), day)).items():
+                out.setdefault(name, spec["kind"])
+        return dict(sorted(out.items()))
+
+    def _segments(self, device: str, since: float | None, until: float | None):
+        first = _day(since) if since is not None else ""
+        last = _day(until) if until is not None else "9999"
+        for day in self.days(device):
+            if first <= day <= last:
+                yield os.path.join(self.root, _slug(device), day)
+
+    def read(
+        self, device: str, column: str, since: float | None = None, until: float | None = None
+    ) -> tuple[Sequence[float], Sequence]:
+        """``(timestamps, values)`` of ``column`` in ``[since, until]``.
+
+        Numeric columns come back as float32 arrays (NaN = missing) —
+        read-only memmap views with numpy when the range lies within one
+        day; text columns as a list of ``str | None``.
+        """
+        ts_parts: list[Sequence] = []
+        value_parts: list[Sequence] = []
+        kind = self.columns(device).get(column, KIND_NUMBER)
+        texts: list[str | None] = []
+        for path in self._segments(device, since, until):
+            spec = _load_schema(path).get(column)
+            rows = _file_rows(os.path.join(path, _TS_FILE), "f8")
+            if spec is not None:
+                rows = min(rows, _file_rows(os.path.join(path, spec["file"]), spec["kind"]))
+            ts = _load(os.path.join(path, _TS_FILE), "f8", rows)
+            lo = 0 if since is None else _index(ts, since)
+            hi = rows if until is None else _index(ts, until, right=True)
+            if lo >= hi:
+                continue
+            ts_parts.append(ts[lo:hi])
+            if spec is None or spec["kind"] != kind:  # not recorded (as this kind) that day
+                if kind == KIND_TEXT:
+                    texts.extend([None] * (hi - lo))
+                else:
+                    value_parts.append(_load_missing(hi - lo))
+                continue
+            values = _load(os.path.join(path, spec["file"]), spec["kind"], rows)[lo:hi]
+            if kind == KIND_TEXT:
+                dictionary = spec.get("dictionary", [])
+                texts.extend(
+                    dictionary[c] if c < len(dictionary) else None for c in map(int, values)
+                )
+            else:
+                value_parts.append(values)
+        timestamps = _concat(ts_parts, "f8")
+        return timestamps, texts if kind == KIND_TEXT else _concat(value_parts, KIND_NUMBER)
+
+    def aggregate(
+        self,
+        device: str,
+        columns: Iterable[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        bucket: float | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Per-column statistics over ``[since, until]``, optionally per ``bucket`` seconds.
+
+        Each entry is ``{"start": <epoch s>, ...}`` plus ``count`` / ``min``
+        / ``max`` / ``mean`` for numeric columns or ``counts`` (rows per
+        text value, e.g. time in each operating mode) for text columns.
+        Buckets without data are omitted.
+        """
+        kinds = self.columns(device)
+        out: dict[str, list[dict[str, Any]]] = {}
+        for column in kinds if columns is None else columns:
+            ts, values = self.read(device, column, since, until)
+            if not len(ts):
+                out[column] = []
+                continue
+            start = ts[0] if since is None else since
+            if bucket:
+                start = math.floor(start / bucket) * bucket
+                edges = [start + i * bucket for i in range(int((ts[-1] - start) // bucket) + 2)]
+            else:
+                edges = [start, math.inf]
+            entries = []
+            for lo_edge, hi_edge in zip(edges, edges[1:], strict=False):
+                lo, hi = _index(ts, lo_edge), _index(ts, hi_edge)
+                if lo >= hi:
+                    continue
+                if kinds.get(column) == KIND_TEXT:
+                    stats = _text_stats(values[lo:hi])
+                    stats = stats and {"counts": stats}
+                else:
+                    stats = _number_stats(values[lo:hi])
+                if stats:
+                    entries.append({"start": float(lo_edge), **stats})
+            out[column] = entries
+        return out
+
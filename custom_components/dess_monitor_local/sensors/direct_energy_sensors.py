@@ -97,6 +97,12 @@ class DirectEnergySensorBase(RestoreSensor, DirectTypedSensorBase):
 
         self._restored = True
         await super().async_added_to_hass()
+        if getattr(self.coordinator, "oversampling", False):
+            self.async_on_remove(
+                self.coordinator.async_add_sample_listener(
+                    self._inverter_device.inverter_id, self._ingest
+                )
+            )
 
     @property
     def available(self) -> bool:
@@ -104,6 +110,11 @@ class DirectEnergySensorBase(RestoreSensor, DirectTypedSensorBase):
         return super().available and self._restored
 
     def update_energy_value(self, current_value: float):
+        self._integrate(current_value)
+        self.async_write_ha_state()
+
+    def _integrate(self, current_value: float) -> None:
+        """Advance the trapezoid by one power sample, without writing state."""
         now = time.monotonic()
         elapsed_seconds = now - self._prev_ts
 
@@ -133,49 +144,68 @@ class DirectEnergySensorBase(RestoreSensor, DirectTypedSensorBase):
                 )
                 self._prev_power = None
                 self._prev_ts = now
-                self.async_write_ha_state()
                 return
 
         # Обновляем предыдущее значение мощности и время
         self._prev_power = current_value
         self._prev_ts = now
-        self.async_write_ha_state()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Каждое обновление координатора — берём свежую мощность и накапливаем энергию."""
-        section = self.data.get(self.data_section, {})
+    def _read_power(self, device_data: dict) -> float | None:
+        """Instantaneous power (W) feeding this integrator.
+
+        Returns ``None`` when the sample carries no reading (the
+        accumulator is left as is); raises ``ValueError`` / ``KeyError`` /
+        ``TypeError`` when the reading must be dropped and the trapezoid
+        reset.
+        """
+        section = device_data.get(self.data_section, {})
         raw = section.get(self.data_key)
         try:
             power = float(raw)
         except (TypeError, ValueError):
-            power = None
+            return None
 
         # Sanity-bound: a single sample within the trapezoidal step-guard's
         # 50 kW ceiling but still wildly above this inverter's actual rating
-        # would slip past update_energy_value() and silently bloat the
+        # would slip past _integrate() and silently bloat the
         # accumulator. Reject upfront — keeps PV / InverterOut / Apparent
         # integrators honest the same way the battery integrators are.
-        if power is not None and not is_plausible_power(power):
+        if not is_plausible_power(power):
             _LOGGER.debug(
                 "%s: implausible power reading (%.1f W); dropping sample",
                 self.entity_id or self._attr_unique_id,
                 power,
             )
+            raise ValueError("implausible power")
+        return power
+
+    def _ingest(self, device_data: dict) -> None:
+        """Feed one device sample into the integrator (no state write).
+
+        Called once per coordinator update, or — in oversampling mode —
+        once per fast QPIGS sample via the coordinator's sample listener.
+        """
+        try:
+            power = self._read_power(device_data)
+        except (KeyError, ValueError, TypeError):
             self._prev_power = None
             self._prev_ts = time.monotonic()
-            self.async_write_ha_state()
             return
-
         if power is not None:
-            # update_energy_value() writes the HA state internally; calling
-            # async_write_ha_state() again here would double the event-loop
-            # work per tick (HA logs "took 0.9s" when this stacks across
-            # all energy sensors on a busy loop).
-            self.update_energy_value(power)
-        else:
-            # No new sample — still publish so the accumulator stays visible.
-            self.async_write_ha_state()
+            self._integrate(power)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Каждое обновление координатора — берём свежую мощность и накапливаем энергию."""
+        # When oversampling, every sample was already integrated by
+        # _ingest() as it arrived; integrating the published one again
+        # would double-count it. Just publish the accumulator.
+        if not getattr(self.coordinator, "oversampling", False):
+            self._ingest(self.data)
+        # One write per tick, whatever the sample did — a second
+        # async_write_ha_state() would double the event-loop work (HA logs
+        # "took 0.9s" when this stacks across all energy sensors).
+        self.async_write_ha_state()
 
 
 class DirectPVEnergySensor(DirectEnergySensorBase):
@@ -205,17 +235,10 @@ class DirectPV2EnergySensor(DirectEnergySensorBase):
             name_suffix="PV2 Power Energy",
         )
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        try:
-            sec = self.data["qpigs2"]
-            current = float(sec["pv_current"])
-            voltage = float(sec["pv_voltage"])
-        except (KeyError, ValueError, TypeError):
-            self._prev_power = None
-            self._prev_ts = time.monotonic()
-            self.async_write_ha_state()
-            return
+    def _read_power(self, device_data: dict) -> float | None:
+        sec = device_data["qpigs2"]
+        current = float(sec["pv_current"])
+        voltage = float(sec["pv_voltage"])
 
         power = current * voltage
         if not is_plausible_power(power):
@@ -226,13 +249,8 @@ class DirectPV2EnergySensor(DirectEnergySensorBase):
                 voltage,
                 power,
             )
-            self._prev_power = None
-            self._prev_ts = time.monotonic()
-            self.async_write_ha_state()
-            return
-
-        # update_energy_value() already writes state; don't double-write.
-        self.update_energy_value(power)
+            raise ValueError("implausible power")
+        return power
 
 
 class DirectInverterOutputEnergySensor(DirectEnergySensorBase):
@@ -276,53 +294,41 @@ class DirectBatteryInEnergySensor(DirectEnergySensorBase):
             name_suffix="Battery In Energy",
         )
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        qpigs = self.data.get("qpigs", {})
-
-        try:
-            current_raw = qpigs.get("battery_charging_current")
-            # Use the live terminal voltage from QPIGS, not the static
-            # bulk_charging_voltage setpoint from QPIRI. Reasons:
-            #  - Physical correctness: P = I × V_live. The bulk setpoint
-            #    (e.g. 28.4 V) overstates power during bulk-rise (V_live
-            #    is 26-28 V) and understates during float (V_live ~27.2 V).
-            #  - Reliability: qpiri can be empty for a tick after a CRC
-            #    fail / coordinator freeze, while qpigs already has the
-            #    full reading. Reading both forced the sensor to drop
-            #    valid charge samples whenever qpiri momentarily lagged,
-            #    causing Battery IN Energy to chronically undercount vs
-            #    Battery OUT (round-trip > 100% in the stats).
-            voltage_raw = qpigs.get("battery_voltage")
-            if current_raw is None or voltage_raw is None:
-                raise ValueError("no data")
-            current = float(current_raw)
-            voltage = float(voltage_raw)
-            if math.isnan(current) or math.isnan(voltage):
-                raise ValueError("NaN")
-            # All-zeros == bridge offline / empty payload — skip silently.
-            if current == 0.0 and voltage == 0.0:
-                raise ValueError("no data")
-            if not is_plausible_battery_current(current) or not is_plausible_battery_voltage(voltage):
-                _LOGGER.debug(
-                    "%s: implausible reading (I=%.2f A, V=%.2f V); dropping sample",
-                    self.entity_id or self._attr_unique_id,
-                    current,
-                    voltage,
-                )
-                raise ValueError("out of plausible range")
-        except (KeyError, ValueError, TypeError):
-            self._prev_power = None
-            self._prev_ts = time.monotonic()
-            self.async_write_ha_state()
-            return
+    def _read_power(self, device_data: dict) -> float | None:
+        qpigs = device_data.get("qpigs", {})
+        current_raw = qpigs.get("battery_charging_current")
+        # Use the live terminal voltage from QPIGS, not the static
+        # bulk_charging_voltage setpoint from QPIRI. Reasons:
+        #  - Physical correctness: P = I × V_live. The bulk setpoint
+        #    (e.g. 28.4 V) overstates power during bulk-rise (V_live
+        #    is 26-28 V) and understates during float (V_live ~27.2 V).
+        #  - Reliability: qpiri can be empty for a tick after a CRC
+        #    fail / coordinator freeze, while qpigs already has the
+        #    full reading. Reading both forced the sensor to drop
+        #    valid charge samples whenever qpiri momentarily lagged,
+        #    causing Battery IN Energy to chronically undercount vs
+        #    Battery OUT (round-trip > 100% in the stats).
+        voltage_raw = qpigs.get("battery_voltage")
+        if current_raw is None or voltage_raw is None:
+            raise ValueError("no data")
+        current = float(current_raw)
+        voltage = float(voltage_raw)
+        if math.isnan(current) or math.isnan(voltage):
+            raise ValueError("NaN")
+        # All-zeros == bridge offline / empty payload — skip silently.
+        if current == 0.0 and voltage == 0.0:
+            raise ValueError("no data")
+        if not is_plausible_battery_current(current) or not is_plausible_battery_voltage(voltage):
+            _LOGGER.debug(
+                "%s: implausible reading (I=%.2f A, V=%.2f V); dropping sample",
+                self.entity_id or self._attr_unique_id,
+                current,
+                voltage,
+            )
+            raise ValueError("out of plausible range")
         if current > 0:
-            power = current * voltage
-        else:
-            power = 0.0
-
-        # update_energy_value() already writes state; don't double-write.
-        self.update_energy_value(power)
+            return current * voltage
+        return 0.0
 
 
 class DirectBatteryOutEnergySensor(DirectEnergySensorBase):
@@ -338,39 +344,29 @@ class DirectBatteryOutEnergySensor(DirectEnergySensorBase):
             name_suffix="Battery Out Energy",
         )
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        qpigs = self.data.get("qpigs", {})
-        try:
-            current_raw = qpigs.get("battery_discharge_current")
-            voltage_raw = qpigs.get("battery_voltage")
-            if current_raw is None or voltage_raw is None:
-                raise ValueError("no data")
-            current = float(current_raw)
-            voltage = float(voltage_raw)
-            if math.isnan(current) or math.isnan(voltage):
-                raise ValueError("NaN")
-            # All-zeros == bridge offline / empty payload — skip silently.
-            if current == 0.0 and voltage == 0.0:
-                raise ValueError("no data")
-            if not is_plausible_battery_current(current) or not is_plausible_battery_voltage(voltage):
-                _LOGGER.debug(
-                    "%s: implausible reading (I=%.2f A, V=%.2f V); dropping sample",
-                    self.entity_id or self._attr_unique_id,
-                    current,
-                    voltage,
-                )
-                raise ValueError("out of plausible range")
-        except (KeyError, ValueError, TypeError):
-            self._prev_power = None
-            self._prev_ts = time.monotonic()
-            self.async_write_ha_state()
-            return
+    def _read_power(self, device_data: dict) -> float | None:
+        qpigs = device_data.get("qpigs", {})
+        current_raw = qpigs.get("battery_discharge_current")
+        voltage_raw = qpigs.get("battery_voltage")
+        if current_raw is None or voltage_raw is None:
+            raise ValueError("no data")
+        current = float(current_raw)
+        voltage = float(voltage_raw)
+        if math.isnan(current) or math.isnan(voltage):
+            raise ValueError("NaN")
+        # All-zeros == bridge offline / empty payload — skip silently.
+        if current == 0.0 and voltage == 0.0:
+            raise ValueError("no data")
+        if not is_plausible_battery_current(current) or not is_plausible_battery_voltage(voltage):
+            _LOGGER.debug(
+                "%s: implausible reading (I=%.2f A, V=%.2f V); dropping sample",
+                self.entity_id or self._attr_unique_id,
+                current,
+                voltage,
+            )
+            raise ValueError("out of plausible range")
         power = current * voltage
-        if power <= 0:
-            power = 0.0
-        # update_energy_value() already writes state; don't double-write.
-        self.update_energy_value(power)
+        return power if power > 0 else 0.0
 
 
 class BatteryStoredData(ExtraStoredData):
@@ -528,6 +524,12 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
 
         self._restored = True
         await super().async_added_to_hass()
+        if getattr(self.coordinator, "oversampling", False):
+            self.async_on_remove(
+                self.coordinator.async_add_sample_listener(
+                    self._inverter_device.inverter_id, self._ingest
+                )
+            )
 
     async def async_get_extra_data(self) -> ExtraStoredData:
         """Сохранение данных при выгрузке / рестарте."""
@@ -687,7 +689,14 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
         return self._estimator.last_sync_at
 
     def update_soc(self, signed_current_a: float, current_voltage: float):
-        """Advance the SoC estimator and publish the result.
+        """Advance the SoC estimator and publish the result."""
+        self._advance_soc(signed_current_a, current_voltage, self.data)
+        self.async_write_ha_state()
+
+    def _advance_soc(
+        self, signed_current_a: float, current_voltage: float, device_data: dict
+    ) -> None:
+        """Advance the SoC estimator by one sample, without writing state.
 
         Resolves the HA-bound inputs (snap voltage from the override
         number / inverter bulk, float voltage from QPIRI, BMS SoC from
@@ -699,7 +708,7 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
         sync_voltage = self.get_full_charge_sync_voltage()
         floating_voltage = self.get_floating_charging_voltage()
         bms_soc = (
-            self._read_bms_soc()
+            self._read_bms_soc(device_data)
             if self._estimator.mode == BATTERY_MODE_LI_BMS
             else None
         )
@@ -715,9 +724,8 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
         )
 
         self._attr_native_value = result
-        self.async_write_ha_state()
 
-    def _read_bms_soc(self) -> float | None:
+    def _read_bms_soc(self, device_data: dict) -> float | None:
         """Read battery_capacity (BMS-sourced SoC %) from the latest qpigs.
 
         Returns None when the value is missing, unparseable, or sentinel
@@ -725,7 +733,7 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
         finishes handshake).
         """
         try:
-            section = self.data.get(self.data_section, {})
+            section = device_data.get(self.data_section, {})
             raw = section.get("battery_capacity")
             if raw is None or raw == "":
                 return None
@@ -740,9 +748,13 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
     def native_value(self):
         return self._attr_native_value
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        section = self.data.get(self.data_section, {})
+    def _ingest(self, device_data: dict) -> None:
+        """Feed one device sample into the estimator (no state write).
+
+        Called once per coordinator update, or — in oversampling mode —
+        once per fast QPIGS sample via the coordinator's sample listener.
+        """
+        section = device_data.get(self.data_section, {})
         try:
             current_voltage = float(section.get("battery_voltage", 0))
             charging_current = float(section.get("battery_charging_current", 0))
@@ -752,10 +764,17 @@ class DirectBatteryStateOfChargeSensor(RestoreSensor, DirectTypedSensorBase):
             # net direction is what we want.
             signed_current_a = charging_current - discharging_current
 
-            self.update_soc(signed_current_a, current_voltage)
+            self._advance_soc(signed_current_a, current_voltage, device_data)
         except (KeyError, ValueError, TypeError):
             self._attr_native_value = None
-            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # When oversampling, the estimator already advanced on every fast
+        # sample; feeding the published one again would double-count it.
+        if not getattr(self.coordinator, "oversampling", False):
+            self._ingest(self.data)
+        self.async_write_ha_state()
 
 
 # ---------------------------------------------------------------------------
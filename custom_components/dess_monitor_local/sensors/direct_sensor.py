@@ -2,6 +2,7 @@ import logging
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.const import (
+    PERCENTAGE,
     EntityCategory,
     UnitOfApparentPower,
     UnitOfElectricCurrent,
@@ -9,6 +10,7 @@ from homeassistant.const import (
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -86,6 +88,11 @@ class DirectSensorBase(CoordinatorEntity, SensorEntity):
 class DirectTypedSensorBase(DirectSensorBase):
     """Абстрактный базовый класс для сенсоров, получающих значение по ключу."""
 
+    # Window stats change on every publish; keep them out of the recorder.
+    _unrecorded_attributes = frozenset(
+        {"window_min", "window_max", "window_mean", "window_samples"}
+    )
+
     def __init__(
             self,
             inverter_device: InverterDevice,
@@ -116,8 +123,26 @@ class DirectTypedSensorBase(DirectSensorBase):
                 self._attr_native_value = None
         else:
             self._attr_native_value = None
+        self._attr_extra_state_attributes = self._window_attributes()
         self.async_write_ha_state()
 
+    def _window_attributes(self) -> dict | None:
+        """Min / max / mean of this field over the oversampling window.
+
+        Only populated when the coordinator oversamples QPIGS (see
+        ``coordinators/oversampling.py``); ``None`` otherwise, so the
+        attribute set of a plain entry is unchanged.
+        """
+        stats = (self.data.get(f"{self.data_section}_window") or {}).get(self.data_key)
+        if not stats:
+            return None
+        return {
+            "window_min": stats["min"],
+            "window_max": stats["max"],
+            "window_mean": stats["mean"],
+            "window_samples": stats["samples"],
+        }
+
 
 # All numeric base classes below get ``state_class = MEASUREMENT``.
 # This enables HA's long-term statistics: a row is written every 5 minutes
@@ -616,6 +641,94 @@ class DirectDeviceStatusSensor(DirectSensorBase):
         return attrs
 
 
+class DirectLinkStateSensor(DirectSensorBase):
+    """Polling circuit-breaker state for this inverter's link.
+
+    ``closed`` = polled normally; ``open`` = stopped answering and is
+    skipped until the next probe; ``half_open`` = a single probe is due.
+    Attributes carry the failure count and the probe backoff (see
+    ``coordinators/circuit_breaker.py``).
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["closed", "open", "half_open"]
+    _attr_icon = "mdi:lan-pending"
+
+    def __init__(self, inverter_device: InverterDevice, coordinator: DirectCoordinator):
+        super().__init__(inverter_device, coordinator)
+        self._attr_unique_id = f"{self._inverter_device.inverter_id}_direct_link_state"
+        self._attr_name = f"{self._inverter_device.name} Direct Link State"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        link = dict(self.data.get("link") or {})
+        self._attr_native_value = link.pop("state", None)
+        self._attr_extra_state_attributes = link or None
+        self.async_write_ha_state()
+
+
+class _DirectPollMetricSensorBase(DirectSensorBase):
+    """Poll-health numbers from the metrics registry (see ``metrics.py``).
+
+    Disabled by default — they exist to size the update interval and to
+    spot a failing gateway, not for everyday dashboards.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _metric_key = ""
+
+    def __init__(
+        self, inverter_device: InverterDevice, coordinator: DirectCoordinator,
+        suffix: str, name: str,
+    ):
+        super().__init__(inverter_device, coordinator)
+        self._attr_unique_id = f"{self._inverter_device.inverter_id}_direct_{suffix}"
+        self._attr_name = f"{self._inverter_device.name} Direct {name}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = (self.data.get("metrics") or {}).get(self._metric_key)
+        self.async_write_ha_state()
+
+
+class DirectPollDurationSensor(_DirectPollMetricSensorBase):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _metric_key = "poll_seconds"
+
+    def __init__(self, inverter_device, coordinator):
+        super().__init__(inverter_device, coordinator, "poll_duration", "Poll Duration")
+
+
+class DirectPollSuccessRatioSensor(_DirectPollMetricSensorBase):
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 0
+    _metric_key = "success_ratio"
+
+    def __init__(self, inverter_device, coordinator):
+        super().__init__(inverter_device, coordinator, "poll_success_ratio", "Poll Success Ratio")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        ratio = (self.data.get("metrics") or {}).get(self._metric_key)
+        self._attr_native_value = None if ratio is None else round(ratio * 100, 1)
+        self.async_write_ha_state()
+
+
+class DirectRttP95Sensor(_DirectPollMetricSensorBase):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 3
+    _metric_key = "rtt_p95_seconds"
+
+    def __init__(self, inverter_device, coordinator):
+        super().__init__(inverter_device, coordinator, "rtt_p95", "Response Time p95")
+
+
 class DirectOperatingModeSensor(DirectEnumSensorBase):
     """Inverter operating mode from QMOD: PowerOn / Standby / Line /
     Battery / ShutdownApproaching / Fault.
@@ -895,6 +1008,10 @@ DIRECT_SENSORS = [
     DirectBatteryPowerSensor,
     DirectOperatingModeSensor,
     DirectInverterFaultSummarySensor,
+    DirectLinkStateSensor,
+    DirectPollDurationSensor,
+    DirectPollSuccessRatioSensor,
+    DirectRttP95Sensor,
 ]
 
 
@@ -2,15 +2,20 @@
 
 Gives the user immediate proof the integration is working: a single
 ``Discovered dongles`` sensor on a hub device, whose state is the number of
-dongles seen and whose attributes list each one (PN, status, last_seen,
-enabled, protocol). It also fires a one-shot persistent notification when a
+dongles seen and whose attributes count the connected / enabled ones and
+list each dongle (PN, status, last_seen, enabled, protocol) — the first
+``MAX_LISTED_DONGLES`` of them on a large hub, with ``not_listed`` giving
+the rest. The list is kept out of the recorder. It also fires a one-shot persistent notification when a
 brand-new, still-unconfigured dongle appears, nudging the user to open the
 hub options and assign a protocol.
 
 Discovery state lives in the hub's registry, not in ``coordinator.data`` —
 and the hub coordinator runs with ``always_update=False``, so it would not
-fire when no child data changes. The sensor therefore refreshes on its own
-timer, reading the live registry from the hub runtime each tick.
+fire when no child data changes. The sensor therefore observes the registry
+itself, through the hub runtime so the subscription follows the listener if
+it adopts another registry object: a change (new dongle, connect / disconnect, configuration) schedules
+one refresh at most every update interval, and nothing is written while the
+registry is unchanged — heartbeats only moving ``last_seen`` included.
 """
 from __future__ import annotations
 
@@ -21,9 +26,8 @@ from homeassistant.components import persistent_notification
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 
-from ..api.protocols.eybond_discovery import DongleStatus
 from ..const import (
     CONF_NAME,
     CONF_UPDATE_INTERVAL,
@@ -35,6 +39,9 @@ _LOGGER = logging.getLogger(__name__)
 
 # Refresh cadence floor — discovery is cheap, but don't hammer the loop.
 _MIN_INTERVAL_S = 5
+# State attributes are rewritten every tick and HA warns above 16 KiB; a
+# dongle entry is ~150 bytes.
+MAX_LISTED_DONGLES = 50
 
 
 class EybondHubDiscoverySensor(SensorEntity):
@@ -46,6 +53,7 @@ class EybondHubDiscoverySensor(SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_native_unit_of_measurement = "dongles"
     _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"dongles", "not_listed"})
 
     def __init__(self, hass: HomeAssistant, config_entry) -> None:
         self._hass = hass
@@ -67,12 +75,19 @@ class EybondHubDiscoverySensor(SensorEntity):
         self._known: set[str] = set()
         self._seeded = False
         self._unsub = None
+        self._unsub_refresh = None
+        self._written_version: int | None = None
+        # Registry ``_known`` was seeded from; a swapped-in one is re-seeded.
+        self._seeded_from = None
 
-    def _registry(self):
+    def _runtime(self):
         # Lazy import avoids a config_flow/__init__ import cycle.
         from ..eybond_hub import get_hub_runtime
 
-        runtime = get_hub_runtime(self._hass, self._entry_id)
+        return get_hub_runtime(self._hass, self._entry_id)
+
+    def _registry(self):
+        runtime = self._runtime()
         return runtime.registry if runtime is not None else None
 
     @property
@@ -84,8 +99,9 @@ class EybondHubDiscoverySensor(SensorEntity):
     def extra_state_attributes(self) -> dict:
         registry = self._registry()
         if registry is None:
-            return {"connected": 0, "dongles": []}
+            return {"connected": 0, "enabled": 0, "dongles": []}
         records = registry.all()
+        listed = records[:MAX_LISTED_DONGLES]
         dongles = [
             {
                 "pn": r.pn,
@@ -96,33 +112,58 @@ class EybondHubDiscoverySensor(SensorEntity):
                 "name": r.name or r.pn,
                 "last_seen": r.last_seen or "",
             }
-            for r in records
+            for r in listed
         ]
-        connected = sum(
-            1 for r in records if r.status is DongleStatus.CONNECTED
-        )
-        return {"connected": connected, "dongles": dongles}
+        attrs = {
+            "connected": registry.connected_count(),
+            "enabled": registry.enabled_count(),
+            "dongles": dongles,
+        }
+        if len(records) > len(listed):
+            attrs["not_listed"] = len(records) - len(listed)
+        return attrs
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        registry = self._registry()
-        if registry is not None:
-            self._known = {r.pn for r in registry.all()}
+        runtime = self._runtime()
+        if runtime is not None:
+            self._seed(runtime.registry)
+            self._written_version = runtime.registry.version
+            # Self-driven refresh: discovery isn't part of coordinator.data.
+            self._unsub = runtime.add_observer(self._on_registry_change)
         self._seeded = True
-        # Self-driven refresh: discovery isn't part of coordinator.data.
-        self._unsub = async_track_time_interval(
-            self._hass, self._tick, self._interval
-        )
+
+    def _seed(self, registry) -> None:
+        self._known = {r.pn for r in registry.all()}
+        self._seeded_from = registry
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsub is not None:
             self._unsub()
             self._unsub = None
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def _on_registry_change(self, version: int) -> None:
+        if self._unsub_refresh is None:
+            self._unsub_refresh = async_call_later(self._hass, self._interval, self._tick)
 
     @callback
     def _tick(self, now=None) -> None:
+        self._unsub_refresh = None
+        registry = self._registry()
+        version = registry.version if registry is not None else None
+        swapped = self._seeded_from is not None and registry is not None
+        if swapped and registry is not self._seeded_from:
+            # Adopted registry: its dongles were persisted before, not new.
+            self._seed(registry)
+        elif version is not None and version == self._written_version:
+            return
         self._maybe_notify_new()
         self.async_write_ha_state()
+        self._written_version = version
 
     def _maybe_notify_new(self) -> None:
         if not self._seeded:
@@ -0,0 +1,71 @@
+"""Integration-wide services (registered once, not per config entry)."""
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from . import cpuprofile, memprofile
+from .const import CPU_PROFILE_FILE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_PROFILE_MEMORY = "profile_memory"
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional("seconds", default=cpuprofile.DEFAULT_SECONDS): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=cpuprofile.MAX_SECONDS)
+    ),
+    vol.Optional("cycles"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    vol.Optional("interval_ms", default=cpuprofile.DEFAULT_INTERVAL * 1000): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=1000)
+    ),
+    vol.Optional("top", default=cpuprofile.DEFAULT_TOP): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=200)
+    ),
+})
+
+PROFILE_MEMORY_SCHEMA = vol.Schema({
+    vol.Optional("cycles", default=memprofile.DEFAULT_CYCLES): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=1000)
+    ),
+    vol.Optional("frames", default=memprofile.DEFAULT_FRAMES): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=100)
+    ),
+    vol.Optional("top", default=memprofile.DEFAULT_TOP): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=200)
+    ),
+})
+
+
+async def _profile(call: ServiceCall) -> None:
+    path = call.hass.config.path(CPU_PROFILE_FILE)
+    # Runs on the event loop, so the sampler watches the loop thread.
+    cpuprofile.start(
+        path,
+        seconds=call.data["seconds"],
+        cycles=call.data.get("cycles"),
+        interval=call.data["interval_ms"] / 1000,
+        top=call.data["top"],
+    )
+    if "cycles" in call.data:
+        _LOGGER.info("CPU profile running for %d poll cycles; writing %s", call.data["cycles"], path)
+    else:
+        _LOGGER.info("CPU profile running for %.0f s; writing %s", call.data["seconds"], path)
+
+
+async def _profile_memory(call: ServiceCall) -> None:
+    memprofile.start(call.data["cycles"], call.data["frames"], call.data["top"])
+    _LOGGER.info(
+        "Memory profile armed for %d poll cycles; the result is in the diagnostics download",
+        call.data["cycles"],
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_MEMORY, _profile_memory, schema=PROFILE_MEMORY_SCHEMA
+    )
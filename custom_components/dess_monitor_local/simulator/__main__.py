@@ -0,0 +1,122 @@
+"""Local multi-protocol inverter simulator for load testing.
+
+Serves simulated inverters on localhost over every transport the
+integration speaks, so polling — one device, a hub of hundreds, the
+``cli`` benchmark — can be exercised end to end without hardware::
+
+    python -m custom_components.dess_monitor_local.simulator --pi30 100 --pi18 20 \\
+        --modbus 20 --agent 10 --dongles 200 --eybond 127.0.0.1:8899 \\
+        --latency 0.08 --jitter 0.04 --crc-error-rate 0.01 --nak QPIGS2 \\
+        --session-lifetime 4
+
+It prints one device URI per line as soon as everything listens (feed
+them to ``python -m custom_components.dess_monitor_local.cli`` or a
+config entry), then runs until Ctrl-C and prints the fault counters
+(requests, replies, NAKs, corrupted, dropped, closed, dongle sessions)
+as one JSON line on stderr.
+
+Dongles dial the EyBond listener given by ``--eybond`` — the one Home
+Assistant or the CLI binds for ``eybond://`` URIs — and redial every
+``--reconnect-delay`` seconds until it is up, so start order does not
+matter. With ``--base-port`` the listeners take consecutive ports;
+otherwise the OS picks them. Raise ``ulimit -n`` before going much past
+a few hundred endpoints.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+
+from .fleet import Fleet
+from .state import FaultProfile
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.dess_monitor_local.simulator",
+        description="Serve simulated inverters on localhost for load testing.",
+    )
+    fleet = parser.add_argument_group("fleet")
+    fleet.add_argument("--pi30", type=int, default=0, help="PI30 inverters behind Elfin TCP")
+    fleet.add_argument("--pi18", type=int, default=0, help="PI18 inverters behind Elfin TCP")
+    fleet.add_argument("--modbus", type=int, default=0, help="SMG-II Modbus RTU-over-TCP inverters")
+    fleet.add_argument("--agent", type=int, default=0, help="devices behind one solar-system-agent")
+    fleet.add_argument("--dongles", type=int, default=0, help="EyBond dongles dialling --eybond")
+    fleet.add_argument("--dongle-protocol", choices=("pi30", "pi18", "modbus"), default="pi30")
+    fleet.add_argument("--inverters-per-dongle", type=int, default=1, help="RS485 addresses per dongle")
+    fleet.add_argument("--host", default="127.0.0.1", help="listen address")
+    fleet.add_argument("--base-port", type=int, default=0, help="first listen port (default: ephemeral)")
+    fleet.add_argument("--eybond", default="127.0.0.1:8899", metavar="HOST:PORT", help="EyBond listener")
+    fleet.add_argument("--seed", type=int, default=0)
+    faults = parser.add_argument_group("faults")
+    faults.add_argument("--latency", type=float, default=0.05, help="reply delay in seconds")
+    faults.add_argument("--jitter", type=float, default=0.0, help="± seconds around --latency")
+    faults.add_argument("--crc-error-rate", type=float, default=0.0, help="share of replies with a bad CRC")
+    faults.add_argument("--drop-rate", type=float, default=0.0, help="share of requests never answered")
+    faults.add_argument(
+        "--nak", action="append", default=[],
+        help="command / setting key / Modbus block start to NAK (repeatable)",
+    )
+    faults.add_argument("--close-every", type=int, default=0, help="clean close instead of every Nth reply")
+    faults.add_argument("--session-lifetime", type=float, default=0.0, help="dongle session length in seconds")
+    faults.add_argument("--reconnect-delay", type=float, default=1.0, help="dongle redial delay in seconds")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging to stderr")
+    return parser.parse_args(argv)
+
+
+def profile_from_args(args: argparse.Namespace) -> FaultProfile:
+    return FaultProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        crc_error_rate=args.crc_error_rate,
+        drop_rate=args.drop_rate,
+        nak=frozenset(args.nak),
+        close_every=args.close_every,
+        session_lifetime=args.session_lifetime,
+        reconnect_delay=args.reconnect_delay,
+    )
+
+
+async def run(args: argparse.Namespace, fleet: Fleet) -> None:
+    eybond_host, _, eybond_port = args.eybond.rpartition(":")
+    try:
+        await fleet.start(
+            pi30=args.pi30,
+            pi18=args.pi18,
+            modbus=args.modbus,
+            agent=args.agent,
+            dongles=args.dongles,
+            host=args.host,
+            base_port=args.base_port,
+            eybond_host=eybond_host or "127.0.0.1",
+            eybond_port=int(eybond_port),
+            dongle_protocol=args.dongle_protocol,
+            inverters_per_dongle=args.inverters_per_dongle,
+        )
+        for uri in fleet.uris():
+            print(uri, flush=True)
+        await asyncio.Event().wait()
+    finally:
+        await fleet.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    fleet = Fleet(profile_from_args(args), args.seed)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run(args, fleet))
+    print(json.dumps(fleet.stats(), sort_keys=True), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
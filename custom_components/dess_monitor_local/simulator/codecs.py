@@ -0,0 +1,430 @@
+"""Wire encoding of :class:`~.state.InverterState` for every protocol.
+
+Each ``*_request`` function takes one complete request frame, exactly as
+the integration's transports send it, and returns ``(command, build)``:
+``command`` is the label the fault profile's NAK set is matched against,
+and ``build(nak, corrupt)`` renders the reply frame. Fault decisions are
+taken by the caller (see :mod:`.servers`), so the same codec serves a
+TCP listener and a frame forwarded through an EyBond dongle.
+
+The encoders are the inverse of the integration's decoders — PI30
+``decode_direct_response``, PI18 ``decode_pi18_response`` and the SMG-II
+register map of ``read_smg2_snapshot_via`` — and are exercised against
+them in the tests.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+
+from ..api.crc import crc16_modbus, crc16_voltronic, crc16_xmodem_bytes
+from ..api.decoders.pi18 import LOGICAL_TO_NATIVE
+from .state import RATED_OUTPUT_W, InverterState, Reading
+
+Builder = Callable[[bool, bool], bytes]
+
+_NATIVE_TO_LOGICAL = {native: logical for logical, native in LOGICAL_TO_NATIVE.items()}
+
+# PI30 QPIRI / SMG-II priority codes → PI18 PIRI codes (PI18 has no
+# "utility first" for either; the nearest member is used).
+_PI18_OUTPUT_PRIORITY = {0: 0, 1: 0, 2: 1}
+_PI18_CHARGER_PRIORITY = {0: 1, 1: 0, 2: 1, 3: 2}
+# QMOD letter → PI18 MOD code / SMG-II register 201 / agent operating_mode.
+_PI18_MODE = {"P": 0, "S": 1, "L": 5, "B": 3, "D": 3, "F": 4}
+_SMG2_MODE = {"P": 0, "S": 1, "L": 2, "B": 3, "D": 3, "F": 6}
+_AGENT_MODE = {"P": "PowerOn", "S": "Standby", "L": "Mains", "B": "OffGrid", "D": "Shutdown", "F": "Fault"}
+_AGENT_OUTPUT_PRIORITY = {0: "UtilityFirst", 1: "SolarFirst", 2: "SBU"}
+_AGENT_CHARGER_PRIORITY = {0: "UtilityFirst", 1: "SolarFirst", 2: "SolarAndUtility", 3: "OnlySolar"}
+
+
+def _corrupt(crc: bytes) -> bytes:
+    """A wrong CRC that still contains no frame delimiter."""
+    return bytes((b ^ 0x5A) + (1 if (b ^ 0x5A) in (0x0A, 0x0D, 0x28) else 0) for b in crc)
+
+
+def _warnings(state: InverterState, r: Reading) -> dict[str, bool]:
+    return {
+        "line_fail": not state.grid_available,
+        "battery_low": r.soc < 15,
+        "overload": r.load_percent > 100,
+        "fault": bool(state.fault_code),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Set commands — the bodies the integration's setters send, shared by PI30
+# and PI18 (the PI18 path wraps the same bodies in ``^P`` framing).
+# ---------------------------------------------------------------------------
+def apply_set_command(state: InverterState, body: str) -> bool:
+    """Apply a Voltronic set command; ``False`` means the device NAKs it."""
+    try:
+        if body.startswith("POP") and int(body[3:]) in (0, 1, 2):
+            state.output_priority = int(body[3:])
+        elif body.startswith("PCP") and int(body[3:]) in (0, 1, 2, 3):
+            state.charger_priority = int(body[3:])
+        elif body.startswith("PBT") and 0 <= int(body[3:]) <= 7:
+            state.battery_type = int(body[3:])
+        elif body.startswith("PBAV"):
+            state.bulk_voltage = float(body[4:])
+        elif body.startswith("PBFV"):
+            state.float_voltage = float(body[4:])
+        elif body.startswith(("MCHGC", "PBATC")):
+            state.max_charging_current = int(body[5:])
+        elif body.startswith("MUCHGC"):
+            state.max_utility_charging_current = int(float(body[6:]))
+        else:
+            return False
+    except ValueError:
+        return False
+    state.settings_written += 1
+    return True
+
+
+# ---------------------------------------------------------------------------
+# PI30 (Voltronic Axpert) — ``CMD<crc>\r`` → ``(<payload><crc>\r``
+# ---------------------------------------------------------------------------
+def pi30_frame(payload: bytes, corrupt: bool = False) -> bytes:
+    crc = crc16_voltronic(b"(" + payload)
+    return b"(" + payload + (_corrupt(crc) if corrupt else crc) + b"\r"
+
+
+def _pi30_qpigs(state: InverterState, r: Reading) -> str:
+    warn = _warnings(state, r)
+    charging = max(r.battery_current, 0.0)
+    b7_b0 = "".join("1" if bit else "0" for bit in (
+        warn["fault"], False, False, warn["line_fail"], warn["battery_low"], False,
+        warn["overload"], r.mode in ("L", "B"),
+    ))
+    b10_b8 = "".join("1" if bit else "0" for bit in (
+        charging > 0, charging > 0 and r.mode == "L", charging > 0 and r.pv_power > 0,
+    ))
+    pv_current = r.pv_power / r.pv_voltage if r.pv_voltage else 0.0
+    return (
+        f"{r.grid_voltage:05.1f} {r.grid_frequency:04.1f} {r.output_voltage:05.1f} "
+        f"{r.output_frequency:04.1f} {r.load_va:04d} {r.load_w:04d} {r.load_percent:03d} "
+        f"{390 + int(r.battery_voltage):03d} {r.battery_voltage:05.2f} {int(charging):03d} "
+        f"{r.soc:03d} {r.heat_sink_temperature:04d} {pv_current:04.1f} {r.pv_voltage:05.1f} "
+        f"{r.battery_voltage:05.2f} {int(max(-r.battery_current, 0.0)):05d} {b7_b0} 00 00 "
+        f"{r.pv_power:05d} {b10_b8} 0 00 0000"
+    )
+
+
+def _pi30_qpiri(state: InverterState) -> str:
+    return (
+        f"230.0 17.3 230.0 50.0 17.3 {RATED_OUTPUT_W:04d} {RATED_OUTPUT_W:04d} 24.0 23.0 21.0 "
+        f"{state.bulk_voltage:04.1f} {state.float_voltage:04.1f} {state.battery_type} "
+        f"{state.max_utility_charging_current:02d} {state.max_charging_current:03d} 0 "
+        f"{state.output_priority} {state.charger_priority} 6 01 0 0 27.0 0 1 200 0 000"
+    )
+
+
+def _pi30_qpiws(state: InverterState, r: Reading) -> str:
+    warn = _warnings(state, r)
+    bits = ["0"] * 32
+    for index, name in ((1, "fault"), (5, "line_fail"), (12, "battery_low"), (16, "overload")):
+        if warn[name]:
+            bits[index] = "1"
+    return "".join(bits)
+
+
+def pi30_request(state: InverterState, request: bytes) -> tuple[str, Builder]:
+    command = request[:-3].decode("ascii", errors="replace").upper()
+
+    def build(nak: bool, corrupt: bool) -> bytes:
+        payload = None if nak else _pi30_payload(state, command)
+        return pi30_frame(b"NAK" if payload is None else payload.encode("ascii"), corrupt)
+
+    return command, build
+
+
+def _pi30_payload(state: InverterState, command: str) -> str | None:
+    if command == "QPIRI":
+        return _pi30_qpiri(state)
+    if command == "QPI":
+        return "PI30"
+    if command in ("QID", "QSID"):
+        return state.serial
+    if command == "QVFW":
+        return "VERFW:00072.70"
+    if command.startswith(("P", "MCHGC", "MUCHGC")):
+        return "ACK" if apply_set_command(state, command) else None
+    r = state.sample()
+    if command == "QPIGS":
+        return _pi30_qpigs(state, r)
+    if command == "QPIGS2":
+        pv_current = r.pv_power / r.pv_voltage if r.pv_voltage else 0.0
+        return f"{pv_current:04.1f} {r.pv_voltage:05.1f} {r.pv_energy_today:05d}"
+    if command == "QMOD":
+        return r.mode
+    if command == "QPIWS":
+        return _pi30_qpiws(state, r)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# PI18 (InfiniSolar-V) — ``^Pnnn<body><crc>\r`` → ``^Dnnn<payload><crc>\r``
+# ---------------------------------------------------------------------------
+def pi18_frame(payload: bytes, corrupt: bool = False) -> bytes:
+    # PI18 CRCs are not byte-bumped, so like the real firmware roughly one
+    # frame in 128 carries a CR inside its CRC and reaches the client cut
+    # short — a CRC failure the fault profile did not ask for.
+    head = f"^D{len(payload) + 3:03d}".encode("ascii") + payload
+    crc = crc16_xmodem_bytes(head)
+    return head + (_corrupt(crc) if corrupt else crc) + b"\r"
+
+
+def _pi18_marker(marker: bytes, corrupt: bool) -> bytes:
+    crc = crc16_xmodem_bytes(marker)
+    return marker + (_corrupt(crc) if corrupt else crc) + b"\r"
+
+
+def _pi18_gs(state: InverterState, r: Reading) -> str:
+    charging = max(r.battery_current, 0.0)
+    discharging = max(-r.battery_current, 0.0)
+    battery_dir = 1 if charging > 0 else 2 if discharging > 0 else 0
+    fields = (
+        f"{int(r.grid_voltage * 10):04d}", f"{int(r.grid_frequency * 10):03d}",
+        f"{int(r.output_voltage * 10):04d}", f"{int(r.output_frequency * 10):03d}",
+        f"{r.load_va:04d}", f"{r.load_w:04d}", f"{r.load_percent:03d}",
+        f"{int(r.battery_voltage * 10):03d}", f"{int(r.battery_voltage * 10):03d}", "000",
+        f"{int(discharging):03d}", f"{int(charging):03d}", f"{r.soc:03d}",
+        f"{r.heat_sink_temperature:03d}", f"{r.dcdc_temperature:03d}", "000",
+        f"{r.pv_power:04d}", "0000", f"{int(r.pv_voltage * 10):04d}", "0000",
+        "0", "2" if r.pv_power else "1", "0", "1", str(battery_dir),
+        "2" if r.mode == "B" else "1" if charging > 0 else "0",
+        "1" if r.mode == "L" else "0", "0",
+    )
+    return ",".join(fields)
+
+
+def _pi18_piri(state: InverterState) -> str:
+    fields = (
+        "2300", "173", "2300", "500", "173", f"{RATED_OUTPUT_W:04d}", f"{RATED_OUTPUT_W:04d}",
+        "240", "270", "230", "210",
+        f"{int(round(state.bulk_voltage * 10)):03d}", f"{int(round(state.float_voltage * 10)):03d}",
+        str(state.battery_type), f"{state.max_utility_charging_current:02d}",
+        f"{state.max_charging_current:03d}", "0",
+        str(_PI18_OUTPUT_PRIORITY.get(state.output_priority, 0)),
+        str(_PI18_CHARGER_PRIORITY.get(state.charger_priority, 1)),
+        "6", "0", "0", "0", "0", "1",
+    )
+    return ",".join(fields)
+
+
+def _pi18_fws(state: InverterState, r: Reading) -> str:
+    warn = _warnings(state, r)
+    flags = ["0"] * 16
+    for index, name in ((0, "line_fail"), (5, "battery_low"), (7, "overload")):
+        if warn[name]:
+            flags[index] = "1"
+    return ",".join([f"{state.fault_code:02d}", *flags])
+
+
+def pi18_request(state: InverterState, request: bytes) -> tuple[str, Builder]:
+    body = request[5:-3].decode("ascii", errors="replace").upper()
+    command = _NATIVE_TO_LOGICAL.get(body, body)
+
+    def build(nak: bool, corrupt: bool) -> bytes:
+        if nak:
+            return _pi18_marker(b"^0", corrupt)
+        if body.startswith(("P", "MCHGC", "MUCHGC")) and body not in LOGICAL_TO_NATIVE.values():
+            return _pi18_marker(b"^1" if apply_set_command(state, body) else b"^0", corrupt)
+        payload = _pi18_payload(state, body)
+        if payload is None:
+            return _pi18_marker(b"^0", corrupt)
+        return pi18_frame(payload.encode("ascii"), corrupt)
+
+    return command, build
+
+
+def _pi18_payload(state: InverterState, body: str) -> str | None:
+    if body == "PIRI":
+        return _pi18_piri(state)
+    if body == "PI":
+        return "18"
+    if body == "ID":
+        return f"{len(state.serial):02d}{state.serial:0<20}"
+    if body == "VFW":
+        return "05220,00000,00000"
+    r = state.sample()
+    if body == "GS":
+        return _pi18_gs(state, r)
+    if body == "MOD":
+        return f"{_PI18_MODE.get(r.mode, 0):02d}"
+    if body == "FWS":
+        return _pi18_fws(state, r)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# SMG-II Modbus RTU — func 0x03 reads of blocks 100/201/300, 0x06 / 0x10
+# single-register writes to the config block.
+# ---------------------------------------------------------------------------
+# Writable config registers: address → (attribute, scale).
+_SMG2_CONFIG = {
+    301: ("output_priority", 1),
+    331: ("charger_priority", 1),
+    324: ("bulk_voltage", 10),
+    325: ("float_voltage", 10),
+    332: ("max_charging_current", 10),
+    333: ("max_utility_charging_current", 10),
+}
+
+
+def _u16(value: float) -> int:
+    return int(round(value)) & 0xFFFF
+
+
+def smg2_registers(state: InverterState, r: Reading) -> dict[int, int]:
+    """The SMG-II holding registers ``read_smg2_snapshot_via`` reads."""
+    warn = _warnings(state, r)
+    warning_code = (warn["line_fail"] << 0) | (warn["battery_low"] << 1) | (warn["overload"] << 2)
+    output_current = r.load_va / r.output_voltage if r.output_voltage else 0.0
+    battery_power = r.battery_current * r.battery_voltage
+    regs = {
+        100: state.fault_code >> 16, 101: state.fault_code & 0xFFFF,
+        108: warning_code >> 16, 109: warning_code & 0xFFFF,
+        201: _SMG2_MODE.get(r.mode, 0),
+        202: _u16(r.grid_voltage * 10), 203: _u16(r.grid_frequency * 100), 204: _u16(r.grid_power),
+        205: _u16(r.output_voltage * 10), 206: _u16(output_current * 10),
+        207: _u16(r.output_frequency * 100), 208: _u16(r.load_w),
+        209: _u16(max(battery_power, 0.0) if r.mode == "L" else 0),
+        210: _u16(r.output_voltage * 10), 211: _u16(output_current * 10),
+        212: _u16(r.output_frequency * 100), 213: _u16(r.load_w),
+        215: _u16(r.battery_voltage * 10), 216: _u16(r.battery_current * 10), 217: _u16(battery_power),
+        219: _u16(r.pv_voltage * 10), 220: _u16(r.pv_power / r.pv_voltage * 10 if r.pv_voltage else 0),
+        223: r.pv_power, 224: r.pv_power, 225: r.load_percent,
+        226: r.dcdc_temperature, 227: r.heat_sink_temperature,
+        300: 0, 302: 0, 303: 1, 305: 1, 306: 1, 307: 0, 308: 1, 309: 1, 310: 0, 313: 0,
+        320: 2300, 321: 5000, 323: 300, 326: 270, 327: 230, 329: 210,
+        334: 288, 335: 60, 336: 120, 337: 30,
+    }
+    for address, (attr, scale) in _SMG2_CONFIG.items():
+        regs[address] = _u16(getattr(state, attr) * scale)
+    regs.update(state.extra_registers)
+    return regs
+
+
+def write_smg2_register(state: InverterState, address: int, value: int) -> None:
+    attr_scale = _SMG2_CONFIG.get(address)
+    if attr_scale is None:
+        state.extra_registers[address] = value
+    else:
+        attr, scale = attr_scale
+        current = getattr(state, attr)
+        setattr(state, attr, type(current)(value / scale) if scale != 1 else value)
+    state.settings_written += 1
+
+
+def modbus_frame(body: bytes, corrupt: bool = False) -> bytes:
+    crc = crc16_modbus(body)
+    if corrupt:
+        crc ^= 0x5A5A
+    return body + bytes([crc & 0xFF, crc >> 8])
+
+
+def modbus_request(
+    state: InverterState, request: bytes, unit_id: int
+) -> tuple[str, Builder] | None:
+    """Codec for one RTU frame; ``None`` when a real slave stays silent
+    (another unit id, bad request CRC, unknown function)."""
+    if len(request) < 8 or request[0] != unit_id:
+        return None
+    if crc16_modbus(request[:-2]) != (request[-2] | request[-1] << 8):
+        return None
+    func = request[1]
+    address = request[2] << 8 | request[3]
+    if func == 0x03:
+        count = request[4] << 8 | request[5]
+
+        def build(nak: bool, corrupt: bool) -> bytes:
+            if nak or not 0 < count <= 125:
+                return modbus_frame(bytes([unit_id, 0x83, 0x02]), corrupt)
+            regs = smg2_registers(state, state.sample())
+            data = b"".join(
+                regs.get(a, 0).to_bytes(2, "big") for a in range(address, address + count)
+            )
+            return modbus_frame(bytes([unit_id, 0x03, len(data)]) + data, corrupt)
+
+        return str(address), build
+    if func in (0x06, 0x10):
+        value = request[4] << 8 | request[5] if func == 0x06 else request[7] << 8 | request[8]
+
+        def build(nak: bool, corrupt: bool) -> bytes:
+            if nak:
+                return modbus_frame(bytes([unit_id, func | 0x80, 0x02]), corrupt)
+            write_smg2_register(state, address, value)
+            # 0x06 echoes the request; 0x10 answers address + quantity.
+            return modbus_frame(request[:6], corrupt)
+
+        return str(address), build
+    return None
+
+
+# ---------------------------------------------------------------------------
+# solar-system-agent — GET /devices/<id>/latest, POST /devices/<id>/settings
+# ---------------------------------------------------------------------------
+def agent_snapshot(state: InverterState, device_id: str, rng: random.Random) -> dict:
+    """The agent's ``/latest`` body: a flat raw dict plus reading age."""
+    r = state.sample()
+    warn = _warnings(state, r)
+    mode = _AGENT_MODE.get(r.mode, "Standby")
+    raw = {
+        "grid_voltage": f"{r.grid_voltage:.1f}",
+        "grid_frequency": f"{r.grid_frequency:.2f}",
+        "ac_output_voltage": f"{r.output_voltage:.1f}",
+        "ac_output_frequency": f"{r.output_frequency:.2f}",
+        "output_apparent_power": str(r.load_va),
+        "output_active_power": str(r.load_w),
+        "load_percent": str(r.load_percent),
+        "battery_voltage": f"{r.battery_voltage:.2f}",
+        "battery_current": f"{r.battery_current:.1f}",
+        "battery_capacity": str(r.soc),
+        "pv_input_voltage": f"{r.pv_voltage:.1f}",
+        "pv_input_power": str(r.pv_power),
+        "pv_charging_power": str(r.pv_power),
+        "inverter_heat_sink_temperature": str(r.heat_sink_temperature),
+        "operating_mode": mode,
+        "qmod.operating_mode": mode,
+        "output_source_priority": _AGENT_OUTPUT_PRIORITY.get(state.output_priority, "SBU"),
+        "charger_source_priority": _AGENT_CHARGER_PRIORITY.get(state.charger_priority, "SolarFirst"),
+        "bulk_charging_voltage": f"{state.bulk_voltage:.1f}",
+        "float_charging_voltage": f"{state.float_voltage:.1f}",
+        "max_charging_current": f"{state.max_charging_current:.1f}",
+        "max_utility_charging_current": f"{state.max_utility_charging_current:.1f}",
+        "warn_any": "1" if any(warn.values()) else "0",
+        "warn_line_fail": "1" if warn["line_fail"] else "0",
+        "warn_battery_low": "1" if warn["battery_low"] else "0",
+        "warn_overload": "1" if warn["overload"] else "0",
+        "fault_code": str(state.fault_code),
+    }
+    return {"providerDeviceId": device_id, "ageMs": int(rng.uniform(100, 5000)), "raw": raw}
+
+
+def _as_int(value) -> int:
+    return int(float(value))
+
+
+_AGENT_SETTINGS = {
+    "output_source_priority": ("output_priority", {v: k for k, v in _AGENT_OUTPUT_PRIORITY.items()}),
+    "charger_source_priority": ("charger_priority", {v: k for k, v in _AGENT_CHARGER_PRIORITY.items()}),
+    "bulk_charging_voltage": ("bulk_voltage", float),
+    "float_charging_voltage": ("float_voltage", float),
+    "max_charging_current": ("max_charging_current", _as_int),
+    "max_utility_charging_current": ("max_utility_charging_current", _as_int),
+}
+
+
+def apply_agent_setting(state: InverterState, key: str, value) -> dict:
+    """The agent's ``/settings`` answer for ``{"key": key, "value": value}``."""
+    entry = _AGENT_SETTINGS.get(key)
+    if entry is None:
+        return {"ok": False, "error": f"unknown setting {key!r}", "code": "validation"}
+    attr, convert = entry
+    try:
+        parsed = convert[value] if isinstance(convert, dict) else convert(value)
+    except (KeyError, TypeError, ValueError):
+        return {"ok": False, "error": f"invalid value {value!r} for {key}", "code": "validation"}
+    setattr(state, attr, parsed)
+    state.settings_written += 1
+    return {"ok": True, "rawResponse": "ACK"}
@@ -0,0 +1,94 @@
+"""A fleet of simulated inverters started and stopped together."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+from .servers import AgentServer, DongleClient, ModbusServer, Pi18Server, Pi30Server
+from .state import FaultProfile, InverterState
+
+
+class Fleet:
+    """Endpoints for ``count`` inverters per protocol on one event loop.
+
+    Inverter ``i`` of the fleet is seeded ``seed + i`` and its PV curve
+    shifted by a fraction of an hour, so no two instances report the same
+    values and the fleet doesn't peak in lockstep. Listeners take
+    consecutive ports from ``base_port`` (0 = ephemeral); dongles dial
+    ``eybond_host:eybond_port``.
+    """
+
+    def __init__(self, profile: FaultProfile = FaultProfile(), seed: int = 0) -> None:
+        self.profile = profile
+        self.seed = seed
+        self.servers: list = []
+        self.agent: AgentServer | None = None
+        self.dongles: list[DongleClient] = []
+        self._eybond_port = 0
+        self._next = 0
+
+    def _state(self) -> InverterState:
+        i = self._next
+        self._next += 1
+        return InverterState(seed=self.seed + i, clock_offset=(i % 16) * 0.25)
+
+    async def start(
+        self,
+        pi30: int = 0,
+        pi18: int = 0,
+        modbus: int = 0,
+        agent: int = 0,
+        dongles: int = 0,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        eybond_host: str = "127.0.0.1",
+        eybond_port: int = 8899,
+        dongle_protocol: str = "pi30",
+        inverters_per_dongle: int = 1,
+    ) -> None:
+        port = base_port
+        for server_cls, count in ((Pi30Server, pi30), (Pi18Server, pi18), (ModbusServer, modbus)):
+            for _ in range(count):
+                server = server_cls(self._state(), self.profile)
+                await server.start(host, port)
+                self.servers.append(server)
+                port = port + 1 if port else 0
+        if agent:
+            self.agent = AgentServer(
+                {f"sim-{i + 1}": self._state() for i in range(agent)}, self.profile
+            )
+            await self.agent.start(host, port)
+        for i in range(dongles):
+            dongle = DongleClient(
+                f"SIM{self.seed + i:011d}",
+                {addr: self._state() for addr in range(1, inverters_per_dongle + 1)},
+                dongle_protocol,
+                self.profile,
+            )
+            dongle.start(eybond_host, eybond_port)
+            self.dongles.append(dongle)
+        self._eybond_port = eybond_port
+
+    def uris(self) -> list[str]:
+        """Device URIs for the integration, one per simulated inverter."""
+        uris = [server.uri for server in self.servers]
+        if self.agent is not None:
+            uris += [self.agent.device_uri(device_id) for device_id in self.agent.states]
+        for dongle in self.dongles:
+            # The integration binds its listener; the URI names the bind address.
+            uris += [
+                dongle.device_uri("0.0.0.0", self._eybond_port, addr) for addr in dongle.inverters
+            ]
+        return uris
+
+    def stats(self) -> dict[str, int]:
+        """Fault-injector counters summed over every endpoint."""
+        total: Counter[str] = Counter()
+        endpoints = [*self.servers, *self.dongles, *([self.agent] if self.agent else [])]
+        for endpoint in endpoints:
+            total.update(endpoint.faults.stats)
+        return dict(total)
+
+    async def close(self) -> None:
+        endpoints = [*self.servers, *self.dongles, *([self.agent] if self.agent else [])]
+        await asyncio.gather(*(endpoint.close() for endpoint in endpoints))
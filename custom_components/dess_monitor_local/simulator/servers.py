@@ -0,0 +1,410 @@
+"""asyncio endpoints that put simulated inverters on the network.
+
+* :class:`Pi30Server`, :class:`Pi18Server`, :class:`ModbusServer` — one
+  TCP listener per inverter, like an Elfin gateway in front of each
+  one; ``tcp://``, ``pi18://`` and ``modbus://`` URIs point at them.
+* :class:`AgentServer` — one HTTP listener serving many devices, like a
+  solar-system-agent; ``agent://host:port/<id>``.
+* :class:`DongleClient` — an EyBond dongle: it dials the integration's
+  ``EybondManager`` listener, identifies itself with FC=1 heartbeats
+  carrying its PN and answers FC=4 forwards for the inverters on its
+  RS485 addresses.
+
+Every endpoint pushes each request through :class:`FaultInjector`, so
+latency, jitter, CRC corruption, NAKs, drops and clean closes behave the
+same on all of them. Nothing here blocks or spawns threads: a few
+hundred endpoints are a few hundred sockets and tasks on one loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from ..api.protocols.eybond_dongle import (
+    DEFAULT_DEVCODE,
+    FC_FORWARD2DEVICE,
+    FC_HEARTBEAT,
+    HEADER_SIZE,
+    _decode_header,
+    _encode_header,
+    _EyHeader,
+)
+from .codecs import (
+    Builder,
+    agent_snapshot,
+    apply_agent_setting,
+    modbus_request,
+    pi18_request,
+    pi30_request,
+)
+from .state import FaultProfile, InverterState
+
+_LOGGER = logging.getLogger(__name__)
+
+# Returned by FaultInjector.reply for a clean close instead of a reply.
+CLOSE = b""
+
+
+class FaultInjector:
+    """Applies a :class:`FaultProfile` to the requests of one endpoint."""
+
+    def __init__(self, profile: FaultProfile, seed: int = 0) -> None:
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.stats: Counter[str] = Counter()
+
+    async def reply(self, command: str, build: Builder, can_corrupt: bool = True) -> bytes | None:
+        """The frame to send, :data:`CLOSE`, or ``None`` to stay silent."""
+        profile = self.profile
+        self.stats["requests"] += 1
+        if profile.close_every and self.stats["requests"] % profile.close_every == 0:
+            self.stats["closed"] += 1
+            return CLOSE
+        if profile.drop_rate and self.rng.random() < profile.drop_rate:
+            self.stats["dropped"] += 1
+            return None
+        delay = profile.delay(self.rng)
+        if delay:
+            await asyncio.sleep(delay)
+        nak = command in profile.nak
+        corrupt = (
+            can_corrupt
+            and not nak
+            and bool(profile.crc_error_rate)
+            and self.rng.random() < profile.crc_error_rate
+        )
+        self.stats["naks" if nak else "corrupted" if corrupt else "replies"] += 1
+        return build(nak, corrupt)
+
+
+class _Listener(ABC):
+    """A TCP listener; subclasses serve each connection in :meth:`_handle`."""
+
+    scheme = ""
+
+    def __init__(self, faults: FaultInjector) -> None:
+        self.faults = faults
+        self.host = ""
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1] if self._server else 0
+
+    @property
+    def uri(self) -> str:
+        return f"{self.scheme}://{self.host}:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self._server = await asyncio.start_server(self._handle, host, port, reuse_address=True)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    @abstractmethod
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until it ends."""
+
+
+class _StreamServer(_Listener):
+    """A TCP listener whose connections carry request/reply frames."""
+
+    @abstractmethod
+    async def _read_request(self, reader: asyncio.StreamReader) -> bytes:
+        """One complete request frame off the connection."""
+
+    @abstractmethod
+    def _codec(self, request: bytes) -> tuple[str, Builder] | None:
+        """The fault key and reply builder for ``request``; ``None`` ignores it."""
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                codec = self._codec(await self._read_request(reader))
+                if codec is None:
+                    continue
+                frame = await self.faults.reply(*codec)
+                if frame == CLOSE:
+                    break
+                if frame:
+                    writer.write(frame)
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class Pi30Server(_StreamServer):
+    """Voltronic PI30 behind an Elfin gateway (``tcp://``)."""
+
+    scheme = "tcp"
+
+    def __init__(self, state: InverterState, profile: FaultProfile = FaultProfile()) -> None:
+        super().__init__(FaultInjector(profile, state.seed))
+        self.state = state
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> bytes:
+        # PI30 request CRCs are byte-bumped, so the first CR ends the frame.
+        return await reader.readuntil(b"\r")
+
+    def _codec(self, request: bytes) -> tuple[str, Builder] | None:
+        return pi30_request(self.state, request)
+
+
+class Pi18Server(_StreamServer):
+    """InfiniSolar PI18 behind an Elfin gateway (``pi18://``)."""
+
+    scheme = "pi18"
+
+    def __init__(self, state: InverterState, profile: FaultProfile = FaultProfile()) -> None:
+        super().__init__(FaultInjector(profile, state.seed))
+        self.state = state
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> bytes:
+        # The CRC is not bumped and may contain a CR: frame by ``^Pnnn``.
+        head = await reader.readexactly(5)
+        if not head.startswith(b"^P"):
+            raise ValueError(f"not a PI18 request: {head!r}")
+        return head + await reader.readexactly(int(head[2:5]))
+
+    def _codec(self, request: bytes) -> tuple[str, Builder] | None:
+        return pi18_request(self.state, request)
+
+
+class ModbusServer(_StreamServer):
+    """SMG-II Modbus RTU over TCP (``modbus://``)."""
+
+    scheme = "modbus"
+
+    def __init__(
+        self, state: InverterState, profile: FaultProfile = FaultProfile(), unit_id: int = 1
+    ) -> None:
+        super().__init__(FaultInjector(profile, state.seed))
+        self.state = state
+        self.unit_id = unit_id
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> bytes:
+        head = await reader.readexactly(2)
+        if head[1] in (0x03, 0x06):
+            return head + await reader.readexactly(6)
+        if head[1] == 0x10:
+            fixed = await reader.readexactly(5)
+            return head + fixed + await reader.readexactly(fixed[4] + 2)
+        raise ValueError(f"unsupported modbus function {head[1]}")
+
+    def _codec(self, request: bytes) -> tuple[str, Builder] | None:
+        return modbus_request(self.state, request, self.unit_id)
+
+
+class AgentServer(_Listener):
+    """solar-system-agent HTTP API for several devices (``agent://``).
+
+    NAK-set entries are setting keys, answered ``{"ok": false, "code":
+    "device_nak"}``; CRC corruption does not apply to HTTP.
+    """
+
+    scheme = "agent"
+
+    def __init__(self, states: dict[str, InverterState], profile: FaultProfile = FaultProfile()) -> None:
+        super().__init__(FaultInjector(profile, 0))
+        self.states = states
+
+    def device_uri(self, device_id: str) -> str:
+        return f"{self.uri}/{device_id}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            method, path, body = await self._read_http(reader)
+            command, build = self._route(method, path, body)
+            frame = await self.faults.reply(command, build, can_corrupt=False)
+            if frame is None:
+                await reader.read()  # silent until the client gives up
+            elif frame != CLOSE:
+                writer.write(frame)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_http(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+        method, path, _ = (await reader.readuntil(b"\r\n")).decode("latin-1").split(" ", 2)
+        length = 0
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return method, path, await reader.readexactly(length) if length else b""
+
+    def _route(self, method: str, path: str, body: bytes) -> tuple[str, Builder]:
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        state = self.states.get(parts[1]) if len(parts) == 3 and parts[0] == "devices" else None
+        if state is not None and method == "GET" and parts[2] == "latest":
+            return "latest", lambda nak, corrupt: _http(
+                200, agent_snapshot(state, parts[1], self.faults.rng)
+            )
+        if state is not None and method == "POST" and parts[2] == "settings":
+            request = json.loads(body or b"{}")
+            key = str(request.get("key"))
+
+            def build(nak: bool, corrupt: bool) -> bytes:
+                if nak:
+                    return _http(200, {"ok": False, "error": "device rejected the setting", "code": "device_nak"})
+                return _http(200, apply_agent_setting(state, key, request.get("value")))
+
+            return key, build
+        return "", lambda nak, corrupt: _http(404, {"error": "not found"})
+
+
+def _http(status: int, body: dict) -> bytes:
+    payload = json.dumps(body).encode()
+    reason = "OK" if status == 200 else "Not Found"
+    head = (
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+    )
+    return head.encode("ascii") + payload
+
+
+class DongleClient:
+    """An EyBond WiFi dongle with inverters on one RS485 bus.
+
+    ``protocol`` is what the inverters speak inside FC=4: ``pi30``,
+    ``pi18`` or ``modbus`` (the RS485 address doubles as the unit id).
+    The dongle redials after every session end — server close, clean
+    close from the fault profile, or ``session_lifetime`` expiry.
+    """
+
+    _CODECS = {"pi30", "pi18", "modbus"}
+
+    def __init__(
+        self,
+        pn: str,
+        inverters: dict[int, InverterState],
+        protocol: str = "pi30",
+        profile: FaultProfile = FaultProfile(),
+        devcode: int = DEFAULT_DEVCODE,
+    ) -> None:
+        if protocol not in self._CODECS:
+            raise ValueError(f"unknown dongle protocol {protocol!r}")
+        self.pn = pn
+        self.inverters = inverters
+        self.protocol = protocol
+        self.devcode = devcode
+        self.faults = FaultInjector(profile, zlib.crc32(pn.encode()))
+        self.connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def device_uri(self, host: str, port: int, devaddr: int = 1) -> str:
+        scheme = {"pi30": "eybond", "pi18": "eybond-pi18", "modbus": "eybond-modbus"}[self.protocol]
+        return f"{scheme}://{host}:{port}/{devaddr}?pn={self.pn}"
+
+    def start(self, host: str, port: int) -> None:
+        self._task = asyncio.create_task(self._run(host, port))
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _heartbeat(self, tid: int) -> bytes:
+        payload = self.pn.encode("ascii")[:14].ljust(14, b"\0")
+        return _encode_header(tid, self.devcode, HEADER_SIZE + len(payload), 1, FC_HEARTBEAT) + payload
+
+    async def _run(self, host: str, port: int) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError as err:
+                _LOGGER.debug("dongle %s: dial %s:%d failed: %s", self.pn, host, port, err)
+            else:
+                self.faults.stats["sessions"] += 1
+                self.connected.set()
+                try:
+                    await self._session(reader, writer)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    pass
+                finally:
+                    self.connected.clear()
+                    writer.close()
+            await asyncio.sleep(self.faults.profile.reconnect_delay)
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        lifetime = self.faults.profile.session_lifetime
+        deadline = loop.time() + lifetime if lifetime else None
+        writer.write(self._heartbeat(0))
+        await writer.drain()
+        # Each forward is answered from its own task, so the injected delay
+        # of one request does not hold back the next: replies overlap as
+        # far as the integration's in-flight window lets requests through.
+        forwards: set[asyncio.Task] = set()
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        head = _decode_header(await reader.readexactly(HEADER_SIZE))
+                        payload = await reader.readexactly(head.payload_len) if head.payload_len > 0 else b""
+                except TimeoutError:
+                    return  # clean close, like a dongle going back to the cloud
+                if head.fcode == FC_HEARTBEAT:
+                    writer.write(self._heartbeat(head.tid))
+                    await writer.drain()
+                elif head.fcode == FC_FORWARD2DEVICE:
+                    task = asyncio.create_task(self._answer(head, payload, writer))
+                    forwards.add(task)
+                    task.add_done_callback(forwards.discard)
+        finally:
+            for task in forwards:
+                task.cancel()
+
+    async def _answer(self, head: _EyHeader, payload: bytes, writer: asyncio.StreamWriter) -> None:
+        frame = await self._forward(head.devaddr, payload)
+        if frame == CLOSE:
+            writer.close()  # the session loop sees EOF and the dongle redials
+            return
+        if frame:
+            writer.write(_encode_header(
+                head.tid, head.devcode, HEADER_SIZE + len(frame), head.devaddr, FC_FORWARD2DEVICE
+            ) + frame)
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+
+    async def _forward(self, devaddr: int, request: bytes) -> bytes | None:
+        state = self.inverters.get(devaddr)
+        if state is None:
+            return None  # nobody at that RS485 address
+        if self.protocol == "pi18":
+            codec = pi18_request(state, request)
+        elif self.protocol == "modbus":
+            codec = modbus_request(state, request, devaddr)
+        else:
+            codec = pi30_request(state, request)
+        if codec is None:
+            return None
+        return await self.faults.reply(*codec)
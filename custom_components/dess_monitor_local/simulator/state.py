@@ -0,0 +1,190 @@
+"""Simulated inverter state and the fault profile applied to its replies.
+
+:class:`InverterState` is a small, deterministic-per-seed model of a 24 V
+off-grid hybrid: a diurnal PV curve, a random-walk house load, a battery
+whose state of charge integrates the net current between reads, and a
+grid that can be switched off. It holds the configuration the set
+commands change (priorities, charge voltages / currents), so a write
+through any protocol is visible on the next read through any other.
+
+Values are recomputed lazily on :meth:`InverterState.sample` — once per
+request, a few dozen float operations — so hundreds of instances cost
+nothing while idle.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+
+RATED_BATTERY_VOLTAGE = 24.0
+RATED_BATTERY_AH = 200.0
+RATED_OUTPUT_W = 4000
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """How badly a simulated device (or the link to it) behaves.
+
+    * ``latency`` / ``jitter`` — seconds before a reply; the delay is
+      drawn uniformly from ``latency ± jitter`` and clamped at zero.
+    * ``crc_error_rate`` — probability a reply goes out with a wrong CRC
+      (payload intact, as on a noisy RS232 line).
+    * ``drop_rate`` — probability a request is never answered, so the
+      client runs into its timeout.
+    * ``nak`` — commands always answered with NAK: logical names
+      (``QPIGS2``, ``QPIWS``) for PI30 / PI18, setting keys for the agent,
+      and block start addresses (``"100"``) for Modbus, which answers
+      them with exception 2 (illegal data address).
+    * ``close_every`` — every Nth request on a server is answered with
+      a clean close instead of a reply (the Elfin "connection reset"
+      pattern); 0 disables it.
+    * ``session_lifetime`` — EyBond dongles only: seconds after which a
+      session is closed cleanly and redialled after ``reconnect_delay``,
+      like a dongle handing itself back to the SmartESS cloud; 0 keeps
+      sessions up.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    crc_error_rate: float = 0.0
+    drop_rate: float = 0.0
+    nak: frozenset[str] = frozenset()
+    close_every: int = 0
+    session_lifetime: float = 0.0
+    reconnect_delay: float = 1.0
+
+    def delay(self, rng: random.Random) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(self.latency + rng.uniform(-self.jitter, self.jitter), 0.0)
+
+
+@dataclass
+class Reading:
+    """One consistent set of live values, in engineering units."""
+
+    grid_voltage: float
+    grid_frequency: float
+    output_voltage: float
+    output_frequency: float
+    load_w: int
+    load_va: int
+    load_percent: int
+    battery_voltage: float
+    battery_current: float  # + charging, − discharging
+    soc: int
+    pv_voltage: float
+    pv_power: int
+    grid_power: int
+    heat_sink_temperature: int
+    dcdc_temperature: int
+    mode: str  # PI30 QMOD letter
+    pv_energy_today: int  # Wh
+
+
+@dataclass
+class InverterState:
+    """A simulated inverter: live model plus writable configuration."""
+
+    seed: int = 0
+    serial: str = ""
+    pv_peak_w: int = 3000
+    base_load_w: int = 450
+    grid_available: bool = True
+    fault_code: int = 0
+    # Hours added to UTC when placing the PV curve, so a fleet doesn't
+    # peak in lockstep.
+    clock_offset: float = 0.0
+    output_priority: int = 2  # PI30 code: 0 utility, 1 solar, 2 SBU
+    charger_priority: int = 1  # PI30 code: 0 utility, 1 solar, 2 both, 3 solar only
+    battery_type: int = 2
+    bulk_voltage: float = 28.2
+    float_voltage: float = 27.0
+    max_charging_current: int = 60
+    max_utility_charging_current: int = 30
+    settings_written: int = 0
+    # Modbus registers written outside the modelled config block.
+    extra_registers: dict[int, int] = field(default_factory=dict, repr=False)
+    rng: random.Random = field(init=False, repr=False)
+    soc: float = field(init=False)
+    _load: float = field(init=False, repr=False)
+    _last: float | None = field(default=None, init=False, repr=False)
+    _pv_wh: float = field(default=0.0, init=False, repr=False)
+    _day: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+        self.serial = self.serial or f"SIM{self.seed:011d}"
+        self.soc = 50.0 + self.rng.uniform(-20.0, 30.0)
+        self._load = float(self.base_load_w)
+
+    def sample(self, now: float | None = None) -> Reading:
+        """Advance the model to ``now`` and return the values to report."""
+        now = time.time() if now is None else now
+        dt = 0.0 if self._last is None else min(max(now - self._last, 0.0), 3600.0)
+        self._last = now
+        rng = self.rng
+
+        local_hours = now / 3600.0 + self.clock_offset
+        hour = local_hours % 24.0
+        sun = max(math.sin(math.pi * (hour - 6.0) / 12.0), 0.0)
+        pv_power = int(self.pv_peak_w * sun * rng.uniform(0.85, 1.0))
+        pv_voltage = round(95.0 + 30.0 * sun + rng.uniform(-1.5, 1.5), 1) if pv_power else 0.0
+
+        # Mean-reverting random walk, with the odd kettle.
+        self._load += (self.base_load_w - self._load) * 0.1 + rng.gauss(0.0, 40.0)
+        if rng.random() < 0.02:
+            self._load += rng.uniform(800.0, 1800.0)
+        load_w = int(min(max(self._load, 60.0), RATED_OUTPUT_W * 1.1))
+
+        on_grid = self.grid_available and (self.output_priority == 0 or self.soc < 20.0)
+        if self.fault_code:
+            mode = "F"
+        elif on_grid:
+            mode = "L"
+        elif self.soc <= 1.0 and not self.grid_available:
+            mode = "D"
+        else:
+            mode = "B"
+
+        battery_v_nominal = RATED_BATTERY_VOLTAGE + 3.0 * self.soc / 100.0
+        surplus_w = pv_power - (0 if on_grid else load_w)
+        if on_grid and self.grid_available and self.charger_priority in (0, 2) and self.soc < 95.0:
+            surplus_w += self.max_utility_charging_current * battery_v_nominal
+        current = surplus_w / battery_v_nominal
+        current = min(max(current, -150.0), float(self.max_charging_current))
+        if self.soc >= 100.0 and current > 0:
+            current = 0.0
+        self.soc = min(max(self.soc + current * dt / 3600.0 / RATED_BATTERY_AH * 100.0, 0.0), 100.0)
+        if int(local_hours // 24) != self._day:
+            self._day = int(local_hours // 24)
+            self._pv_wh = 0.0
+        self._pv_wh += pv_power * dt / 3600.0
+
+        battery_voltage = round(
+            min(battery_v_nominal + current * 0.012, self.bulk_voltage + 0.2), 2
+        )
+        grid_voltage = round(230.0 + rng.gauss(0.0, 1.5), 1) if self.grid_available else 0.0
+        grid_power = max(load_w + max(current, 0.0) * battery_voltage - pv_power, 0) if on_grid else 0
+        load_va = int(load_w * rng.uniform(1.05, 1.2))
+        return Reading(
+            grid_voltage=grid_voltage,
+            grid_frequency=round(50.0 + rng.gauss(0.0, 0.02), 2) if self.grid_available else 0.0,
+            output_voltage=round(230.0 + rng.gauss(0.0, 0.3), 1),
+            output_frequency=round(50.0 + rng.gauss(0.0, 0.01), 2),
+            load_w=load_w,
+            load_va=load_va,
+            load_percent=min(int(load_va * 100 / RATED_OUTPUT_W), 199),
+            battery_voltage=battery_voltage,
+            battery_current=round(current, 1),
+            soc=int(self.soc),
+            pv_voltage=pv_voltage,
+            pv_power=pv_power,
+            grid_power=int(grid_power),
+            heat_sink_temperature=int(32 + load_w / 120 + rng.uniform(-1, 1)),
+            dcdc_temperature=int(30 + pv_power / 150 + rng.uniform(-1, 1)),
+            mode=mode,
+            pv_energy_today=int(self._pv_wh),
+        )
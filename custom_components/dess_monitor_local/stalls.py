@@ -0,0 +1,210 @@
+"""Event-loop stall watchdog for the integration's own callbacks.
+
+Everything this integration does runs on Home Assistant's event loop,
+so one slow entity update, decoder or accidental blocking call (a
+subprocess, a serial port open) freezes every other integration for its duration. Home Assistant
+and asyncio's debug mode only report that *some* task "took 0.9 s";
+this module times the integration's loop-side work at the places it is
+dispatched and names the culprit:
+
+* ``entity_update`` — every entity's ``_handle_coordinator_update``
+  (wrapped when the entity subscribes to the coordinator) and
+  ``sample_listener`` for the oversampling listeners;
+* ``data_received`` — the protocol callbacks of the Elfin, serial and
+  PI18 transports, plus the per-frame handling of EyBond sessions;
+* ``queue_step`` — each step (the code between two ``await``) of a
+  command run by the ``CommandQueue`` worker: connect, write, decode;
+* ``serial_open`` — the loop-side part of opening a serial port, timed
+  on its own so it shows up by name rather than as part of a step.
+
+Implementation choices:
+
+* Module-level registry (like ``metrics``) so protocol classes and the
+  queue record without access to ``hass``.
+* Per kind, the last ``WINDOW`` durations in a ``deque`` give a rolling
+  max / p50 / p99 for the diagnostics download (``"stalls"``) that
+  tracks the present rather than a week-old outlier; lifetime totals
+  are two counters.
+* Names are resolved lazily — only for steps over ``THRESHOLD`` — so the
+  fast path is two ``perf_counter()`` calls and a deque append. The
+  device comes from the labels the coordinator binds around each read
+  (``metrics.bind``), like ``frame_log``.
+* A slow step is logged at WARNING the first time per (kind, name) and
+  at DEBUG afterwards: an entity that is always slow shouldn't flood the
+  log, and its count keeps growing in diagnostics. The last
+  ``RECENT`` slow steps are kept with their wall-clock time.
+* Coroutine steps are timed by wrapping the coroutine itself
+  (:func:`steps`): each ``send()`` / ``throw()`` the task makes is one
+  uninterrupted stretch on the loop — the time spent waiting for the
+  inverter is not counted.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from functools import wraps
+from typing import Any
+
+from . import metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds on the loop before a step is reported (asyncio's debug-mode
+# ``slow_callback_duration`` is 0.1 s; ours are meant to be sub-ms).
+THRESHOLD = 0.05
+WINDOW = 512
+RECENT = 20
+
+_Name = str | Callable[..., str]
+
+_perf = time.perf_counter
+
+
+class _Series:
+    __slots__ = ("durations", "count", "slow")
+
+    def __init__(self) -> None:
+        self.durations: deque[float] = deque(maxlen=WINDOW)
+        self.count = 0
+        self.slow = 0
+
+
+_SERIES: dict[str, _Series] = {}
+# (wall time, kind, name, seconds), newest last
+_RECENT: deque[tuple[float, str, str, float]] = deque(maxlen=RECENT)
+_warned: set[tuple[str, str]] = set()
+
+
+def observe(kind: str, seconds: float, name: _Name, *args: Any) -> None:
+    """Record one step; ``name`` (or ``name(*args)``) is only built when slow."""
+    series = _SERIES.get(kind)
+    if series is None:
+        series = _SERIES[kind] = _Series()
+    series.durations.append(seconds)
+    series.count += 1
+    if seconds < THRESHOLD:
+        return
+    series.slow += 1
+    try:
+        label = name(*args) if callable(name) else name
+    except Exception:  # noqa: BLE001 — naming must never break the step it reports
+        label = "?"
+    _RECENT.append((time.time(), kind, label, seconds))
+    log = _LOGGER.debug if (kind, label) in _warned else _LOGGER.warning
+    _warned.add((kind, label))
+    log("%s of %s blocked the event loop for %.0f ms", kind, label, seconds * 1000)
+
+
+@contextmanager
+def watch(kind: str, name: _Name) -> Iterator[None]:
+    """Time the block as one step on the loop."""
+    start = _perf()
+    try:
+        yield
+    finally:
+        observe(kind, _perf() - start, name)
+
+
+def timed(kind: str, name: _Name) -> Callable[[Callable], Callable]:
+    """Decorator: time every call; a callable ``name`` gets the call's args."""
+
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args: Any) -> Any:
+            start = _perf()
+            try:
+                return fn(*args)
+            finally:
+                observe(kind, _perf() - start, name, *args)
+
+        return wrapper
+
+    return decorate
+
+
+class _Steps(Coroutine):
+    """Coroutine proxy timing each step the driving task runs."""
+
+    __slots__ = ("_coro", "_kind", "_name")
+
+    def __init__(self, kind: str, coro: Coroutine[Any, Any, Any], name: _Name):
+        self._coro = coro
+        self._kind = kind
+        self._name = name
+
+    def send(self, value: Any) -> Any:
+        start = _perf()
+        try:
+            return self._coro.send(value)
+        finally:
+            observe(self._kind, _perf() - start, self._name)
+
+    def throw(self, *exc: Any) -> Any:
+        start = _perf()
+        try:
+            return self._coro.throw(*exc)
+        finally:
+            observe(self._kind, _perf() - start, self._name)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+    def __await__(self):
+        return self
+
+
+def steps(kind: str, coro: Coroutine[Any, Any, Any], name: _Name) -> Coroutine[Any, Any, Any]:
+    """Wrap ``coro`` so every step of it on the loop is timed as ``kind``."""
+    return _Steps(kind, coro, name)
+
+
+def bound_name(what: str) -> str:
+    """``what`` prefixed with the device the coordinator bound (``metrics.bind``)."""
+    device = metrics.bound_label("device")
+    return f"{device} {what}" if device else what
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def snapshot() -> dict[str, Any]:
+    """Rolling max / percentiles per kind and the latest slow steps."""
+    kinds = {}
+    for kind, series in sorted(_SERIES.items()):
+        window = sorted(series.durations)
+        kinds[kind] = {
+            "count": series.count,
+            "slow": series.slow,
+            "window": len(window),
+            "max_ms": _ms(window[-1]),
+            "p50_ms": _ms(window[(len(window) - 1) // 2]),
+            "p99_ms": _ms(window[min(int(len(window) * 0.99), len(window) - 1)]),
+        }
+    return {
+        "threshold_ms": _ms(THRESHOLD),
+        "kinds": kinds,
+        "recent": [
+            {
+                "ts": datetime.fromtimestamp(ts, UTC).isoformat(),
+                "kind": kind,
+                "name": name,
+                "ms": _ms(seconds),
+            }
+            for ts, kind, name, seconds in reversed(_RECENT)
+        ],
+    }
+
+
+def clear() -> None:
+    """Forget all timings (integration unload)."""
+    _SERIES.clear()
+    _RECENT.clear()
+    _warned.clear()
@@ -0,0 +1,147 @@
+"""Opt-in span recorder for poll cycles, exported as a Chrome trace.
+
+When a hub cycle takes 90 s the logs say *that* it was slow, not
+*where*: queue wait, TCP connect, the dongle's answer, retry sleeps or
+entity fan-out. With the ``trace_cycles`` option set, every stage of
+the last N coordinator cycles is recorded as a span and the buffer is
+included in the diagnostics download under ``"trace"`` — that value is
+a Trace Event Format document that ``chrome://tracing`` and
+https://ui.perfetto.dev open directly (save it to its own file first).
+
+Implementation choices:
+
+* Module-level buffer (like ``frame_log`` / ``metrics``) so transports
+  and the command queue record without threading ``hass`` through.
+* **Zero cost when disabled**: :func:`span` returns one shared
+  ``nullcontext`` after a single global check; nothing is allocated,
+  timed or formatted. Timestamps are raw ``time.monotonic()`` floats
+  and events are kept as tuples — JSON is only built in :func:`export`.
+  Callers therefore pass raw values: a span name may be a
+  ``str.format`` template over its own args (``"{command} attempt
+  {attempt}"``) and float args are rounded, both only at export.
+* Tracks (the ``tid`` rows in the viewer) follow a ``ContextVar``: a
+  span opened with ``track=<device id>`` puts everything below it —
+  including queued reads, which run in the caller's context, and the
+  protocol callbacks they spawn — on that device's row.
+* :func:`begin_cycle` starts a new event list; the last ``N`` lists
+  are kept (``deque(maxlen=N)``), so memory is bounded by cycles, not
+  uptime. Several config entries tracing at once share the buffer and
+  the largest requested depth.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any
+
+_NULL = nullcontext()
+
+_enabled = False
+# owner (config entry id) -> requested depth in cycles
+_owners: dict[str, int] = {}
+# (name, category, start, end, track, args)
+_Event = tuple[str, str, float, float, str, dict[str, Any] | None]
+_cycles: deque[list[_Event]] = deque(maxlen=1)
+
+_track: ContextVar[str] = ContextVar("dess_monitor_local_trace_track", default="coordinator")
+
+
+def configure(owner: str, cycles: int) -> None:
+    """Request (``cycles > 0``) or release (``0``) tracing for ``owner``."""
+    global _cycles, _enabled
+    if cycles > 0:
+        _owners[owner] = cycles
+    else:
+        _owners.pop(owner, None)
+    depth = max(_owners.values(), default=0)
+    _enabled = depth > 0
+    if not _enabled:
+        _cycles = deque(maxlen=1)
+    elif depth != _cycles.maxlen:
+        _cycles = deque(_cycles, maxlen=depth)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def begin_cycle() -> None:
+    """Open a new cycle; the oldest one drops out once N are kept."""
+    if _enabled:
+        _cycles.append([])
+
+
+def _record(event: _Event) -> None:
+    if not _cycles:
+        _cycles.append([])
+    _cycles[-1].append(event)
+
+
+@contextmanager
+def _span(name: str, cat: str, track: str | None, args: dict[str, Any]) -> Iterator[None]:
+    token = _track.set(track) if track else None
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _record((name, cat, start, time.monotonic(), track or _track.get(), args or None))
+        if token is not None:
+            _track.reset(token)
+
+
+def span(name: str, cat: str = "poll", track: str | None = None, **args: Any):
+    """Time the enclosed block. ``track`` also becomes the row of nested spans.
+
+    ``name`` is formatted with ``args`` at export time, so hot callers
+    pass a constant template and raw values instead of an f-string.
+    """
+    if not _enabled:
+        return _NULL
+    return _span(name, cat, track, args)
+
+
+def add(name: str, start: float, end: float, cat: str = "poll", **args: Any) -> None:
+    """Record an already-measured interval (e.g. queue wait) on the current track."""
+    if _enabled:
+        _record((name, cat, start, end, _track.get(), args or None))
+
+
+def export() -> dict[str, Any]:
+    """Recorded cycles as a Trace Event Format (JSON object) document."""
+    tids: dict[str, int] = {}
+    events: list[dict[str, Any]] = []
+    for cycle in _cycles:
+        for name, cat, start, end, track, args in cycle:
+            tid = tids.setdefault(track, len(tids) + 1)
+            event = {
+                "name": name.format_map(args) if args else name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round(start * 1e6),
+                "dur": max(round((end - start) * 1e6), 0),
+                "pid": 1,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = {
+                    k: str(round(v, 3) if isinstance(v, float) else v) for k, v in args.items()
+                }
+            events.append(event)
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "dess_monitor_local"}},
+        *(
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+            for track, tid in tids.items()
+        ),
+    ]
+    return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+
+def clear() -> None:
+    """Drop recorded cycles (tracing stays as configured)."""
+    for cycle in _cycles:
+        cycle.clear()
+    _cycles.clear()
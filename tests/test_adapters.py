@@ -9,12 +9,18 @@ import pytest
 
 pytest.importorskip("homeassistant")
 
+from custom_components.dess_monitor_local.api.adapters import agent as agent_adapter  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters import factory  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters.agent import AgentAdapter  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters.base import BaseAdapter  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters.eybond import EyBondAdapter  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters.modbus import ModbusAdapter  # noqa: E402
 from custom_components.dess_monitor_local.api.adapters.pi18 import PI18Adapter  # noqa: E402
+from custom_components.dess_monitor_local.api.adapters.replay import ReplayAdapter  # noqa: E402
+from custom_components.dess_monitor_local.api.adapters.snapshot_cache import (  # noqa: E402
+    PollCycle,
+    snapshots,
+)
 from custom_components.dess_monitor_local.api.adapters.voltronic import VoltronicAdapter  # noqa: E402
 from custom_components.dess_monitor_local.api.decoders.enums import (  # noqa: E402
     BatteryTypeSetting,
@@ -23,6 +29,13 @@ from custom_components.dess_monitor_local.api.decoders.enums import (  # noqa: E
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_adapters():
+    factory._ADAPTERS.clear()
+    yield
+    factory._ADAPTERS.clear()
+
+
 class TestFactoryRouting:
     @pytest.mark.parametrize("uri,cls", [
         ("agent://10.0.0.5:8787/dev1", AgentAdapter),
@@ -32,17 +45,40 @@ class TestFactoryRouting:
         ("eybond://0.0.0.0:8899/1", EyBondAdapter),
         ("eybond-pi18://0.0.0.0:8899/1", EyBondAdapter),
         ("tcp://10.0.0.5:8899", VoltronicAdapter),
+        ("replay:///config/capture.bin?speed=0", ReplayAdapter),
         ("/dev/ttyUSB0", VoltronicAdapter),       # bare serial path -> default
         ("COM3", VoltronicAdapter),               # Windows serial -> default
     ])
     def test_scheme_maps_to_adapter(self, uri, cls):
         assert isinstance(factory.get_adapter(uri), cls)
 
-    def test_passes_timeout_and_strict_crc(self):
-        a = factory.get_adapter("tcp://x:1", timeout=12.5, strict_crc=True)
-        assert a.timeout == 12.5
-        assert a.strict_crc is True
-        assert a.uri == "tcp://x:1"
+    def test_defaults_left_for_per_call_options(self):
+        a = factory.get_adapter("tcp://x:1")
+        assert (a.uri, a.timeout, a.strict_crc) == ("tcp://x:1", 30.0, False)
+
+    def test_one_instance_per_uri(self):
+        a = factory.get_adapter("modbus://10.0.0.5:502")
+        assert factory.get_adapter("modbus://10.0.0.5:502") is a
+        assert factory.get_adapter("modbus://10.0.0.6:502") is not a
+
+    def test_uri_parsed_once(self):
+        a = factory.get_adapter("eybond-pi18://0.0.0.0:8899/2?pn=PN1&window=4")
+        assert (a.endpoint.devaddr, a.endpoint.pn, a.endpoint.window) == (2, "PN1", 4)
+        assert factory.get_adapter("tcp://10.0.0.5:8899").endpoint == ("10.0.0.5", 8899)
+
+    @pytest.mark.asyncio
+    async def test_close_adapters_scoped_to_uris(self):
+        mine = factory.get_adapter("modbus://10.0.0.5:502")
+        other = factory.get_adapter("agent://10.0.0.6:8787/dev2")
+        await factory.close_adapters(["modbus://10.0.0.5:502"])
+        assert factory.get_adapter("agent://10.0.0.6:8787/dev2") is other
+        assert factory.get_adapter("modbus://10.0.0.5:502") is not mine
+
+    @pytest.mark.asyncio
+    async def test_close_adapters_forgets_them(self):
+        a = factory.get_adapter("agent://10.0.0.5:8787/dev1")
+        await factory.close_adapters()
+        assert factory.get_adapter("agent://10.0.0.5:8787/dev1") is not a
 
     def test_eybond_pi18_flag(self):
         a = factory.get_adapter("eybond-pi18://0.0.0.0:8899/1")
@@ -129,3 +165,30 @@ class TestBaseSemanticCommands:
         a = _RecordingAdapter()
         await a.set_battery_type(BatteryTypeSetting.LIFEP04)
         assert a.sent == BatteryTypeSetting.LIFEP04.value
+
+
+class TestAgentSnapshotPerCycle:
+    @pytest.mark.asyncio
+    async def test_one_fetch_per_cycle_and_write_invalidates(self, monkeypatch):
+        fetches = []
+
+        async def fake_fetch(host, port, provider_device_id, timeout):
+            fetches.append(provider_device_id)
+            return {"ageMs": 10, "raw": {"grid_voltage": "230.0", "operating_mode": "OffGrid"}}
+
+        async def fake_post(device, key, value, timeout=30.0):
+            return {"ok": True}
+
+        monkeypatch.setattr(agent_adapter, "fetch_agent_snapshot", fake_fetch)
+        monkeypatch.setattr(agent_adapter, "post_agent_setting", fake_post)
+        snapshots.clear()
+        a = AgentAdapter("agent://10.0.0.5:8787/dev1")
+        cycle = PollCycle()
+        for cmd in ("QPIGS", "QPIRI", "QMOD", "QPIGS2", "QPIWS", "QFWS"):
+            await a.get_data(cmd, cycle)
+        assert fetches == ["dev1"]
+
+        await a.set_battery_float_voltage(27.0)
+        await a.get_data("QPIRI", cycle)
+        assert fetches == ["dev1", "dev1"]
+        snapshots.clear()
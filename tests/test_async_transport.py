@@ -4,6 +4,8 @@ No pytest-asyncio dependency — each test drives the coroutine with
 ``asyncio.run`` and fakes the stream pair so no real socket is opened.
 """
 import asyncio
+import contextvars
+import time
 
 import pytest
 
@@ -88,6 +90,92 @@ class TestCommandQueue:
 
         assert asyncio.run(scenario()) is True
 
+    def test_expired_deadline_skips_command(self):
+        async def scenario():
+            q = CommandQueue(min_delay=0.0)
+            await q.start()
+            ran = []
+
+            async def fn():
+                ran.append(1)
+                return 1
+
+            try:
+                with pytest.raises(TimeoutError):
+                    await q.enqueue(fn, deadline=time.monotonic() - 1)
+                # A live deadline still runs normally.
+                result = await q.enqueue(fn, deadline=time.monotonic() + 60)
+            finally:
+                await q.stop()
+            return ran, result
+
+        ran, result = asyncio.run(scenario())
+        assert ran == [1]
+        assert result == 1
+
+    def test_command_runs_in_caller_context(self):
+        # Metric labels / trace tracks bound by the caller must reach the
+        # transport, even though the worker task executes the command.
+        var = contextvars.ContextVar("var", default="worker")
+
+        async def scenario():
+            q = CommandQueue(min_delay=0.0)
+            await q.start()
+
+            async def fn():
+                return var.get()
+
+            try:
+                var.set("caller")
+                return await q.enqueue(fn)
+            finally:
+                await q.stop()
+
+        assert asyncio.run(scenario()) == "caller"
+
+
+    def test_lanes_run_concurrently_but_each_in_order(self):
+        async def scenario():
+            q = CommandQueue(min_delay=0.0)
+            await q.start()
+            running, peak, order = set(), [0], []
+
+            def make(lane, n):
+                async def fn():
+                    running.add((lane, n))
+                    peak[0] = max(peak[0], len(running))
+                    await asyncio.sleep(0.01)
+                    running.discard((lane, n))
+                    order.append((lane, n))
+                return fn
+
+            try:
+                await asyncio.gather(*(
+                    q.enqueue(make(lane, n), lane=lane) for n in range(3) for lane in ("a", "b")
+                ))
+            finally:
+                await q.stop()
+            return peak[0], order
+
+        peak, order = asyncio.run(scenario())
+        assert peak == 2  # one command per lane at a time, lanes side by side
+        assert [n for lane, n in order if lane == "a"] == [0, 1, 2]
+        assert [n for lane, n in order if lane == "b"] == [0, 1, 2]
+
+    def test_lane_enqueued_before_start_runs_after(self):
+        async def scenario():
+            q = CommandQueue(min_delay=0.0)
+            pending = asyncio.create_task(q.enqueue(lambda: _const(7), lane="x"))
+            await asyncio.sleep(0)
+            assert not pending.done()
+            await q.start()
+            try:
+                return await pending
+            finally:
+                await q.stop()
+
+        assert asyncio.run(scenario()) == 7
+
 
 async def _const(v):
     return v
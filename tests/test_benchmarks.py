@@ -0,0 +1,37 @@
+"""Smoke tests for the benchmark suite (benchmarks/), so cases don't rot."""
+import json
+import pathlib
+
+import pytest
+
+# The coordinator-cycle cases go through the dispatcher and every transport.
+pytest.importorskip("serial_asyncio_fast")
+
+from benchmarks import cases  # noqa: F401  (registers the cases)
+from benchmarks.harness import CASES, compare, measure
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_case_runs(name):
+    op = CASES[name]()
+    try:
+        op()
+    finally:
+        if hasattr(op, "close"):
+            op.close()
+
+
+def test_baseline_covers_every_case():
+    baseline = json.loads((pathlib.Path(cases.__file__).with_name("baseline.json")).read_text())
+    assert set(baseline["cases"]) == set(CASES)
+
+
+def test_measure_and_compare():
+    result = measure(lambda: bytes(64), repeat=2, min_time=0.01)
+    assert result["ops_per_s"] > 0
+    assert result["retained_b_per_op"] < 64
+    baseline = {"fast": {"ops_per_s": 1000.0, "peak_alloc_b": 100}}
+    assert compare({"fast": {"ops_per_s": 800.0, "peak_alloc_b": 300}}, baseline, 0.25) == []
+    assert compare({"fast": {"ops_per_s": 700.0, "peak_alloc_b": 100}}, baseline, 0.25) == ["fast"]
+    assert compare({"fast": {"ops_per_s": 1000.0, "peak_alloc_b": 500}}, baseline, 0.25) == ["fast"]
+    assert compare({"new": {"ops_per_s": 1.0, "peak_alloc_b": 0}}, baseline, 0.25) == []
@@ -0,0 +1,103 @@
+"""Tests for the per-device / per-endpoint circuit breaker (circuit_breaker.py)."""
+from custom_components.dess_monitor_local.coordinators.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    endpoint_key,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def _breaker(**kw):
+    clock = _Clock()
+    return CircuitBreaker(3, base_backoff=30.0, max_backoff=120.0, now=clock, **kw), clock
+
+
+class TestStates:
+    def test_closed_until_threshold(self):
+        b, _ = _breaker()
+        assert b.on_failure("dev") is BreakerState.CLOSED
+        assert b.on_failure("dev") is BreakerState.CLOSED
+        assert b.on_failure("dev") is BreakerState.OPEN
+
+    def test_success_resets_count(self):
+        b, _ = _breaker()
+        b.on_failure("dev")
+        b.on_failure("dev")
+        b.on_success("dev")
+        assert b.on_failure("dev") is BreakerState.CLOSED
+
+    def test_half_open_after_backoff(self):
+        b, clock = _breaker()
+        for _ in range(3):
+            b.on_failure("dev")
+        clock.t += 29
+        assert b.state("dev") is BreakerState.OPEN
+        clock.t += 1
+        assert b.state("dev") is BreakerState.HALF_OPEN
+
+    def test_failed_probe_doubles_backoff_up_to_cap(self):
+        b, clock = _breaker()
+        for _ in range(3):
+            b.on_failure("dev")
+        backoffs = []
+        for _ in range(4):
+            clock.t += 1000
+            assert b.state("dev") is BreakerState.HALF_OPEN
+            b.on_failure("dev")
+            backoffs.append(b.describe("dev")["backoff_seconds"])
+        assert backoffs == [60.0, 120.0, 120.0, 120.0]
+
+    def test_probe_success_closes(self):
+        b, clock = _breaker()
+        for _ in range(3):
+            b.on_failure("dev")
+        clock.t += 30
+        b.on_success("dev")
+        assert b.state("dev") is BreakerState.CLOSED
+        assert b.retry_in("dev") is None
+
+    def test_keys_isolated(self):
+        b, _ = _breaker()
+        for _ in range(3):
+            b.on_failure("dev1")
+        assert b.state("dev2") is BreakerState.CLOSED
+
+    def test_describe(self):
+        b, clock = _breaker()
+        for _ in range(3):
+            b.on_failure("dev")
+        clock.t += 10
+        d = b.describe("dev")
+        assert d["state"] == "open"
+        assert d["consecutive_failures"] == 3
+        assert d["retry_in_seconds"] == 20.0
+        assert d["trips"] == 1
+        assert set(b.snapshot()) == {"dev"}
+
+
+class TestEndpointKey:
+    def test_tcp_host_port(self):
+        assert endpoint_key("tcp://10.0.0.5:8899") == "10.0.0.5:8899"
+
+    def test_agent_children_share_endpoint(self):
+        assert endpoint_key("agent://h:8787/a") == endpoint_key("agent://h:8787/b")
+
+    def test_eybond_routed_by_pn(self):
+        a = endpoint_key("eybond://0.0.0.0:8899/1?pn=PN1")
+        b = endpoint_key("eybond-modbus://0.0.0.0:8899/1?pn=PN2")
+        assert a == "eybond:PN1"
+        assert a != b
+
+    def test_eybond_without_pn_uses_listener(self):
+        assert endpoint_key("eybond://0.0.0.0:8899/1") == "0.0.0.0:8899"
+
+    def test_serial_paths(self):
+        assert endpoint_key("/dev/ttyUSB0") == "/dev/ttyUSB0"
+        assert endpoint_key("pi18-serial:///dev/ttyUSB1") == "pi18-serial:/dev/ttyUSB1"
@@ -0,0 +1,65 @@
+"""Tests for the headless poller / benchmark CLI (cli.py)."""
+import asyncio
+import io
+import json
+
+import pytest
+
+# The dispatcher imports every transport, including the serial one.
+pytest.importorskip("serial_asyncio_fast")
+
+from custom_components.dess_monitor_local import cli, metrics
+from custom_components.dess_monitor_local.api.decoders.enums import OperatingMode
+
+
+@pytest.fixture(autouse=True)
+def _fake_transport(monkeypatch):
+    calls = []
+
+    async def _get_direct_data(device, command, timeout=30.0, strict_crc=False, deadline=None):
+        calls.append((device, command, metrics.bound_label("device")))
+        if command == "QPIGS2":
+            return {"error": "NAK response received. Command not accepted."}
+        if command == "QMOD":
+            return {"operating_mode": OperatingMode.Line}
+        return {"grid_voltage": "230.0"}
+
+    metrics.clear()
+    monkeypatch.setattr(cli, "get_direct_data", _get_direct_data)
+    yield calls
+    metrics.clear()
+
+
+def _run(argv):
+    args = cli.parse_args(argv)
+    stats = cli.BenchStats()
+    out = io.StringIO()
+    asyncio.run(cli.run(args, stats, out))
+    return stats, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestCli:
+    def test_percentile_nearest_rank(self):
+        assert cli.percentile([], 0.5) is None
+        assert cli.percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+        assert cli.percentile([1.0, 2.0, 3.0, 4.0], 0.95) == 4.0
+
+    def test_poll_emits_json_lines(self, _fake_transport):
+        _, lines = _run(["-n", "2", "-i", "0", "-c", "qpigs", "-c", "QMOD", "tcp://a:1", "tcp://b:1"])
+        assert len(lines) == 8
+        assert {line["device"] for line in lines} == {"tcp://a:1", "tcp://b:1"}
+        qmod = next(line for line in lines if line["command"] == "QMOD")
+        assert qmod["ok"] is True
+        assert qmod["data"] == {"operating_mode": "Line"}
+        # Reads run with the device bound, like coordinator reads.
+        assert all(device == bound for device, _, bound in _fake_transport)
+
+    def test_bench_summary(self):
+        stats, lines = _run(["--bench", "-n", "3", "-c", "QPIGS", "-c", "QPIGS2", "tcp://a:1"])
+        assert lines == []
+        summary = stats.summary()
+        assert summary["requests"] == 6
+        assert summary["errors"] == 3
+        rows = {row["command"]: row for row in summary["commands"]}
+        assert rows["QPIGS2"]["error_rate"] == 1.0
+        assert rows["QPIGS"]["rtt_p95"] is not None
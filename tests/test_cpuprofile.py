@@ -0,0 +1,70 @@
+"""Tests for the on-demand stack-sampling CPU profile (cpuprofile.py)."""
+import sys
+import time
+
+import pytest
+
+from custom_components.dess_monitor_local import cpuprofile, frame_log
+from custom_components.dess_monitor_local.api.crc import crc16_xmodem
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    cpuprofile.clear()
+    yield
+    cpuprofile.clear()
+    frame_log.clear()
+
+
+def _busy(seconds):
+    until = time.monotonic() + seconds
+    while time.monotonic() < until:
+        crc16_xmodem(b"(230.0 50.0 230.0 50.0 0460 0391 011 409 26.50 000 080" * 4)
+
+
+def _wait_done():
+    cpuprofile._sampler.join(5)
+    return cpuprofile.report()
+
+
+class TestCpuProfile:
+    def test_own_stack_cut_at_outermost_own_frame(self):
+        assert cpuprofile.own_stack(sys._getframe()) is None  # test code isn't ours
+        captured = {}
+
+        def leaf(data):
+            captured["stack"] = cpuprofile.own_stack(sys._getframe())
+            return 0
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(frame_log.frame_capture, "append", lambda *args: leaf(args))
+            frame_log.record("QMOD", b"(B", True, device="inv1")
+        names = [code.co_name for code in captured["stack"]]
+        assert names == ["record", "<lambda>", "leaf"]
+
+    def test_seconds_profile_writes_collapsed_stacks(self, tmp_path):
+        path = tmp_path / "profile.collapsed"
+        cpuprofile.start(str(path), seconds=0.3, interval=0.001, top=5)
+        assert cpuprofile.report()["state"] == "running"
+        _busy(0.5)
+        report = _wait_done()
+
+        assert report["state"] == "done"
+        assert report["samples"] > 0 and 0 < report["integration_samples"] <= report["samples"]
+        assert report["top_self"][0]["function"] == "crc16_xmodem (api/crc.py:10)"
+        assert len(report["top_total"]) <= 5
+        lines = path.read_text().splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack == "crc16_xmodem (api/crc.py:10)" and int(count) > 0
+
+    def test_cycles_profile_stops_on_last_cycle(self, tmp_path):
+        cpuprofile.start(str(tmp_path / "p.collapsed"), cycles=2, interval=0.001)
+        cpuprofile.end_cycle()
+        assert cpuprofile.report()["cycles_left"] == 1
+        cpuprofile.end_cycle()
+        assert _wait_done()["state"] == "done"
+        assert not cpuprofile.running()
+
+    def test_unwritable_path_is_reported(self, tmp_path):
+        cpuprofile.start(str(tmp_path / "missing" / "p.collapsed"), seconds=0.05)
+        assert "file_error" in _wait_done()
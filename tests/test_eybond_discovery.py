@@ -119,6 +119,22 @@ class TestConfiguration:
         assert "PN001" not in reg
         assert reg.remove("PN001") is None
 
+    def test_listeners_fire_on_configuration_changes_only(self):
+        reg = EybondRegistry(now=_Clock())
+        calls = []
+        remove = reg.add_listener(lambda: calls.append(1))
+        reg.record_seen("PN1")  # lifecycle: silent
+        reg.set_enabled("PN1", True)
+        reg.set_enabled("PN1", True)  # unchanged: silent
+        reg.put(DongleRecord(pn="PN2"))
+        reg.remove("PN2")
+        reg.remove("PN2")  # unknown: silent
+        reg.load({})
+        assert len(calls) == 4
+        remove()
+        reg.set_enabled("PN1", False)
+        assert len(calls) == 4
+
 
 class TestQueries:
     def _populate(self) -> EybondRegistry:
@@ -141,6 +157,62 @@ class TestQueries:
         reg = self._populate()
         assert {r.pn for r in reg.all()} == {"PN_A", "PN_B"}
 
+    def test_indexes_follow_every_mutation(self):
+        reg = self._populate()
+        reg.set_enabled("PN_B", True)
+        reg.record_seen("PN_B", "10.0.0.2:3")
+        assert (reg.enabled_count(), reg.connected_count()) == (2, 2)
+        assert [r.pn for r in reg.enabled()] == ["PN_A", "PN_B"]
+        reg.set_enabled("PN_A", False)
+        reg.remove("PN_B")
+        assert reg.enabled_pns() == [] and reg.connected_pns() == ["PN_A"]
+        reg.reset_connection_state()
+        assert reg.connected_pns() == []
+        reg.put(DongleRecord(pn="PN_C", enabled=True, status=DongleStatus.CONNECTED))
+        assert reg.enabled_pns() == reg.connected_pns() == ["PN_C"]
+
+        loaded = EybondRegistry()
+        loaded.load(reg.to_dict())
+        assert loaded.enabled_pns() == loaded.connected_pns() == ["PN_C"]
+
+
+class TestChangeTracking:
+    def test_version_moves_on_changes_not_on_heartbeats(self):
+        reg = EybondRegistry(now=_Clock())
+        seen = []
+        reg.add_observer(seen.append)
+        reg.record_seen("PN_A", "10.0.0.1:1")     # new dongle
+        reg.record_seen("PN_A", "10.0.0.1:1")     # heartbeat
+        reg.set_protocol("PN_A", "voltronic")
+        reg.set_protocol("PN_A", "voltronic")     # no-op
+        reg.mark_disconnected("PN_A")
+        reg.mark_disconnected("PN_A")             # already disconnected
+        assert seen == [1, 2, 3] and reg.version == 3
+
+    def test_to_dict_reserializes_only_changed_records(self):
+        reg = EybondRegistry(now=_Clock())
+        reg.record_seen("PN_A", "10.0.0.1:1")
+        reg.record_seen("PN_B", "10.0.0.2:1")
+        first = reg.to_dict()
+        assert not reg.dirty
+        reg.record_seen("PN_A", "10.0.0.1:1")     # touched: last_seen moved
+        assert reg.dirty
+        second = reg.to_dict()
+        assert second["PN_B"] is first["PN_B"]
+        assert second["PN_A"]["last_seen"] != first["PN_A"]["last_seen"]
+        reg.remove("PN_B")
+        assert list(reg.to_dict()) == ["PN_A"]
+
+    def test_load_dirties_everything(self):
+        reg = EybondRegistry()
+        reg.load({"PN_A": {"pn": "PN_A", "status": "connected", "peer": "x"}})
+        assert reg.dirty
+        version = reg.version
+        reg.reset_connection_state()
+        assert reg.version == version + 1
+        reg.reset_connection_state()              # nothing stale left
+        assert reg.version == version + 1
+
 
 class TestSerialization:
     def test_round_trip(self):
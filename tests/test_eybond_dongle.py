@@ -7,6 +7,8 @@ Also exercises the multi-session EybondManager (one listener, many dongles
 routed by PN) using in-memory fake StreamReader/StreamWriter so no real
 socket is bound."""
 import asyncio
+import ipaddress
+import logging
 import struct
 from unittest.mock import patch
 
@@ -128,6 +130,14 @@ class TestResolveBroadcast:
     def test_loopback_returns_default(self):
         assert ey._resolve_broadcast_for_announce_ip("127.0.0.1") == ey.DEFAULT_BROADCAST
 
+    def test_matching_subnet(self):
+        ifaces = (ipaddress.IPv4Interface("10.1.0.5/16"), ipaddress.IPv4Interface("192.168.1.10/24"))
+        assert ey._resolve_broadcast_for_announce_ip("192.168.1.10", ifaces) == "192.168.1.255"
+
+    def test_no_matching_subnet_uses_slash24_heuristic(self):
+        ifaces = (ipaddress.IPv4Interface("172.17.0.2/16"),)
+        assert ey._resolve_broadcast_for_announce_ip("192.168.5.7", ifaces) == "192.168.5.255"
+
 
 # ---------------------------------------------------------------------------
 # Multi-session manager — in-memory fakes (no real socket)
@@ -223,12 +233,10 @@ def _new_manager() -> ey.EybondManager:
 
 async def _drain(mgr: ey.EybondManager, *tasks) -> None:
     """Cancel outstanding tasks so asyncio.run() exits cleanly."""
-    if mgr._announce_task and not mgr._announce_task.done():
-        mgr._announce_task.cancel()
-    for t in tasks:
+    for t in (mgr._announce_task, mgr._wheel_task, *tasks):
         if t and not t.done():
             t.cancel()
-    for t in (mgr._announce_task, *tasks):
+    for t in (mgr._announce_task, mgr._wheel_task, *tasks):
         if t:
             try:
                 await t
@@ -407,6 +415,57 @@ class TestMultiSession:
 
         asyncio.run(scenario())
 
+    def test_hub_registry_adopted_via_get_eybond_manager(self):
+        async def noop(self):
+            return None
+
+        async def scenario():
+            hub_registry = ey.EybondRegistry()
+            hub_registry.set_enabled("PN1", True)
+            hub_registry.set_enabled("PN2", True)
+            with patch.object(ey.EybondManager, "ensure_started", noop):
+                mgr = await ey.get_eybond_manager("127.0.0.1", 18999, registry=hub_registry)
+            try:
+                assert mgr.registry is hub_registry
+                r, w = _FakeReader(), _FakeWriter(("10.0.0.1", 1111))
+                task = asyncio.create_task(mgr._handle_session(r, w))
+                r.feed(_dongle_heartbeat("PN1"))
+                await _until(lambda: mgr.identified_pns == ["PN1"])
+                assert mgr._should_announce() is True  # PN2 still missing
+                hub_registry.set_enabled("PN3", True)
+                assert mgr._expected == {"PN1", "PN2", "PN3"}
+                await _drain(mgr, task)
+                await mgr.shutdown()
+                # A shut-down manager no longer follows the hub's registry.
+                hub_registry.set_enabled("PN4", True)
+                assert "PN4" not in mgr._expected
+            finally:
+                ey._managers.pop(("127.0.0.1", 18999), None)
+
+        asyncio.run(scenario())
+
+    def test_registry_observers_follow_adoption(self):
+        mgr = ey.EybondManager("127.0.0.1", 0, ey.DEFAULT_BROADCAST)
+        seen = []
+
+        def observer(version):
+            seen.append(version)
+
+        remove = mgr.add_registry_observer(observer)
+        old = mgr.registry
+        hub_registry = ey.EybondRegistry()
+        hub_registry.set_enabled("PN1", True)
+        mgr.adopt_registry(hub_registry)
+        assert seen == [hub_registry.version]  # told to redraw from the new one
+        old.set_enabled("PN_OLD", True)
+        assert len(seen) == 1  # the dropped registry is no longer observed
+        hub_registry.set_enabled("PN2", True)
+        assert seen[-1] == hub_registry.version
+        calls = len(seen)
+        remove()
+        hub_registry.set_enabled("PN3", True)
+        assert len(seen) == calls
+
     def test_announce_gating(self):
         async def scenario():
             mgr = _new_manager()
@@ -434,6 +493,53 @@ class TestMultiSession:
 
         asyncio.run(scenario())
 
+    def test_announcer_is_event_driven(self):
+        # Paused: no timer at all; a drop wakes it and broadcasts at once.
+        class _Sock:
+            sent: list[bytes] = []
+
+            def __init__(self, *args):
+                pass
+
+            def setsockopt(self, *args):
+                pass
+
+            def setblocking(self, flag):
+                pass
+
+            def sendto(self, data, addr):
+                self.sent.append(data)
+
+            def close(self):
+                pass
+
+        async def scenario():
+            mgr = _new_manager()
+            mgr._announce_task.cancel()
+            r, w = _FakeReader(), _FakeWriter(("10.0.0.1", 1111))
+            task = asyncio.create_task(mgr._handle_session(r, w))
+            r.feed(_dongle_heartbeat("PN0000000001"))
+            await _until(lambda: mgr.connected)
+            mgr.registry.set_enabled("PN0000000001", True)
+
+            discovery = ey._netif.InterfaceDiscovery(
+                reader=lambda: ey._netif.NetSnapshot((), "10.0.0.5")
+            )
+            await discovery.snapshot()  # cached before socket.socket is patched
+            with patch.object(ey.socket, "socket", _Sock), patch.object(ey._netif, "discovery", discovery):
+                mgr._announce_task = asyncio.create_task(mgr._announce_loop())
+                await asyncio.sleep(0.05)
+                assert _Sock.sent == []
+                assert not mgr._announce_wake.is_set()  # parked on the event
+
+                r.feed_eof()
+                await _until(lambda: _Sock.sent)
+                assert _Sock.sent == [b"set>server=10.0.0.5:18899;"]
+                await _drain(mgr, task)
+            discovery.close()
+
+        asyncio.run(scenario())
+
     def test_force_rediscovery_overrides_gating(self):
         async def scenario():
             mgr = _new_manager()
@@ -511,8 +617,8 @@ class TestMultiSession:
             r = _FakeReader()
             w = _FakeWriter(("10.0.0.1", 1111), fail_drain=True)
             sess = ey._Session(reader=r, writer=w, peer="10.0.0.1:1111")
-            # The loop sends one heartbeat; drain() raises → it closes & returns.
-            await mgr._heartbeat_loop(sess)
+            # The wheel sends a heartbeat; drain() raises → it closes the writer.
+            await mgr._beat(sess)
             assert w.closed is True
             await _drain(mgr)
 
@@ -589,3 +695,504 @@ class TestDiscoveryIntegration:
             await _drain(mgr, t1, t2)
 
         asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# BufferedProtocol session reader
+# ---------------------------------------------------------------------------
+class _FakeTransport:
+    def __init__(self, peer=("10.0.0.1", 1111)):
+        self.frames: list[bytes] = []
+        self.closed = False
+        self._peer = peer
+
+    def get_extra_info(self, key, default=None):
+        return self._peer if key == "peername" else default
+
+    def write(self, data: bytes) -> None:
+        self.frames.append(bytes(data))
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _feed(proto, data: bytes, chunk: int) -> None:
+    """Deliver ``data`` the way the event loop does: recv_into get_buffer()."""
+    for i in range(0, len(data), chunk):
+        piece = data[i:i + chunk]
+        buf = proto.get_buffer(-1)
+        n = min(len(piece), len(buf))
+        buf[:n] = piece[:n]
+        proto.buffer_updated(n)
+        if n < len(piece):
+            _feed(proto, piece[n:], chunk)
+
+
+class TestDongleProtocol:
+    def _run(self, chunk):
+        async def scenario():
+            mgr = _new_manager()
+            proto, transport = ey._DongleProtocol(mgr), _FakeTransport()
+            proto.connection_made(transport)
+            _feed(proto, _dongle_heartbeat("PN0000000001"), chunk)
+            assert mgr.identified_pns == ["PN0000000001"]
+
+            send = asyncio.create_task(mgr.send_frame(1, b"QPIGS\r", timeout=5.0, pn="PN0000000001"))
+            await _until(lambda: _find_fc4(transport.frames)[1] is not None)
+            h, _ = _find_fc4(transport.frames)
+            reply = ey._build_forward2device(h.tid, b"(230.0 50.0", devaddr=1)
+            # The reply arrives together with the next heartbeat.
+            _feed(proto, reply + _dongle_heartbeat("PN0000000001"), chunk)
+            assert await send == b"(230.0 50.0"
+            assert proto._start == proto._end == 0  # nothing partial left
+
+            proto.connection_lost(None)
+            assert mgr.identified_pns == []
+            assert mgr.registry.connected_pns() == []
+            assert transport.closed
+            await _drain(mgr, send)
+
+        asyncio.run(scenario())
+
+    def test_frames_split_across_reads(self):
+        self._run(chunk=1)
+
+    def test_frames_coalesced_in_one_read(self):
+        self._run(chunk=4096)
+
+    def test_frame_larger_than_buffer_grows_it(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, transport = ey._DongleProtocol(mgr), _FakeTransport()
+            proto.connection_made(transport)
+            sess = proto._sess
+            fut = asyncio.get_running_loop().create_future()
+            sess.pending[5] = fut
+            big = bytes(range(256)) * 20  # > RECV_BUFFER_SIZE
+            _feed(proto, ey._build_forward2device(5, big, devaddr=1), 700)
+            assert fut.result() == big
+            assert len(proto._buf) >= len(big) + ey.HEADER_SIZE
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_steady_stream_compacts_instead_of_growing(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, transport = ey._DongleProtocol(mgr), _FakeTransport()
+            proto.connection_made(transport)
+            frame = ey._build_forward2device(9, bytes(227 - ey.HEADER_SIZE), devaddr=1)
+            assert len(frame) == 227
+            # 100-byte reads leave a partial frame behind whenever the tail fills.
+            _feed(proto, frame * 100, 100)
+            assert len(proto._buf) == ey.RECV_BUFFER_SIZE
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_malformed_header_closes_connection(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, transport = ey._DongleProtocol(mgr), _FakeTransport()
+            proto.connection_made(transport)
+            _feed(proto, ey._HEADER.pack(1, ey.DEFAULT_DEVCODE, 0, 1, 1), 64)  # total < header
+            assert transport.closed
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_listener_round_trip_over_tcp(self):
+        async def quiet(self):
+            await asyncio.sleep(3600)
+
+        async def scenario():
+            mgr = ey.EybondManager("127.0.0.1", 0, ey.DEFAULT_BROADCAST)
+            await mgr.ensure_started()
+            port = mgr._server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(_dongle_heartbeat("PN0000000001"))
+            await _until(lambda: mgr.identified_pns == ["PN0000000001"])
+
+            send = asyncio.create_task(mgr.send_frame(1, b"QMOD\r", timeout=5.0, pn="PN0000000001"))
+            while True:
+                h = ey._decode_header(await reader.readexactly(ey.HEADER_SIZE))
+                await reader.readexactly(h.payload_len)
+                if h.fcode == ey.FC_FORWARD2DEVICE:
+                    break
+            writer.write(ey._build_forward2device(h.tid, b"(B", devaddr=1))
+            assert await send == b"(B"
+
+            writer.close()
+            await _until(lambda: not mgr.identified_pns)
+            await mgr.shutdown()
+
+        with patch.object(ey.EybondManager, "_announce_loop", quiet):
+            asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# In-flight window (TID pipelining)
+# ---------------------------------------------------------------------------
+class TestParseWindowFromUri:
+    def test_window_present_and_clamped(self):
+        assert ey._parse_window_from_uri("eybond://0.0.0.0:8899/1?pn=X&window=4") == 4
+        assert ey._parse_window_from_uri("eybond://0.0.0.0:8899/1?window=0") == 1
+        assert ey._parse_window_from_uri("eybond://0.0.0.0:8899/1?window=999") == ey.MAX_WINDOW
+
+    def test_window_absent_or_bad_is_none(self):
+        assert ey._parse_window_from_uri("eybond://0.0.0.0:8899/1") is None
+        assert ey._parse_window_from_uri("eybond://0.0.0.0:8899/1?window=many") is None
+
+
+class TestEybondEndpoint:
+    def test_parsed_fields(self):
+        ep = ey.eybond_endpoint(
+            "eybond-modbus://0.0.0.0:9000/3?pn=PN7&window=2&announce=192.168.1.2"
+        )
+        assert (ep.bind_host, ep.bind_port, ep.devaddr) == ("0.0.0.0", 9000, 3)
+        assert (ep.pn, ep.window, ep.announce_ip) == ("PN7", 2, "192.168.1.2")
+
+    def test_send_accepts_parsed_endpoint(self):
+        sent = {}
+
+        class _Mgr:
+            async def send_frame(
+                self, devaddr, v_frame, timeout, context="", pn=None, window=None, write=False
+            ):
+                sent.update(devaddr=devaddr, pn=pn, window=window, write=write)
+                return b"ok"
+
+        async def fake_manager(*args):
+            sent["listener"] = args
+            return _Mgr()
+
+        ep = ey.eybond_endpoint("eybond://0.0.0.0:8899/5?pn=PNE&window=3")
+        with patch.object(ey, "_get_manager", side_effect=fake_manager):
+            assert asyncio.run(ey.send_eybond_bytes(ep, b"x", 1.0)) == b"ok"
+        assert sent == {
+            "listener": ("0.0.0.0", 8899, ey.DEFAULT_BROADCAST, None),
+            "devaddr": 5, "pn": "PNE", "window": 3, "write": False,
+        }
+
+
+class TestInflightWindow:
+    def test_shrinks_by_half_and_grows_back_slowly(self):
+        win = ey._InflightWindow(8)
+        assert win.shrink() and win.limit == 4
+        assert win.shrink() and win.limit == 2
+        assert win.shrink() and win.limit == 1
+        assert not win.shrink()
+        for _ in range(ey.WINDOW_GROW_AFTER - 1):
+            win.ok()
+        assert win.limit == 1
+        win.ok()
+        assert win.limit == 2
+
+    def test_slots_granted_in_order(self):
+        async def scenario():
+            win = ey._InflightWindow(1)
+            await win.acquire()
+            order = []
+
+            async def take(n):
+                await win.acquire()
+                order.append(n)
+
+            tasks = [asyncio.create_task(take(n)) for n in range(3)]
+            await asyncio.sleep(0)
+            assert order == []
+            for _ in range(3):
+                win.release()
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+            assert order == [0, 1, 2]
+
+        asyncio.run(scenario())
+
+
+class TestPipelining:
+    async def _session(self, pn="PN0000000001"):
+        mgr = _new_manager()
+        proto, transport = ey._DongleProtocol(mgr), _FakeTransport()
+        proto.connection_made(transport)
+        _feed(proto, _dongle_heartbeat(pn), 4096)
+        return mgr, proto, transport
+
+    @staticmethod
+    def _forwards(transport):
+        return [
+            ey._decode_header(f[:ey.HEADER_SIZE]) for f in transport.frames
+            if ey._decode_header(f[:ey.HEADER_SIZE]).fcode == ey.FC_FORWARD2DEVICE
+        ]
+
+    def test_devaddrs_overlap_within_window(self):
+        async def scenario():
+            mgr, proto, transport = await self._session()
+            sends = [
+                asyncio.create_task(
+                    mgr.send_frame(addr, b"QPIGS\r", timeout=5.0, pn="PN0000000001", window=2)
+                )
+                for addr in (1, 2)
+            ]
+            await _until(lambda: len(self._forwards(transport)) == 2)
+            first, second = self._forwards(transport)
+            # Replies come back out of order; TIDs route them.
+            _feed(proto, ey._build_forward2device(second.tid, b"(two", devaddr=2), 4096)
+            _feed(proto, ey._build_forward2device(first.tid, b"(one", devaddr=1), 4096)
+            assert await asyncio.gather(*sends) == [b"(one", b"(two"]
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_same_devaddr_stays_one_at_a_time(self):
+        async def scenario():
+            mgr, proto, transport = await self._session()
+            sends = [
+                asyncio.create_task(
+                    mgr.send_frame(1, cmd, timeout=5.0, pn="PN0000000001", window=4)
+                )
+                for cmd in (b"QPIGS\r", b"QMOD\r")
+            ]
+            await _until(lambda: len(self._forwards(transport)) == 1)
+            await asyncio.sleep(0.01)
+            assert len(self._forwards(transport)) == 1
+            _feed(proto, ey._build_forward2device(self._forwards(transport)[0].tid, b"(a", 1), 4096)
+            await _until(lambda: len(self._forwards(transport)) == 2)
+            _feed(proto, ey._build_forward2device(self._forwards(transport)[1].tid, b"(b", 1), 4096)
+            assert await asyncio.gather(*sends) == [b"(a", b"(b"]
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_window_shrinks_on_timeout_and_stray_reply(self):
+        async def scenario():
+            mgr, proto, transport = await self._session()
+            sess = proto._sess
+            with patch.object(ey, "FORWARD_RESPONSE_TIMEOUT", 0.02):
+                result = await mgr.send_frame(1, b"QPIGS\r", timeout=5.0, pn="PN0000000001", window=8)
+            assert result is None
+            assert sess.window.limit == 4
+            late = self._forwards(transport)[0].tid
+            _feed(proto, ey._build_forward2device(late, b"(late", 1), 4096)
+            assert sess.window.limit == 4  # already counted by its timeout
+            _feed(proto, ey._build_forward2device(late + 100, b"(stray", 1), 4096)
+            assert sess.window.limit == 2
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# Reconnect identification (peer-address affinity)
+# ---------------------------------------------------------------------------
+class TestReconnectAffinity:
+    @staticmethod
+    def _connect(mgr, peer, pn=None):
+        proto, transport = ey._DongleProtocol(mgr), _FakeTransport(peer)
+        proto.connection_made(transport)
+        if pn:
+            _feed(proto, _dongle_heartbeat(pn), 4096)
+        return proto, transport
+
+    def test_heartbeat_sent_on_accept(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, transport = self._connect(mgr, ("10.0.0.1", 1111))
+            await asyncio.sleep(0)
+            assert ey._decode_header(transport.frames[0][:ey.HEADER_SIZE]).fcode == ey.FC_HEARTBEAT
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_reconnect_routed_before_heartbeat(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, _ = self._connect(mgr, ("10.0.0.1", 1111), "PN0000000001")
+            proto.connection_lost(None)
+            proto, transport = self._connect(mgr, ("10.0.0.1", 2222))
+            assert mgr.identified_pns == ["PN0000000001"]  # no heartbeat yet
+
+            send = asyncio.create_task(mgr.send_frame(1, b"QMOD\r", timeout=5.0, pn="PN0000000001"))
+            await _until(lambda: _find_fc4(transport.frames)[1] is not None)
+            _feed(proto, ey._build_forward2device(_find_fc4(transport.frames)[0].tid, b"(B", 1), 4096)
+            await asyncio.sleep(0.01)
+            assert not send.done()  # reply held until the PN is confirmed
+            _feed(proto, _dongle_heartbeat("PN0000000001"), 4096)
+            assert await send == b"(B"
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_wrong_guess_corrected_and_reply_discarded(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, _ = self._connect(mgr, ("10.0.0.1", 1111), "PN0000000001")
+            proto.connection_lost(None)
+            proto, transport = self._connect(mgr, ("10.0.0.1", 2222))
+
+            send = asyncio.create_task(mgr.send_frame(1, b"QMOD\r", timeout=5.0, pn="PN0000000001"))
+            await _until(lambda: _find_fc4(transport.frames)[1] is not None)
+            _feed(proto, ey._build_forward2device(_find_fc4(transport.frames)[0].tid, b"(B", 1), 4096)
+            _feed(proto, _dongle_heartbeat("PN0000000002"), 4096)
+            assert await send is None
+            assert mgr.identified_pns == ["PN0000000002"]
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_set_command_held_until_pn_confirmed(self):
+        async def scenario():
+            mgr = _new_manager()
+            ey._managers[("0.0.0.0", 18899)] = mgr
+            try:
+                proto, _ = self._connect(mgr, ("10.0.0.1", 1111), "PN0000000001")
+                proto.connection_lost(None)
+                # DHCP handed the address to another dongle.
+                proto, transport = self._connect(mgr, ("10.0.0.1", 2222))
+                assert mgr.identified_pns == ["PN0000000001"]  # affinity guess
+
+                uri = "eybond://0.0.0.0:18899/1?pn=PN0000000001"
+                send = asyncio.create_task(ey.send_eybond_set_command(uri, "POP00", timeout=5.0))
+                await asyncio.sleep(0.01)
+                assert _find_fc4(transport.frames)[1] is None  # nothing written yet
+                _feed(proto, _dongle_heartbeat("PN0000000002"), 4096)
+                assert await send == {"error": "no response"}
+                assert _find_fc4(transport.frames)[1] is None  # never reached PN2
+                proto.connection_lost(None)
+                await _drain(mgr)
+            finally:
+                ey._managers.pop(("0.0.0.0", 18899), None)
+
+        asyncio.run(scenario())
+
+    def test_set_command_sent_once_pn_confirmed(self):
+        async def scenario():
+            mgr = _new_manager()
+            proto, _ = self._connect(mgr, ("10.0.0.1", 1111), "PN0000000001")
+            proto.connection_lost(None)
+            proto, transport = self._connect(mgr, ("10.0.0.1", 2222))
+
+            send = asyncio.create_task(
+                mgr.send_frame(1, b"POP00\r", timeout=5.0, pn="PN0000000001", write=True)
+            )
+            await asyncio.sleep(0.01)
+            assert _find_fc4(transport.frames)[1] is None
+            _feed(proto, _dongle_heartbeat("PN0000000001"), 4096)
+            await _until(lambda: _find_fc4(transport.frames)[1] is not None)
+            _feed(proto, ey._build_forward2device(_find_fc4(transport.frames)[0].tid, b"(ACK", 1), 4096)
+            assert await send == b"(ACK"
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+    def test_shared_address_is_never_guessed(self):
+        async def scenario():
+            mgr = _new_manager()
+            for pn, port in (("PN0000000001", 1111), ("PN0000000002", 1112)):
+                proto, _ = self._connect(mgr, ("10.0.0.9", port), pn)
+                proto.connection_lost(None)
+            proto, _ = self._connect(mgr, ("10.0.0.9", 1113))
+            assert mgr.identified_pns == []
+            proto.connection_lost(None)
+            await _drain(mgr)
+
+        asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# Heartbeat wheel
+# ---------------------------------------------------------------------------
+class TestHeartbeatWheel:
+    @staticmethod
+    def _beats(transport):
+        return sum(
+            ey._decode_header(f[:ey.HEADER_SIZE]).fcode == ey.FC_HEARTBEAT for f in transport.frames
+        )
+
+    def test_one_task_beats_every_session_and_stops_when_idle(self):
+        async def scenario():
+            mgr = _new_manager()
+            conns = []
+            for i in range(5):
+                proto, transport = ey._DongleProtocol(mgr), _FakeTransport(("10.0.0.1", 1000 + i))
+                proto.connection_made(transport)
+                conns.append((proto, transport))
+                await asyncio.sleep(0.01)  # spread over the wheel's buckets
+            wheel = mgr._wheel_task
+            assert all(self._beats(t) == 1 for _, t in conns)  # sent on accept
+            await _until(lambda: all(self._beats(t) >= 3 for _, t in conns))
+            assert mgr._wheel_task is wheel
+            for proto, _ in conns:
+                proto.connection_lost(None)
+            assert not any(mgr._wheel)
+            await asyncio.wait_for(wheel, 1.0)  # ends with the last session
+            await _drain(mgr)
+
+        with patch.object(ey, "HEARTBEAT_INTERVAL", 0.06), patch.object(ey, "HEARTBEAT_SLOTS", 6):
+            asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# Hot-path logging cost
+# ---------------------------------------------------------------------------
+class _HexSpy(bytes):
+    """bytes that count ``hex()`` calls — i.e. log-argument formatting."""
+
+    calls = 0
+
+    def hex(self, *args):
+        type(self).calls += 1
+        return super().hex(*args)
+
+
+class _SpyReader(_FakeReader):
+    async def readexactly(self, n: int) -> bytes:
+        return _HexSpy(await super().readexactly(n))
+
+
+class TestLazyLogging:
+    def _exchange(self):
+        async def scenario():
+            mgr = _new_manager()
+            r, w = _SpyReader(), _FakeWriter(("10.0.0.1", 1111))
+            t = asyncio.create_task(mgr._handle_session(r, w))
+            r.feed(_dongle_heartbeat("PN0000000001"))
+            await _until(lambda: mgr.identified_pns == ["PN0000000001"])
+            send = asyncio.create_task(
+                mgr.send_frame(1, _HexSpy(b"QPIGS\r"), timeout=5.0, context="QPIGS")
+            )
+            await _until(lambda: _find_fc4(w.frames)[1] is not None)
+            h, _ = _find_fc4(w.frames)
+            r.feed(ey._build_forward2device(h.tid, b"(230.0", devaddr=1))
+            assert await send == b"(230.0"
+            # Anomalies: an unsolicited reply and an unknown function code.
+            r.feed(ey._build_forward2device(999, b"(late", devaddr=1))
+            r.feed(ey._encode_header(7, ey.DEFAULT_DEVCODE, ey.HEADER_SIZE + 2, 1, 9) + b"\x00\x01")
+            await asyncio.sleep(0.05)
+            await _drain(mgr, t, send)
+
+        _HexSpy.calls = 0
+        asyncio.run(scenario())
+        return _HexSpy.calls
+
+    def test_no_hex_formatting_at_info(self, caplog):
+        caplog.set_level(logging.INFO, logger=ey.__name__)
+        assert self._exchange() == 0
+
+    def test_anomalies_are_hex_dumped_at_debug(self, caplog):
+        caplog.set_level(logging.DEBUG, logger=ey.__name__)
+        assert self._exchange() > 0
+        assert "unhandled FC=9" in caplog.text
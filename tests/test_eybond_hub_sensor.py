@@ -52,6 +52,33 @@ def test_value_and_attributes():
     assert pns["PN_B"]["protocol"] == "none"
 
 
+def test_large_hub_attributes_are_capped():
+    reg = EybondRegistry()
+    for i in range(mod.MAX_LISTED_DONGLES + 7):
+        reg.record_seen(f"PN{i:03d}", f"10.0.0.{i}:1")
+    reg.set_enabled("PN000", True)
+    attrs = _make(reg).extra_state_attributes
+    assert attrs["connected"] == mod.MAX_LISTED_DONGLES + 7
+    assert attrs["enabled"] == 1
+    assert len(attrs["dongles"]) == mod.MAX_LISTED_DONGLES
+    assert attrs["not_listed"] == 7
+
+
+def test_writes_state_only_when_registry_changed():
+    reg = EybondRegistry()
+    reg.record_seen("PN_A", "10.0.0.1:1")
+    ent = _make(reg)
+    writes = []
+    ent.async_write_ha_state = lambda: writes.append(reg.version)
+    ent._tick()
+    reg.record_seen("PN_A", "10.0.0.1:1")  # heartbeat: last_seen only
+    ent._tick()
+    assert len(writes) == 1
+    reg.mark_disconnected("PN_A")
+    ent._tick()
+    assert len(writes) == 2
+
+
 def test_notifies_only_for_new_unconfigured():
     reg = EybondRegistry()
     reg.record_seen("PN_OLD", "10.0.0.1:1")  # known at setup
@@ -91,3 +118,19 @@ def test_not_seeded_does_not_notify():
     with patch.object(mod.persistent_notification, "async_create") as create:
         ent._tick()
         assert create.call_count == 0
+
+
+def test_adopted_registry_is_reseeded_not_notified():
+    old = EybondRegistry()
+    ent = _make(old)
+    ent._seed(old)
+    ent._seeded = True
+    new = EybondRegistry()
+    new.record_seen("PN_PERSISTED", "10.0.0.3:3")
+    ent._registry = lambda: new  # the listener adopted the hub's registry
+    with patch.object(mod.persistent_notification, "async_create") as create:
+        ent._tick()
+        assert create.call_count == 0
+        new.record_seen("PN_NEW", "10.0.0.4:4")
+        ent._tick()
+        assert create.call_count == 1
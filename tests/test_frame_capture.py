@@ -0,0 +1,128 @@
+"""Tests for the persistent memory-mapped frame capture (frame_capture.py)."""
+import pytest
+
+from custom_components.dess_monitor_local import frame_capture, frame_log, metrics
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "frames.cap")
+
+
+class TestFrameCapture:
+    def test_roundtrip(self, path):
+        cap = frame_capture.FrameCapture(path, 4096)
+        cap.append("inv1", "QPIGS", b"(230.0\x12\x34\r", True, ts=100.0)
+        cap.append("inv1", "QMOD", b"(L\xff\xff\r", False, ts=101.0)
+        frames = list(cap.frames())
+        assert frames == [
+            frame_capture.CapturedFrame(100.0, "inv1", "QPIGS", True, b"(230.0\x12\x34\r"),
+            frame_capture.CapturedFrame(101.0, "inv1", "QMOD", False, b"(L\xff\xff\r"),
+        ]
+        cap.close()
+
+    def test_wraps_and_keeps_newest_contiguous(self, path):
+        cap = frame_capture.FrameCapture(path, 2048)
+        for i in range(500):
+            cap.append("inv1", "QPIGS", bytes([i % 256]) * (i % 37 + 1), True, ts=float(i))
+        frames = list(cap.frames())
+        assert 0 < len(frames) == cap.count < 500
+        assert [f.ts for f in frames] == [float(i) for i in range(500 - len(frames), 500)]
+        assert frames[-1].raw == bytes([499 % 256]) * (499 % 37 + 1)
+        cap.close()
+
+    def test_survives_reopen(self, path):
+        cap = frame_capture.FrameCapture(path, 4096)
+        for i in range(100):
+            cap.append("inv1", "QPIGS", b"x" * 20, True, ts=float(i))
+        before = list(cap.frames())
+        cap.close()
+        cap = frame_capture.FrameCapture(path, 4096)
+        assert list(cap.frames()) == before
+        cap.append("inv1", "QPIGS", b"y", True, ts=100.0)
+        assert list(cap.frames())[-1].ts == 100.0
+        cap.close()
+
+    def test_resize_starts_fresh(self, path):
+        cap = frame_capture.FrameCapture(path, 4096)
+        cap.append("inv1", "QPIGS", b"x", True)
+        cap.close()
+        cap = frame_capture.FrameCapture(path, 8192)
+        assert list(cap.frames()) == []
+        cap.close()
+
+    def test_time_range_uses_index(self, path):
+        cap = frame_capture.FrameCapture(path, 64 * 1024)
+        for i in range(1000):
+            cap.append("inv1", "QPIGS", b"z" * 10, True, ts=float(i))
+        # Seek lands on an indexed record at or before ``since``.
+        offset, seq = cap._seek(500.0)
+        assert seq == 500 - 500 % frame_capture.INDEX_EVERY
+        assert cap._record_at(offset)[1] == seq
+        assert [f.ts for f in cap.frames(since=500.0, until=503.0)] == [500.0, 501.0, 502.0, 503.0]
+        assert cap._seek(-1.0) == (cap.tail, 0)  # before everything: from the tail
+        cap.close()
+
+    def test_seek_after_wrap_bisects_live_entries(self, path):
+        cap = frame_capture.FrameCapture(path, 4096)
+        for i in range(2000):
+            cap.append("inv1", "QPIGS", b"z" * 10, True, ts=float(i))
+        oldest = cap.next_seq - cap.count
+        assert oldest > 0  # the ring wrapped
+        for since in (float(oldest), oldest + 50.5, 1999.0, 5000.0):
+            offset, seq = cap._seek(since)
+            assert seq <= since and cap._record_at(offset)[1] == seq
+            assert min(since, 1999.0) - seq < frame_capture.INDEX_EVERY or seq == oldest
+        assert [f.ts for f in cap.frames(since=1990.0)] == [float(i) for i in range(1990, 2000)]
+        cap.close()
+
+    def test_reader_and_stats(self, path):
+        cap = frame_capture.FrameCapture(path, 4096)
+        cap.append("inv1", "QPIGS", b"a", True, ts=5.0)
+        cap.append("inv2", "QPIRI", b"b", True, ts=7.0)
+        with frame_capture.CaptureReader(path) as reader:
+            assert [f.device for f in reader.frames()] == ["inv1", "inv2"]
+            assert reader.stats()["oldest"] == 5.0
+            assert reader.stats()["newest"] == 7.0
+        cap.close()
+
+    def test_not_a_capture_file(self, tmp_path):
+        bogus = tmp_path / "bogus.cap"
+        bogus.write_bytes(b"\0" * 128)
+        with pytest.raises(ValueError):
+            frame_capture.CaptureReader(str(bogus))
+
+
+class TestFrameLogHook:
+    def teardown_method(self):
+        frame_capture.stop("entry1")
+        frame_capture.stop("entry2")
+        frame_log.clear()
+        frame_log.configure(frame_log._MAX_FRAMES_PER_COMMAND)
+
+    def test_record_feeds_capture_even_with_frame_log_off(self, path):
+        frame_capture.start("entry1", path, 4096)
+        frame_log.configure(0)
+        with metrics.bind(device="inv1"):
+            frame_log.record("QPIGS", bytearray(b"(1 2\r"), crc_valid=False)
+        (frame,) = frame_capture._active.frames()
+        assert (frame.device, frame.command, frame.crc_valid, frame.raw) == (
+            "inv1", "QPIGS", False, b"(1 2\r",
+        )
+        assert frame_capture.stats()["records"] == 1
+
+    def test_closes_on_last_stop(self, path):
+        frame_capture.start("entry1", path, 4096)
+        frame_capture.start("entry2", path, 8192)
+        assert frame_capture.stats()["data_bytes"] == 4096  # first opener wins
+        frame_capture.stop("entry1")  # the opener leaves first
+        frame_log.record("QPIGS", b"(1", True, device="inv1")
+        assert frame_capture.stats()["records"] == 1
+        frame_capture.stop("entry2")
+        assert frame_capture.stats() is None
+
+    def test_capture_false_skips_the_file(self, path):
+        frame_capture.start("entry1", path, 4096)
+        frame_log.record("QPIGS", b"(1", True, device="inv1", capture=False)
+        assert frame_capture.stats()["records"] == 0
+        assert frame_log.snapshot()["inv1 QPIGS"]
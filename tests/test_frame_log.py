@@ -1,5 +1,7 @@
 """Tests for the diagnostic frame ring buffer (frame_log.py)."""
-from custom_components.dess_monitor_local import frame_log
+from datetime import UTC, datetime
+
+from custom_components.dess_monitor_local import frame_log, metrics
 
 
 class TestFrameLog:
@@ -41,3 +43,56 @@ class TestFrameLog:
         frame_log.record("QPIGS", b"a", crc_valid=True)
         frame_log.clear()
         assert frame_log.snapshot() == {}
+
+
+class TestFrameLogBuffers:
+    def setup_method(self):
+        frame_log.clear()
+
+    def teardown_method(self):
+        frame_log.configure(frame_log._MAX_FRAMES_PER_COMMAND, frame_log._MAX_TOTAL_BYTES)
+        frame_log.clear()
+
+    def test_keeps_newest_in_order(self):
+        for i in range(25):
+            frame_log.record("QPIGS", bytes([i]), crc_valid=True)
+        entries = frame_log.snapshot()["QPIGS"]
+        assert [e["raw_hex"] for e in entries] == [f"{i:02x}" for i in range(5, 25)]
+
+    def test_per_device_separation(self):
+        frame_log.record("QPIGS", b"a", crc_valid=True, device="PN1")
+        frame_log.record("QPIGS", b"b", crc_valid=True, device="PN2")
+        assert set(frame_log.snapshot()) == {"PN1 QPIGS", "PN2 QPIGS"}
+        assert list(frame_log.snapshot(device="PN2")) == ["PN2 QPIGS"]
+
+    def test_device_from_bound_labels(self):
+        with metrics.bind(device="PN7", command="QMOD"):
+            frame_log.record("QMOD", b"(B", crc_valid=True)
+        assert list(frame_log.snapshot()) == ["PN7 QMOD"]
+
+    def test_byte_budget_evicts_globally_oldest(self):
+        frame_log.configure(budget_bytes=10)
+        frame_log.record("QPIGS", b"12345", crc_valid=True, device="old")
+        frame_log.record("QPIGS", b"12345", crc_valid=True, device="new")
+        frame_log.record("QPIRI", b"12345", crc_valid=True, device="new")
+        snap = frame_log.snapshot()
+        assert set(snap) == {"new QPIGS", "new QPIRI"}
+
+    def test_resize_keeps_newest(self):
+        for i in range(10):
+            frame_log.record("QPIGS", bytes([i]), crc_valid=True)
+        frame_log.configure(frames_per_command=3)
+        assert [e["raw_hex"] for e in frame_log.snapshot()["QPIGS"]] == ["07", "08", "09"]
+        frame_log.record("QPIGS", b"\x0a", crc_valid=True)
+        assert len(frame_log.snapshot()["QPIGS"]) == 3
+
+    def test_zero_capacity_disables(self):
+        frame_log.configure(frames_per_command=0)
+        frame_log.record("QPIGS", b"a", crc_valid=True)
+        assert frame_log.snapshot() == {}
+
+    def test_timestamp_is_wall_clock(self):
+        before = datetime.now(UTC)
+        frame_log.record("QPIGS", b"a", crc_valid=True)
+        stamp = datetime.fromisoformat(frame_log.snapshot()["QPIGS"][0]["timestamp"])
+        assert abs((stamp - before).total_seconds()) < 5
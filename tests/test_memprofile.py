@@ -0,0 +1,66 @@
+"""Tests for the opt-in tracemalloc cycle profile (memprofile.py)."""
+import tracemalloc
+
+import pytest
+
+from custom_components.dess_monitor_local import frame_log, memprofile, metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    memprofile.clear()
+    frame_log.clear()
+    yield
+    memprofile.clear()
+    frame_log.clear()
+
+
+def _cycle(devices):
+    memprofile.begin_cycle()
+    for device in devices:
+        with metrics.bind(device=device):
+            frame_log.record("QPIGS", b"(230.0 50.0 " + device.encode() * 20, True)
+    memprofile.end_cycle()
+
+
+class TestMemProfile:
+    def test_idle_until_started(self):
+        _cycle(["inv1"])
+        assert memprofile.report() is None
+        assert not tracemalloc.is_tracing()
+
+    def test_running_state(self):
+        memprofile.start(cycles=3)
+        assert memprofile.report() == {"state": "running", "cycles_left": 3, "started": False}
+        _cycle(["inv1"])
+        assert memprofile.report() == {"state": "running", "cycles_left": 2, "started": True}
+        memprofile.cancel()
+        assert memprofile.report() is None
+        assert not tracemalloc.is_tracing()
+
+    def test_growth_attributed_to_frame_log(self):
+        memprofile.start(cycles=2, frames=10, top=5)
+        assert tracemalloc.is_tracing()
+        _cycle(["inv0"])
+        _cycle([f"inv{i}" for i in range(1, 40)])
+        assert not tracemalloc.is_tracing()
+        assert not memprofile.running()
+
+        report = memprofile.report()
+        assert report["state"] == "done"
+        assert report["components"]["frame_log"]["growth_b"] > 0
+        assert next(iter(report["components"])) == "frame_log"  # sorted by growth
+        assert report["top_growth"][0]["where"].startswith("frame_log.py:")
+        assert len(report["top_allocators"]) <= 5
+        assert report["live_objects"]["frame_log_buffers"] == {"before": 0, "after": 40}
+        assert memprofile.report() is report  # computed once
+
+    def test_keeps_tracemalloc_it_did_not_start(self):
+        tracemalloc.start()
+        try:
+            memprofile.start(cycles=1)
+            _cycle(["inv1"])
+            assert tracemalloc.is_tracing()
+            assert memprofile.report()["state"] == "done"
+        finally:
+            tracemalloc.stop()
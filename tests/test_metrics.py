@@ -0,0 +1,102 @@
+"""Tests for the transport metrics registry (metrics.py)."""
+import asyncio
+
+import pytest
+
+from custom_components.dess_monitor_local import metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestHistogram:
+    def test_empty_has_no_percentile(self):
+        assert metrics.Histogram((1.0, 2.0)).percentile(0.5) is None
+
+    def test_interpolates_inside_bucket(self):
+        h = metrics.Histogram((1.0, 2.0, 4.0))
+        for v in (0.5, 1.5, 1.5, 3.0):
+            h.observe(v)
+        # Rank 2 of 4 sits halfway into the (1, 2] bucket.
+        assert h.percentile(0.5) == pytest.approx(1.5)
+        assert h.count == 4
+        assert h.sum == pytest.approx(6.5)
+
+    def test_overflow_reports_last_bound(self):
+        h = metrics.Histogram((1.0, 2.0))
+        h.observe(100.0)
+        assert h.percentile(0.95) == 2.0
+
+    def test_to_dict_buckets_are_cumulative(self):
+        h = metrics.Histogram((1.0, 2.0))
+        for v in (0.5, 1.5, 9.0):
+            h.observe(v)
+        assert h.to_dict()["buckets"] == {"1.0": 1, "2.0": 2, "+Inf": 3}
+
+
+class TestLabels:
+    def test_bound_labels_apply(self):
+        with metrics.bind(device="inv1", command="QPIGS", transport="elfin"):
+            metrics.inc("requests")
+        assert metrics.counter("requests", device="inv1", command="QPIGS") == 1
+        assert metrics.counter("requests", device="other") == 0
+
+    def test_explicit_label_wins(self):
+        with metrics.bind(device="inv1", transport="elfin"):
+            metrics.inc("response_bytes_total", 10, transport="serial")
+        assert metrics.counter("response_bytes_total", transport="serial") == 10
+        assert metrics.counter("response_bytes_total", transport="elfin") == 0
+
+    def test_bind_is_restored(self):
+        with metrics.bind(device="inv1"):
+            pass
+        metrics.inc("requests")
+        assert metrics.counter("requests", device="") == 1
+
+    def test_tasks_inherit_bound_labels(self):
+        async def _callback():
+            metrics.inc("crc_failures")
+
+        async def _run():
+            with metrics.bind(device="inv2", transport="pi18"):
+                await asyncio.create_task(_callback())
+
+        asyncio.run(_run())
+        assert metrics.counter("crc_failures", device="inv2", transport="pi18") == 1
+
+
+class TestAggregation:
+    def test_percentile_merges_matching_series(self):
+        for device, value in (("a", 0.04), ("b", 0.04), ("a", 4.0)):
+            metrics.observe("rtt_seconds", value, device=device)
+        assert metrics.percentile("rtt_seconds", 0.5, device="a") is not None
+        assert metrics.percentile("rtt_seconds", 0.99) > 2.5
+        assert metrics.percentile("rtt_seconds", 0.5, device="missing") is None
+
+    def test_snapshot_and_clear(self):
+        metrics.inc("timeouts", device="inv1", command="QMOD")
+        metrics.observe("response_bytes", 40, buckets=metrics.BYTE_BUCKETS, transport="serial")
+        snap = metrics.snapshot()
+        assert snap["counters"] == [
+            {"name": "timeouts", "labels": {"device": "inv1", "command": "QMOD"}, "value": 1},
+        ]
+        (hist,) = snap["histograms"]
+        assert hist["labels"] == {"transport": "serial"}
+        assert hist["count"] == 1
+        metrics.clear()
+        assert metrics.snapshot() == {"counters": [], "histograms": []}
+
+
+class TestTransportOf:
+    @pytest.mark.parametrize(("uri", "expected"), [
+        ("/dev/ttyUSB0", "serial"),
+        ("tcp://192.168.1.5:8899", "elfin"),
+        ("pi18://192.168.1.5:8899", "pi18"),
+        ("eybond://0.0.0.0:8899?pn=Q1", "eybond"),
+    ])
+    def test_labels(self, uri, expected):
+        assert metrics.transport_of(uri) == expected
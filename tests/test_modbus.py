@@ -9,6 +9,11 @@ from unittest.mock import patch
 import pytest
 
 from custom_components.dess_monitor_local.api.adapters import modbus as modadapter
+from custom_components.dess_monitor_local.api.adapters.snapshot_cache import (
+    PollCycle,
+    SnapshotCache,
+    snapshots,
+)
 from custom_components.dess_monitor_local.api.crc import crc16_modbus
 from custom_components.dess_monitor_local.api.protocols import modbus_rtu
 
@@ -202,7 +207,7 @@ class TestSnapshotCache:
             calls["n"] += 1
             return (dict(_SENSORS), dict(_CONFIG), {})
 
-        modadapter._clear_snapshot_cache()
+        snapshots.clear()
         uri = "eybond-modbus://0.0.0.0:8899/1?pn=PN_CACHE"
         with patch.object(modadapter, "read_smg2_snapshot_via", side_effect=fake_snapshot):
             # New adapter per command (matches real dispatch), same URI.
@@ -219,7 +224,7 @@ class TestSnapshotCache:
             calls["n"] += 1
             return (dict(_SENSORS), dict(_CONFIG), {})
 
-        modadapter._clear_snapshot_cache()
+        snapshots.clear()
         with patch.object(modadapter, "read_smg2_snapshot_via", side_effect=fake_snapshot):
             asyncio.run(modadapter.ModbusAdapter("eybond-modbus://0.0.0.0:8899/1?pn=A").get_data("QPIGS"))
             asyncio.run(modadapter.ModbusAdapter("eybond-modbus://0.0.0.0:8899/2?pn=B").get_data("QPIGS"))
@@ -232,7 +237,7 @@ class TestSnapshotCache:
             calls["n"] += 1
             raise ConnectionError("dongle gone")
 
-        modadapter._clear_snapshot_cache()
+        snapshots.clear()
         uri = "eybond-modbus://0.0.0.0:8899/1?pn=PN_FAIL"
         with patch.object(modadapter, "read_smg2_snapshot_via", side_effect=boom):
             a = asyncio.run(modadapter.ModbusAdapter(uri).get_data("QPIGS"))
@@ -240,3 +245,78 @@ class TestSnapshotCache:
         assert a == {} and b == {}
         # Failure cached too — not re-hammered for every command in the cycle.
         assert calls["n"] == 1
+
+    def test_cycle_reads_once_and_next_cycle_rereads(self):
+        calls = {"n": 0}
+
+        async def fake_snapshot(read_block):
+            calls["n"] += 1
+            return (dict(_SENSORS), dict(_CONFIG), {})
+
+        snapshots.clear()
+        uri = "eybond-modbus://0.0.0.0:8899/1?pn=PN_CYCLE"
+        adapter = modadapter.ModbusAdapter(uri)
+
+        async def poll(cycle):
+            for cmd in ("QPIGS", "QPIRI", "QMOD", "QPIGS2", "QPIWS", "QFWS"):
+                await adapter.get_data(cmd, cycle)
+
+        with patch.object(modadapter, "read_smg2_snapshot_via", side_effect=fake_snapshot):
+            asyncio.run(poll(PollCycle()))
+            assert calls["n"] == 1
+            # A new cycle reads again even inside the out-of-cycle TTL.
+            asyncio.run(poll(PollCycle()))
+            assert calls["n"] == 2
+            # Out-of-cycle callers (CLI) reuse the last read.
+            asyncio.run(adapter.get_data("QPIGS"))
+            assert calls["n"] == 2
+
+    def test_write_invalidates_mid_cycle(self):
+        calls = {"n": 0}
+
+        async def fake_snapshot(read_block):
+            calls["n"] += 1
+            return (dict(_SENSORS), dict(_CONFIG), {})
+
+        async def fake_write(self, address, value, timeout=None):
+            return {"ok": True}
+
+        snapshots.clear()
+        uri = "modbus://10.0.0.5:502"
+        adapter = modadapter.ModbusAdapter(uri)
+        cycle = PollCycle()
+
+        async def main():
+            await adapter.get_data("QPIGS", cycle)
+            await adapter.set_battery_float_voltage(27.0)
+            await adapter.get_data("QPIRI", cycle)
+
+        with patch.object(modadapter, "read_smg2_snapshot_via", side_effect=fake_snapshot), \
+                patch.object(modadapter._TcpModbusTransport, "write_register", fake_write):
+            asyncio.run(main())
+        assert calls["n"] == 2
+        assert len(snapshots) == 1
+
+    def test_lru_is_bounded_and_ttl_expires(self, monkeypatch):
+        cache = SnapshotCache(ttl=5.0, max_entries=2)
+        now = [100.0]
+        monkeypatch.setattr("time.monotonic", lambda: now[0])
+        reads = []
+
+        def reader(key):
+            async def read():
+                reads.append(key)
+                return key
+            return read
+
+        async def main():
+            for key in ("a", "b", "a", "c"):
+                await cache.get(key, reader(key))
+            # "b" was least recently used when "c" arrived.
+            assert len(cache) == 2
+            await cache.get("b", reader("b"))
+            now[0] += 5.0
+            await cache.get("c", reader("c"))
+
+        asyncio.run(main())
+        assert reads == ["a", "b", "c", "b", "c"]
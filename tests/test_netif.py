@@ -0,0 +1,128 @@
+"""Tests for host interface discovery (api/protocols/netif.py)."""
+import asyncio
+import ipaddress
+import socket
+import struct
+
+import pytest
+
+from custom_components.dess_monitor_local.api.protocols import netif
+
+
+def _nlmsg(msg_type: int, body: bytes) -> bytes:
+    msg = struct.pack("=IHHII", 16 + len(body), msg_type, 2, 1, 0) + body
+    return msg + b"\0" * (-len(msg) % 4)
+
+
+def _newaddr(local: str, prefix: int, peer: str | None = None) -> bytes:
+    def attr(kind: int, value: bytes) -> bytes:
+        return struct.pack("=HH", 4 + len(value), kind) + value
+
+    body = struct.pack("=BBBBI", socket.AF_INET, prefix, 0, 0, 2)
+    body += attr(netif.IFA_ADDRESS, socket.inet_aton(peer or local))
+    body += attr(netif.IFA_LOCAL, socket.inet_aton(local))
+    body += attr(3, b"eth0\0")  # IFA_LABEL, padded to 4
+    return _nlmsg(netif.RTM_NEWADDR, body)
+
+
+class TestParsers:
+    def test_netlink_dump(self):
+        data = _newaddr("127.0.0.1", 8) + _newaddr("10.8.0.1", 32, peer="10.8.0.2")
+        found, done = netif.parse_netlink_addresses(data)
+        assert not done
+        assert found == [ipaddress.IPv4Interface("127.0.0.1/8"), ipaddress.IPv4Interface("10.8.0.1/32")]
+        found, done = netif.parse_netlink_addresses(_newaddr("192.168.1.10", 24) + _nlmsg(netif.NLMSG_DONE, b"\0" * 4))
+        assert done and found == [ipaddress.IPv4Interface("192.168.1.10/24")]
+
+    def test_netlink_error(self):
+        with pytest.raises(OSError):
+            netif.parse_netlink_addresses(_nlmsg(netif.NLMSG_ERROR, struct.pack("=i", -1) + b"\0" * 16))
+
+    def test_ip_addr_output(self):
+        raw = (
+            "1: lo: <LOOPBACK,UP>\n    inet 127.0.0.1/8 scope host lo\n"
+            "2: eth0: <BROADCAST,UP>\n    inet 192.168.1.10/24 brd 192.168.1.255 scope global eth0\n"
+        )
+        assert netif.parse_ip_addr(raw) == [
+            ipaddress.IPv4Interface("127.0.0.1/8"), ipaddress.IPv4Interface("192.168.1.10/24")
+        ]
+
+    def test_ipconfig_output(self):
+        raw = (
+            "   IPv4 Address. . . . . . . . . . . : 192.168.1.10\n"
+            "   Subnet Mask . . . . . . . . . . . : 255.255.255.0\n"
+            "   IPv4-адрес. . . . . . . . . . . . : 10.0.0.4\n"
+            "   Маска подсети . . . . . . . . . . : 255.255.0.0\n"
+        )
+        assert netif.parse_ipconfig(raw) == [
+            ipaddress.IPv4Interface("192.168.1.10/24"), ipaddress.IPv4Interface("10.0.0.4/16")
+        ]
+
+    def test_broadcast_for(self):
+        ifaces = (ipaddress.IPv4Interface("192.168.1.10/24"),)
+        assert netif.broadcast_for("192.168.1.10", ifaces) == "192.168.1.255"
+        assert netif.broadcast_for("10.0.0.1", ifaces) is None
+        assert netif.broadcast_for("bogus", ifaces) is None
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_NETLINK"), reason="Linux only")
+    def test_read_interfaces_finds_loopback(self):
+        assert ipaddress.IPv4Interface("127.0.0.1/8") in netif.read_interfaces()
+
+
+class TestInterfaceDiscovery:
+    def _discovery(self, ttl=300.0):
+        calls = []
+
+        def reader():
+            calls.append(1)
+            return netif.NetSnapshot((ipaddress.IPv4Interface(f"10.0.0.{len(calls)}/24"),), "10.0.0.1")
+
+        return netif.InterfaceDiscovery(ttl, reader), calls
+
+    def test_concurrent_callers_share_one_read_and_cache(self):
+        discovery, calls = self._discovery()
+
+        async def main():
+            first = await asyncio.gather(*(discovery.snapshot() for _ in range(5)))
+            again = await discovery.snapshot()
+            discovery.close()
+            return first, again
+
+        first, again = asyncio.run(main())
+        assert calls == [1]
+        assert all(snap is first[0] for snap in first) and again is first[0]
+
+    def test_invalidate_and_ttl_force_reread(self):
+        discovery, calls = self._discovery(ttl=0)
+
+        async def main():
+            a = await discovery.snapshot()
+            b = await discovery.snapshot()  # TTL 0: always stale
+            discovery.ttl = 300
+            c = await discovery.snapshot()
+            discovery.invalidate()
+            d = await discovery.snapshot()
+            discovery.close()
+            return a, b, c, d
+
+        a, b, c, d = asyncio.run(main())
+        assert len(calls) == 4
+        assert a != b and d.interfaces[0] == ipaddress.IPv4Interface("10.0.0.4/24")
+
+    def test_address_change_notification_invalidates(self):
+        discovery, calls = self._discovery()
+
+        async def main():
+            await discovery.snapshot()
+            reader, writer = socket.socketpair()
+            reader.setblocking(False)
+            discovery.close()
+            discovery._watch, discovery._watch_loop = reader, asyncio.get_running_loop()
+            writer.send(_nlmsg(netif.RTM_DELADDR, b"\0" * 8))
+            discovery._on_address_change()
+            await discovery.snapshot()
+            discovery.close()
+            writer.close()
+
+        asyncio.run(main())
+        assert len(calls) == 2
@@ -0,0 +1,56 @@
+"""Tests for the QPIGS oversampling window (coordinators/oversampling.py)."""
+from custom_components.dess_monitor_local.coordinators.oversampling import (
+    SampleWindow,
+    oversampling_enabled,
+)
+
+
+class TestEnabled:
+    def test_zero_disables(self):
+        assert oversampling_enabled(0, 10) is False
+
+    def test_faster_than_publish(self):
+        assert oversampling_enabled(1, 10) is True
+
+    def test_not_faster_than_publish_is_off(self):
+        assert oversampling_enabled(10, 10) is False
+        assert oversampling_enabled(5, 2) is False
+
+
+class TestSampleWindow:
+    def test_min_max_mean(self):
+        w = SampleWindow()
+        for p in ("0100", "0300", "0200"):
+            w.add({"pv_charging_power": p})
+        stats = w.summary()["pv_charging_power"]
+        assert stats == {"min": 100.0, "max": 300.0, "mean": 200.0, "samples": 3}
+        assert len(w) == 3
+
+    def test_non_numeric_fields_skipped(self):
+        w = SampleWindow()
+        w.add({
+            "device_status_bits_b7_b0": "00010000",
+            "device_status_bits_b10_b8": "010",
+            "eeprom_version": "00",
+            "error": "NAK response received",
+            "flag": True,
+            "nan": float("nan"),
+            "battery_voltage": "26.50",
+        })
+        assert set(w.summary()) == {"battery_voltage"}
+
+    def test_field_missing_in_some_samples(self):
+        w = SampleWindow()
+        w.add({"a": 1, "b": 10})
+        w.add({"a": 3})
+        summary = w.summary()
+        assert summary["a"]["samples"] == 2
+        assert summary["b"]["samples"] == 1
+        assert len(w) == 2
+
+    def test_reset(self):
+        w = SampleWindow()
+        w.add({"a": 1})
+        w.reset()
+        assert len(w) == 0
+        assert w.summary() == {}
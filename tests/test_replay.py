@@ -0,0 +1,157 @@
+"""Tests for the replay:// adapter and offline decoder (api/adapters/replay.py)."""
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+# The adapter package imports the serial transport.
+pytest.importorskip("serial_asyncio_fast")
+
+from custom_components.dess_monitor_local import cli, frame_capture, frame_log, metrics
+from custom_components.dess_monitor_local.api.adapters import replay
+from custom_components.dess_monitor_local.api.adapters.factory import get_adapter
+from custom_components.dess_monitor_local.api.crc import build_pi30_frame
+from custom_components.dess_monitor_local.api.decoders.enums import OperatingMode
+from custom_components.dess_monitor_local.api.decoders.pi18 import build_request_frame
+from custom_components.dess_monitor_local.api.dispatcher import get_direct_data
+from custom_components.dess_monitor_local.simulator import codecs
+from custom_components.dess_monitor_local.simulator.state import InverterState
+
+
+def _state(soc):
+    state = InverterState(seed=7)
+    state.soc = soc
+    return state
+
+
+def _pi30(state, command, corrupt=False):
+    return codecs.pi30_request(state, build_pi30_frame(command))[1](False, corrupt)[:-1]
+
+
+def _pi18(state, command, corrupt=False):
+    return codecs.pi18_request(state, build_request_frame(command))[1](False, corrupt)[:-1]
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    replay.clear()
+    frame_log.clear()
+    metrics.clear()
+    yield
+    replay.clear()
+    frame_log.clear()
+    metrics.clear()
+
+
+@pytest.fixture
+def diagnostics(tmp_path):
+    """A diagnostics download of two PI30 devices, three cycles each."""
+    for cycle, soc in enumerate((80.0, 70.0, 60.0)):
+        for device in ("inv1", "inv2"):
+            state = _state(soc)
+            frame_log.record("QPIGS", _pi30(state, "QPIGS"), True, device=device)
+            frame_log.record("QMOD", _pi30(state, "QMOD", corrupt=cycle == 1), cycle != 1, device=device)
+    path = tmp_path / "diag.json"
+    path.write_text(json.dumps({"home_assistant": {}, "data": {"frames": frame_log.snapshot()}}))
+    frame_log.clear()
+    return str(path)
+
+
+def _read_all(uri, commands, timeout=2.0, strict_crc=False):
+    async def scenario():
+        return [await get_direct_data(uri, c, timeout, strict_crc) for c in commands]
+    return asyncio.run(scenario())
+
+
+class TestReplayAdapter:
+    def test_routing_and_read_only(self, diagnostics):
+        adapter = get_adapter(f"replay://{diagnostics}")
+        assert isinstance(adapter, replay.ReplayAdapter)
+        assert "error" in asyncio.run(adapter.set_data("POP00"))
+
+    def test_cursors_per_command_and_end_of_recording(self, diagnostics):
+        uri = f"replay://{diagnostics}?device=inv1&speed=0"
+        qpigs = _read_all(uri, ["QPIGS", "QMOD", "qpigs", "QPIGS", "QPIGS", "QPIRI"])
+        assert [r.get("battery_capacity") for r in qpigs[:5]] == ["080", None, "070", "060", None]
+        assert qpigs[1] == {"operating_mode": OperatingMode.Battery}
+        assert qpigs[4] == qpigs[5] == {}  # recording exhausted / never recorded
+
+    def test_strict_crc_drops_recorded_bad_frame_and_loop(self, diagnostics):
+        uri = f"replay://{diagnostics}?device=inv2&speed=0&loop=1"
+        modes = _read_all(uri, ["QMOD"] * 4, strict_crc=True)
+        assert modes == [{"operating_mode": OperatingMode.Battery}, {}] + [
+            {"operating_mode": OperatingMode.Battery}
+        ] * 2
+        # Replayed frames land in frame_log like live ones.
+        assert len(frame_log.snapshot()["QMOD"]) == 4
+
+    def test_strict_crc_is_per_read_on_one_adapter(self, diagnostics):
+        uri = f"replay://{diagnostics}?device=inv2&speed=0"
+        lax = _read_all(uri, ["QMOD", "QMOD"])
+        replay.clear()
+        strict = _read_all(uri, ["QMOD", "QMOD"], strict_crc=True)
+        assert lax[1] != {} and strict[1] == {}  # same adapter, option per call
+        assert get_adapter(uri) is get_adapter(uri)
+
+    def test_close_forgets_the_recording(self, diagnostics):
+        uri = f"replay://{diagnostics}?device=inv1&speed=0"
+        adapter = replay.ReplayAdapter(uri)
+
+        async def scenario():
+            first = await adapter.get_data("QPIGS")
+            await adapter.close()
+            return first, await adapter.get_data("QPIGS")
+
+        first, again = asyncio.run(scenario())
+        assert first == again  # reopened from the start
+
+    def test_several_devices_need_a_device(self, diagnostics):
+        assert _read_all(f"replay://{diagnostics}?speed=0", ["QPIGS"]) == [{}]
+        assert _read_all(f"replay://{diagnostics}?device=inv9", ["QPIGS"]) == [{}]
+
+    def test_pacing_returns_nothing_until_the_frame_is_due(self, tmp_path):
+        state = _state(80.0)
+        cap = frame_capture.FrameCapture(str(tmp_path / "c.cap"), 4096)
+        cap.append("", "PI18:QMOD", _pi18(state, "QMOD"), True, ts=1000.0)
+        cap.append("", "PI18:QMOD", _pi18(state, "QMOD"), True, ts=1060.0)
+        cap.close()
+        uri = f"replay://{tmp_path / 'c.cap'}"
+        first, early = _read_all(f"{uri}?speed=1", ["QMOD", "QMOD"], timeout=0.05)
+        assert first["operating_mode"] and early == {}
+        # At 1200x the second frame is due 50 ms after the first.
+        replay.clear()
+        fast = _read_all(f"{uri}?speed=1200", ["QMOD", "QMOD"], timeout=1.0)
+        assert fast[0] == fast[1] == first
+
+
+class TestDecodeFile:
+    @pytest.fixture
+    def capture(self, tmp_path):
+        path = str(tmp_path / "big.cap")
+        cap = frame_capture.FrameCapture(path, 64 * 1024)
+        for i in range(40):
+            state = _state(float(i + 20))
+            cap.append("inv1", "QPIGS", _pi30(state, "QPIGS", corrupt=i == 5), i != 5, ts=float(i))
+            cap.append("inv1", "PI18:QPIGS", _pi18(state, "QPIGS"), True, ts=i + 0.5)
+        cap.close()
+        return path
+
+    def test_sharded_over_processes_keeps_order(self, capture):
+        serial = list(replay.decode_file(capture, workers=1))
+        pooled = list(replay.decode_file(capture, strict_crc=True, workers=2, shard_size=7))
+        assert len(serial) == len(pooled) == 80
+        assert [r["ts"] for r in pooled] == sorted(r["ts"] for r in pooled)
+        assert [r["data"]["battery_capacity"] for r in serial[::2]] == [f"{i + 20:03d}" for i in range(40)]
+        assert pooled[10]["data"] is None and serial[10]["data"]
+        assert [r["data"] for r in serial[11:]] == [r["data"] for r in pooled[11:]]
+        assert serial[1]["command"] == "PI18:QPIGS" and "battery_capacity" in serial[1]["data"]
+
+    def test_cli_decode(self, capture, monkeypatch):
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        assert cli.main(["--decode", capture, "--workers", "1"]) == 0
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(lines) == 80
+        assert lines[0]["type"] == "frame" and lines[0]["device"] == "inv1"
@@ -0,0 +1,132 @@
+"""Tests for the columnar on-disk sample log (sample_log.py)."""
+import math
+import os
+from datetime import UTC, datetime
+
+import pytest
+
+from custom_components.dess_monitor_local import sample_log
+from custom_components.dess_monitor_local.api.decoders.enums import OperatingMode
+
+DAY1 = datetime(2026, 3, 1, 12, 0, tzinfo=UTC).timestamp()
+DAY2 = datetime(2026, 3, 2, 12, 0, tzinfo=UTC).timestamp()
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "samples")
+
+
+def _cycle(voltage, mode=OperatingMode.Line):
+    return {
+        "qpigs": {"grid_voltage": voltage, "device_status_bits_b7_b0": "00010000"},
+        "qmod": {"operating_mode": mode},
+        "qpigs2": {"error": "NAK response received. Command not accepted."},
+    }
+
+
+class TestFlatten:
+    def test_types_and_skips(self):
+        row = sample_log.flatten(_cycle("239.7"))
+        assert row == {
+            "qpigs.grid_voltage": pytest.approx(239.7),
+            "qpigs.device_status_bits_b7_b0": 10000.0,
+            "qmod.operating_mode": "Line",
+        }
+
+
+class TestSampleLog:
+    def test_roundtrip_and_range(self, root):
+        writer = sample_log.SampleLogWriter(root)
+        for i in range(10):
+            writer.append("inv1", DAY1 + i, _cycle(f"{230 + i}.0"))
+        writer.close()
+        log = sample_log.SampleLog(root)
+        assert log.devices() == ["inv1"]
+        assert log.columns("inv1")["qmod.operating_mode"] == sample_log.KIND_TEXT
+        ts, volts = log.read("inv1", "qpigs.grid_voltage", since=DAY1 + 2, until=DAY1 + 4)
+        assert list(ts) == [DAY1 + 2, DAY1 + 3, DAY1 + 4]
+        assert list(volts) == [232.0, 233.0, 234.0]
+        _, modes = log.read("inv1", "qmod.operating_mode")
+        assert modes == ["Line"] * 10
+
+    def test_new_field_is_backfilled(self, root):
+        writer = sample_log.SampleLogWriter(root)
+        writer.append("inv1", DAY1, {"qpigs": {"grid_voltage": "230.0"}})
+        writer.append("inv1", DAY1 + 1, {"qpigs": {"grid_voltage": "231.0", "pv_input_voltage": "80.5"}})
+        writer.close()
+        _, pv = sample_log.SampleLog(root).read("inv1", "qpigs.pv_input_voltage")
+        assert math.isnan(pv[0]) and pv[1] == pytest.approx(80.5)
+
+    def test_reopen_trims_partial_row(self, root):
+        writer = sample_log.SampleLogWriter(root)
+        writer.append("inv1", DAY1, _cycle("230.0"))
+        writer.close()
+        # A crash after the column writes but before ts.f8.
+        segment = os.path.join(root, "inv1", "2026-03-01")
+        with open(os.path.join(segment, "qpigs.grid_voltage.f4"), "ab") as f:
+            f.write(b"\0\0\0\0")
+        writer = sample_log.SampleLogWriter(root)
+        writer.append("inv1", DAY1 + 1, _cycle("231.0"))
+        writer.close()
+        _, volts = sample_log.SampleLog(root).read("inv1", "qpigs.grid_voltage")
+        assert list(volts) == [230.0, 231.0]
+
+    def test_days_span_and_retention(self, root):
+        writer = sample_log.SampleLogWriter(root, retention_days=1)
+        writer.append("inv1", DAY1 - 86400 * 3, _cycle("220.0"))
+        writer.append("inv1", DAY1, _cycle("230.0"))
+        writer.append("inv1", DAY2, _cycle("240.0", OperatingMode.Battery))
+        writer.close()
+        log = sample_log.SampleLog(root)
+        assert log.days("inv1") == ["2026-03-01", "2026-03-02"]
+        _, volts = log.read("inv1", "qpigs.grid_voltage")
+        assert list(volts) == [230.0, 240.0]
+
+    def test_aggregate_buckets(self, root):
+        writer = sample_log.SampleLogWriter(root)
+        for i in range(6):
+            mode = OperatingMode.Line if i < 4 else OperatingMode.Battery
+            writer.append("inv1", DAY1 + i * 60, _cycle(f"{230 + i}.0", mode))
+        writer.close()
+        agg = sample_log.SampleLog(root).aggregate(
+            "inv1", ["qpigs.grid_voltage", "qmod.operating_mode"], bucket=180
+        )
+        first, second = agg["qpigs.grid_voltage"]
+        assert (first["count"], first["min"], first["max"]) == (3, 230.0, 232.0)
+        assert second["mean"] == pytest.approx(234.0)
+        assert [e["counts"] for e in agg["qmod.operating_mode"]] == [
+            {"Line": 3}, {"Line": 1, "Battery": 2},
+        ]
+
+    def test_rows_buffered_until_flush_interval(self, root):
+        writer = sample_log.SampleLogWriter(root, flush_interval=60.0)
+        log = sample_log.SampleLog(root)
+        writer.append_cycle(DAY1, {"inv1": _cycle("230.0"), "inv2": _cycle("231.0")})
+        writer.append_cycle(DAY1 + 30, {"inv1": _cycle("232.0"), "inv2": _cycle("233.0")})
+        assert not len(log.read("inv1", "qpigs.grid_voltage")[0])
+        writer.append_cycle(DAY1 + 60, {"inv1": _cycle("234.0")})
+        _, volts = log.read("inv1", "qpigs.grid_voltage")
+        assert list(volts) == [230.0, 232.0, 234.0]
+        writer.append("inv2", DAY1 + 61, _cycle("235.0"))
+        writer.close()
+        _, volts = log.read("inv2", "qpigs.grid_voltage")
+        assert list(volts) == [231.0, 233.0, 235.0]
+
+    @pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+    def test_no_file_handles_held_between_flushes(self, root):
+        def open_under_root():
+            links = []
+            for fd in os.listdir("/proc/self/fd"):
+                try:
+                    links.append(os.readlink(f"/proc/self/fd/{fd}"))
+                except OSError:
+                    pass
+            return [link for link in links if link.startswith(root)]
+
+        writer = sample_log.SampleLogWriter(root, flush_interval=0.0)
+        for i in range(3):
+            writer.append_cycle(DAY1 + i, {f"inv{n}": _cycle("230.0") for n in range(50)})
+        assert open_under_root() == []
+        writer.close()
+        assert len(sample_log.SampleLog(root).devices()) == 50
@@ -62,7 +62,9 @@ _QPIRI = {
 }
 
 
-async def _fake_get(device, command, timeout=30, strict_crc=False):
+# Patched with autospec=True: calls are checked against the real
+# get_direct_data signature, so the stub needn't mirror it.
+async def _fake_get(device, command, *_args, **_kwargs):
     if command == "QPIGS":
         return dict(_QPIGS)
     if command == "QPIRI":
@@ -89,6 +91,7 @@ async def test_setup_creates_entities_and_unloads(hass, enable_custom_integratio
 
     with patch(
         "custom_components.dess_monitor_local.coordinators.direct_coordinator.get_direct_data",
+        autospec=True,
         side_effect=_fake_get,
     ):
         assert await hass.config_entries.async_setup(entry.entry_id)
@@ -115,6 +118,9 @@ class _FakeManager:
     def __init__(self, registry):
         self.registry = registry
 
+    def add_registry_observer(self, observer):
+        return self.registry.add_observer(observer)
+
 
 async def _fake_get_manager(
     bind_host, bind_port, broadcast="255.255.255.255", announce_ip=None, registry=None
@@ -178,6 +184,7 @@ async def test_hub_entry_polls_enabled_child(
         side_effect=_fake_shutdown_manager,
     ), patch(
         "custom_components.dess_monitor_local.coordinators.direct_coordinator.get_direct_data",
+        autospec=True,
         side_effect=_fake_get,
     ):
         assert await hass.config_entries.async_setup(entry.entry_id)
@@ -206,6 +213,7 @@ async def test_soc_unavailable_until_capacity_set(hass, enable_custom_integratio
 
     with patch(
         "custom_components.dess_monitor_local.coordinators.direct_coordinator.get_direct_data",
+        autospec=True,
         side_effect=_fake_get,
     ):
         assert await hass.config_entries.async_setup(entry.entry_id)
@@ -252,6 +260,7 @@ async def test_hub_reconcile_adds_child_in_place(
         side_effect=_fake_shutdown_manager,
     ), patch(
         "custom_components.dess_monitor_local.coordinators.direct_coordinator.get_direct_data",
+        autospec=True,
         side_effect=_fake_get,
     ):
         assert await hass.config_entries.async_setup(entry.entry_id)
@@ -280,3 +289,27 @@ async def test_hub_reconcile_adds_child_in_place(
 
         assert await hass.config_entries.async_unload(entry.entry_id)
         await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_timed_read_samples_only_answers():
+    """A fast empty read is not an RTT sample; a real answer is."""
+    from custom_components.dess_monitor_local.coordinators.direct_coordinator import (
+        DirectCoordinator,
+    )
+    from custom_components.dess_monitor_local.coordinators.timeout_budget import RtoEstimator
+
+    c = DirectCoordinator.__new__(DirectCoordinator)  # bypass HA base __init__
+    c._rto = RtoEstimator()
+    target = "custom_components.dess_monitor_local.coordinators.direct_coordinator.get_direct_data"
+
+    async def empty(*_args, **_kwargs):
+        return {}
+
+    with patch(target, autospec=True, side_effect=empty):
+        assert await c._timed_read("dev", "tcp://x:1", "QPIWS", None, False) == {}
+    assert c._rto.snapshot() == {}
+
+    with patch(target, autospec=True, side_effect=_fake_get):
+        assert await c._timed_read("dev", "tcp://x:1", "QPIGS", None, False)
+    assert list(c._rto.snapshot()["dev"]) == ["QPIGS"]
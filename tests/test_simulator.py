@@ -0,0 +1,253 @@
+"""Tests for the load-testing inverter simulator (simulator/)."""
+import asyncio
+import json
+
+import pytest
+
+# The Elfin / PI18 adapters import the serial transport.
+pytest.importorskip("serial_asyncio_fast")
+
+from custom_components.dess_monitor_local.api.adapters.voltronic import VoltronicAdapter
+from custom_components.dess_monitor_local.api.crc import build_pi30_frame, validate_voltronic_response
+from custom_components.dess_monitor_local.api.decoders.enums import OperatingMode
+from custom_components.dess_monitor_local.api.decoders.pi18 import build_request_frame, decode_pi18_response
+from custom_components.dess_monitor_local.api.decoders.voltronic import decode_direct_response
+from custom_components.dess_monitor_local.api.protocols import eybond_dongle as ey
+from custom_components.dess_monitor_local.api.protocols.agent_http import split_raw_by_command
+from custom_components.dess_monitor_local.api.protocols.modbus_rtu import (
+    read_smg2_snapshot,
+    smg2_to_qpigs,
+    write_modbus_single_register,
+)
+from custom_components.dess_monitor_local.api.protocols.pi18_tcp import query_pi18
+from custom_components.dess_monitor_local.simulator import codecs, servers
+from custom_components.dess_monitor_local.simulator.__main__ import parse_args, profile_from_args
+from custom_components.dess_monitor_local.simulator.fleet import Fleet
+from custom_components.dess_monitor_local.simulator.state import FaultProfile, InverterState
+
+FAST = FaultProfile(latency=0.0)
+
+
+def _state(**kwargs):
+    # SBU with a charged battery: deterministic Battery mode.
+    state = InverterState(seed=7, **kwargs)
+    state.soc = 80.0
+    return state
+
+
+async def _serve(server):
+    await server.start()
+    return server
+
+
+class TestCodecs:
+    def test_pi30_frames_decode(self):
+        state = _state()
+        _, build = codecs.pi30_request(state, build_pi30_frame("QPIGS"))
+        frame = build(False, False)
+        ok, _ = validate_voltronic_response(frame[:-1])
+        assert ok
+        qpigs = decode_direct_response("QPIGS", frame.decode("ascii", errors="ignore"))
+        assert len(qpigs) == 24
+        assert qpigs["battery_capacity"] == "080"
+        assert float(qpigs["grid_voltage"]) > 200
+
+    def test_pi30_corrupt_and_nak(self):
+        state = _state()
+        _, build = codecs.pi30_request(state, build_pi30_frame("QMOD"))
+        assert not validate_voltronic_response(build(False, True)[:-1])[0]
+        assert decode_direct_response("QMOD", build(True, False).decode("ascii", errors="ignore")) == {
+            "error": "NAK response received. Command not accepted."
+        }
+
+    def test_set_command_shows_in_qpiri(self):
+        state = _state()
+        _, build = codecs.pi30_request(state, build_pi30_frame("POP00"))
+        assert b"ACK" in build(False, False)
+        _, build = codecs.pi30_request(state, build_pi30_frame("QPIRI"))
+        qpiri = decode_direct_response("QPIRI", build(False, False).decode("ascii", errors="ignore"))
+        assert qpiri["output_source_priority"] == "UtilityFirst"
+        assert state.settings_written == 1
+
+    def test_pi18_frames_decode(self):
+        state = _state()
+        for command, key in (("QPIGS", "battery_capacity"), ("QPIRI", "bulk_charging_voltage"),
+                             ("QMOD", "operating_mode"), ("QFWS", "fault_code")):
+            name, build = codecs.pi18_request(state, build_request_frame(command))
+            assert name == command
+            assert key in decode_pi18_response(command, build(False, False))
+        _, build = codecs.pi18_request(state, build_request_frame("QMOD"))
+        assert decode_pi18_response("QMOD", build(True, False)) == {"status": "NAK"}
+
+
+class TestServers:
+    def test_stream_server_hooks_are_abstract(self):
+        with pytest.raises(TypeError):
+            servers._StreamServer(servers.FaultInjector(FAST))
+
+    def test_pi30_over_tcp(self):
+        async def scenario():
+            server = await _serve(servers.Pi30Server(_state(), FaultProfile(latency=0.0, nak={"QPIGS2"})))
+            adapter = VoltronicAdapter(server.uri, timeout=2.0)
+            try:
+                mode = await adapter.get_data("QMOD")
+                qpigs2 = await adapter.get_data("QPIGS2")
+            finally:
+                await server.close()
+            return mode, qpigs2, server.faults.stats
+
+        mode, qpigs2, stats = asyncio.run(scenario())
+        assert mode == {"operating_mode": OperatingMode.Battery}
+        assert "error" in qpigs2
+        assert (stats["replies"], stats["naks"]) == (1, 1)
+
+    def test_strict_crc_and_close_every(self):
+        async def scenario():
+            server = await _serve(servers.Pi30Server(_state(), FaultProfile(latency=0.0, crc_error_rate=1.0)))
+            closing = await _serve(servers.Pi30Server(_state(), FaultProfile(latency=0.0, close_every=1)))
+            try:
+                strict = await VoltronicAdapter(server.uri, 2.0, strict_crc=True).get_data("QMOD")
+                closed = await VoltronicAdapter(closing.uri, 2.0).get_data("QMOD")
+            finally:
+                await server.close()
+                await closing.close()
+            return strict, closed, closing.faults.stats["closed"]
+
+        assert asyncio.run(scenario()) == ({}, {}, 1)
+
+    def test_pi18_over_tcp(self):
+        async def scenario():
+            server = await _serve(servers.Pi18Server(_state(), FAST))
+            try:
+                return await query_pi18(server.uri, "QPIRI", timeout=2.0)
+            finally:
+                await server.close()
+
+        assert asyncio.run(scenario())["max_charging_current"] == "060"
+
+    def test_modbus_snapshot_and_write(self):
+        async def scenario():
+            state = _state()
+            server = await _serve(servers.ModbusServer(state, FAST))
+            try:
+                written = await write_modbus_single_register("127.0.0.1", server.port, 332, 400, timeout=2.0)
+                sensors, config, faults = await read_smg2_snapshot("127.0.0.1", server.port)
+            finally:
+                await server.close()
+            return written, sensors, config, faults, state
+
+        written, sensors, config, faults, state = asyncio.run(scenario())
+        assert written == {"status": "OK", "func": 6}
+        assert state.max_charging_current == 40
+        assert config["max_charging_current"] == 40.0
+        assert sensors["operation_mode"] == "Off-Grid"
+        assert smg2_to_qpigs(sensors)["battery_voltage"]
+        assert faults["has_fault"] is False
+
+    def test_agent_http(self):
+        async def http(port, request):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await reader.read()
+            writer.close()
+            head, _, body = response.partition(b"\r\n\r\n")
+            return int(head.split()[1]), json.loads(body)
+
+        async def scenario():
+            server = await _serve(servers.AgentServer({"sim-1": _state()}, FAST))
+            body = json.dumps({"key": "output_source_priority", "value": "UtilityFirst"}).encode()
+            try:
+                latest = await http(server.port, b"GET /devices/sim-1/latest HTTP/1.1\r\nHost: x\r\n\r\n")
+                missing = await http(server.port, b"GET /devices/nope/latest HTTP/1.1\r\n\r\n")
+                setting = await http(
+                    server.port,
+                    b"POST /devices/sim-1/settings HTTP/1.1\r\nContent-Length: "
+                    + str(len(body)).encode() + b"\r\n\r\n" + body,
+                )
+            finally:
+                await server.close()
+            return latest, missing, setting, server.states["sim-1"]
+
+        (status, latest), missing, setting, state = asyncio.run(scenario())
+        assert status == 200 and latest["providerDeviceId"] == "sim-1"
+        assert split_raw_by_command(latest["raw"], "QPIGS")["battery_capacity"] == "80"
+        assert missing[0] == 404
+        assert setting == (200, {"ok": True, "rawResponse": "ACK"})
+        assert state.output_priority == 0
+
+
+class TestDongle:
+    def test_forward_through_manager_and_redial(self):
+        async def scenario():
+            mgr = ey.EybondManager("127.0.0.1", 0, ey.DEFAULT_BROADCAST)
+            mgr._announce_task = asyncio.create_task(asyncio.sleep(3600))  # no UDP announcer
+            await mgr.ensure_started()
+            port = mgr._server.sockets[0].getsockname()[1]
+            profile = FaultProfile(latency=0.0, session_lifetime=0.3, reconnect_delay=0.05)
+            dongle = servers.DongleClient("SIM00000000042", {1: _state(), 2: _state()}, "pi30", profile)
+            dongle.start("127.0.0.1", port)
+            try:
+                await asyncio.wait_for(mgr._ready_event_for(dongle.pn).wait(), 2.0)
+                raw = await mgr.send_frame(2, build_pi30_frame("QMOD"), 2.0, pn=dongle.pn)
+                await asyncio.sleep(0.5)  # outlive one session
+                await asyncio.wait_for(mgr._ready_event_for(dongle.pn).wait(), 2.0)
+                again = await mgr.send_frame(1, build_pi30_frame("QMOD"), 2.0, pn=dongle.pn)
+            finally:
+                await dongle.close()
+                await mgr.shutdown()
+            return raw, again, dongle.faults.stats["sessions"]
+
+        raw, again, sessions = asyncio.run(scenario())
+        assert raw == again == codecs.pi30_frame(b"B")
+        assert sessions >= 2
+
+    def test_forwards_answered_concurrently(self):
+        async def scenario():
+            mgr = ey.EybondManager("127.0.0.1", 0, ey.DEFAULT_BROADCAST)
+            mgr._announce_task = asyncio.create_task(asyncio.sleep(3600))  # no UDP announcer
+            await mgr.ensure_started()
+            port = mgr._server.sockets[0].getsockname()[1]
+            profile = FaultProfile(latency=0.3)
+            dongle = servers.DongleClient("SIM00000000043", {1: _state(), 2: _state()}, "pi30", profile)
+            dongle.start("127.0.0.1", port)
+            try:
+                await asyncio.wait_for(mgr._ready_event_for(dongle.pn).wait(), 2.0)
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                replies = await asyncio.gather(*(
+                    mgr.send_frame(addr, build_pi30_frame("QMOD"), 2.0, pn=dongle.pn, window=4)
+                    for addr in (1, 2, 1, 2)
+                ))
+                elapsed = loop.time() - started
+            finally:
+                await dongle.close()
+                await mgr.shutdown()
+            return replies, elapsed
+
+        replies, elapsed = asyncio.run(scenario())
+        assert replies == [codecs.pi30_frame(b"B")] * 4
+        # Four 0.3 s replies in flight together, not one after another.
+        assert elapsed < 0.9
+
+
+class TestFleet:
+    def test_uris_and_stats(self):
+        async def scenario():
+            fleet = Fleet(FAST, seed=100)
+            await fleet.start(pi30=2, pi18=1, modbus=1, agent=2, eybond_port=1)
+            uris = fleet.uris()
+            await VoltronicAdapter(uris[0], 2.0).get_data("QMOD")
+            await fleet.close()
+            return uris, fleet.stats()
+
+        uris, stats = asyncio.run(scenario())
+        assert [uri.split(":")[0] for uri in uris] == ["tcp", "tcp", "pi18", "modbus", "agent", "agent"]
+        assert uris[-1].endswith("/sim-2")
+        assert stats == {"requests": 1, "replies": 1}
+
+    def test_cli_profile(self):
+        args = parse_args(["--pi30", "3", "--nak", "QPIGS2", "--nak", "QPIWS", "--jitter", "0.01"])
+        profile = profile_from_args(args)
+        assert args.pi30 == 3
+        assert profile.nak == {"QPIGS2", "QPIWS"}
+        assert profile.jitter == 0.01
@@ -0,0 +1,92 @@
+"""Tests for the event-loop stall watchdog (stalls.py)."""
+import asyncio
+import logging
+import time
+
+import pytest
+
+from custom_components.dess_monitor_local import frame_log, metrics, stalls
+from custom_components.dess_monitor_local.api.commands.direct_command_queue import CommandQueue
+from custom_components.dess_monitor_local.api.protocols.elfin_tcp import ElfinTCPProtocol
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    monkeypatch.setattr(stalls, "THRESHOLD", 0.02)
+    stalls.clear()
+    yield
+    stalls.clear()
+    frame_log.clear()
+
+
+class TestStalls:
+    def test_fast_steps_only_feed_the_window(self):
+        names = []
+        for _ in range(3):
+            stalls.observe("entity_update", 0.001, lambda: names.append(1) or "x")
+        snap = stalls.snapshot()
+        assert names == []  # lazily named
+        assert snap["kinds"]["entity_update"]["count"] == 3
+        assert snap["kinds"]["entity_update"]["slow"] == 0
+        assert snap["recent"] == []
+
+    def test_rolling_max_and_p99(self):
+        for i in range(1, 101):
+            stalls.observe("data_received", i / 10000, "inv1 QPIGS")
+        kind = stalls.snapshot()["kinds"]["data_received"]
+        assert kind["max_ms"] == 10.0
+        assert kind["p99_ms"] == 10.0
+        assert kind["p50_ms"] == 5.0
+
+    def test_slow_step_warned_once_then_debug(self, caplog):
+        caplog.set_level(logging.DEBUG, logger=stalls.__name__)
+        stalls.observe("entity_update", 0.3, "sensor.inverter_pv_power")
+        stalls.observe("entity_update", 0.3, "sensor.inverter_pv_power")
+        warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert len(warnings) == 1
+        assert "sensor.inverter_pv_power" in warnings[0].getMessage()
+        recent = stalls.snapshot()["recent"]
+        assert [r["name"] for r in recent] == ["sensor.inverter_pv_power"] * 2
+        assert recent[0]["ms"] == 300.0
+
+    def test_timed_names_from_call_args(self):
+        class Entity:
+            entity_id = "sensor.slow"
+
+            def handle(self):
+                time.sleep(0.03)
+
+        Entity.handle = stalls.timed("entity_update", lambda self: self.entity_id)(Entity.handle)
+        Entity().handle()
+        assert stalls.snapshot()["recent"][0]["name"] == "sensor.slow"
+
+    def test_data_received_named_by_bound_device(self, monkeypatch):
+        monkeypatch.setattr(stalls, "THRESHOLD", 0)
+        proto = ElfinTCPProtocol("QMOD", lambda data, err: None)
+        with metrics.bind(device="inv1"):
+            proto.data_received(b"(B\xe7\xc9\r")
+        assert stalls.snapshot()["recent"][0] | {"ts": None, "ms": None} == {
+            "ts": None, "kind": "data_received", "name": "inv1 QMOD", "ms": None
+        }
+
+    def test_queue_step_times_loop_time_not_waits(self):
+        async def command():
+            await asyncio.sleep(0.05)  # waiting on the inverter: not a stall
+            time.sleep(0.03)  # blocking decode: a stall
+            return "ok"
+
+        async def main():
+            queue = CommandQueue(min_delay=0)
+            await queue.start()
+            try:
+                with metrics.bind(device="inv1"):
+                    return await queue.enqueue(command, desc="QPIGS")
+            finally:
+                await queue.stop()
+
+        assert asyncio.run(main()) == "ok"
+        snap = stalls.snapshot()
+        assert snap["kinds"]["queue_step"]["count"] == 2
+        assert snap["kinds"]["queue_step"]["slow"] == 1
+        assert [r["name"] for r in snap["recent"]] == ["inv1 QPIGS"]
+        assert snap["recent"][0]["ms"] < 50
@@ -0,0 +1,121 @@
+"""Tests for the adaptive per-command timeouts (timeout_budget.py)."""
+from custom_components.dess_monitor_local.coordinators.timeout_budget import (
+    DEFAULT_INITIAL_RTO,
+    DEFAULT_MAX_RTO,
+    MAX_BACKOFF,
+    RtoEstimator,
+    remaining,
+)
+
+
+class TestRto:
+    def test_unknown_device_uses_initial(self):
+        est = RtoEstimator(initial_rto=30.0)
+        assert est.rto("dev", "QPIGS") == 30.0
+
+    def test_learns_fast_device(self):
+        est = RtoEstimator(initial_rto=30.0, min_rto=1.0)
+        for _ in range(20):
+            est.on_sample("dev", "QPIGS", 0.4)
+        # Stable 0.4 s answers → clamped to the floor, far below 30 s.
+        assert est.rto("dev", "QPIGS") == 1.0
+
+    def test_jitter_widens_rto(self):
+        steady, jittery = RtoEstimator(min_rto=0.0), RtoEstimator(min_rto=0.0)
+        for i in range(20):
+            steady.on_sample("dev", "QPIGS", 2.0)
+            jittery.on_sample("dev", "QPIGS", 1.0 if i % 2 else 3.0)
+        assert jittery.rto("dev", "QPIGS") > steady.rto("dev", "QPIGS")
+
+    def test_max_clamp(self):
+        est = RtoEstimator(max_rto=10.0)
+        est.on_sample("dev", "QPIRI", 25.0)
+        assert est.rto("dev", "QPIRI") == 10.0
+
+    def test_unseen_command_borrows_slowest_known(self):
+        est = RtoEstimator(initial_rto=30.0, min_rto=0.0)
+        est.on_sample("dev", "QMOD", 0.5)
+        est.on_sample("dev", "QPIRI", 2.0)
+        assert est.rto("dev", "QFWS") == est.rto("dev", "QPIRI")
+
+    def test_per_device_isolation(self):
+        est = RtoEstimator(initial_rto=30.0)
+        est.on_sample("dev1", "QPIGS", 0.5)
+        assert est.rto("dev2", "QPIGS") == 30.0
+
+
+class TestBackoff:
+    def test_timeout_doubles_then_caps(self):
+        est = RtoEstimator(min_rto=0.0, max_rto=1000.0)
+        est.on_sample("dev", "QPIGS", 1.0)
+        base = est.rto("dev", "QPIGS")
+        est.on_timeout("dev", "QPIGS")
+        assert est.rto("dev", "QPIGS") == base * 2
+        for _ in range(10):
+            est.on_timeout("dev", "QPIGS")
+        assert est.rto("dev", "QPIGS") == base * MAX_BACKOFF
+
+    def test_sample_resets_backoff(self):
+        est = RtoEstimator(min_rto=0.0)
+        est.on_sample("dev", "QPIGS", 1.0)
+        est.on_timeout("dev", "QPIGS")
+        est.on_sample("dev", "QPIGS", 1.0)
+        assert est.rto("dev", "QPIGS") < 2 * 3.0
+
+    def test_default_initial_is_not_the_ceiling(self):
+        est = RtoEstimator()
+        assert est.rto("dev", "QPIGS") == DEFAULT_INITIAL_RTO < DEFAULT_MAX_RTO
+
+    def test_timeout_on_unknown_backs_off(self):
+        est = RtoEstimator(initial_rto=3.0, max_rto=1000.0)
+        est.on_timeout("dev", "QPIGS")
+        assert est.rto("dev", "QPIGS") == 6.0
+        for _ in range(10):
+            est.on_timeout("dev", "QPIGS")
+        assert est.rto("dev", "QPIGS") == 3.0 * MAX_BACKOFF
+        # Other keys of the same device are unaffected.
+        assert est.rto("dev", "QMOD") == 3.0
+
+    def test_unknown_backoff_capped_by_max_rto(self):
+        est = RtoEstimator(initial_rto=3.0, max_rto=10.0)
+        for _ in range(3):
+            est.on_timeout("dev", "QPIGS")
+        assert est.rto("dev", "QPIGS") == 10.0
+
+    def test_first_sample_clears_unknown_backoff(self):
+        est = RtoEstimator(initial_rto=3.0, min_rto=0.0)
+        est.on_timeout("dev", "QPIGS")
+        est.on_sample("dev", "QPIGS", 1.0)
+        assert est.rto("dev", "QPIGS") == 3.0  # 1.0 + 4 * 0.5, no backoff
+        assert est._unanswered["dev"] == {}
+
+    def test_unseen_command_on_known_device_backs_off(self):
+        est = RtoEstimator(min_rto=0.0, max_rto=1000.0)
+        est.on_sample("dev", "QPIGS", 1.0)
+        prior = est.rto("dev", "QPIRI")
+        est.on_timeout("dev", "QPIRI")
+        assert est.rto("dev", "QPIRI") == prior * 2
+        assert est.rto("dev", "QPIGS") == prior
+
+
+class TestDeadline:
+    def test_remaining_unbounded(self):
+        assert remaining(None) is None
+
+    def test_remaining(self):
+        assert remaining(110.0, now=100.0) == 10.0
+
+    def test_timeout_clipped_to_budget(self):
+        est = RtoEstimator(initial_rto=30.0)
+        assert est.timeout_for("dev", "QPIGS", deadline=105.0, now=100.0) == 5.0
+        assert est.timeout_for("dev", "QPIGS") == 30.0
+
+    def test_spent_budget_is_non_positive(self):
+        est = RtoEstimator()
+        assert est.timeout_for("dev", "QPIGS", deadline=99.0, now=100.0) <= 0
+
+    def test_snapshot_shape(self):
+        est = RtoEstimator()
+        est.on_sample("dev", "QPIGS", 0.5)
+        snap = est.snapshot()
+        assert set(snap["dev"]["QPIGS"]) == {"srtt", "rttvar", "rto"}
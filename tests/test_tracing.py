@@ -0,0 +1,120 @@
+"""Tests for the opt-in poll-cycle tracer (tracing.py)."""
+import asyncio
+import json
+
+import pytest
+
+from custom_components.dess_monitor_local import tracing
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    tracing.configure("test", 0)
+    tracing.clear()
+    yield
+    tracing.configure("test", 0)
+    tracing.configure("other", 0)
+    tracing.clear()
+
+
+def _spans(trace: dict) -> list[dict]:
+    return [e for e in trace["traceEvents"] if e["ph"] == "X"]
+
+
+def _track_names(trace: dict) -> dict[int, str]:
+    return {
+        e["tid"]: e["args"]["name"]
+        for e in trace["traceEvents"]
+        if e["ph"] == "M" and e["name"] == "thread_name"
+    }
+
+
+class TestDisabled:
+    def test_span_is_shared_noop(self):
+        assert tracing.span("a") is tracing.span("b", track="x")
+
+    def test_nothing_recorded(self):
+        with tracing.span("cycle"):
+            tracing.add("queue wait", 0.0, 1.0)
+        tracing.begin_cycle()
+        assert _spans(tracing.export()) == []
+
+
+class TestRecording:
+    def test_span_fields(self):
+        tracing.configure("test", 2)
+        tracing.begin_cycle()
+        with tracing.span("QPIGS attempt 1", "attempt", command="QPIGS"):
+            pass
+        (event,) = _spans(tracing.export())
+        assert event["name"] == "QPIGS attempt 1"
+        assert event["cat"] == "attempt"
+        assert event["dur"] >= 0
+        assert event["args"] == {"command": "QPIGS"}
+
+    def test_name_and_args_formatted_at_export(self):
+        tracing.configure("test", 1)
+        with tracing.span("{command} attempt {attempt}", "attempt", command="QPIGS", attempt=2):
+            tracing.add("read", 0.0, 1.0, timeout=2.718281)
+        names = {e["name"]: e["args"] for e in _spans(tracing.export())}
+        assert names["QPIGS attempt 2"] == {"command": "QPIGS", "attempt": "2"}
+        assert names["read"] == {"timeout": "2.718"}
+
+    def test_keeps_last_n_cycles(self):
+        tracing.configure("test", 2)
+        for n in range(3):
+            tracing.begin_cycle()
+            tracing.add(f"cycle {n}", n, n + 0.5)
+        names = [e["name"] for e in _spans(tracing.export())]
+        assert names == ["cycle 1", "cycle 2"]
+
+    def test_depth_is_largest_request(self):
+        tracing.configure("test", 1)
+        tracing.configure("other", 3)
+        for n in range(4):
+            tracing.begin_cycle()
+            tracing.add(str(n), n, n)
+        assert len(_spans(tracing.export())) == 3
+        tracing.configure("other", 0)
+        assert tracing.enabled()
+        tracing.configure("test", 0)
+        assert not tracing.enabled()
+
+    def test_export_is_json(self):
+        tracing.configure("test", 1)
+        tracing.add("queue wait", 1.0, 1.25, cat="queue")
+        trace = json.loads(json.dumps(tracing.export()))
+        (event,) = _spans(trace)
+        assert event["ts"] == 1_000_000
+        assert event["dur"] == 250_000
+
+
+class TestTracks:
+    def test_nested_spans_inherit_track(self):
+        tracing.configure("test", 1)
+        with tracing.span("fetch device", track="inv1"):
+            with tracing.span("read"):
+                pass
+        with tracing.span("publish"):
+            pass
+        trace = tracing.export()
+        names = _track_names(trace)
+        rows = {e["name"]: names[e["tid"]] for e in _spans(trace)}
+        assert rows == {"fetch device": "inv1", "read": "inv1", "publish": "coordinator"}
+
+    def test_concurrent_devices_get_own_rows(self):
+        tracing.configure("test", 1)
+
+        async def fetch(device):
+            with tracing.span("fetch device", track=device):
+                await asyncio.sleep(0)
+                tracing.add("queue wait", 0.0, 0.0)
+
+        async def cycle():
+            await asyncio.gather(fetch("a"), fetch("b"))
+
+        asyncio.run(cycle())
+        trace = tracing.export()
+        names = _track_names(trace)
+        waits = sorted(names[e["tid"]] for e in _spans(trace) if e["name"] == "queue wait")
+        assert waits == ["a", "b"]
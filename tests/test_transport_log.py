@@ -0,0 +1,44 @@
+"""Tests for the transport logging helpers (api/protocols/transport_log.py)."""
+from custom_components.dess_monitor_local import metrics
+from custom_components.dess_monitor_local.api.protocols import transport_log
+
+
+class TestHexdump:
+    def test_formats_lazily_as_hex(self):
+        assert str(transport_log.hexdump(b"\x01\xab")) == "01ab"
+        assert repr(transport_log.hexdump(b"Q")) == "51"
+
+    def test_limit_truncates(self):
+        text = str(transport_log.hexdump(bytes(range(10)), 4))
+        assert text == "00010203… (10 bytes)"
+
+    def test_short_frame_not_marked_truncated(self):
+        assert str(transport_log.hexdump(b"\x00\x01", 4)) == "0001"
+
+
+class TestCycleSummary:
+    def test_take_resets_window(self):
+        transport_log.take_summary()
+        transport_log.tally("eybond", "rx forward", 20)
+        transport_log.tally("eybond", "rx forward", 30)
+        transport_log.tally("elfin", "tx", 8)
+        summary = transport_log.take_summary()
+        assert summary
+        assert str(summary) == "elfin tx 1×/8 B, eybond rx forward 2×/50 B"
+        assert not transport_log.take_summary()
+
+    def test_owner_defaults_to_bound_device(self):
+        transport_log.take_summary()
+        with metrics.bind(device="inv1"):
+            transport_log.tally("elfin", "tx", 8)
+        transport_log.tally("elfin", "tx", 8, owner="inv2")
+        assert str(transport_log.take_summary(["inv1"])) == "elfin tx 1×/8 B"
+        assert str(transport_log.take_summary()) == "elfin tx 1×/8 B"
+
+    def test_take_leaves_other_owners(self):
+        transport_log.take_summary()
+        transport_log.tally("eybond", "rx heartbeat", 20, owner="eybond:PN1")
+        transport_log.tally("eybond", "rx heartbeat", 20, owner="eybond:PN2")
+        assert str(transport_log.take_summary({"eybond:PN1"})) == "eybond rx heartbeat 1×/20 B"
+        assert not transport_log.take_summary({"eybond:PN1"})
+        assert transport_log.take_summary({"eybond:PN2"})